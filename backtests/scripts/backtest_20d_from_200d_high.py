@@ -11,11 +11,15 @@ This script backtests a momentum trading strategy that:
 
 import pandas as pd
 import numpy as np
+import sys
+import os
 from datetime import datetime, timedelta
 import argparse
 from calc_days_from_high import calculate_days_since_200d_high
 from calc_vola import calculate_rolling_30d_volatility
 from calc_weights import calculate_weights
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def calculate_rolling_volatility_custom(data, window=30):
@@ -54,8 +58,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath)
     
     # Deduplicate symbols: filter to keep only symbols with ":USDC" suffix
     # This fixes the duplicate HYPE/USDC and HYPE/USDC:USDC issue
@@ -25,14 +25,10 @@ import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../signals"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
-# Import statsmodels for ADF test
-try:
-    from statsmodels.tsa.stattools import adfuller
-except ImportError:
-    print("ERROR: statsmodels package not found. Please install it:")
-    print("  pip install statsmodels")
-    sys.exit(1)
+from calc_rolling_adf import ADFCache, clip_adf_stat, rolling_adf
 
 
 def load_data(filepath):
@@ -45,8 +41,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, close, volume, market_cap
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath, columns=["close", "volume", "market_cap", "open", "high", "low"])
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
 
     # Keep only relevant columns
@@ -62,7 +57,7 @@ def load_data(filepath):
     return df
 
 
-def calculate_rolling_adf(data, window=60, regression="ct"):
+def calculate_rolling_adf(data, window=60, regression="ct", workers=1, use_cache=True):
     """
     Calculate rolling ADF test statistic for each cryptocurrency.
 
@@ -78,6 +73,8 @@ def calculate_rolling_adf(data, window=60, regression="ct"):
             - 'ct': constant + trend (recommended for crypto)
             - 'ctt': constant + linear/quadratic trend
             - 'n': no constant, no trend
+        workers (int): Worker processes for the batched ADF engine
+        use_cache (bool): Reuse/persist results in data/.cache/adf
 
     Returns:
         pd.DataFrame: DataFrame with adf_stat and supporting columns
@@ -88,63 +85,33 @@ def calculate_rolling_adf(data, window=60, regression="ct"):
     # Calculate daily log returns for supporting analysis
     df["daily_return"] = df.groupby("symbol")["close"].transform(lambda x: np.log(x / x.shift(1)))
 
-    # Calculate rolling ADF test statistic
-    def calculate_adf_for_group(group):
-        """Calculate rolling ADF for a single coin"""
-        adf_stats = []
-        adf_pvalues = []
-
-        for i in range(len(group)):
-            if i < window:
-                adf_stats.append(np.nan)
-                adf_pvalues.append(np.nan)
-                continue
-
-            # Extract window of PRICE LEVELS (not returns!)
-            window_prices = group["close"].iloc[i - window : i].values
-
-            # Run ADF test
-            try:
-                result = adfuller(window_prices, regression=regression, autolag="AIC")
-                adf_statistic = result[0]  # ADF test statistic
-                adf_pvalue = result[1]  # p-value
-
-                # Sanity check: cap extreme values
-                if adf_statistic < -20:
-                    adf_statistic = -20
-                elif adf_statistic > 0:
-                    adf_statistic = 0
-
-                adf_stats.append(adf_statistic)
-                adf_pvalues.append(adf_pvalue)
-
-            except Exception as e:
-                # If ADF test fails, return NaN
-                adf_stats.append(np.nan)
-                adf_pvalues.append(np.nan)
-
-        return pd.Series(adf_stats), pd.Series(adf_pvalues)
-
-    # Apply ADF calculation to each symbol
+    # Coins with less than one full window of history are dropped
     print("  Calculating ADF statistics for each coin...")
-    adf_results = []
-
-    for symbol in df["symbol"].unique():
-        symbol_data = df[df["symbol"] == symbol].copy().reset_index(drop=True)
-
-        if len(symbol_data) < window:
-            continue
-
-        adf_stats, adf_pvalues = calculate_adf_for_group(symbol_data)
-        symbol_data["adf_stat"] = adf_stats
-        symbol_data["adf_pvalue"] = adf_pvalues
+    history = df.groupby("symbol")["close"].transform("size")
+    df_with_adf = df[history >= window].reset_index(drop=True)
+
+    # ADF on PRICE LEVELS (not returns!), all windows of all coins in one batch
+    adf = rolling_adf(
+        df_with_adf["close"].to_numpy(),
+        df_with_adf["symbol"].to_numpy(),
+        df_with_adf["date"].to_numpy(),
+        window=window,
+        regression=regression,
+        autolag="AIC",
+        workers=workers,
+        cache=ADFCache() if use_cache else None,
+    )
 
-        # Mark as stationary if p-value < 0.05 (95% confidence)
-        symbol_data["is_stationary"] = symbol_data["adf_pvalue"] < 0.05
+    # Day i uses the window ending on day i-1 (the current day is excluded)
+    adf.index = df_with_adf.index
+    shifted = adf.groupby(df_with_adf["symbol"].to_numpy()).shift(1)
 
-        adf_results.append(symbol_data)
+    # Sanity check: cap extreme values
+    df_with_adf["adf_stat"] = clip_adf_stat(shifted["adf_stat"].to_numpy())
+    df_with_adf["adf_pvalue"] = shifted["adf_pvalue"]
 
-    df_with_adf = pd.concat(adf_results, ignore_index=True)
+    # Mark as stationary if p-value < 0.05 (95% confidence)
+    df_with_adf["is_stationary"] = df_with_adf["adf_pvalue"] < 0.05
 
     # Calculate additional statistics for analysis
     df_with_adf["returns_mean_60d"] = df_with_adf.groupby("symbol")["daily_return"].transform(
@@ -12,12 +12,13 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def load_data(price_data_file):
     """Load price data"""
-    df = pd.read_csv(price_data_file)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(price_data_file)
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
     return df
 
@@ -18,10 +18,14 @@ provide opportunities to earn carry while benefiting from reversion.
 
 import pandas as pd
 import numpy as np
+import sys
+import os
 from datetime import datetime, timedelta
 import argparse
 from calc_vola import calculate_rolling_30d_volatility
 from calc_weights import calculate_weights
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts import price_store
 
 
 def calculate_rolling_volatility_custom(data, window=30):
@@ -60,9 +64,7 @@ def load_price_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
+    df = price_store.load_price_data(filepath)
 
     # Normalize symbol format (e.g., 'BTC/USD' -> 'BTC')
     if "base" in df.columns:
@@ -85,8 +87,9 @@ def load_funding_rates(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, coin_symbol, funding_rate_pct
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = price_store.load_dataset(
+        filepath, columns=["coin_symbol", "funding_rate_pct", "rank", "coin_name"]
+    )
     df = df.sort_values(["coin_symbol", "date"]).reset_index(drop=True)
 
     # Keep only necessary columns
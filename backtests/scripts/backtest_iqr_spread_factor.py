@@ -24,6 +24,8 @@ import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../signals"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def load_data(filepath):
@@ -36,8 +38,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, close, volume, market_cap
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath, columns=["close", "volume", "market_cap", "open", "high", "low"])
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
 
     # Keep only relevant columns
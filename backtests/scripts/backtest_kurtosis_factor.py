@@ -18,7 +18,6 @@ Low kurtosis = thin tails, more stable returns
 
 import pandas as pd
 import numpy as np
-from scipy import stats
 from datetime import datetime, timedelta
 import argparse
 import sys
@@ -28,6 +27,9 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../signals"))
 from calc_vola import calculate_rolling_30d_volatility
 from calc_weights import calculate_weights
+from calc_rolling_moments import calculate_rolling_moments
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def load_data(filepath):
@@ -40,8 +42,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, close, volume, market_cap
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath, columns=["close", "volume", "market_cap"])
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
 
     # Keep only relevant columns
@@ -75,20 +76,9 @@ def calculate_rolling_kurtosis(data, window=30):
     # Calculate daily log returns
     df["daily_return"] = df.groupby("symbol")["close"].transform(lambda x: np.log(x / x.shift(1)))
 
-    # Calculate rolling kurtosis using scipy.stats.kurtosis (Fisher=True for excess kurtosis)
-    def rolling_kurt(x):
-        if len(x) < window or x.isna().all():
-            return np.nan
-        try:
-            # Fisher=True: excess kurtosis (normal = 0, leptokurtic > 0, platykurtic < 0)
-            # nan_policy='omit' to handle any NaN values
-            return stats.kurtosis(x.dropna(), fisher=True, nan_policy="omit")
-        except:
-            return np.nan
-
-    df["kurtosis"] = df.groupby("symbol")["daily_return"].transform(
-        lambda x: x.rolling(window=window, min_periods=window).apply(rolling_kurt, raw=False)
-    )
+    # Rolling excess kurtosis (Fisher, biased moments as scipy.stats.kurtosis)
+    # normal = 0, leptokurtic > 0, platykurtic < 0
+    df["kurtosis"] = calculate_rolling_moments(df, window=window, column="daily_return")["kurtosis"]
 
     # Also calculate mean and std of returns in window for context
     df["returns_mean_30d"] = df.groupby("symbol")["daily_return"].transform(
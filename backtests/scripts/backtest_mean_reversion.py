@@ -24,6 +24,7 @@ if workspace_root not in sys.path:
 
 from common.validators import DataValidator
 from common.exceptions import DataValidationError
+from data.scripts.price_store import load_price_data
 import logging
 
 logger = logging.getLogger(__name__)
@@ -39,8 +40,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath)
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
 
     # Validate data structure and quality
@@ -22,8 +22,12 @@ See DIRECTIONAL_MEAN_REVERSION_SUMMARY.md for complete analysis.
 
 import pandas as pd
 import numpy as np
+import sys
+import os
 from datetime import datetime
 import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def load_data(filepath):
@@ -36,8 +40,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath)
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
     return df
 
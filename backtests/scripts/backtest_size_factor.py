@@ -26,9 +26,11 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from common.symbols import base_asset
 from signals.calc_vola import calculate_rolling_30d_volatility
 from signals.calc_weights import calculate_weights
 from data.scripts.fetch_coinmarketcap_data import fetch_coinmarketcap_data, fetch_mock_marketcap_data
+from data.scripts.price_store import load_price_data
 
 
 def calculate_rolling_volatility_custom(data, window=30):
@@ -67,8 +69,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath)
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
     return df
 
@@ -111,10 +112,7 @@ def normalize_symbol(symbol):
     Returns:
         str: Normalized symbol
     """
-    # Extract base symbol (before '/')
-    if "/" in symbol:
-        return symbol.split("/")[0]
-    return symbol
+    return base_asset(symbol)
 
 
 def assign_size_buckets(marketcap_df, num_buckets=5):
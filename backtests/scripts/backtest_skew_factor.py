@@ -17,10 +17,15 @@ may predict future returns through mean reversion or risk premium effects.
 
 import pandas as pd
 import numpy as np
-from scipy.stats import skew
+import sys
+import os
 from datetime import datetime
 import argparse
 import matplotlib.pyplot as plt
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../signals"))
+from calc_rolling_moments import calculate_rolling_moments
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def load_data(filepath):
@@ -33,8 +38,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume, market_cap
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath)
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
     return df
 
@@ -58,11 +62,8 @@ def calculate_skewness(data, lookback_window=30, min_volume=5_000_000, min_marke
     df["returns"] = df.groupby("symbol")["close"].transform(lambda x: np.log(x / x.shift(1)))
 
     # Calculate 30-day rolling skewness (shifted to avoid look-ahead bias)
-    df["skewness_30d"] = df.groupby("symbol")["returns"].transform(
-        lambda x: x.rolling(window=lookback_window, min_periods=lookback_window)
-        .apply(lambda y: skew(y, nan_policy="omit"), raw=False)
-        .shift(1)  # Shift to avoid look-ahead bias
-    )
+    df["skewness_30d"] = calculate_rolling_moments(df, window=lookback_window, column="returns")["skewness"]
+    df["skewness_30d"] = df.groupby("symbol")["skewness_30d"].shift(1)  # Shift to avoid look-ahead bias
 
     # Calculate 30-day average volume (shifted)
     df["volume_30d_avg"] = df.groupby("symbol")["volume"].transform(
@@ -15,7 +15,6 @@ Hypothesis: Clean trendlines with strong breakouts signal continuation.
 
 import pandas as pd
 import numpy as np
-from scipy import stats
 from datetime import datetime, timedelta
 import argparse
 import sys
@@ -23,6 +22,9 @@ import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../signals'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from data.scripts.price_store import load_price_data
+from calc_rolling_trendline import calculate_trendline_metrics
 
 
 def load_data(filepath):
@@ -35,8 +37,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, close, volume, market_cap
     """
-    df = pd.read_csv(filepath)
-    df['date'] = pd.to_datetime(df['date'])
+    df = load_price_data(filepath, columns=['close', 'volume', 'market_cap', 'open', 'high', 'low'])
     df = df.sort_values(['symbol', 'date']).reset_index(drop=True)
     
     # Keep only relevant columns
@@ -77,79 +78,9 @@ def calculate_rolling_trendline(data, window=30):
         lambda x: np.log(x / x.shift(1))
     )
     
-    def fit_trendline(prices, current_idx):
-        """Fit linear regression to price window and predict current price"""
-        n = len(prices)
-        
-        # Remove NaN values
-        valid_mask = ~np.isnan(prices.values)
-        
-        # Require at least 70% data availability
-        min_periods = int(window * 0.7)
-        if valid_mask.sum() < min_periods:
-            return pd.Series({
-                'slope': np.nan,
-                'intercept': np.nan,
-                'r_squared': np.nan,
-                'p_value': np.nan,
-                'predicted_price': np.nan
-            })
-        
-        valid_prices = prices.values[valid_mask]
-        valid_x = np.arange(len(valid_prices))
-        
-        try:
-            # Fit linear regression
-            slope, intercept, r_value, p_value, std_err = stats.linregress(valid_x, valid_prices)
-            r_squared = r_value ** 2
-            
-            # Predict price at current index (end of window)
-            predicted_price = slope * (len(valid_prices) - 1) + intercept
-            
-            return pd.Series({
-                'slope': slope,
-                'intercept': intercept,
-                'r_squared': r_squared,
-                'p_value': p_value,
-                'predicted_price': predicted_price
-            })
-        except Exception as e:
-            return pd.Series({
-                'slope': np.nan,
-                'intercept': np.nan,
-                'r_squared': np.nan,
-                'p_value': np.nan,
-                'predicted_price': np.nan
-            })
-    
-    # Calculate rolling trendline metrics for each coin
-    def calculate_for_group(group):
-        """Calculate trendline metrics for a single coin"""
-        trendline_results = []
-        
-        for i in range(len(group)):
-            if i < window - 1:
-                trendline_results.append({
-                    'slope': np.nan,
-                    'intercept': np.nan,
-                    'r_squared': np.nan,
-                    'p_value': np.nan,
-                    'predicted_price': np.nan
-                })
-            else:
-                # Get window of prices
-                price_window = group['close'].iloc[i-window+1:i+1]
-                result = fit_trendline(price_window, i)
-                trendline_results.append(result.to_dict())
-        
-        return pd.DataFrame(trendline_results)
-    
-    # Apply to each symbol
-    trendline_df = df.groupby('symbol', group_keys=False).apply(
-        calculate_for_group
-    ).reset_index(drop=True)
-    
-    # Merge back with original data
+    # Rolling OLS for every symbol and window at once (see signals/calc_rolling_trendline.py)
+    trendline_df = calculate_trendline_metrics(df, window=window)
+
     for col in ['slope', 'intercept', 'r_squared', 'p_value', 'predicted_price']:
         df[col] = trendline_df[col].values
     
@@ -23,7 +23,9 @@ import sys
 import os
 
 # Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "signals"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from generate_signals_vectorized import (
     generate_volatility_signals_vectorized,
@@ -42,6 +44,22 @@ from generate_signals_vectorized import (
     calculate_cumulative_returns_vectorized,
     calculate_regime_vectorized,
 )
+from calc_rolling_moments import calculate_rolling_moments
+from matrix_engine import is_ranked_factor, run_matrix_engine
+from common.symbols import asset_ids, base_assets
+
+
+def _with_asset_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the shared integer 'asset_id' join key (from 'base', else 'symbol').
+    
+    Price and factor frames name coins differently ('BTC' vs 'BTC/USD'); both
+    resolve to the same id from common.symbols, so merges compare integers.
+    """
+    if 'asset_id' in df.columns:
+        return df
+    keys = df['base'] if 'base' in df.columns else df['symbol']
+    return df.assign(asset_id=asset_ids(keys))
 
 
 def prepare_price_data(
@@ -58,7 +76,7 @@ def prepare_price_data(
         end_date: End date for filtering
     
     Returns:
-        pd.DataFrame: Price data with daily_return column
+        pd.DataFrame: Price data with daily_return and asset_id columns
     """
     df = price_data.copy()
     df['date'] = pd.to_datetime(df['date'])
@@ -66,8 +84,9 @@ def prepare_price_data(
     # Extract base symbol if symbol is in format "BTC/USD"
     if 'base' in df.columns:
         df['symbol'] = df['base']
-    elif len(df) > 0 and '/' in str(df['symbol'].iloc[0]):
-        df['symbol'] = df['symbol'].apply(lambda x: x.split('/')[0] if '/' in str(x) else x)
+    else:
+        df['symbol'] = base_assets(df['symbol'])
+    df['asset_id'] = asset_ids(df['symbol'])
     
     df = df.sort_values(['symbol', 'date']).reset_index(drop=True)
     
@@ -130,9 +149,10 @@ def prepare_factor_data(
             return None
         # Merge with price data to ensure we only trade symbols with price data
         # Keep only dates and symbols that exist in price_data
-        merged = price_data.merge(
-            funding_data,
-            on=['date', 'symbol'],
+        funding_keyed = _with_asset_ids(funding_data).drop(columns=['symbol'])
+        merged = _with_asset_ids(price_data).merge(
+            funding_keyed,
+            on=['date', 'asset_id'],
             how='inner'
         )
         return merged
@@ -147,20 +167,15 @@ def prepare_factor_data(
         if 'market_cap' in price_df_clean.columns:
             price_df_clean = price_df_clean.drop(columns=['market_cap'])
         
-        # Forward-fill market cap data to make it available for all dates
-        # Get all unique dates from price data and all symbols from market cap data
-        mcap_subset = marketcap_data[['date', 'symbol', 'market_cap']].copy()
-        
-        # Merge with left join to keep all price data rows
-        merged = price_df_clean.merge(
-            mcap_subset,
-            on=['date', 'symbol'],
-            how='left'
+        # As-of join: latest market cap on or before each price date
+        from data.scripts.calculate_daily_market_cap import merge_latest_snapshot
+        merged = merge_latest_snapshot(
+            _with_asset_ids(price_df_clean),
+            _with_asset_ids(marketcap_data),
+            by='asset_id',
+            columns=['market_cap'],
         )
-        
-        # Forward-fill market cap within each symbol
         merged = merged.sort_values(['symbol', 'date'])
-        merged['market_cap'] = merged.groupby('symbol')['market_cap'].ffill()
         
         # Drop rows with no market cap data (before first snapshot)
         merged = merged.dropna(subset=['market_cap'])
@@ -169,28 +184,22 @@ def prepare_factor_data(
     
     elif factor_type == 'kurtosis':
         # Calculate kurtosis
-        from scipy import stats
         df = price_data.copy()
         df['daily_return'] = df.groupby('symbol')['close'].transform(
             lambda x: np.log(x / x.shift(1))
         )
         window = factor_params.get('kurtosis_window', 30)
-        df[f'kurtosis_{window}d'] = df.groupby('symbol')['daily_return'].transform(
-            lambda x: x.rolling(window=window, min_periods=window).apply(stats.kurtosis, raw=True)
-        )
+        df[f'kurtosis_{window}d'] = calculate_rolling_moments(df, window=window)['kurtosis']
         return df
     
     elif factor_type == 'skew':
         # Calculate skewness
-        from scipy import stats
         df = price_data.copy()
         df['daily_return'] = df.groupby('symbol')['close'].transform(
             lambda x: np.log(x / x.shift(1))
         )
         window = factor_params.get('skew_window', 30)
-        df[f'skewness_{window}d'] = df.groupby('symbol')['daily_return'].transform(
-            lambda x: x.rolling(window=window, min_periods=window).apply(stats.skew, raw=True)
-        )
+        df[f'skewness_{window}d'] = calculate_rolling_moments(df, window=window)['skewness']
         return df
     
     elif factor_type == 'days_from_high':
@@ -206,52 +215,32 @@ def prepare_factor_data(
         return price_data.copy()
     
     elif factor_type == 'adf':
-        # ADF requires pre-calculation using statsmodels (cannot be vectorized)
-        # User must pass pre-calculated ADF data via adf_data parameter
+        # Use pre-calculated ADF data if given, otherwise run the batched
+        # ADF engine (results are cached under data/.cache/adf)
         adf_data = factor_params.get('adf_data')
         if adf_data is None:
-            raise ValueError("ADF factor requires pre-calculated 'adf_data' parameter")
-        
-        # Symbol format normalization: ADF uses full symbols (e.g., 'AAVE/USD')
-        # while price_data may use base symbols (e.g., 'AAVE')
-        # Check if we need to normalize
-        sample_adf_symbol = str(adf_data['symbol'].iloc[0])
-        sample_price_symbol = str(price_data['symbol'].iloc[0])
-        
-        # If formats differ, use 'base' column from ADF or extract base from symbol
-        if '/' in sample_adf_symbol and '/' not in sample_price_symbol:
-            if 'base' in adf_data.columns:
-                # Use existing base column
-                adf_data = adf_data.copy()
-                adf_data['symbol_normalized'] = adf_data['base']
-            else:
-                # Extract base from symbol (e.g., 'AAVE/USD' -> 'AAVE')
-                adf_data = adf_data.copy()
-                adf_data['symbol_normalized'] = adf_data['symbol'].str.split('/').str[0]
-            merge_on_col = 'symbol_normalized'
-        else:
-            merge_on_col = 'symbol'
+            from backtest_adf_factor import calculate_rolling_adf
+            adf_data = calculate_rolling_adf(
+                price_data,
+                window=factor_params.get('adf_window', 60),
+                regression=factor_params.get('regression', 'ct'),
+            )
         
-        # Merge with price_data to ensure alignment (only keep dates/symbols in price_data)
-        # This is critical when price_data has been filtered by start_date/end_date
-        # First, select only the ADF columns we need
-        adf_cols = ['date', merge_on_col, 'adf_stat']
+        # ADF results may use full symbols (e.g. 'AAVE/USD') while price_data
+        # uses base symbols (e.g. 'AAVE'); both map to the same asset id
+        adf_cols = ['date', 'adf_stat']
         if 'adf_pvalue' in adf_data.columns:
             adf_cols.append('adf_pvalue')
         if 'is_stationary' in adf_data.columns:
             adf_cols.append('is_stationary')
+        adf_subset = _with_asset_ids(adf_data)[adf_cols + ['asset_id']]
         
-        adf_subset = adf_data[adf_cols].copy()
-        
-        # Rename the merge column to 'symbol' for consistency
-        if merge_on_col != 'symbol':
-            adf_subset = adf_subset.rename(columns={merge_on_col: 'symbol'})
-        
-        # Merge with price data (left join to keep all price_data rows)
-        merged = price_data.merge(
+        # Left join on (date, asset_id): only keep dates/symbols in price_data,
+        # which matters when price_data has been filtered by start_date/end_date
+        merged = _with_asset_ids(price_data).merge(
             adf_subset,
-            on=['date', 'symbol'],
-            how='left'  # Left join: keep all price_data rows, add ADF where available
+            on=['date', 'asset_id'],
+            how='left'
         )
         
         # Drop rows where adf_stat is NaN (no ADF data available)
@@ -448,6 +437,89 @@ def forward_fill_weights(
     return weights_daily
 
 
+def add_regime_data(
+    price_df: pd.DataFrame,
+    factor_type: str,
+    factor_params: Dict,
+) -> None:
+    """
+    Calculate the market regime when a kurtosis regime filter is requested.
+
+    Adds 'regime_data' to factor_params in place (or resets the filter to
+    'always' if the regime cannot be calculated).
+
+    Args:
+        price_df: Prepared price data
+        factor_type: Type of factor
+        factor_params: Factor/signal parameters (modified in place)
+    """
+    regime_filter = factor_params.get('regime_filter')
+    if factor_type == 'kurtosis' and regime_filter and regime_filter != 'always':
+        print(f"Step 2.5: Calculating market regime (filter: {regime_filter})...")
+        try:
+            reference_symbol = factor_params.get('reference_symbol', 'BTC')
+            regime_data = calculate_regime_vectorized(
+                price_df,
+                reference_symbol=reference_symbol,
+                ma_short=50,
+                ma_long=200
+            )
+            print(f"  ? Calculated regime for {len(regime_data)} dates")
+
+            # Count regime distribution
+            regime_counts = regime_data['regime'].value_counts()
+            print(f"  ? Bull days: {regime_counts.get('bull', 0)} ({regime_counts.get('bull', 0)/len(regime_data)*100:.1f}%)")
+            print(f"  ? Bear days: {regime_counts.get('bear', 0)} ({regime_counts.get('bear', 0)/len(regime_data)*100:.1f}%)")
+
+            # Add regime data to factor_params so it's passed to signal generation
+            factor_params['regime_data'] = regime_data
+        except Exception as e:
+            print(f"  ??  Warning: Regime calculation failed: {e}")
+            print(f"  Continuing without regime filter (signals will be generated for all dates)")
+            factor_params['regime_filter'] = 'always'
+
+
+def calculate_backtest_metrics(results: pd.DataFrame) -> Dict:
+    """
+    Performance metrics from the cumulative returns table.
+
+    Args:
+        results: Output of calculate_cumulative_returns_vectorized
+
+    Returns:
+        dict: Return, risk and drawdown metrics
+    """
+    total_return = results['cum_return'].iloc[-1] - 1
+    num_days = len(results)
+    years = num_days / 365.25
+    annualized_return = (1 + total_return) ** (1 / years) - 1 if years > 0 else 0
+
+    volatility = results['portfolio_return'].std() * np.sqrt(365)
+    sharpe_ratio = annualized_return / volatility if volatility > 0 else 0
+
+    max_drawdown = results['drawdown'].min()
+    avg_drawdown = results[results['drawdown'] < 0]['drawdown'].mean() if (results['drawdown'] < 0).any() else 0
+
+    downside_returns = results[results['portfolio_return'] < 0]['portfolio_return']
+    downside_vol = downside_returns.std() * np.sqrt(365) if len(downside_returns) > 0 else 0
+    sortino_ratio = annualized_return / downside_vol if downside_vol > 0 else 0
+
+    win_rate = (results['portfolio_return'] > 0).sum() / len(results) if len(results) > 0 else 0
+
+    return {
+        'total_return': total_return,
+        'annualized_return': annualized_return,
+        'volatility': volatility,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'max_drawdown': max_drawdown,
+        'avg_drawdown': avg_drawdown,
+        'downside_vol': downside_vol,
+        'win_rate': win_rate,
+        'num_days': num_days,
+    }
+
+
 def backtest_factor_vectorized(
     price_data: pd.DataFrame,
     factor_type: str,
@@ -460,6 +532,7 @@ def backtest_factor_vectorized(
     short_allocation: float = 0.5,
     rebalance_days: int = 1,
     weighting_method: Literal['equal_weight', 'risk_parity'] = 'equal_weight',
+    engine: Literal['long', 'matrix'] = 'long',
     **factor_params,
 ) -> Dict:
     """
@@ -480,6 +553,8 @@ def backtest_factor_vectorized(
         short_allocation: Allocation to short positions
         rebalance_days: Rebalance every N days
         weighting_method: 'equal_weight' or 'risk_parity'
+        engine: 'long' (DataFrame merges) or 'matrix' (dense date x symbol arrays,
+            see matrix_engine.py); both produce the same portfolio returns
         **factor_params: Additional parameters for factor calculation and signal generation
     
     Returns:
@@ -504,97 +579,108 @@ def backtest_factor_vectorized(
     print(f"  ? Calculated factor for {len(factor_df)} rows")
     
     # Step 2.5: Calculate market regime (if regime filter requested for kurtosis)
-    regime_filter = factor_params.get('regime_filter')
-    if factor_type == 'kurtosis' and regime_filter and regime_filter != 'always':
-        print(f"Step 2.5: Calculating market regime (filter: {regime_filter})...")
-        try:
-            reference_symbol = factor_params.get('reference_symbol', 'BTC')
-            regime_data = calculate_regime_vectorized(
-                price_df,
-                reference_symbol=reference_symbol,
-                ma_short=50,
-                ma_long=200
+    add_regime_data(price_df, factor_type, factor_params)
+
+    if engine == 'matrix':
+        # Steps 3-8 on dense date x symbol matrices
+        signals_df = None
+        if not is_ranked_factor(factor_type):
+            print("Step 3: Generating event-driven signals...")
+            signals_df = generate_signals_for_factor(
+                factor_df,
+                factor_type,
+                strategy,
+                **factor_params
             )
-            print(f"  ? Calculated regime for {len(regime_data)} dates")
-            
-            # Count regime distribution
-            regime_counts = regime_data['regime'].value_counts()
-            print(f"  ? Bull days: {regime_counts.get('bull', 0)} ({regime_counts.get('bull', 0)/len(regime_data)*100:.1f}%)")
-            print(f"  ? Bear days: {regime_counts.get('bear', 0)} ({regime_counts.get('bear', 0)/len(regime_data)*100:.1f}%)")
-            
-            # Add regime data to factor_params so it's passed to signal generation
-            factor_params['regime_data'] = regime_data
-        except Exception as e:
-            print(f"  ??  Warning: Regime calculation failed: {e}")
-            print(f"  Continuing without regime filter (signals will be generated for all dates)")
-            factor_params['regime_filter'] = 'always'
+        print("Steps 3-8: Running matrix engine (signals, weights, returns)...")
+        matrix_results = run_matrix_engine(
+            price_df,
+            factor_df,
+            factor_type,
+            strategy,
+            signals_df=signals_df,
+            rebalance_days=rebalance_days,
+            weighting_method=weighting_method,
+            long_allocation=long_allocation * leverage,
+            short_allocation=short_allocation * leverage,
+            **factor_params
+        )
+        signals_df = matrix_results['signals']
+        weights_df = matrix_results['weights']
+        portfolio_returns = matrix_results['portfolio_returns']
+        print(f"  ? Generated {len(signals_df)} signals")
+        print(f"  ? {weights_df['date'].nunique()} rebalance dates")
+        print(f"  ? Calculated returns for {len(portfolio_returns)} days")
+    elif engine == 'long':
+        # Step 3: Generate signals for ALL dates (vectorized)
+        print("Step 3: Generating signals for ALL dates...")
+        signals_df = generate_signals_for_factor(
+            factor_df,
+            factor_type,
+            strategy,
+            **factor_params
+        )
+        print(f"  ? Generated {len(signals_df)} signals")
+        print(f"  ? Long positions: {(signals_df['signal'] == 1).sum()}")
+        print(f"  ? Short positions: {(signals_df['signal'] == -1).sum()}")
+
+        # Step 4: Filter to rebalance dates
+        print(f"Step 4: Filtering to rebalance dates (every {rebalance_days} days)...")
+        signals_rebalance = filter_to_rebalance_dates(signals_df, rebalance_days)
+        num_rebalances = len(signals_rebalance['date'].unique())
+        print(f"  ? {num_rebalances} rebalance dates")
+
+        # Step 5: Calculate weights for ALL rebalance dates (vectorized)
+        print("Step 5: Calculating portfolio weights...")
+
+        # Prepare volatility data for risk parity if needed
+        volatility_df = None
+        if weighting_method == 'risk_parity':
+            if 'volatility' in signals_rebalance.columns:
+                volatility_df = signals_rebalance[['date', 'symbol', 'volatility']].copy()
+            else:
+                # Calculate volatility
+                vol_window = factor_params.get('volatility_window', 30)
+                price_df['volatility'] = price_df.groupby('symbol')['daily_return'].transform(
+                    lambda x: x.rolling(window=vol_window, min_periods=vol_window).std() * np.sqrt(365)
+                )
+                volatility_df = price_df[['date', 'symbol', 'volatility']].copy()
+
+        weights_df = calculate_weights_vectorized(
+            signals_rebalance,
+            volatility_df=volatility_df,
+            weighting_method=weighting_method,
+            long_allocation=long_allocation * leverage,
+            short_allocation=short_allocation * leverage,
+        )
+        print(f"  ? Calculated weights for {len(weights_df)} positions")
+
+        # Step 6: Forward-fill weights to daily frequency
+        print("Step 6: Forward-filling weights between rebalances...")
+        all_dates = signals_df['date'].unique()
+        weights_daily = forward_fill_weights(
+            weights_df,
+            start_date=all_dates.min(),
+            end_date=all_dates.max(),
+        )
+        print(f"  ? Forward-filled to {len(weights_daily['date'].unique())} days")
+
+        # Step 7: Shift returns by 1 day to avoid lookahead bias
+        # Signals on day T should use returns from day T+1
+        print("Step 7: Aligning returns (avoiding lookahead bias)...")
+        returns_df = price_df[['date', 'symbol', 'daily_return']].copy()
+        returns_df['date'] = returns_df['date'] - pd.Timedelta(days=1)  # Shift back so T+1 returns match T signals
+
+        # Step 8: Calculate portfolio returns for ALL dates (vectorized)
+        print("Step 8: Calculating portfolio returns...")
+        portfolio_returns = calculate_portfolio_returns_vectorized(
+            weights_daily,
+            returns_df,
+        )
+        print(f"  ? Calculated returns for {len(portfolio_returns)} days")
     
-    # Step 3: Generate signals for ALL dates (vectorized)
-    print("Step 3: Generating signals for ALL dates...")
-    signals_df = generate_signals_for_factor(
-        factor_df,
-        factor_type,
-        strategy,
-        **factor_params
-    )
-    print(f"  ? Generated {len(signals_df)} signals")
-    print(f"  ? Long positions: {(signals_df['signal'] == 1).sum()}")
-    print(f"  ? Short positions: {(signals_df['signal'] == -1).sum()}")
-    
-    # Step 4: Filter to rebalance dates
-    print(f"Step 4: Filtering to rebalance dates (every {rebalance_days} days)...")
-    signals_rebalance = filter_to_rebalance_dates(signals_df, rebalance_days)
-    num_rebalances = len(signals_rebalance['date'].unique())
-    print(f"  ? {num_rebalances} rebalance dates")
-    
-    # Step 5: Calculate weights for ALL rebalance dates (vectorized)
-    print("Step 5: Calculating portfolio weights...")
-    
-    # Prepare volatility data for risk parity if needed
-    volatility_df = None
-    if weighting_method == 'risk_parity':
-        if 'volatility' in signals_rebalance.columns:
-            volatility_df = signals_rebalance[['date', 'symbol', 'volatility']].copy()
-        else:
-            # Calculate volatility
-            vol_window = factor_params.get('volatility_window', 30)
-            price_df['volatility'] = price_df.groupby('symbol')['daily_return'].transform(
-                lambda x: x.rolling(window=vol_window, min_periods=vol_window).std() * np.sqrt(365)
-            )
-            volatility_df = price_df[['date', 'symbol', 'volatility']].copy()
-    
-    weights_df = calculate_weights_vectorized(
-        signals_rebalance,
-        volatility_df=volatility_df,
-        weighting_method=weighting_method,
-        long_allocation=long_allocation * leverage,
-        short_allocation=short_allocation * leverage,
-    )
-    print(f"  ? Calculated weights for {len(weights_df)} positions")
-    
-    # Step 6: Forward-fill weights to daily frequency
-    print("Step 6: Forward-filling weights between rebalances...")
-    all_dates = signals_df['date'].unique()
-    weights_daily = forward_fill_weights(
-        weights_df,
-        start_date=all_dates.min(),
-        end_date=all_dates.max(),
-    )
-    print(f"  ? Forward-filled to {len(weights_daily['date'].unique())} days")
-    
-    # Step 7: Shift returns by 1 day to avoid lookahead bias
-    # Signals on day T should use returns from day T+1
-    print("Step 7: Aligning returns (avoiding lookahead bias)...")
-    returns_df = price_df[['date', 'symbol', 'daily_return']].copy()
-    returns_df['date'] = returns_df['date'] - pd.Timedelta(days=1)  # Shift back so T+1 returns match T signals
-    
-    # Step 8: Calculate portfolio returns for ALL dates (vectorized)
-    print("Step 8: Calculating portfolio returns...")
-    portfolio_returns = calculate_portfolio_returns_vectorized(
-        weights_daily,
-        returns_df,
-    )
-    print(f"  ? Calculated returns for {len(portfolio_returns)} days")
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
     
     # Step 9: Calculate cumulative returns (vectorized)
     print("Step 9: Calculating cumulative performance...")
@@ -615,34 +701,19 @@ def backtest_factor_vectorized(
         print("  - Date alignment issues between factor data and price data")
         return None
     
-    total_return = results['cum_return'].iloc[-1] - 1
-    num_days = len(results)
-    years = num_days / 365.25
-    annualized_return = (1 + total_return) ** (1 / years) - 1 if years > 0 else 0
-    
-    volatility = results['portfolio_return'].std() * np.sqrt(365)
-    sharpe_ratio = annualized_return / volatility if volatility > 0 else 0
-    
-    max_drawdown = results['drawdown'].min()
-    avg_drawdown = results[results['drawdown'] < 0]['drawdown'].mean() if (results['drawdown'] < 0).any() else 0
-    
-    downside_returns = results[results['portfolio_return'] < 0]['portfolio_return']
-    downside_vol = downside_returns.std() * np.sqrt(365) if len(downside_returns) > 0 else 0
-    sortino_ratio = annualized_return / downside_vol if downside_vol > 0 else 0
-    
-    win_rate = (results['portfolio_return'] > 0).sum() / len(results) if len(results) > 0 else 0
+    metrics = calculate_backtest_metrics(results)
     
     print(f"\n{'='*80}")
     print(f"BACKTEST RESULTS")
     print(f"{'='*80}")
-    print(f"Total Return:       {total_return:>10.2%}")
-    print(f"Annualized Return:  {annualized_return:>10.2%}")
-    print(f"Volatility:         {volatility:>10.2%}")
-    print(f"Sharpe Ratio:       {sharpe_ratio:>10.3f}")
-    print(f"Sortino Ratio:      {sortino_ratio:>10.3f}")
-    print(f"Max Drawdown:       {max_drawdown:>10.2%}")
-    print(f"Win Rate:           {win_rate:>10.2%}")
-    print(f"Number of Days:     {num_days:>10}")
+    print(f"Total Return:       {metrics['total_return']:>10.2%}")
+    print(f"Annualized Return:  {metrics['annualized_return']:>10.2%}")
+    print(f"Volatility:         {metrics['volatility']:>10.2%}")
+    print(f"Sharpe Ratio:       {metrics['sharpe_ratio']:>10.3f}")
+    print(f"Sortino Ratio:      {metrics['sortino_ratio']:>10.3f}")
+    print(f"Max Drawdown:       {metrics['max_drawdown']:>10.2%}")
+    print(f"Win Rate:           {metrics['win_rate']:>10.2%}")
+    print(f"Number of Days:     {metrics['num_days']:>10}")
     print(f"{'='*80}\n")
     
     return {
@@ -650,16 +721,5 @@ def backtest_factor_vectorized(
         'portfolio_returns': portfolio_returns,
         'signals': signals_df,
         'weights': weights_df,
-        'metrics': {
-            'total_return': total_return,
-            'annualized_return': annualized_return,
-            'volatility': volatility,
-            'sharpe_ratio': sharpe_ratio,
-            'sortino_ratio': sortino_ratio,
-            'max_drawdown': max_drawdown,
-            'avg_drawdown': avg_drawdown,
-            'downside_vol': downside_vol,
-            'win_rate': win_rate,
-            'num_days': num_days,
-        }
+        'metrics': metrics,
     }
@@ -32,6 +32,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "signals"))
 from calc_vola import calculate_rolling_30d_volatility
 from calc_weights import calculate_weights
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from data.scripts.price_store import load_price_data
 
 
 def calculate_rolling_volatility_custom(data, window=30):
@@ -70,8 +72,7 @@ def load_data(filepath):
     Returns:
         pd.DataFrame: DataFrame with date, symbol, open, high, low, close, volume
     """
-    df = pd.read_csv(filepath)
-    df["date"] = pd.to_datetime(df["date"])
+    df = load_price_data(filepath)
     df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
     return df
 
@@ -20,6 +20,8 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backtests", "scripts"))
 
+from data.scripts.incremental_datasets import latest_dataset_path
+
 # Import backtest functions
 from run_all_backtests import (
     load_all_data,
@@ -469,9 +471,9 @@ def main():
     # Mock args for load_all_data
     class Args:
         data_file = "data/raw/combined_coinbase_coinmarketcap_daily.csv"
-        marketcap_file = "data/raw/coinmarketcap_monthly_all_snapshots.csv"
-        funding_rates_file = "data/raw/historical_funding_rates_top100_ALL_HISTORY_20251028_002456.csv"
-        oi_data_file = "data/raw/historical_open_interest_all_perps_since2020_20251027_042634.csv"
+        marketcap_file = latest_dataset_path("market_cap")
+        funding_rates_file = latest_dataset_path("funding_rates")
+        oi_data_file = latest_dataset_path("open_interest")
         run_oi_divergence = False
         run_leverage_inverted = False
     
@@ -0,0 +1,634 @@
+"""
+Dense Matrix Backtest Engine
+
+Array-based counterpart to the long-format pipeline in backtest_vectorized.py.
+Factor values, signals, weights and returns are held as dense date x symbol
+NumPy matrices on a daily calendar, so cross-sectional ranking, weighting,
+forward-filling and return alignment run as whole-matrix operations instead
+of groupby/merge passes over long DataFrames.
+
+The engine reproduces the long pipeline's rules exactly:
+- Quintiles follow pd.qcut (linear quantiles, right-closed bins) and fall back
+  to pd.cut on first-occurrence ranks when bin edges collide
+- Percentiles are rank(method='first') / count * 100
+- Weights are held between rebalances until the symbol's next signal row
+- Returns from day T+1 are applied to weights held on day T
+
+Event-driven factors (breakout, mean_reversion, days_from_high) reuse the
+existing signal generators and are pivoted into the matrix layout.
+"""
+
+import warnings
+import pandas as pd
+import numpy as np
+from typing import Optional, Literal, Dict, List, Tuple
+
+
+# ============================================================================
+# Ranking Rules
+# ============================================================================
+
+# factor_type -> (ranking method, factor column parameter, default column)
+RANKED_FACTORS = {
+    'volatility': ('quintile', 'vol_column', 'volatility_30d'),
+    'size': ('quintile', 'marketcap_column', 'market_cap'),
+    'beta': ('percentile', None, 'beta'),
+    'skew': ('percentile', 'skew_column', 'skewness_30d'),
+    'kurtosis': ('percentile', 'kurtosis_column', 'kurtosis_30d'),
+    'adf': ('percentile', 'adf_column', 'adf_stat'),
+    'carry': ('top_bottom', 'funding_column', 'funding_rate_pct'),
+}
+
+# (factor_type, strategy) -> ordered legs of (selector, signal); later legs
+# overwrite earlier ones, matching the order of the .loc assignments in
+# generate_signals_vectorized.py
+STRATEGY_LEGS: Dict[Tuple[str, str], List[Tuple[str, int]]] = {
+    ('volatility', 'long_low_short_high'): [('q_low', 1), ('q_high', -1)],
+    ('volatility', 'long_low_vol'): [('q_low', 1)],
+    ('volatility', 'long_high_vol'): [('q_high', 1)],
+    ('volatility', 'long_high_short_low'): [('q_high', 1), ('q_low', -1)],
+    ('size', 'long_small_short_large'): [('q_low', 1), ('q_high', -1)],
+    ('size', 'long_small'): [('q_low', 1)],
+    ('size', 'long_large'): [('q_high', 1)],
+    ('size', 'long_large_short_small'): [('q_high', 1), ('q_low', -1)],
+    ('beta', 'betting_against_beta'): [('p_low', 1), ('p_high', -1)],
+    ('beta', 'traditional_risk_premium'): [('p_high', 1), ('p_low', -1)],
+    ('beta', 'long_low_beta'): [('p_low', 1)],
+    ('beta', 'long_high_beta'): [('p_high', 1)],
+    ('skew', 'mean_reversion'): [('p_high', 1), ('p_low', -1)],
+    ('skew', 'momentum'): [('p_low', 1), ('p_high', -1)],
+    ('kurtosis', 'long_low_short_high'): [('p_low', 1), ('p_high', -1)],
+    ('kurtosis', 'long_high_short_low'): [('p_high', 1), ('p_low', -1)],
+    ('adf', 'mean_reversion_premium'): [('p_low', 1), ('p_high', -1)],
+    ('adf', 'trend_following_premium'): [('p_high', 1), ('p_low', -1)],
+    ('adf', 'long_stationary'): [('p_low', 1)],
+    ('adf', 'long_trending'): [('p_high', 1)],
+}
+
+
+def is_ranked_factor(factor_type: str) -> bool:
+    """Return True if the factor's signals are pure cross-sectional ranks."""
+    return factor_type in RANKED_FACTORS
+
+
+# ============================================================================
+# Layout Helpers
+# ============================================================================
+
+def build_daily_calendar(dates: pd.Series) -> pd.DatetimeIndex:
+    """
+    Build a daily calendar spanning the given dates.
+
+    Args:
+        dates: Series of datetimes
+
+    Returns:
+        pd.DatetimeIndex: Daily dates from min to max (inclusive)
+    """
+    return pd.date_range(start=dates.min(), end=dates.max(), freq='D')
+
+
+def pivot_to_matrix(
+    df: pd.DataFrame,
+    value_column: str,
+    dates: pd.DatetimeIndex,
+    symbols: pd.Index,
+) -> np.ndarray:
+    """
+    Scatter a long DataFrame column into a dense date x symbol matrix.
+
+    Cells without a row are NaN. Rows outside the calendar or symbol index are
+    ignored; for duplicate (date, symbol) rows the first occurrence wins.
+
+    Args:
+        df: DataFrame with date, symbol and value columns
+        value_column: Column to scatter
+        dates: Row index (daily calendar)
+        symbols: Column index
+
+    Returns:
+        np.ndarray: Float matrix of shape (len(dates), len(symbols))
+    """
+    matrix = np.full((len(dates), len(symbols)), np.nan)
+    row = dates.get_indexer(pd.to_datetime(df['date']))
+    col = symbols.get_indexer(df['symbol'])
+    valid = (row >= 0) & (col >= 0)
+    values = pd.to_numeric(df[value_column], errors='coerce').to_numpy(dtype=float)
+    # Assign in reverse so the first duplicate is written last
+    matrix[row[valid][::-1], col[valid][::-1]] = values[valid][::-1]
+    return matrix
+
+
+def matrix_to_long(
+    matrices: Dict[str, np.ndarray],
+    dates: pd.DatetimeIndex,
+    symbols: pd.Index,
+    mask: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Convert aligned matrices back to a long DataFrame.
+
+    Args:
+        matrices: Mapping of output column name to date x symbol matrix
+        dates: Row index
+        symbols: Column index
+        mask: Boolean matrix selecting the cells to emit
+
+    Returns:
+        pd.DataFrame: DataFrame with date, symbol and one column per matrix
+    """
+    row, col = np.nonzero(mask)
+    out = pd.DataFrame({
+        'date': dates[row],
+        'symbol': symbols[col],
+    })
+    for name, matrix in matrices.items():
+        out[name] = matrix[row, col]
+    return out.sort_values(['date', 'symbol']).reset_index(drop=True)
+
+
+# ============================================================================
+# Cross-Sectional Ranking
+# ============================================================================
+
+def rank_matrix(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank each row ascending with first-occurrence tie breaking.
+
+    Equivalent to groupby('date').rank(method='first') when symbols are the
+    columns in sorted order.
+
+    Args:
+        values: Date x symbol factor matrix (NaN = no observation)
+
+    Returns:
+        tuple: (ranks matrix with NaN where missing, per-row observation counts)
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, np.inf)
+    order = np.argsort(filled, axis=1, kind='stable')
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, np.arange(1, values.shape[1] + 1, dtype=float)[None, :], axis=1)
+    ranks[~valid] = np.nan
+    return ranks, valid.sum(axis=1)
+
+
+def percentile_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    Percentile ranks per row (rank / count * 100).
+
+    Args:
+        values: Date x symbol factor matrix
+
+    Returns:
+        np.ndarray: Percentiles with NaN where the factor is missing
+    """
+    ranks, counts = rank_matrix(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return ranks / counts[:, None] * 100
+
+
+def quintile_matrix(values: np.ndarray, num_quintiles: int = 5) -> np.ndarray:
+    """
+    Quantile bucket labels (1..num_quintiles) per row.
+
+    Mirrors assign_quintiles_vectorized: rows with fewer observations than
+    buckets get no label, pd.qcut edges are used when they are unique and
+    pd.cut on first-occurrence ranks otherwise.
+
+    Args:
+        values: Date x symbol factor matrix
+        num_quintiles: Number of buckets
+
+    Returns:
+        np.ndarray: Float labels with NaN where unassigned
+    """
+    labels = np.full(values.shape, np.nan)
+    ranks, counts = rank_matrix(values)
+    rows = counts >= num_quintiles
+    if not rows.any():
+        return labels
+
+    sub = values[rows]
+    sub_ranks = ranks[rows]
+    sub_counts = counts[rows].astype(float)
+    q = np.linspace(0, 1, num_quintiles + 1)
+    edges = np.nanquantile(sub, q, axis=1).T  # (rows, q + 1)
+
+    # qcut with duplicates='drop' raises when edges collide -> rank fallback
+    unique_edges = (np.diff(edges, axis=1) > 0).all(axis=1)
+
+    # pd.cut(bins=n) on ranks 1..count: linspace edges with the first widened
+    rank_edges = np.linspace(1.0, sub_counts, num_quintiles + 1, axis=1)
+    rank_edges[:, 0] -= (sub_counts - 1) * 0.001
+
+    inner = np.where(unique_edges[:, None], edges, rank_edges)[:, 1:-1]
+    target = np.where(unique_edges[:, None], sub, sub_ranks)
+
+    with np.errstate(invalid='ignore'):
+        bucket = 1 + (target[:, :, None] > inner[:, None, :]).sum(axis=2)
+    labels[rows] = np.where(np.isnan(sub), np.nan, bucket)
+    return labels
+
+
+def top_bottom_matrix(values: np.ndarray, top_n: int, bottom_n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the top N and bottom N names per row.
+
+    When a row has fewer than top_n + bottom_n names the selection is split
+    proportionally, matching assign_top_bottom_n_vectorized.
+
+    Args:
+        values: Date x symbol factor matrix
+        top_n: Number of highest values to select
+        bottom_n: Number of lowest values to select
+
+    Returns:
+        tuple: (bottom selection mask, top selection mask)
+    """
+    ranks, counts = rank_matrix(values)
+    n = counts.astype(float)
+    enough = n >= (top_n + bottom_n)
+    actual_bottom = np.maximum(1, np.floor(n * bottom_n / (top_n + bottom_n)))
+    actual_top = np.maximum(1, n - actual_bottom)
+    bottom = np.where(enough, bottom_n, actual_bottom)[:, None]
+    top = np.where(enough, top_n, actual_top)[:, None]
+
+    with np.errstate(invalid='ignore'):
+        is_top = ranks > (n[:, None] - top)
+        is_bottom = (ranks <= bottom) & ~is_top
+    return is_bottom, is_top
+
+
+def rank_signals_matrix(
+    values: np.ndarray,
+    factor_type: str,
+    strategy: str,
+    **signal_params,
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Generate signals for a ranked factor from its factor matrix.
+
+    Args:
+        values: Date x symbol factor matrix
+        factor_type: Ranked factor type (see RANKED_FACTORS)
+        strategy: Strategy name
+        **signal_params: Same parameters as generate_signals_for_factor
+
+    Returns:
+        tuple: (signal matrix with NaN where no observation,
+                dict of rank matrices to emit alongside the signals)
+    """
+    method = RANKED_FACTORS[factor_type][0]
+    signals = np.where(np.isnan(values), np.nan, 0.0)
+    extras = {}
+
+    if method == 'top_bottom':
+        is_bottom, is_top = top_bottom_matrix(
+            values,
+            top_n=signal_params.get('top_n', 10),
+            bottom_n=signal_params.get('bottom_n', 10),
+        )
+        signals[is_bottom] = 1
+        signals[is_top] = -1
+        extras['rank'] = rank_matrix(values)[0]
+        return signals, extras
+
+    legs = STRATEGY_LEGS.get((factor_type, strategy), [])
+
+    if method == 'quintile':
+        num_buckets = signal_params.get(
+            'num_buckets' if factor_type == 'size' else 'num_quintiles', 5
+        )
+        quintiles = quintile_matrix(values, num_buckets)
+        extras['quintile'] = quintiles
+        selectors = {
+            'q_low': quintiles == 1,
+            'q_high': quintiles == num_buckets,
+        }
+    else:
+        percentiles = percentile_matrix(values)
+        extras['percentile'] = percentiles
+        with np.errstate(invalid='ignore'):
+            selectors = {
+                'p_low': percentiles <= signal_params.get('long_percentile', 20),
+                'p_high': percentiles >= signal_params.get('short_percentile', 80),
+            }
+
+    for selector, signal in legs:
+        signals[selectors[selector]] = signal
+
+    return signals, extras
+
+
+# ============================================================================
+# Weights and Returns
+# ============================================================================
+
+def rebalance_row_mask(has_row: np.ndarray, rebalance_days: int = 1) -> np.ndarray:
+    """
+    Select every Nth calendar row that carries at least one signal.
+
+    Args:
+        has_row: Boolean date x symbol matrix of signal observations
+        rebalance_days: Rebalance every N signal dates
+
+    Returns:
+        np.ndarray: Boolean mask over calendar rows
+    """
+    active = np.flatnonzero(has_row.any(axis=1))
+    mask = np.zeros(has_row.shape[0], dtype=bool)
+    mask[active[::max(1, rebalance_days)]] = True
+    return mask
+
+
+def side_weights(
+    side: np.ndarray,
+    volatility: Optional[np.ndarray],
+    weighting_method: str,
+) -> np.ndarray:
+    """
+    Unscaled per-row weights for one side (longs or shorts).
+
+    Args:
+        side: Boolean date x symbol matrix of the side's positions
+        volatility: Optional date x symbol volatility matrix for risk parity
+        weighting_method: 'equal_weight' or 'risk_parity'
+
+    Returns:
+        np.ndarray: Weights summing to 1 on rows with any position, else 0
+    """
+    counts = side.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        equal = np.where(side, 1.0 / counts, 0.0)
+    if weighting_method != 'risk_parity' or volatility is None:
+        return equal
+
+    vol = np.where(side, volatility, np.nan)
+    has_vol = (~np.isnan(vol)).any(axis=1, keepdims=True)
+    with warnings.catch_warnings():
+        # All-NaN rows fall back to equal weight below
+        warnings.simplefilter('ignore', RuntimeWarning)
+        row_mean = np.nanmean(vol, axis=1, keepdims=True)
+    vol = np.where(np.isnan(vol), row_mean, vol)
+    inv_vol = np.where(side, 1.0 / np.clip(vol, 0.01, 10.0), 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        risk_parity = inv_vol / inv_vol.sum(axis=1, keepdims=True)
+    return np.where(has_vol, risk_parity, equal)
+
+
+def weights_matrix(
+    signals: np.ndarray,
+    volatility: Optional[np.ndarray] = None,
+    weighting_method: Literal['equal_weight', 'risk_parity'] = 'equal_weight',
+    long_allocation: float = 0.5,
+    short_allocation: float = 0.5,
+) -> np.ndarray:
+    """
+    Portfolio weights for every row of a signal matrix.
+
+    Args:
+        signals: Date x symbol signal matrix (NaN = no observation)
+        volatility: Optional date x symbol volatility matrix for risk parity
+        weighting_method: 'equal_weight' or 'risk_parity'
+        long_allocation: Total allocation to longs
+        short_allocation: Total allocation to shorts
+
+    Returns:
+        np.ndarray: Weights with NaN where there is no signal observation
+    """
+    longs = signals == 1
+    shorts = signals == -1
+    weights = (
+        side_weights(longs, volatility, weighting_method) * long_allocation
+        - side_weights(shorts, volatility, weighting_method) * short_allocation
+    )
+    return np.where(np.isnan(signals), np.nan, weights)
+
+
+def forward_fill_matrix(matrix: np.ndarray) -> np.ndarray:
+    """
+    Forward-fill NaN cells down each column.
+
+    Args:
+        matrix: Date x symbol matrix
+
+    Returns:
+        np.ndarray: Matrix with each NaN replaced by the last value above it
+    """
+    valid = ~np.isnan(matrix)
+    idx = np.where(valid, np.arange(matrix.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = matrix[idx, np.arange(matrix.shape[1])[None, :]]
+    # Cells before the first observation stay NaN
+    filled[~np.logical_or.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+def next_day_returns_matrix(
+    price_df: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    symbols: pd.Index,
+) -> np.ndarray:
+    """
+    Returns realised on T+1, aligned to row T.
+
+    Args:
+        price_df: Prepared price data with date, symbol, daily_return columns
+        dates: Calendar for the signal/weight matrices
+        symbols: Column index
+
+    Returns:
+        np.ndarray: Matrix whose row T holds each symbol's return on T+1
+    """
+    shifted = dates + pd.Timedelta(days=1)
+    returns = pivot_to_matrix(price_df, 'daily_return', shifted, symbols)
+    # A price row with a NaN return still counts as an observation
+    present = pivot_to_matrix(
+        price_df.assign(_present=1.0), '_present', shifted, symbols
+    )
+    returns[(present == 1) & np.isnan(returns)] = 0.0
+    return returns
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+def build_signal_matrix(
+    price_df: pd.DataFrame,
+    factor_df: pd.DataFrame,
+    factor_type: str,
+    strategy: str,
+    signals_df: Optional[pd.DataFrame] = None,
+    **signal_params,
+) -> Dict:
+    """
+    Lay out the signals of one factor configuration on the daily calendar.
+
+    Args:
+        price_df: Output of prepare_price_data
+        factor_df: Output of prepare_factor_data
+        factor_type: Factor type
+        strategy: Strategy name
+        signals_df: Pre-computed long-format signals (required for factors that
+            are not pure cross-sectional ranks)
+        **signal_params: Signal generation parameters
+
+    Returns:
+        dict: dates, symbols, signals and has_row matrices, extras (rank
+            matrices emitted with the signals) and the source signals_df
+    """
+    if signals_df is None:
+        factor_column = RANKED_FACTORS[factor_type][2]
+        column_param = RANKED_FACTORS[factor_type][1]
+        if column_param:
+            factor_column = signal_params.get(column_param, factor_column)
+        source = factor_df.dropna(subset=[factor_column])
+        value_column = factor_column
+    else:
+        source = signals_df
+        value_column = 'signal'
+
+    if len(source) == 0:
+        raise ValueError(f"No signal data available for {factor_type} factor")
+
+    dates = build_daily_calendar(pd.to_datetime(source['date']))
+    symbols = pd.Index(sorted(set(source['symbol']) | set(price_df['symbol'])))
+    values = pivot_to_matrix(source, value_column, dates, symbols)
+    has_row = ~np.isnan(values)
+
+    if signals_df is None:
+        signals, extras = rank_signals_matrix(values, factor_type, strategy, **signal_params)
+        extras = {factor_column: values, **extras}
+
+        regime_filter = signal_params.get('regime_filter')
+        regime_data = signal_params.get('regime_data')
+        if factor_type == 'kurtosis' and regime_filter in ('bear_only', 'bull_only') and regime_data is not None:
+            allowed = 'bear' if regime_filter == 'bear_only' else 'bull'
+            regime = regime_data.drop_duplicates('date').set_index('date')['regime']
+            regime_rows = regime.reindex(dates).to_numpy() == allowed
+            signals[~regime_rows, :] = np.where(has_row[~regime_rows, :], 0.0, np.nan)
+    else:
+        signals = values
+        extras = {}
+
+    return {
+        'dates': dates,
+        'symbols': symbols,
+        'signals': signals,
+        'has_row': has_row,
+        'extras': extras,
+        'signals_df': signals_df,
+    }
+
+
+def volatility_matrix(
+    price_df: pd.DataFrame,
+    layout: Dict,
+    volatility_window: int = 30,
+) -> np.ndarray:
+    """
+    Volatility used for risk parity weights, on the signal layout.
+
+    Taken from the generator's 'volatility' column when it provides one,
+    otherwise the annualized rolling std of daily returns.
+
+    Args:
+        price_df: Output of prepare_price_data
+        layout: Output of build_signal_matrix
+        volatility_window: Rolling window for the fallback volatility
+
+    Returns:
+        np.ndarray: Date x symbol volatility matrix
+    """
+    signals_df = layout['signals_df']
+    if signals_df is not None and 'volatility' in signals_df.columns:
+        return pivot_to_matrix(signals_df, 'volatility', layout['dates'], layout['symbols'])
+
+    vol_df = price_df[['date', 'symbol']].copy()
+    vol_df['volatility'] = price_df.groupby('symbol')['daily_return'].transform(
+        lambda x: x.rolling(window=volatility_window, min_periods=volatility_window).std() * np.sqrt(365)
+    )
+    return pivot_to_matrix(vol_df, 'volatility', layout['dates'], layout['symbols'])
+
+
+def run_matrix_engine(
+    price_df: pd.DataFrame,
+    factor_df: pd.DataFrame,
+    factor_type: str,
+    strategy: str,
+    signals_df: Optional[pd.DataFrame] = None,
+    rebalance_days: int = 1,
+    weighting_method: Literal['equal_weight', 'risk_parity'] = 'equal_weight',
+    long_allocation: float = 0.5,
+    short_allocation: float = 0.5,
+    **signal_params,
+) -> Dict:
+    """
+    Run signal generation through portfolio returns on dense matrices.
+
+    Args:
+        price_df: Output of prepare_price_data
+        factor_df: Output of prepare_factor_data
+        factor_type: Factor type
+        strategy: Strategy name
+        signals_df: Pre-computed long-format signals (required for factors that
+            are not pure cross-sectional ranks)
+        rebalance_days: Rebalance every N signal dates
+        weighting_method: 'equal_weight' or 'risk_parity'
+        long_allocation: Allocation to longs (leverage already applied)
+        short_allocation: Allocation to shorts (leverage already applied)
+        **signal_params: Signal generation parameters
+
+    Returns:
+        dict: signals, weights (rebalance dates), portfolio_returns DataFrames
+    """
+    layout = build_signal_matrix(
+        price_df, factor_df, factor_type, strategy, signals_df=signals_df, **signal_params
+    )
+    dates, symbols = layout['dates'], layout['symbols']
+    signals, has_row = layout['signals'], layout['has_row']
+
+    # Rebalance rows and weights
+    rebalance_rows = rebalance_row_mask(has_row, rebalance_days)
+    volatility = None
+    if weighting_method == 'risk_parity':
+        volatility = volatility_matrix(price_df, layout, signal_params.get('volatility_window', 30))
+
+    rebalance_signals = np.where(rebalance_rows[:, None], signals, np.nan)
+    weights = weights_matrix(
+        rebalance_signals,
+        volatility=volatility,
+        weighting_method=weighting_method,
+        long_allocation=long_allocation,
+        short_allocation=short_allocation,
+    )
+
+    # Hold weights between rebalances and apply T+1 returns
+    held = forward_fill_matrix(weights)
+    next_returns = next_day_returns_matrix(price_df, dates, symbols)
+    active = ~np.isnan(held) & (held != 0) & ~np.isnan(next_returns)
+    contributions = np.where(active, held * next_returns, 0.0)
+    return_rows = active.any(axis=1)
+
+    portfolio_returns = pd.DataFrame({
+        'date': dates[return_rows],
+        'portfolio_return': contributions[return_rows].sum(axis=1),
+    })
+
+    if signals_df is None:
+        signals_df = matrix_to_long({**layout['extras'], 'signal': signals}, dates, symbols, has_row)
+        signals_df['signal'] = signals_df['signal'].astype(int)
+
+    weights_mask = has_row & rebalance_rows[:, None]
+    weights_df = matrix_to_long(
+        {'signal': rebalance_signals, 'weight': weights}, dates, symbols, weights_mask
+    )
+    weights_df['signal'] = weights_df['signal'].astype(int)
+
+    return {
+        'signals': signals_df,
+        'weights': weights_df,
+        'portfolio_returns': portfolio_returns,
+    }
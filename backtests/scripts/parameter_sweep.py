@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep for Vectorized Factor Backtests
+
+Runs a grid of backtest_factor_vectorized configurations while computing each
+distinct piece of work once:
+
+1. Factor panels (prepare_factor_data) are memoized per factor parameters
+   (windows, ADF regression) - a grid over rebalance_days never recomputes them
+2. Signal matrices are memoized per (factor, signal) parameters
+   (strategy, quintiles, percentiles, top/bottom N, ...)
+3. For each (rebalance_days, weighting_method) the long and short legs are
+   weighted once at unit allocation; every long/short allocation pair is then
+   a linear combination of the two leg return series, evaluated as one array
+   operation
+
+Results are identical to running backtest_factor_vectorized (either engine)
+for each combination and are collected in a single table.
+
+Usage:
+    python3 parameter_sweep.py --factor volatility --strategy long_low_short_high \
+        --grid '{"rebalance_days": [1, 7, 14], "weighting_method": ["equal_weight", "risk_parity"]}' \
+        --output backtests/results/volatility_sweep.csv
+"""
+
+import argparse
+import io
+import contextlib
+import itertools
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backtest_vectorized import (
+    add_regime_data,
+    calculate_backtest_metrics,
+    generate_signals_for_factor,
+    prepare_factor_data,
+    prepare_price_data,
+)
+from generate_signals_vectorized import calculate_cumulative_returns_vectorized
+from matrix_engine import (
+    build_signal_matrix,
+    forward_fill_matrix,
+    is_ranked_factor,
+    next_day_returns_matrix,
+    rebalance_row_mask,
+    side_weights,
+    volatility_matrix,
+)
+from data.scripts.price_store import load_price_data
+
+# Evaluated per variant on top of a signal matrix
+PORTFOLIO_PARAMS = ('rebalance_days', 'weighting_method', 'long_allocation', 'short_allocation')
+
+# Read by prepare_factor_data; changing them changes the factor panel
+FACTOR_PANEL_PARAMS = ('window', 'beta_window', 'kurtosis_window', 'skew_window', 'adf_window', 'regression')
+
+# factor_type -> (window parameter, column parameter, column name template)
+WINDOW_COLUMNS = {
+    'volatility': ('window', 'vol_column', 'volatility_{}d'),
+    'kurtosis': ('kurtosis_window', 'kurtosis_column', 'kurtosis_{}d'),
+    'skew': ('skew_window', 'skew_column', 'skewness_{}d'),
+}
+
+PORTFOLIO_DEFAULTS = {
+    'rebalance_days': 1,
+    'weighting_method': 'equal_weight',
+    'long_allocation': 0.5,
+    'short_allocation': 0.5,
+}
+
+
+def expand_grid(param_grid: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Cartesian product of a parameter grid, in grid order.
+
+    Args:
+        param_grid: Mapping of parameter name to candidate values
+
+    Returns:
+        list: One dict per combination
+    """
+    names = list(param_grid)
+    return [
+        dict(zip(names, values, strict=True)) for values in itertools.product(*param_grid.values())
+    ]
+
+
+def _resolve_params(factor_type: str, params: Dict) -> Dict:
+    """Fill the factor column for non-default windows, as callers otherwise must."""
+    if factor_type in WINDOW_COLUMNS:
+        window_param, column_param, template = WINDOW_COLUMNS[factor_type]
+        if window_param in params and column_param not in params:
+            params = {**params, column_param: template.format(params[window_param])}
+    return params
+
+
+def _leg_returns(layout: Dict, next_returns: np.ndarray, volatility: Optional[np.ndarray],
+                 rebalance_days: int, weighting_method: str):
+    """
+    Daily returns of the long and short legs at unit allocation.
+
+    Returns:
+        tuple: (long returns, short returns, long-active rows, short-active rows)
+    """
+    signals = layout['signals']
+    rebalance_rows = rebalance_row_mask(layout['has_row'], rebalance_days)
+    rebalance_signals = np.where(rebalance_rows[:, None], signals, np.nan)
+    missing = np.isnan(rebalance_signals)
+
+    legs = []
+    for side in (rebalance_signals == 1, rebalance_signals == -1):
+        weights = np.where(missing, np.nan, side_weights(side, volatility, weighting_method))
+        held = forward_fill_matrix(weights)
+        active = ~np.isnan(held) & (held != 0) & ~np.isnan(next_returns)
+        legs.append((np.where(active, held * next_returns, 0.0).sum(axis=1), active.any(axis=1)))
+
+    (long_returns, long_rows), (short_returns, short_rows) = legs
+    return long_returns, short_returns, long_rows, short_rows
+
+
+def run_parameter_sweep(
+    price_data: pd.DataFrame,
+    factor_type: str,
+    strategy: str,
+    param_grid: Dict[str, Sequence],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    initial_capital: float = 10000,
+    leverage: float = 1.0,
+    output_file: Optional[str] = None,
+    **base_params,
+) -> pd.DataFrame:
+    """
+    Backtest every combination of a parameter grid for one factor.
+
+    Args:
+        price_data: DataFrame with OHLCV data
+        factor_type: Type of factor ('volatility', 'beta', 'carry', ...)
+        strategy: Strategy name (may be overridden by a 'strategy' grid entry)
+        param_grid: Mapping of parameter name to candidate values. Any
+            backtest_factor_vectorized keyword is accepted: rebalance_days,
+            weighting_method, long_allocation, short_allocation, windows,
+            num_quintiles, percentiles, top_n/bottom_n, ...
+        start_date: Start date for backtest
+        end_date: End date for backtest
+        initial_capital: Initial portfolio capital
+        leverage: Leverage multiplier
+        output_file: Optional CSV path for the results table
+        **base_params: Parameters shared by all combinations (e.g. funding_data)
+
+    Returns:
+        pd.DataFrame: One row per combination with its parameters and metrics
+    """
+    combos = expand_grid(param_grid)
+    grid_names = list(param_grid)
+    signal_names = [n for n in grid_names if n not in PORTFOLIO_PARAMS]
+    factor_names = [n for n in signal_names if n in FACTOR_PANEL_PARAMS]
+
+    print(f"\n{'='*80}")
+    print(f"Parameter Sweep: {factor_type.upper()} Factor - {len(combos)} combinations")
+    print(f"{'='*80}")
+
+    price_df = prepare_price_data(price_data, start_date, end_date)
+
+    shared_params = {k: v for k, v in base_params.items() if k not in PORTFOLIO_PARAMS}
+    portfolio = [
+        {**PORTFOLIO_DEFAULTS, **{k: v for k, v in base_params.items() if k in PORTFOLIO_PARAMS}, **combo}
+        for combo in combos
+    ]
+
+    # Group combinations: signal parameters -> portfolio variants
+    groups: Dict[tuple, List[int]] = {}
+    for i, combo in enumerate(combos):
+        groups.setdefault(tuple(combo[n] for n in signal_names), []).append(i)
+
+    factor_panels = {}
+    regime_cache = {}
+    next_returns_cache = {}
+    volatility_cache = {}
+    rows = [None] * len(combos)
+
+    for signal_values, members in groups.items():
+        signal_combo = dict(zip(signal_names, signal_values, strict=True))
+        params = _resolve_params(factor_type, {**shared_params, **signal_combo})
+        params.pop('strategy', None)
+        combo_strategy = signal_combo.get('strategy', strategy)
+
+        # Factor panel, once per factor parameters
+        factor_key = tuple(params.get(n) for n in factor_names)
+        if factor_key not in factor_panels:
+            factor_combo = dict(zip(factor_names, factor_key, strict=True))
+            print(f"  Factor panel: {factor_combo or 'default'}")
+            factor_panels[factor_key] = prepare_factor_data(price_df, factor_type, **params)
+        factor_df = factor_panels[factor_key]
+
+        # Market regime, once per filter setting
+        regime_key = (params.get('regime_filter'), params.get('reference_symbol'))
+        if regime_key not in regime_cache:
+            regime_params = dict(params)
+            with contextlib.redirect_stdout(io.StringIO()):
+                add_regime_data(price_df, factor_type, regime_params)
+            regime_cache[regime_key] = {
+                k: regime_params[k] for k in ('regime_filter', 'regime_data') if k in regime_params
+            }
+        params.update(regime_cache[regime_key])
+
+        signals_df = None
+        if not is_ranked_factor(factor_type):
+            signals_df = generate_signals_for_factor(factor_df, factor_type, combo_strategy, **params)
+        try:
+            layout = build_signal_matrix(
+                price_df, factor_df, factor_type, combo_strategy, signals_df=signals_df, **params
+            )
+        except ValueError as e:
+            print(f"  ??  Skipping {signal_combo}: {e}")
+            continue
+
+        dates, symbols = layout['dates'], layout['symbols']
+        layout_key = (dates[0], dates[-1], tuple(symbols))
+        if layout_key not in next_returns_cache:
+            next_returns_cache[layout_key] = next_day_returns_matrix(price_df, dates, symbols)
+        next_returns = next_returns_cache[layout_key]
+
+        # Portfolio variants sharing rebalance schedule and weighting
+        variants: Dict[tuple, List[int]] = {}
+        for i in members:
+            variants.setdefault((portfolio[i]['rebalance_days'], portfolio[i]['weighting_method']), []).append(i)
+
+        for (rebalance_days, weighting_method), indices in variants.items():
+            volatility = None
+            if weighting_method == 'risk_parity':
+                vol_key = (layout_key, params.get('volatility_window', 30), signal_values if signals_df is not None else None)
+                if vol_key not in volatility_cache:
+                    volatility_cache[vol_key] = volatility_matrix(price_df, layout, params.get('volatility_window', 30))
+                volatility = volatility_cache[vol_key]
+
+            long_returns, short_returns, long_rows, short_rows = _leg_returns(
+                layout, next_returns, volatility, rebalance_days, weighting_method
+            )
+
+            # All allocation pairs at once: returns = a * long leg - b * short leg
+            allocations = np.array([
+                [portfolio[i]['long_allocation'] * leverage, portfolio[i]['short_allocation'] * leverage]
+                for i in indices
+            ])
+            variant_returns = (
+                long_returns[:, None] * allocations[:, 0] - short_returns[:, None] * allocations[:, 1]
+            )
+            variant_rows = (
+                (long_rows[:, None] & (allocations[:, 0] != 0))
+                | (short_rows[:, None] & (allocations[:, 1] != 0))
+            )
+
+            for j, i in enumerate(indices):
+                portfolio_returns = pd.DataFrame({
+                    'date': dates[variant_rows[:, j]],
+                    'portfolio_return': variant_returns[variant_rows[:, j], j],
+                })
+                results = calculate_cumulative_returns_vectorized(portfolio_returns, initial_capital=initial_capital)
+                metrics = calculate_backtest_metrics(results) if len(results) > 0 else {}
+                rows[i] = {'factor_type': factor_type, 'strategy': combo_strategy, **combos[i], **metrics}
+
+    results_df = pd.DataFrame([row for row in rows if row is not None])
+    print(f"  ? {len(factor_panels)} factor panels, {len(groups)} signal sets, {len(results_df)} results")
+
+    if output_file:
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        results_df.to_csv(output_file, index=False)
+        print(f"  ? Results saved to: {output_file}")
+
+    return results_df
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parameter sweep over vectorized factor backtests",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--data-file",
+        type=str,
+        default="data/raw/combined_coinbase_coinmarketcap_daily.csv",
+        help="Path to historical OHLCV data CSV file",
+    )
+    parser.add_argument("--factor", type=str, required=True, help="Factor type (volatility, beta, kurtosis, ...)")
+    parser.add_argument("--strategy", type=str, required=True, help="Strategy name")
+    parser.add_argument("--grid", type=str, required=True, help="JSON object of parameter -> list of values")
+    parser.add_argument("--start-date", type=str, default=None, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=str, default=None, help="End date (YYYY-MM-DD)")
+    parser.add_argument("--initial-capital", type=float, default=10000, help="Initial portfolio capital")
+    parser.add_argument("--leverage", type=float, default=1.0, help="Leverage multiplier")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="backtests/results/parameter_sweep.csv",
+        help="Output CSV for the results table",
+    )
+    args = parser.parse_args()
+
+    price_data = load_price_data(args.data_file)
+    results_df = run_parameter_sweep(
+        price_data,
+        args.factor,
+        args.strategy,
+        json.loads(args.grid),
+        start_date=args.start_date,
+        end_date=args.end_date,
+        initial_capital=args.initial_capital,
+        leverage=args.leverage,
+        output_file=args.output,
+    )
+    if len(results_df) > 0:
+        print(results_df.sort_values("sharpe_ratio", ascending=False).head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,11 @@ Regime-aware ADF factor strategy that adjusts between trend-following and mean-r
 
 PERFORMANCE OPTIMIZATIONS:
 - Data is loaded once upfront and shared across all backtests (eliminates repetitive I/O)
+- CSVs are cached as typed Parquet in data/.cache/price_store and read with
+  column/date pushdown (--no-price-store to bypass, --data-lookback-days for warmup)
+- --workers N runs the independent backtests in a process pool; loaded datasets
+  are published once to shared memory (shared_frames.py) and results are
+  merged in the same order as a sequential run
 - Backtest functions are imported conditionally (avoids loading heavy dependencies)
 - scipy is only imported when kurtosis/trendline backtests are run
 - statsmodels is only imported when ADF/regime-switching backtests are run
@@ -49,6 +54,9 @@ import sys
 import os
 from datetime import datetime
 import argparse
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent directories to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -61,6 +69,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backtest
 
 # Import vectorized backtest engine
 from backtest_vectorized import backtest_factor_vectorized
+from data.scripts.price_store import load_dataset, load_price_data
+from data.scripts.incremental_datasets import latest_dataset_path
+from shared_frames import SharedFramePool, attach_frame
 
 
 def calculate_comprehensive_metrics(portfolio_df, initial_capital, benchmark_returns=None):
@@ -202,11 +213,24 @@ def load_all_data(args):
     
     data = {}
     
+    # Columnar store options: CSVs are converted to Parquet on first use and
+    # later runs only read the date range (plus lookback) they need
+    store_kwargs = {
+        "use_store": not getattr(args, "no_price_store", False),
+        "build_if_stale": True,
+    }
+    load_start = None
+    if getattr(args, "start_date", None):
+        lookback_days = getattr(args, "data_lookback_days", 400)
+        load_start = pd.to_datetime(args.start_date) - pd.Timedelta(days=lookback_days)
+    load_end = getattr(args, "end_date", None)
+    
     # Load price data
     if os.path.exists(args.data_file):
         print(f"Loading price data from {args.data_file}...")
-        df = pd.read_csv(args.data_file)
-        df["date"] = pd.to_datetime(df["date"])
+        df = load_price_data(
+            args.data_file, start_date=load_start, end_date=load_end, **store_kwargs
+        )
         
         # Deduplicate symbols: filter to keep only symbols with ":USDC" suffix
         # This fixes the duplicate HYPE/USDC and HYPE/USDC:USDC issue
@@ -233,7 +257,9 @@ def load_all_data(args):
     # Load market cap data
     if os.path.exists(args.marketcap_file):
         print(f"Loading market cap data from {args.marketcap_file}...")
-        df = pd.read_csv(args.marketcap_file)
+        df = load_dataset(
+            args.marketcap_file, start_date=load_start, end_date=load_end, **store_kwargs
+        )
         # Handle snapshot_date column (stored as integer YYYYMMDD)
         if "snapshot_date" in df.columns:
             df["date"] = pd.to_datetime(df["snapshot_date"], format='%Y%m%d')
@@ -257,11 +283,9 @@ def load_all_data(args):
     # Load funding rates data
     if os.path.exists(args.funding_rates_file):
         print(f"Loading funding rates from {args.funding_rates_file}...")
-        df = pd.read_csv(args.funding_rates_file)
-        if "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"])
-        elif "timestamp" in df.columns:
-            df["date"] = pd.to_datetime(df["timestamp"])
+        df = load_dataset(
+            args.funding_rates_file, start_date=load_start, end_date=load_end, **store_kwargs
+        )
         data["funding_data"] = df
         print(f"  ? Loaded {len(df)} rows")
     else:
@@ -272,9 +296,9 @@ def load_all_data(args):
     if hasattr(args, 'run_oi_divergence') and args.run_oi_divergence:
         if hasattr(args, 'oi_data_file') and os.path.exists(args.oi_data_file):
             print(f"Loading OI data from {args.oi_data_file}...")
-            df = pd.read_csv(args.oi_data_file)
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"])
+            df = load_dataset(
+                args.oi_data_file, start_date=load_start, end_date=load_end, **store_kwargs
+            )
             data["oi_data"] = df
             print(f"  ? Loaded {len(df)} rows")
         else:
@@ -288,8 +312,7 @@ def load_all_data(args):
         leverage_file = "signals/historical_leverage_weekly_20251102_170645.csv"
         if os.path.exists(leverage_file):
             print(f"Loading leverage data from {leverage_file}...")
-            df = pd.read_csv(leverage_file)
-            df["date"] = pd.to_datetime(df["date"])
+            df = load_dataset(leverage_file, **store_kwargs)
             data["leverage_data"] = df
             print(f"  ? Loaded {len(df)} rows, {df['coin_symbol'].nunique()} coins")
         else:
@@ -1344,6 +1367,262 @@ def run_adf_factor_backtest(price_data, **kwargs):
         return None
 
 
+def build_backtest_jobs(args, common_params):
+    """
+    Describe the enabled backtests as independent jobs.
+
+    Jobs are listed in the canonical summary order; both the sequential and
+    the parallel runner return results in this order.
+
+    Args:
+        args: Parsed command line arguments (with resolved run_* flags)
+        common_params (dict): Parameters shared by every backtest
+
+    Returns:
+        list: Job dicts with name, func, data (loaded_data keys passed
+            positionally), kwargs and skip_message
+    """
+    jobs = []
+
+    def add_job(enabled, name, func, data, skip_message, **kwargs):
+        if enabled:
+            jobs.append({
+                "name": name,
+                "func": func,
+                "data": data,
+                "kwargs": {**kwargs, **common_params},
+                "skip_message": skip_message,
+            })
+
+    # 1. Breakout Signal
+    add_job(
+        args.run_breakout, "Breakout", "run_breakout_backtest", ["price_data"],
+        "? Skipping Breakout backtest: price data not available",
+        entry_window=50, exit_window=70,
+    )
+
+    # 2. Mean Reversion
+    add_job(
+        args.run_mean_reversion, "Mean Reversion", "run_mean_reversion_backtest", ["price_data"],
+        "? Skipping Mean Reversion backtest: price data not available",
+        lookback_window=30,
+        return_threshold=1.0,
+        volume_threshold=1.0,
+    )
+
+    # 3. Size Factor (LONG small caps, SHORT large caps)
+    add_job(
+        args.run_size, "Size Factor", "run_size_factor_backtest", ["price_data", "marketcap_data"],
+        "? Skipping Size Factor backtest: price or marketcap data not available",
+        strategy="long_small_short_large",  # Traditional size premium: long SMALL, short LARGE
+        num_buckets=5,
+        rebalance_days=10,  # Optimal: 10 days
+    )
+
+    # 4. Carry Factor
+    add_job(
+        args.run_carry, "Carry Factor", "run_carry_factor_backtest", ["price_data", "funding_data"],
+        "? Skipping Carry Factor backtest: price or funding data not available",
+        top_n=10,
+        bottom_n=10,
+        rebalance_days=7,  # Optimal: 7 days (Sharpe: 0.45)
+    )
+
+    # 5. Days from High
+    add_job(
+        args.run_days_from_high, "Days from High", "run_days_from_high_backtest", ["price_data"],
+        "? Skipping Days from High backtest: price data not available",
+        days_threshold=20,
+    )
+
+    # # 6. OI Divergence  # Removed: OI data not used
+    # add_job(
+    #     args.run_oi_divergence, "OI Divergence", "run_oi_divergence_backtest", ["price_data", "oi_data"],
+    #     "? Skipping OI Divergence backtest: price or OI data not available",
+    #     oi_mode=args.oi_mode,
+    #     lookback=30,
+    #     top_n=10,
+    #     bottom_n=10,
+    #     rebalance_days=7,
+    # )
+
+    # 7. Volatility Factor
+    add_job(
+        args.run_volatility, "Volatility Factor", "run_volatility_factor_backtest", ["price_data"],
+        "? Skipping Volatility Factor backtest: price data not available",
+        strategy=args.volatility_strategy,
+        num_quintiles=5,
+        rebalance_days=3,  # Optimal: 3 days (Sharpe: 1.41)
+        weighting_method="equal_weight",
+    )
+
+    # 8. Kurtosis Factor (BEAR MARKETS ONLY: Long low kurtosis, Short high kurtosis)
+    add_job(
+        args.run_kurtosis, "Kurtosis Factor", "run_kurtosis_factor_backtest", ["price_data"],
+        "? Skipping Kurtosis Factor backtest: price data not available",
+        strategy=args.kurtosis_strategy,  # Default: long_low_short_high (long low kurtosis, short high kurtosis)
+        kurtosis_window=30,
+        rebalance_days=args.kurtosis_rebalance_days,
+        weighting="risk_parity",
+        long_percentile=20,  # Top 20% = lowest kurtosis (most stable)
+        short_percentile=80,  # Top 80% = highest kurtosis (most unstable)
+        regime_filter="bear_only",  # CRITICAL: Only trade when BTC 50MA < 200MA (bear market)
+        reference_symbol="BTC",  # Use BTC for regime detection
+    )
+
+    # 9. Beta Factor (BAB with Equal Weight, 5-day Rebalancing)
+    add_job(
+        args.run_beta, "Beta Factor", "run_beta_factor_backtest", ["price_data"],
+        "? Skipping Beta Factor backtest: price data not available",
+        strategy=args.beta_strategy,
+        beta_window=90,
+        rebalance_days=args.beta_rebalance_days,
+        weighting_method=args.beta_weighting,
+        long_percentile=20,
+        short_percentile=80,
+    )
+
+    # 10. ADF Factor (Regime-Aware Strategy Switching)
+    add_job(
+        args.run_adf, "ADF Factor", "run_adf_factor_backtest", ["price_data"],
+        "? Skipping ADF Factor backtest: price data not available",
+        mode=args.adf_mode,
+        adf_window=args.adf_window,
+        regression="ct",
+        regime_lookback=5,
+    )
+
+    # 11. Inverted Leverage Factor (LONG low leverage, SHORT high leverage)
+    add_job(
+        args.run_leverage_inverted, "Inverted Leverage", "run_leverage_inverted_backtest",
+        ["leverage_data", "price_data"],
+        "? Skipping Inverted Leverage backtest: leverage or price data not available",
+        rebalance_days=args.leverage_rebalance_days,
+        top_n=10,
+        bottom_n=10,
+        transaction_cost=0.001,
+    )
+
+    # 11. Dilution Factor (Long low dilution, Short high dilution)
+    add_job(
+        args.run_dilution, "Dilution Factor", "run_dilution_factor_backtest", ["price_data"],
+        "? Skipping Dilution Factor backtest: price data not available",
+        rebalance_days=args.dilution_rebalance_days,  # Default: 7 days (weekly)
+        top_n=10,
+        transaction_cost=0.001,  # 0.1% transaction cost
+    )
+
+    # 12. Turnover Factor (24h Volume / Market Cap)
+    add_job(
+        args.run_turnover, "Turnover Factor", "run_turnover_factor_backtest", ["price_data", "marketcap_data"],
+        "? Skipping Turnover Factor backtest: price or market cap data not available",
+        strategy=args.turnover_strategy,  # Default: long_short
+        rebalance_days=args.turnover_rebalance_days,  # Default: 30 days (monthly)
+        weighting_method="equal_weight",
+    )
+
+    return jobs
+
+
+def run_backtest_jobs(jobs, loaded_data):
+    """
+    Run backtest jobs one after another in this process.
+
+    Args:
+        jobs (list): Jobs from build_backtest_jobs
+        loaded_data (dict): Output of load_all_data
+
+    Returns:
+        list: Non-empty results in job order
+    """
+    all_results = []
+    for job in jobs:
+        data = [loaded_data.get(key) for key in job["data"]]
+        if any(df is None for df in data):
+            print(job["skip_message"])
+            continue
+        result = globals()[job["func"]](*data, **job["kwargs"])
+        if result:
+            all_results.append(result)
+    return all_results
+
+
+# Shared-memory descriptors for the datasets, set once per worker process
+_WORKER_DATA = {}
+
+
+def _init_backtest_worker(descriptors):
+    """Process pool initializer: remember where the shared datasets live."""
+    _WORKER_DATA.update(descriptors)
+
+
+def _run_backtest_job_in_worker(job):
+    """
+    Run one job inside a worker process.
+
+    Returns:
+        tuple: (result or None, captured stdout)
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        data = [attach_frame(_WORKER_DATA[key]) for key in job["data"]]
+        result = globals()[job["func"]](*data, **job["kwargs"])
+    if result:
+        # Intermediate signal/weight frames are not used by the summary and are
+        # expensive to send back to the parent
+        result = {key: value for key, value in result.items() if key != "results"}
+    return result, log.getvalue()
+
+
+def run_backtest_jobs_parallel(jobs, loaded_data, workers):
+    """
+    Run backtest jobs across a process pool.
+
+    Loaded datasets are published once to shared memory; workers attach to
+    them instead of receiving pickled copies. Results (and each job's console
+    output) are collected in job order, so the summary table and combined
+    daily returns are identical to a sequential run.
+
+    Args:
+        jobs (list): Jobs from build_backtest_jobs
+        loaded_data (dict): Output of load_all_data
+        workers (int): Number of worker processes
+
+    Returns:
+        list: Non-empty results in job order
+    """
+    runnable = []
+    for job in jobs:
+        if any(loaded_data.get(key) is None for key in job["data"]):
+            print(job["skip_message"])
+        else:
+            runnable.append(job)
+    if not runnable:
+        return []
+
+    needed = sorted({key for job in runnable for key in job["data"]})
+    print(f"\nRunning {len(runnable)} backtests on {workers} worker processes...")
+
+    all_results = []
+    with SharedFramePool({key: loaded_data[key] for key in needed}) as pool:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(runnable)),
+            initializer=_init_backtest_worker,
+            initargs=(pool.descriptors,),
+        ) as executor:
+            futures = [executor.submit(_run_backtest_job_in_worker, job) for job in runnable]
+            for job, future in zip(runnable, futures, strict=True):
+                try:
+                    result, log = future.result()
+                except Exception as e:
+                    print(f"Error in {job['name']} backtest worker: {e}")
+                    continue
+                print(log, end="")
+                if result:
+                    all_results.append(result)
+    return all_results
+
+
 def combine_daily_returns(all_results):
     """
     Combine daily returns from all strategies into a single DataFrame.
@@ -1631,19 +1910,19 @@ def main():
     parser.add_argument(
         "--marketcap-file",
         type=str,
-        default="data/raw/coinmarketcap_monthly_all_snapshots.csv",
+        default=latest_dataset_path("market_cap"),
         help="Path to market cap data CSV file (monthly snapshots)",
     )
     parser.add_argument(
         "--funding-rates-file",
         type=str,
-        default="data/raw/historical_funding_rates_top100_ALL_HISTORY_20251028_002456.csv",
+        default=latest_dataset_path("funding_rates"),
         help="Path to funding rates data CSV file (top 100 coins, 2020-present)",
     )
     parser.add_argument(
         "--oi-data-file",
         type=str,
-        default="data/raw/historical_open_interest_all_perps_since2020_20251027_042634.csv",
+        default=latest_dataset_path("open_interest"),
         help="Path to open interest data CSV file",
     )
     parser.add_argument(
@@ -1655,6 +1934,23 @@ def main():
     parser.add_argument(
         "--end-date", type=str, default=None, help="End date for backtest (YYYY-MM-DD)"
     )
+    parser.add_argument(
+        "--data-lookback-days",
+        type=int,
+        default=400,
+        help="Days of history loaded before --start-date (covers 200d MAs and 90d betas)",
+    )
+    parser.add_argument(
+        "--no-price-store",
+        action="store_true",
+        help="Read the raw CSVs directly instead of the columnar price store (data/.cache/price_store)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Run backtests in N worker processes (datasets are shared via shared memory)",
+    )
     parser.add_argument(
         "--output-file",
         type=str,
@@ -1922,6 +2218,7 @@ def main():
     print(f"  End date: {args.end_date or 'Last available'}")
     print(f"  Output file: {args.output_file}")
     print(f"  OI mode: {args.oi_mode}")
+    print(f"  Workers: {args.workers}")
     
     # Display which backtests will run
     enabled_backtests = [name.replace('_', ' ').title() for name, enabled in run_flags.items() if enabled]
@@ -1942,214 +2239,12 @@ def main():
         "volatility_window": 30,
     }
 
-    # Run all backtests
-    all_results = []
-
-    # 1. Breakout Signal
-    if args.run_breakout:
-        if loaded_data["price_data"] is not None:
-            result = run_breakout_backtest(
-                loaded_data["price_data"], entry_window=50, exit_window=70, **common_params
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Breakout backtest: price data not available")
-
-    # 2. Mean Reversion
-    if args.run_mean_reversion:
-        if loaded_data["price_data"] is not None:
-            result = run_mean_reversion_backtest(
-                loaded_data["price_data"],
-                lookback_window=30,
-                return_threshold=1.0,
-                volume_threshold=1.0,
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Mean Reversion backtest: price data not available")
-
-    # 3. Size Factor (LONG small caps, SHORT large caps)
-    if args.run_size:
-        if loaded_data["price_data"] is not None and loaded_data["marketcap_data"] is not None:
-            result = run_size_factor_backtest(
-                loaded_data["price_data"],
-                loaded_data["marketcap_data"],
-                strategy="long_small_short_large",  # Traditional size premium: long SMALL, short LARGE
-                num_buckets=5,
-                rebalance_days=10,  # Optimal: 10 days
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Size Factor backtest: price or marketcap data not available")
-
-    # 4. Carry Factor
-    if args.run_carry:
-        if loaded_data["price_data"] is not None and loaded_data["funding_data"] is not None:
-            result = run_carry_factor_backtest(
-                loaded_data["price_data"],
-                loaded_data["funding_data"],
-                top_n=10,
-                bottom_n=10,
-                rebalance_days=7,  # Optimal: 7 days (Sharpe: 0.45)
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Carry Factor backtest: price or funding data not available")
-
-    # 5. Days from High
-    if args.run_days_from_high:
-        if loaded_data["price_data"] is not None:
-            result = run_days_from_high_backtest(
-                loaded_data["price_data"], days_threshold=20, **common_params
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Days from High backtest: price data not available")
-
-    # # 6. OI Divergence  # Removed: OI data not used
-    # if args.run_oi_divergence:
-    #     if loaded_data["price_data"] is not None and loaded_data["oi_data"] is not None:
-    #         result = run_oi_divergence_backtest(
-    #             loaded_data["price_data"],
-    #             loaded_data["oi_data"],
-    #             oi_mode=args.oi_mode,
-    #             lookback=30,
-    #             top_n=10,
-    #             bottom_n=10,
-    #             rebalance_days=7,
-    #             **common_params,
-    #         )
-    #         if result:
-    #             all_results.append(result)
-    #     else:
-    #         print("? Skipping OI Divergence backtest: price or OI data not available")
-
-    # 7. Volatility Factor
-    if args.run_volatility:
-        if loaded_data["price_data"] is not None:
-            result = run_volatility_factor_backtest(
-                loaded_data["price_data"],
-                strategy=args.volatility_strategy,
-                num_quintiles=5,
-                rebalance_days=3,  # Optimal: 3 days (Sharpe: 1.41)
-                weighting_method="equal_weight",
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Volatility Factor backtest: price data not available")
-
-    # 8. Kurtosis Factor (BEAR MARKETS ONLY: Long low kurtosis, Short high kurtosis)
-    if args.run_kurtosis:
-        if loaded_data["price_data"] is not None:
-            result = run_kurtosis_factor_backtest(
-                loaded_data["price_data"],
-                strategy=args.kurtosis_strategy,  # Default: long_low_short_high (long low kurtosis, short high kurtosis)
-                kurtosis_window=30,
-                rebalance_days=args.kurtosis_rebalance_days,
-                weighting="risk_parity",
-                long_percentile=20,  # Top 20% = lowest kurtosis (most stable)
-                short_percentile=80,  # Top 80% = highest kurtosis (most unstable)
-                regime_filter="bear_only",  # CRITICAL: Only trade when BTC 50MA < 200MA (bear market)
-                reference_symbol="BTC",  # Use BTC for regime detection
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Kurtosis Factor backtest: price data not available")
-
-    # 9. Beta Factor (BAB with Equal Weight, 5-day Rebalancing)
-    if args.run_beta:
-        if loaded_data["price_data"] is not None:
-            result = run_beta_factor_backtest(
-                loaded_data["price_data"],
-                strategy=args.beta_strategy,
-                beta_window=90,
-                rebalance_days=args.beta_rebalance_days,
-                weighting_method=args.beta_weighting,
-                long_percentile=20,
-                short_percentile=80,
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Beta Factor backtest: price data not available")
-
-    # 10. ADF Factor (Regime-Aware Strategy Switching)
-    if args.run_adf:
-        if loaded_data["price_data"] is not None:
-            result = run_adf_factor_backtest(
-                loaded_data["price_data"],
-                mode=args.adf_mode,
-                adf_window=args.adf_window,
-                regression="ct",
-                regime_lookback=5,
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping ADF Factor backtest: price data not available")
-    
-    # 11. Inverted Leverage Factor (LONG low leverage, SHORT high leverage)
-    if args.run_leverage_inverted:
-        if loaded_data["leverage_data"] is not None and loaded_data["price_data"] is not None:
-            result = run_leverage_inverted_backtest(
-                loaded_data["leverage_data"],
-                loaded_data["price_data"],
-                rebalance_days=args.leverage_rebalance_days,
-                top_n=10,
-                bottom_n=10,
-                transaction_cost=0.001,
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Inverted Leverage backtest: leverage or price data not available")
-
-    # 11. Dilution Factor (Long low dilution, Short high dilution)
-    if args.run_dilution:
-        if loaded_data["price_data"] is not None:
-            result = run_dilution_factor_backtest(
-                loaded_data["price_data"],
-                rebalance_days=args.dilution_rebalance_days,  # Default: 7 days (weekly)
-                top_n=10,
-                transaction_cost=0.001,  # 0.1% transaction cost
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Dilution Factor backtest: price data not available")
-
-    # 12. Turnover Factor (24h Volume / Market Cap)
-    if args.run_turnover:
-        if loaded_data["price_data"] is not None and loaded_data["marketcap_data"] is not None:
-            result = run_turnover_factor_backtest(
-                loaded_data["price_data"],
-                loaded_data["marketcap_data"],
-                strategy=args.turnover_strategy,  # Default: long_short
-                rebalance_days=args.turnover_rebalance_days,  # Default: 30 days (monthly)
-                weighting_method="equal_weight",
-                **common_params,
-            )
-            if result:
-                all_results.append(result)
-        else:
-            print("? Skipping Turnover Factor backtest: price or market cap data not available")
-
+    # Run all backtests (results are always collected in job order)
+    jobs = build_backtest_jobs(args, common_params)
+    if args.workers > 1:
+        all_results = run_backtest_jobs_parallel(jobs, loaded_data, args.workers)
+    else:
+        all_results = run_backtest_jobs(jobs, loaded_data)
 
     # Create and display summary table
     summary_df = create_summary_table(all_results)
@@ -0,0 +1,189 @@
+"""
+Shared-Memory DataFrames for Parallel Backtests
+
+Publishes the DataFrames loaded by run_all_backtests into POSIX shared memory
+once, so worker processes attach to the same buffers instead of receiving a
+pickled copy of every dataset with each task.
+
+Each column is stored as a contiguous NumPy array inside one shared block:
+- numeric, bool and datetime64 columns are stored as-is
+- string / object / categorical columns are stored as integer codes, with the
+  (small) category list carried in the picklable descriptor
+
+Usage (parent):
+    with SharedFramePool({"price_data": price_df}) as pool:
+        descriptors = pool.descriptors      # pickle these to workers
+
+Usage (worker):
+    price_df = attach_frame(descriptors["price_data"])
+"""
+
+import sys
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ColumnSpec:
+    """Location and decoding info for one column inside a shared block."""
+
+    name: str
+    dtype: str
+    offset: int
+    categories: Optional[list] = None
+    source_dtype: Optional[str] = None
+
+
+@dataclass
+class SharedFrameDescriptor:
+    """Picklable handle to a DataFrame published in shared memory."""
+
+    shm_name: str
+    num_rows: int
+    columns: List[ColumnSpec] = field(default_factory=list)
+
+
+def _encode_column(series: pd.Series) -> Tuple[np.ndarray, Optional[list], Optional[str]]:
+    """Return (array, categories, source dtype) for a column."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int32)
+        return codes, list(dtype.categories), "category"
+    if pd.api.types.is_bool_dtype(dtype) and not series.hasnans:
+        return series.to_numpy(dtype=bool), None, None
+    if pd.api.types.is_datetime64_any_dtype(dtype) and getattr(dtype, "tz", None) is None:
+        return series.to_numpy(), None, None
+    if pd.api.types.is_numeric_dtype(dtype):
+        if pd.api.types.is_extension_array_dtype(dtype):
+            return series.to_numpy(dtype=float, na_value=np.nan), None, None
+        return series.to_numpy(), None, None
+
+    # Strings and anything else: factorize to int32 codes (-1 = missing)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return codes.astype(np.int32), list(uniques), str(dtype)
+
+
+class SharedFramePool:
+    """
+    Publish a set of DataFrames to shared memory for the lifetime of a block.
+
+    The parent process owns the segments and unlinks them on exit; workers
+    only attach (see attach_frame).
+    """
+
+    def __init__(self, frames: Dict[str, Optional[pd.DataFrame]]):
+        self.frames = frames
+        self.descriptors: Dict[str, Optional[SharedFrameDescriptor]] = {}
+        self._segments: List[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> "SharedFramePool":
+        for key, df in self.frames.items():
+            self.descriptors[key] = None if df is None else self._publish(df)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _publish(self, df: pd.DataFrame) -> SharedFrameDescriptor:
+        encoded = []
+        total = 0
+        for name in df.columns:
+            array, categories, source_dtype = _encode_column(df[name])
+            array = np.ascontiguousarray(array)
+            # Keep every column 8-byte aligned
+            offset = (total + 7) // 8 * 8
+            encoded.append((name, array, categories, source_dtype, offset))
+            total = offset + array.nbytes
+
+        segment = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        self._segments.append(segment)
+
+        specs = []
+        for name, array, categories, source_dtype, offset in encoded:
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf, offset=offset)
+            view[:] = array
+            specs.append(ColumnSpec(name, array.dtype.str, offset, categories, source_dtype))
+            del view
+
+        return SharedFrameDescriptor(segment.name, len(df), specs)
+
+    def close(self):
+        """Release and unlink all published segments."""
+        for segment in self._segments:
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+        self._segments = []
+
+
+# Segments attached in this (worker) process, kept open while frames are alive
+_ATTACHED: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching registers the segment with the resource tracker,
+    # which then unlinks it (or double-unregisters it) behind the parent's back
+    register = resource_tracker.register
+    resource_tracker.register = lambda *_args: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def attach_frame(descriptor: Optional[SharedFrameDescriptor]) -> Optional[pd.DataFrame]:
+    """
+    Rebuild a DataFrame from a shared-memory descriptor.
+
+    Numeric columns are read-only views onto the shared block; encoded columns
+    are decoded into new arrays.
+
+    Args:
+        descriptor: Descriptor produced by SharedFramePool (or None)
+
+    Returns:
+        pd.DataFrame or None
+    """
+    if descriptor is None:
+        return None
+
+    segment = _ATTACHED.get(descriptor.shm_name)
+    if segment is None:
+        segment = _attach_segment(descriptor.shm_name)
+        _ATTACHED[descriptor.shm_name] = segment
+
+    columns = {}
+    for spec in descriptor.columns:
+        dtype = np.dtype(spec.dtype)
+        array = np.ndarray((descriptor.num_rows,), dtype=dtype, buffer=segment.buf, offset=spec.offset)
+        array.flags.writeable = False
+        if spec.categories is not None:
+            values = pd.Categorical.from_codes(array, categories=spec.categories)
+            if spec.source_dtype != "category":
+                values = pd.Series(values).astype(spec.source_dtype).array
+            columns[spec.name] = values
+        else:
+            columns[spec.name] = array
+
+    return pd.DataFrame(columns, copy=False)
+
+
+def detach_all():
+    """Close every segment attached by this process."""
+    for segment in _ATTACHED.values():
+        try:
+            segment.close()
+        except BufferError:
+            # Frames built on the buffer are still alive; the OS reclaims on exit
+            pass
+    _ATTACHED.clear()
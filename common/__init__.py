@@ -5,6 +5,10 @@ This package contains:
 - exceptions: Custom exception hierarchy
 - validators: Input validation utilities
 - retry: Retry logic with exponential backoff
+- rate_limit: Token-bucket rate limiting
+- tracing: Per-run stage latency spans and API call counters
+- symbols: Venue symbol parsing and the persistent universe index
+- storage: Atomic cache file writes and the optional pyarrow probe
 - logging_config: Structured logging setup
 - metrics: System metrics tracking
 - health_checks: Health check utilities
@@ -0,0 +1,124 @@
+"""
+Client-side rate limiting.
+
+Provides a thread-safe token bucket for spreading API calls over an
+exchange's weight budget (e.g. Hyperliquid's 1200 weight per minute)
+instead of sleeping a fixed delay between calls.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    acquire() reserves tokens immediately and sleeps until they are
+    covered, so concurrent callers are served in arrival order and the
+    long-run throughput never exceeds `rate`.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum tokens held (burst size)
+        clock: Monotonic clock returning seconds (injectable for tests)
+        sleep: Sleep function (injectable for tests)
+
+    Example:
+        bucket = TokenBucket(rate=1200 / 60, capacity=200)
+        bucket.acquire(20)  # blocks until 20 weight is available
+        exchange.fetch_ohlcv(...)
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = self._clock()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update (lock held)."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative while callers are waiting)."""
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available now, without waiting.
+
+        Returns:
+            True if the tokens were taken
+        """
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (possibly into debt) and return the seconds until they are covered."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping until the bucket covers them.
+
+        Requests larger than the capacity are allowed; they simply wait
+        for the bucket to refill past zero.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """acquire() for asyncio code: awaits instead of blocking the event loop.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, seconds: float):
+        """Stall every caller for `seconds` (e.g. after an HTTP 429).
+
+        Empties the bucket and pushes it `seconds` worth of refill into
+        debt, so subsequent acquire() calls wait at least that long.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+        logger.warning(f"Rate limiter paused for {seconds:.1f}s")
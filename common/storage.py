@@ -0,0 +1,39 @@
+"""
+On-disk storage helpers shared by the caches.
+
+Provides the optional pyarrow probe (parquet when available, CSV
+otherwise) and an atomic file replace, so a crash or a concurrent
+reader never sees a half-written cache file.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    PYARROW_AVAILABLE = False
+
+
+def write_atomic(path: Path, write: Callable[[Path], object]) -> None:
+    """Write a file through a temporary sibling and an atomic replace.
+
+    The temporary name is unique per process and thread, and it is removed
+    if `write` or the replace fails, leaving any previous file untouched.
+
+    Args:
+        path: Destination file
+        write: Callable writing the full contents to the path it is given
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
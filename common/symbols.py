@@ -0,0 +1,399 @@
+"""
+Symbol normalization and the universe index.
+
+Every data source names the same coin differently: Hyperliquid 'BTC/USDC:USDC',
+Coinbase 'BTC/USD', CoinMarketCap 'BTC', Coinalyze 'BTCUSDT_PERP.A' / 'BTC.H'
+and DefiLlama protocol tickers that sometimes differ from the traded coin
+(e.g. 'SKY' -> 'MKR'). This module provides one set of parsers for those
+formats and a persistent SymbolIndex that assigns each base asset a stable
+integer id and records which venue symbol maps to it over which dates.
+
+Joins across sources then run on the shared asset codes (or on categoricals
+with the shared SymbolIndex.dtype) instead of on strings re-derived per
+module.
+"""
+
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from common.storage import PYARROW_AVAILABLE, write_atomic
+
+logger = logging.getLogger(__name__)
+
+VENUES = ("hyperliquid", "coinbase", "cmc", "coinalyze", "defillama")
+# Pseudo-venue of assets registered by name only (symbol == base)
+BASE_VENUE = "base"
+INDEX_COLUMNS = ["venue", "symbol", "asset_id", "base", "valid_from", "valid_to"]
+
+_COINALYZE_PERP = re.compile(r"^(?P<base>.+?)(?P<quote>USDT|USDC|USD)?_PERP\.(?P<exchange>\w+)$")
+_COINALYZE_SHORT = re.compile(r"^(?P<base>[^.]+)\.(?P<exchange>\w+)$")
+
+
+def parse_symbol(symbol: str) -> Tuple[str, str]:
+    """Split a ccxt market symbol into base and quote.
+
+    'BTC/USDC:USDC' -> ('BTC', 'USDC'), 'BTC/USD' -> ('BTC', 'USD').
+    Symbols without a '/' are returned as (symbol, '').
+    """
+    if not isinstance(symbol, str) or "/" not in symbol:
+        return symbol, ""
+    base, rhs = symbol.split("/", 1)
+    quote = rhs.split(":", 1)[0] if ":" in rhs else rhs
+    return base, quote
+
+
+def base_asset(symbol: str, venue: Optional[str] = None) -> str:
+    """Base asset of a venue symbol.
+
+    Without a venue only the ccxt 'BASE/QUOTE' form is split ('BTC/USD' ->
+    'BTC'); any other string is returned unchanged. With venue='coinalyze'
+    the Coinalyze forms are parsed too ('BTCUSDT_PERP.A' and 'BTC.H' ->
+    'BTC'). Non-strings (NaN) pass through.
+
+    Args:
+        symbol: Venue symbol
+        venue: Optional venue name (one of VENUES)
+
+    Returns:
+        str: Base asset
+    """
+    if not isinstance(symbol, str):
+        return symbol
+    if venue == "coinalyze":
+        match = _COINALYZE_PERP.match(symbol) or _COINALYZE_SHORT.match(symbol)
+        return match.group("base") if match else symbol
+    return parse_symbol(symbol)[0]
+
+
+def base_assets(symbols: Union[pd.Series, Iterable[str]], venue: Optional[str] = None) -> pd.Series:
+    """Vectorized base_asset().
+
+    Each distinct symbol is parsed once and the result broadcast back through
+    its factorized code, so a long panel costs one parse per symbol rather
+    than one per row.
+
+    Args:
+        symbols: Series (index is kept) or iterable of venue symbols
+        venue: Optional venue name, see base_asset()
+
+    Returns:
+        pd.Series: Base assets, NaN where the input is missing
+    """
+    symbols = symbols if isinstance(symbols, pd.Series) else pd.Series(list(symbols), dtype=object)
+    codes, uniques = pd.factorize(symbols)
+    bases = np.array([base_asset(s, venue) for s in uniques] + [np.nan], dtype=object)
+    return pd.Series(bases[codes], index=symbols.index, name=symbols.name)
+
+
+def coinalyze_symbol(base: str, quote: str = "USDT", exchange_code: str = "A") -> str:
+    """Coinalyze perpetual symbol for a base asset.
+
+    Formats by exchange:
+    - Aggregate (A): {BASE}USDT_PERP.A (e.g., BTCUSDT_PERP.A), always USDT
+    - Hyperliquid (H): {BASE}.H (e.g., BTC.H)
+    - Others: {BASE}{QUOTE}_PERP.{CODE} (e.g., BTCUSDT_PERP.4)
+    """
+    if exchange_code == "A":
+        return f"{base}USDT_PERP.A"
+    if exchange_code == "H":
+        return f"{base}.H"
+    return f"{base}{quote}_PERP.{exchange_code}"
+
+
+def hyperliquid_symbol(base: str) -> str:
+    """Hyperliquid perpetual symbol in ccxt notation (BTC -> BTC/USDC:USDC)"""
+    return f"{base}/USDC:USDC"
+
+
+def coinbase_symbol(base: str) -> str:
+    """Coinbase spot symbol in ccxt notation (BTC -> BTC/USD)"""
+    return f"{base}/USD"
+
+
+def default_index_path() -> Path:
+    """Location of the persisted universe index (workspace/data/.cache/symbols)"""
+    workspace_root = Path(__file__).parent.parent
+    suffix = "parquet" if PYARROW_AVAILABLE else "csv"
+    return workspace_root / "data" / ".cache" / "symbols" / f"universe_index.{suffix}"
+
+
+class SymbolIndex:
+    """Base assets with stable integer ids and their per-venue symbols.
+
+    Asset ids are assigned in order of first registration (by symbol within
+    one add() call) and never change, so the index can grow (new listings,
+    new venues) without renumbering codes held elsewhere. Each (venue,
+    symbol) row carries the date range it was observed over; a ticker
+    reused for a different asset after a rebrand is registered through
+    `bases` with its own date range. Assets first seen through
+    codes(register=True) get a BASE_VENUE row so they persist with their id.
+
+    Example:
+        index = SymbolIndex()
+        index.add("hyperliquid", ["BTC/USDC:USDC", "ETH/USDC:USDC"])
+        index.add("coinalyze", ["BTCUSDT_PERP.A"])
+        codes = index.codes(prices["symbol"], venue="coinbase")
+        prices["asset"] = index.categorical(prices["symbol"], venue="coinbase")
+    """
+
+    def __init__(self, table: Optional[pd.DataFrame] = None):
+        """
+        Initialize the index
+
+        Args:
+            table: Rows with INDEX_COLUMNS as written by save()
+        """
+        self.assets: List[str] = []
+        self._asset_ids: Dict[str, int] = {}
+        self._symbols: Dict[Tuple[str, str], int] = {}
+        self._dtype: Optional[pd.CategoricalDtype] = None
+        self._lock = threading.Lock()
+        self.table = pd.DataFrame(columns=INDEX_COLUMNS)
+
+        if table is not None and not table.empty:
+            assets = table[["asset_id", "base"]].drop_duplicates().sort_values("asset_id")
+            if list(assets["asset_id"]) != list(range(len(assets))):
+                raise ValueError("Universe index asset ids must be unique and contiguous from 0")
+            for base in assets["base"]:
+                self._register_asset(base)
+            self.table = self._normalize_table(table[INDEX_COLUMNS])
+            self._rebuild_lookup()
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    @staticmethod
+    def _normalize_table(table: pd.DataFrame) -> pd.DataFrame:
+        table = table.copy()
+        table["asset_id"] = table["asset_id"].astype("int32")
+        for col in ("valid_from", "valid_to"):
+            table[col] = pd.to_datetime(table[col]).astype("datetime64[ns]")
+        table = table.sort_values(["venue", "symbol", "valid_from"], na_position="first")
+        return table.reset_index(drop=True)
+
+    def _register_asset(self, base: str) -> int:
+        asset_id = self._asset_ids.get(base)
+        if asset_id is None:
+            asset_id = len(self.assets)
+            self.assets.append(base)
+            self._asset_ids[base] = asset_id
+            self._dtype = None
+        return asset_id
+
+    def _rebuild_lookup(self) -> None:
+        # Latest row per (venue, symbol) wins for date-free lookups
+        latest = self.table.sort_values("valid_to", na_position="last")
+        self._symbols = {
+            (venue, symbol): asset_id
+            for venue, symbol, asset_id in latest[["venue", "symbol", "asset_id"]].itertuples(
+                index=False
+            )
+        }
+
+    @property
+    def dtype(self) -> pd.CategoricalDtype:
+        """Categorical dtype whose codes are the asset ids.
+
+        Columns built with this dtype from the same index share categories,
+        so merges and groupbys on them compare integer codes.
+        """
+        if self._dtype is None:
+            self._dtype = pd.CategoricalDtype(self.assets)
+        return self._dtype
+
+    def asset_id(self, base: str) -> int:
+        """Asset id of a base asset, -1 if unknown"""
+        return self._asset_ids.get(base, -1)
+
+    def add(
+        self,
+        venue: str,
+        symbols: Union[pd.Series, Iterable[str]],
+        dates: Optional[Iterable] = None,
+        bases: Optional[Mapping[str, str]] = None,
+    ) -> int:
+        """Register venue symbols, widening the validity range of known ones.
+
+        Args:
+            venue: Venue name (one of VENUES)
+            symbols: Venue symbols, repeated freely (e.g. a price panel column)
+            dates: Optional dates aligned with symbols; each symbol's range
+                becomes [first date, last date]. Without dates the range is
+                left open.
+            bases: Optional explicit symbol -> base asset overrides for
+                tickers the parser cannot map (e.g. DefiLlama 'SKY' -> 'MKR')
+
+        Returns:
+            int: Number of (venue, symbol) pairs not seen before
+        """
+        if venue not in VENUES:
+            raise ValueError(f"Unknown venue '{venue}'. Use one of {list(VENUES)}")
+        with self._lock:
+            return self._add(venue, symbols, dates, bases)
+
+    def _add(self, venue, symbols, dates=None, bases=None) -> int:
+        frame = pd.DataFrame({"symbol": pd.Series(list(symbols), dtype=object)})
+        frame["date"] = pd.to_datetime(pd.Series(list(dates))) if dates is not None else pd.NaT
+        frame = frame.dropna(subset=["symbol"])
+        if frame.empty:
+            return 0
+
+        ranges = frame.groupby("symbol", sort=True)["date"].agg(["min", "max"])
+        bases = bases or {}
+        parsed = base_assets(pd.Series(ranges.index, index=ranges.index), venue)
+        rows = pd.DataFrame(
+            {
+                "venue": venue,
+                "symbol": ranges.index,
+                "base": [bases.get(s, b) for s, b in parsed.items()],
+                "valid_from": ranges["min"].to_numpy(),
+                "valid_to": ranges["max"].to_numpy(),
+            }
+        )
+        rows["asset_id"] = [self._register_asset(b) for b in rows["base"]]
+
+        known = pd.MultiIndex.from_frame(self.table[["venue", "symbol"]])
+        new_pairs = int((~pd.MultiIndex.from_frame(rows[["venue", "symbol"]]).isin(known)).sum())
+
+        merged = pd.concat([self.table, rows[INDEX_COLUMNS]], ignore_index=True)
+        merged = merged.groupby(["venue", "symbol", "asset_id"], sort=False).agg(
+            base=("base", "first"), valid_from=("valid_from", "min"), valid_to=("valid_to", "max")
+        )
+        self.table = self._normalize_table(merged.reset_index()[INDEX_COLUMNS])
+        self._rebuild_lookup()
+        return int(new_pairs)
+
+    def codes(
+        self,
+        symbols: Union[pd.Series, Iterable[str]],
+        venue: Optional[str] = None,
+        register: bool = False,
+    ) -> np.ndarray:
+        """Asset ids for venue symbols.
+
+        Symbols registered for the venue resolve through the index; others
+        fall back to their parsed base asset. Each distinct symbol is looked
+        up once, so the strings are hashed a single time and later joins
+        run on the returned integers.
+
+        Args:
+            symbols: Venue symbols
+            venue: Venue name; None treats the symbols as base assets or
+                ccxt 'BASE/QUOTE' symbols
+            register: Give base assets not in the index a new id (under
+                BASE_VENUE) instead of -1
+
+        Returns:
+            np.ndarray: int32 asset ids, -1 for unknown or missing symbols
+        """
+        if not isinstance(symbols, pd.Series):
+            symbols = pd.Series(list(symbols), dtype=object)
+        codes, uniques = pd.factorize(symbols)
+        bases = [base_asset(symbol, venue) for symbol in uniques]
+        with self._lock:
+            if register:
+                unknown = {
+                    base
+                    for symbol, base in zip(uniques, bases)
+                    if (venue, symbol) not in self._symbols and base not in self._asset_ids
+                }
+                if unknown:
+                    self._add(BASE_VENUE, sorted(unknown))
+            ids = np.empty(len(uniques) + 1, dtype=np.int32)
+            for i, (symbol, base) in enumerate(zip(uniques, bases)):
+                asset_id = self._symbols.get((venue, symbol))
+                ids[i] = asset_id if asset_id is not None else self.asset_id(base)
+        ids[-1] = -1
+        return ids[codes]
+
+    def categorical(
+        self,
+        symbols: Union[pd.Series, Iterable[str]],
+        venue: Optional[str] = None,
+        register: bool = False,
+    ) -> pd.Categorical:
+        """Base assets of venue symbols as a categorical with the shared dtype"""
+        codes = self.codes(symbols, venue, register)
+        return pd.Categorical.from_codes(codes, dtype=self.dtype)
+
+    def venue_symbol(self, base: str, venue: str, date=None) -> Optional[str]:
+        """Symbol of a base asset on a venue, valid on date if given.
+
+        Open-ended ranges (NaT) match any date. When several symbols match,
+        the one seen most recently is returned.
+        """
+        asset_id = self.asset_id(base)
+        if asset_id < 0:
+            return None
+        rows = self.table[(self.table["venue"] == venue) & (self.table["asset_id"] == asset_id)]
+        if date is not None:
+            date = pd.Timestamp(date)
+            rows = rows[
+                (rows["valid_from"].isna() | (rows["valid_from"] <= date))
+                & (rows["valid_to"].isna() | (rows["valid_to"] >= date))
+            ]
+        if rows.empty:
+            return None
+        return rows.sort_values("valid_to", na_position="last")["symbol"].iloc[-1]
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Write the index (parquet, CSV without pyarrow) atomically"""
+        path = Path(path) if path is not None else default_index_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".parquet":
+            write_atomic(path, lambda p: self.table.to_parquet(p, index=False))
+        else:
+            write_atomic(path, lambda p: self.table.to_csv(p, index=False))
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None) -> "SymbolIndex":
+        """Read an index written by save(); an empty index if the file is missing"""
+        path = Path(path) if path is not None else default_index_path()
+        if not path.exists():
+            return cls()
+        if path.suffix == ".parquet":
+            table = pd.read_parquet(path)
+        else:
+            table = pd.read_csv(path, keep_default_na=False, na_values=[""])
+        return cls(table)
+
+
+_default_index: Optional[SymbolIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_symbol_index(reload: bool = False) -> SymbolIndex:
+    """Process-wide index loaded once from default_index_path().
+
+    Modules that join on asset codes should all take them from this
+    instance so their categoricals share one dtype.
+    """
+    global _default_index
+    with _default_lock:
+        if _default_index is None or reload:
+            _default_index = SymbolIndex.load()
+        return _default_index
+
+
+def asset_ids(symbols: Union[pd.Series, Iterable[str]], venue: Optional[str] = None) -> np.ndarray:
+    """Asset ids from the process-wide index, registering unseen assets.
+
+    The join key of choice: every module encoding its frames through this
+    function gets the same integer id for the same asset, including assets
+    missing from the persisted index (they are added in memory only).
+
+    Args:
+        symbols: Venue symbols
+        venue: Venue name, see SymbolIndex.codes()
+
+    Returns:
+        np.ndarray: int32 asset ids, -1 only for missing symbols
+    """
+    return get_symbol_index().codes(symbols, venue, register=True)
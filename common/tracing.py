@@ -0,0 +1,372 @@
+"""
+Per-run latency tracing.
+
+A rebalance run is a handful of stages (market selection, OHLCV fetch,
+strategies, reallocation, position fetch, execution ticks), each making
+API calls. A Tracer records spans - named intervals on a monotonic clock,
+nested through a context variable - and counts API calls into every span
+open at the time of the call, so a run can be written out as a JSON
+timeline and summarized per stage.
+
+Tracing is off until start_run() installs a Tracer; until then span() and
+count_api_call() are no-ops, so instrumented library code costs nothing in
+backtests and simulations.
+
+API calls are counted by:
+- install_ccxt_hook(): wraps ccxt's sync and async Exchange.fetch, so every
+  REST request of every ccxt client is counted (source "ccxt.<exchange id>")
+- CoinalyzeClient._request (source "coinalyze")
+
+Example:
+    tracer = start_run("rebalance")
+    with span("ohlcv_fetch", symbols=len(symbols)):
+        data = fetch(symbols)
+    tracer.finish()
+    print(tracer.format_summary())
+    tracer.write("backtests/results/traces")
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class Span:
+    """One timed interval of a run.
+
+    Args:
+        tracer: Owning tracer
+        name: Stage name (e.g. "strategy.size", "execution.tick")
+        parent: Enclosing span, if any
+        attrs: Extra fields recorded with the span
+    """
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.thread = threading.current_thread().name
+        self.start = tracer.clock()
+        self.end_time: Optional[float] = None
+        self.error: Optional[str] = None
+        self.api_calls: Dict[str, int] = defaultdict(int)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end_time is None else self.end_time - self.start
+
+    def end(self, error: Optional[BaseException] = None):
+        """Close the span (idempotent) and make its parent current again."""
+        if self.end_time is not None:
+            return
+        self.end_time = self.tracer.clock()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.tracer._pop(self)
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc)
+        return False
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent.name if self.parent else None,
+            "start": round(self.start - origin, 6),
+            "duration": None if self.duration is None else round(self.duration, 6),
+            "thread": self.thread,
+            "attrs": self.attrs,
+            "api_calls": dict(self.api_calls),
+            "error": self.error,
+        }
+
+
+class _NullSpan:
+    """Span returned while tracing is off."""
+
+    def end(self, error=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+# Spans open in the current thread / asyncio task, innermost last
+_stack: contextvars.ContextVar[Tuple[Span, ...]] = contextvars.ContextVar(
+    "tracing_stack", default=()
+)
+
+
+class Tracer:
+    """Records the spans and API call counts of one run.
+
+    Spans opened in threads or tasks that did not inherit the run's context
+    (e.g. a plain ThreadPoolExecutor) are attributed to the spans open in
+    the thread that started the run, so a stage's API calls include those
+    of its worker threads.
+
+    Args:
+        name: Run name written to the timeline
+        clock: Monotonic clock returning seconds (injectable for tests)
+    """
+
+    def __init__(self, name: str = "run", clock: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.clock = clock or time.perf_counter
+        self.started_at = datetime.now(timezone.utc)
+        self.origin = self.clock()
+        self.finished: Optional[float] = None
+        self.spans: List[Span] = []
+        self.api_calls: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._owner = threading.get_ident()
+        self._owner_stack: Tuple[Span, ...] = ()
+
+    def _current_stack(self) -> Tuple[Span, ...]:
+        stack = _stack.get()
+        if not stack and threading.get_ident() != self._owner:
+            return self._owner_stack
+        return stack
+
+    def start_span(self, name: str, **attrs) -> Span:
+        """Open a span; close it with span.end() or use it as a context manager."""
+        stack = self._current_stack()
+        span = Span(self, name, stack[-1] if stack else None, attrs)
+        with self._lock:
+            self.spans.append(span)
+        _stack.set(stack + (span,))
+        if threading.get_ident() == self._owner:
+            self._owner_stack = stack + (span,)
+        return span
+
+    def _pop(self, span: Span):
+        stack = _stack.get()
+        if span in stack:
+            # Also closes children left open (e.g. a stage ended early)
+            remaining = stack[: stack.index(span)]
+            for child in stack[len(remaining) + 1 :]:
+                if child.end_time is None:
+                    child.end_time = span.end_time
+            _stack.set(remaining)
+            if threading.get_ident() == self._owner:
+                self._owner_stack = remaining
+
+    def stage(self, name: str, **attrs) -> Span:
+        """End the current top-level stage (if any) and start the next one."""
+        stack = self._current_stack()
+        if stack:
+            stack[0].end()
+        return self.start_span(name, **attrs)
+
+    def count(self, source: str, endpoint: str = "", n: int = 1):
+        """Count n API calls to source/endpoint in the run and every open span."""
+        stack = self._current_stack()
+        with self._lock:
+            self.api_calls[source][endpoint] += n
+            for span in stack:
+                span.api_calls[source] += n
+
+    def finish(self):
+        """Close every open span and stop the run clock."""
+        end = self.clock()
+        for span in self.spans:
+            if span.end_time is None:
+                span.end_time = end
+        self.finished = end
+        _stack.set(())
+        self._owner_stack = ()
+
+    @property
+    def duration(self) -> float:
+        return (self.finished if self.finished is not None else self.clock()) - self.origin
+
+    def summary(self) -> List[dict]:
+        """Per span name: count, total/max seconds and API calls, in first-seen order."""
+        rows: Dict[str, dict] = {}
+        for span in self.spans:
+            row = rows.setdefault(
+                span.name, {"name": span.name, "count": 0, "total": 0.0, "max": 0.0, "api_calls": 0}
+            )
+            duration = span.duration or 0.0
+            row["count"] += 1
+            row["total"] += duration
+            row["max"] = max(row["max"], duration)
+            row["api_calls"] += sum(span.api_calls.values())
+        return list(rows.values())
+
+    def format_summary(self) -> str:
+        """Summary table of the run."""
+        lines = [
+            "=" * 80,
+            f"RUN TIMING: {self.name} ({self.duration:.2f}s)",
+            "=" * 80,
+            f"  {'stage':36s} {'count':>6s} {'total s':>9s} {'max s':>8s} {'% run':>6s} {'API':>6s}",
+        ]
+        run = self.duration or 1.0
+        for row in self.summary():
+            lines.append(
+                f"  {row['name'][:36]:36s} {row['count']:>6d} {row['total']:>9.2f} "
+                f"{row['max']:>8.2f} {row['total'] / run * 100:>5.1f}% {row['api_calls']:>6d}"
+            )
+        for source, endpoints in self.api_calls.items():
+            total = sum(endpoints.values())
+            detail = ", ".join(f"{e or '-'}={n}" for e, n in sorted(endpoints.items()))
+            lines.append(f"  API {source}: {total} call(s) ({detail})")
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration": round(self.duration, 6),
+            "api_calls": {s: dict(e) for s, e in self.api_calls.items()},
+            "summary": self.summary(),
+            "spans": [span.to_dict(self.origin) for span in self.spans],
+        }
+
+    def write(self, directory: str) -> str:
+        """Write the timeline to <directory>/<name>_<UTC start>.json and return the path."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"{self.name}_{stamp}.json")
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_run(name: str = "run", clock: Optional[Callable[[], float]] = None) -> Tracer:
+    """Install a fresh Tracer as the current run (and hook ccxt)."""
+    global _tracer
+    install_ccxt_hook()
+    _stack.set(())
+    _tracer = Tracer(name, clock)
+    return _tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The current run's tracer, or None when tracing is off."""
+    return _tracer
+
+
+def stop_run():
+    """Turn tracing off."""
+    global _tracer
+    _tracer = None
+
+
+def span(name: str, **attrs):
+    """Open a span in the current run (no-op when tracing is off); usable with `with`."""
+    tracer = _tracer
+    return tracer.start_span(name, **attrs) if tracer is not None else _NULL_SPAN
+
+
+def stage(name: str, **attrs):
+    """Start the next top-level stage of the current run (see Tracer.stage)."""
+    tracer = _tracer
+    return tracer.stage(name, **attrs) if tracer is not None else _NULL_SPAN
+
+
+def count_api_call(source: str, endpoint: str = "", n: int = 1):
+    """Count API calls in the current run (no-op when tracing is off)."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(source, endpoint, n)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator running the function inside a span (default name: function name)."""
+
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _ccxt_endpoint(url: str, body) -> str:
+    """Hyperliquid posts every call to /info or /exchange; the body names the action."""
+    path = url.split("?", 1)[0].rsplit("/", 1)[-1]
+    if isinstance(body, str) and body.startswith("{"):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return path
+        kind = payload.get("type") or (payload.get("action") or {}).get("type")
+        if kind:
+            return f"{path}:{kind}"
+    return path
+
+
+_ccxt_hooked = False
+
+
+def install_ccxt_hook():
+    """Count every ccxt REST request (sync and async clients) in the current run."""
+    global _ccxt_hooked
+    if _ccxt_hooked:
+        return
+    try:
+        from ccxt.base.exchange import Exchange
+        from ccxt.async_support.base.exchange import Exchange as AsyncExchange
+    except ImportError:
+        return
+
+    sync_fetch = Exchange.fetch
+    async_fetch = AsyncExchange.fetch
+
+    @functools.wraps(sync_fetch)
+    def fetch(self, url, method="GET", headers=None, body=None):
+        count_api_call(f"ccxt.{self.id}", _ccxt_endpoint(url, body))
+        return sync_fetch(self, url, method, headers, body)
+
+    @functools.wraps(async_fetch)
+    async def fetch_async(self, url, method="GET", headers=None, body=None):
+        count_api_call(f"ccxt.{self.id}", _ccxt_endpoint(url, body))
+        return await async_fetch(self, url, method, headers, body)
+
+    Exchange.fetch = fetch
+    AsyncExchange.fetch = fetch_async
+    _ccxt_hooked = True
+
+
+@contextmanager
+def traced_run(name: str, directory: Optional[str] = None, clock=None):
+    """Trace a run, then print the summary and write the timeline to directory."""
+    tracer = start_run(name, clock)
+    try:
+        yield tracer
+    finally:
+        tracer.finish()
+        print("\n" + tracer.format_summary())
+        if directory:
+            try:
+                print(f"Run timeline written to {tracer.write(directory)}")
+            except OSError as e:
+                print(f"Warning: Could not write run timeline: {e}")
+        stop_run()
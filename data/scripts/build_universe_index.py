@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Build the universe index from the raw datasets.
+
+Registers the symbols of every source in the shared SymbolIndex
+(common/symbols.py) with the date range each was seen over:
+
+- hyperliquid: perpetual markets list (BTC/USDC:USDC)
+- coinbase:    combined daily price file (BTC/USD)
+- cmc:         monthly CoinMarketCap snapshots (BTC)
+- coinalyze:   funding rate and open interest datasets (BTCUSDT_PERP.A),
+               mapped through their coin_symbol column
+- defillama:   protocol tickers via PROTOCOL_TO_SYMBOL_MAP (SKY -> MKR)
+
+By default the persisted index is extended, so asset ids assigned by earlier
+runs never change. Missing sources are skipped.
+
+Usage:
+    python data/scripts/build_universe_index.py
+    python data/scripts/build_universe_index.py --rebuild
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Add workspace root to path for imports
+WORKSPACE_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(WORKSPACE_ROOT) not in sys.path:
+    sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from common.symbols import SymbolIndex, default_index_path
+from data.scripts.incremental_datasets import latest_dataset_path
+from data.scripts.map_defillama_to_universe import PROTOCOL_TO_SYMBOL_MAP
+
+DATA_RAW_DIR = WORKSPACE_ROOT / "data" / "raw"
+HYPERLIQUID_MARKETS_FILE = "hyperliquid_perpetual_futures.csv"
+COINBASE_PRICES_FILE = "combined_coinbase_coinmarketcap_daily.csv"
+
+
+def _read(path: Path, columns) -> Optional[pd.DataFrame]:
+    if not path.exists():
+        print(f"  ? {path.name} not found, skipped")
+        return None
+    return pd.read_csv(path, usecols=lambda c: c in columns)
+
+
+def build_universe_index(
+    index: Optional[SymbolIndex] = None, data_dir: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Register the symbols of all raw sources in the index.
+
+    Args:
+        index: Index to extend (default: a new empty index)
+        data_dir: Directory holding the raw datasets (default: data/raw)
+
+    Returns:
+        dict: {venue: number of new (venue, symbol) pairs}
+    """
+    index = index if index is not None else SymbolIndex()
+    data_dir = Path(data_dir) if data_dir is not None else DATA_RAW_DIR
+    added = {}
+
+    markets = _read(data_dir / HYPERLIQUID_MARKETS_FILE, {"symbol", "base"})
+    if markets is not None:
+        bases = dict(zip(markets["symbol"], markets["base"]))
+        added["hyperliquid"] = index.add("hyperliquid", markets["symbol"], bases=bases)
+
+    prices = _read(data_dir / COINBASE_PRICES_FILE, {"symbol", "date"})
+    if prices is not None:
+        added["coinbase"] = index.add("coinbase", prices["symbol"], prices["date"])
+
+    path = Path(latest_dataset_path("market_cap", str(data_dir)))
+    snapshots = _read(path, {"Symbol", "snapshot_date"})
+    if snapshots is not None:
+        dates = pd.to_datetime(snapshots["snapshot_date"].astype(str), format="%Y%m%d")
+        added["cmc"] = index.add("cmc", snapshots["Symbol"], dates)
+
+    added["coinalyze"] = 0
+    for name in ("funding_rates", "open_interest"):
+        path = Path(latest_dataset_path(name, str(data_dir)))
+        history = _read(path, {"coin_symbol", "symbol", "date"})
+        if history is None:
+            continue
+        bases = None
+        if "coin_symbol" in history.columns:
+            pairs = history[["symbol", "coin_symbol"]].drop_duplicates("symbol").dropna()
+            bases = dict(zip(pairs["symbol"], pairs["coin_symbol"]))
+        added["coinalyze"] += index.add("coinalyze", history["symbol"], history["date"], bases)
+
+    protocols = PROTOCOL_TO_SYMBOL_MAP
+    added["defillama"] = index.add("defillama", protocols, bases=protocols)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared universe index")
+    parser.add_argument("--data-dir", default=None, help="Raw data directory (default: data/raw)")
+    parser.add_argument(
+        "--output", default=None, help=f"Index file (default: {default_index_path()})"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Start from an empty index (asset ids are reassigned)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BUILDING UNIVERSE INDEX")
+    print("=" * 80)
+
+    index = SymbolIndex() if args.rebuild else SymbolIndex.load(args.output)
+    print(f"\nStarting from {len(index)} assets")
+    added = build_universe_index(index, args.data_dir)
+
+    for venue, count in added.items():
+        print(f"  ✓ {venue:<12} +{count} symbols")
+
+    path = index.save(args.output)
+    print(f"\n✓ {len(index)} assets, {len(index.table)} venue symbols saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
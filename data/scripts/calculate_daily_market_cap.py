@@ -14,17 +14,109 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import argparse
 
-def calculate_daily_market_cap(price_data, marketcap_snapshots):
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.symbols import asset_ids, base_assets
+from data.scripts.incremental_datasets import latest_dataset_path
+
+
+def merge_latest_snapshot(frame, snapshots, by, columns, on='date'):
+    """
+    Attach to every row of frame the latest snapshot values on or before its date.
+
+    Single as-of join (pd.merge_asof by key) instead of building, merging and
+    forward-filling a daily frame per symbol. Snapshot rows with missing values
+    are skipped, so a gap carries the previous snapshot forward.
+
+    Args:
+        frame: DataFrame with columns [on, by, ...] (e.g. daily prices)
+        snapshots: DataFrame with columns [on, by] + columns (e.g. monthly supply)
+        by: Key column present in both frames. Integer keys (e.g. 'asset_id'
+            from common.symbols.asset_ids) are joined as is; other keys are
+            factorized first
+        columns: Snapshot columns to attach
+        on: Date column present in both frames
+
+    Returns:
+        DataFrame: frame (same row order and index) with columns added; NaN
+        before a key's first snapshot or for keys without snapshots
+    """
+    left = frame.drop(columns=[c for c in columns if c in frame.columns])
+    right = snapshots[[on, by] + list(columns)].dropna(subset=list(columns))
+
+    if pd.api.types.is_integer_dtype(left[by]) and pd.api.types.is_integer_dtype(right[by]):
+        key_codes = np.concatenate([left[by].to_numpy(), right[by].to_numpy()])
+    else:
+        key_codes, _ = pd.factorize(
+            pd.concat([left[by].astype(str), right[by].astype(str)], ignore_index=True)
+        )
+    left_dates = pd.to_datetime(left[on])
+    right = right[[on] + list(columns)].assign(
+        **{on: pd.to_datetime(right[on]).astype(left_dates.dtype), '_key': key_codes[len(left):]}
+    ).sort_values(on, kind='stable')
+
+    keys = pd.DataFrame(
+        {on: left_dates, '_key': key_codes[:len(left)], '_row': np.arange(len(left))}
+    )
+    matched = pd.merge_asof(
+        keys.sort_values(on, kind='stable'), right, on=on, by='_key', direction='backward'
+    ).sort_values('_row')
+
+    result = left.copy()
+    for col in columns:
+        result[col] = matched[col].to_numpy()
+    return result
+
+
+def _prepare_snapshots(marketcap_snapshots):
+    """Snapshots as ['date', 'symbol', 'circulating_supply']"""
+    mcap_df = marketcap_snapshots.copy()
+
+    # Handle snapshot_date column
+    if 'snapshot_date' in mcap_df.columns:
+        mcap_df['date'] = pd.to_datetime(mcap_df['snapshot_date'].astype(str), format='%Y%m%d')
+        mcap_df = mcap_df.drop(columns=['snapshot_date'])
+    elif 'date' in mcap_df.columns:
+        mcap_df['date'] = pd.to_datetime(mcap_df['date'])
+
+    # Normalize column names
+    if 'Symbol' in mcap_df.columns:
+        mcap_df['symbol'] = mcap_df['Symbol']
+
+    # Keep only necessary columns
+    mcap_df = mcap_df[['date', 'symbol', 'Circulating Supply']].copy()
+    mcap_df.columns = ['date', 'symbol', 'circulating_supply']
+    return mcap_df
+
+
+def calculate_daily_market_cap(price_data, marketcap_snapshots, existing=None, since=None):
     """
     Calculate daily market cap from price and circulating supply.
     
+    Each price row takes the circulating supply of the latest snapshot on or
+    before its date (merge_latest_snapshot).
+
+    With `existing` (a previous output), only rows dated on or after `since`
+    are recomputed and the earlier rows are kept, so new monthly snapshots and
+    new price days extend the series without redoing the full history. Every
+    output row records the snapshot its supply came from, so `since` defaults
+    to the earliest of the day after the last existing row and the first
+    snapshot newer than any used in `existing`. An `existing` output without
+    that column is recomputed in full.
+    
     Args:
         price_data: DataFrame with columns ['date', 'symbol', 'close']
         marketcap_snapshots: DataFrame with columns ['date', 'Symbol', 'Circulating Supply']
+        existing: Optional previous output to extend
+        since: First date to recompute when extending
     
     Returns:
-        DataFrame with columns ['date', 'symbol', 'market_cap']
+        DataFrame with columns ['date', 'symbol', 'market_cap', 'snapshot_date']
     """
     print("="*100)
     print("CALCULATING DAILY MARKET CAP")
@@ -34,11 +126,10 @@ def calculate_daily_market_cap(price_data, marketcap_snapshots):
     price_df = price_data.copy()
     price_df['date'] = pd.to_datetime(price_df['date'])
     
-    # Extract base symbol (remove trading pair)
+    # Extract base symbol (remove trading pair) and its shared asset id
     if 'base' not in price_df.columns:
-        price_df['base'] = price_df['symbol'].apply(
-            lambda x: x.split('/')[0] if '/' in str(x) else x
-        )
+        price_df['base'] = base_assets(price_df['symbol'])
+    price_df['asset_id'] = asset_ids(price_df['base'])
     
     print(f"\n1. Price Data:")
     print(f"   Rows: {len(price_df):,}")
@@ -46,22 +137,7 @@ def calculate_daily_market_cap(price_data, marketcap_snapshots):
     print(f"   Date range: {price_df['date'].min().date()} to {price_df['date'].max().date()}")
     
     # Prepare market cap snapshots
-    mcap_df = marketcap_snapshots.copy()
-    
-    # Handle snapshot_date column
-    if 'snapshot_date' in mcap_df.columns:
-        mcap_df['date'] = pd.to_datetime(mcap_df['snapshot_date'], format='%Y%m%d')
-        mcap_df = mcap_df.drop(columns=['snapshot_date'])
-    elif 'date' in mcap_df.columns:
-        mcap_df['date'] = pd.to_datetime(mcap_df['date'])
-    
-    # Normalize column names
-    if 'Symbol' in mcap_df.columns:
-        mcap_df['symbol'] = mcap_df['Symbol']
-    
-    # Keep only necessary columns
-    mcap_df = mcap_df[['date', 'symbol', 'Circulating Supply']].copy()
-    mcap_df.columns = ['date', 'symbol', 'circulating_supply']
+    mcap_df = _prepare_snapshots(marketcap_snapshots)
     
     print(f"\n2. Market Cap Snapshots:")
     print(f"   Rows: {len(mcap_df):,}")
@@ -69,64 +145,39 @@ def calculate_daily_market_cap(price_data, marketcap_snapshots):
     print(f"   Symbols: {mcap_df['symbol'].nunique()}")
     print(f"   Date range: {mcap_df['date'].min().date()} to {mcap_df['date'].max().date()}")
     
-    # Get all dates from price data
-    all_dates = sorted(price_df['date'].unique())
-    
-    print(f"\n3. Expanding Circulating Supply to Daily Frequency:")
-    print(f"   Target: {len(all_dates)} daily observations")
-    
-    # For each symbol, create daily circulating supply by forward-filling
-    daily_supply_list = []
-    
-    symbols_with_supply = mcap_df['symbol'].unique()
-    print(f"   Processing {len(symbols_with_supply)} symbols with supply data...")
-    
-    for i, symbol in enumerate(symbols_with_supply):
-        if (i + 1) % 50 == 0:
-            print(f"   Progress: {i+1}/{len(symbols_with_supply)} symbols processed")
-        
-        # Get supply snapshots for this symbol
-        symbol_supply = mcap_df[mcap_df['symbol'] == symbol][['date', 'circulating_supply']].copy()
-        symbol_supply = symbol_supply.sort_values('date')
-        
-        # Create daily index for this symbol
-        daily_df = pd.DataFrame({'date': all_dates})
-        
-        # Merge and forward-fill
-        daily_df = daily_df.merge(symbol_supply, on='date', how='left')
-        daily_df['circulating_supply'] = daily_df['circulating_supply'].fillna(method='ffill')
-        
-        # Add symbol
-        daily_df['symbol'] = symbol
-        
-        # Keep only rows with valid supply
-        daily_df = daily_df.dropna(subset=['circulating_supply'])
-        
-        daily_supply_list.append(daily_df)
-    
-    # Combine all symbols
-    daily_supply_df = pd.concat(daily_supply_list, ignore_index=True)
-    
-    print(f"   ✓ Created {len(daily_supply_df):,} daily supply observations")
-    
-    # Merge with price data to calculate market cap
-    print(f"\n4. Merging Price and Supply:")
-    
-    # Merge on base symbol
-    merged = price_df.merge(
-        daily_supply_df[['date', 'symbol', 'circulating_supply']],
-        left_on=['date', 'base'],
-        right_on=['date', 'symbol'],
-        how='left',
-        suffixes=('', '_supply')
+    kept = None
+    has_existing = existing is not None and not existing.empty
+    if has_existing and since is None and 'snapshot_date' not in existing.columns:
+        print(f"\n   Existing series has no snapshot_date column, recomputing in full")
+        existing = None
+    if existing is not None and not existing.empty:
+        existing = existing[['date', 'symbol', 'market_cap', 'snapshot_date']].copy()
+        existing['date'] = pd.to_datetime(existing['date'])
+        existing['snapshot_date'] = pd.to_datetime(existing['snapshot_date'])
+        if since is None:
+            since = existing['date'].max() + pd.Timedelta(days=1)
+            new_snapshots = mcap_df.loc[mcap_df['date'] > existing['snapshot_date'].max(), 'date']
+            if not new_snapshots.empty:
+                since = min(since, new_snapshots.min())
+        since = pd.Timestamp(since)
+        kept = existing[existing['date'] < since]
+        price_df = price_df[price_df['date'] >= since]
+        print(f"\n   Extending existing series: {len(kept):,} rows kept")
+        print(f"   Recomputing from {since.date()}")
+    
+    # As-of join: latest supply snapshot on or before each price date
+    print(f"\n3. Joining Price and Latest Supply Snapshot:")
+    supply = mcap_df.assign(
+        asset_id=asset_ids(mcap_df['symbol'], venue='cmc'), snapshot_date=mcap_df['date']
     )
-    
-    print(f"   Before merge: {len(price_df):,} rows")
-    print(f"   After merge: {len(merged):,} rows")
+    merged = merge_latest_snapshot(
+        price_df, supply, by='asset_id', columns=['circulating_supply', 'snapshot_date']
+    )
+    print(f"   Rows: {len(merged):,}")
     print(f"   Rows with supply: {merged['circulating_supply'].notna().sum():,}")
     
     # Calculate daily market cap
-    print(f"\n5. Calculating Market Cap:")
+    print(f"\n4. Calculating Market Cap:")
     merged['market_cap'] = merged['close'] * merged['circulating_supply']
     
     # Remove rows without market cap
@@ -134,17 +185,21 @@ def calculate_daily_market_cap(price_data, marketcap_snapshots):
     print(f"   Valid market cap rows: {valid_mcap.sum():,}")
     
     # Prepare output
-    result = merged[valid_mcap][['date', 'symbol', 'market_cap']].copy()
+    result = merged[valid_mcap][['date', 'symbol', 'market_cap', 'snapshot_date']].copy()
+    if kept is not None:
+        result = pd.concat([kept, result], ignore_index=True)
+        result = result.sort_values(['date', 'symbol'], kind='stable').reset_index(drop=True)
     
-    print(f"\n6. Final Daily Market Cap Data:")
+    print(f"\n5. Final Daily Market Cap Data:")
     print(f"   Rows: {len(result):,}")
     print(f"   Symbols: {result['symbol'].nunique()}")
-    print(f"   Date range: {result['date'].min().date()} to {result['date'].max().date()}")
-    print(f"   Daily observations: {result['date'].nunique()}")
+    if not result.empty:
+        print(f"   Date range: {result['date'].min().date()} to {result['date'].max().date()}")
+        print(f"   Daily observations: {result['date'].nunique()}")
     
-    # Summary statistics
-    avg_symbols_per_day = result.groupby('date').size().mean()
-    print(f"   Avg symbols per day: {avg_symbols_per_day:.0f}")
+        # Summary statistics
+        avg_symbols_per_day = result.groupby('date').size().mean()
+        print(f"   Avg symbols per day: {avg_symbols_per_day:.0f}")
     
     print("\n" + "="*100)
     print("✓ DAILY MARKET CAP CALCULATION COMPLETE")
@@ -155,19 +210,30 @@ def calculate_daily_market_cap(price_data, marketcap_snapshots):
 
 def main():
     """Test the daily market cap calculation."""
+    parser = argparse.ArgumentParser(description="Calculate daily market cap")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Extend the existing output instead of recomputing the full history",
+    )
+    args = parser.parse_args()
+
     # Load data
     print("\nLoading data...")
     price_file = "data/raw/combined_coinbase_coinmarketcap_daily.csv"
-    mcap_file = "data/raw/coinmarketcap_monthly_all_snapshots.csv"
+    mcap_file = latest_dataset_path("market_cap")
+    output_file = "data/raw/daily_calculated_market_cap.csv"
     
     price_df = pd.read_csv(price_file)
     mcap_df = pd.read_csv(mcap_file)
+    existing = None
+    if args.incremental and os.path.exists(output_file):
+        existing = pd.read_csv(output_file)
     
     # Calculate daily market cap
-    daily_mcap = calculate_daily_market_cap(price_df, mcap_df)
+    daily_mcap = calculate_daily_market_cap(price_df, mcap_df, existing=existing)
     
     # Save to file
-    output_file = "data/raw/daily_calculated_market_cap.csv"
     daily_mcap.to_csv(output_file, index=False)
     print(f"\n✓ Saved to: {output_file}")
     
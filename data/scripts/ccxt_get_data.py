@@ -1,8 +1,193 @@
 import ccxt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import math
+import os
+import sys
+import threading
 import pandas as pd
 import time
 
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.rate_limit import TokenBucket
+
+OHLCV_COLUMNS = ["date", "symbol", "open", "high", "low", "close", "volume"]
+
+# Hyperliquid info endpoint budget: 1200 weight per minute per IP.
+# candleSnapshot costs 20 plus 1 per 60 candles returned.
+HYPERLIQUID_WEIGHT_PER_MINUTE = 1200
+HYPERLIQUID_BURST_WEIGHT = 200
+CANDLE_SNAPSHOT_WEIGHT = 20
+CANDLES_PER_EXTRA_WEIGHT = 60
+
+
+def candle_request_weight(limit):
+    """
+    Hyperliquid weight of one candleSnapshot request.
+
+    Args:
+        limit: Number of candles requested
+
+    Returns:
+        int: Request weight
+    """
+    return CANDLE_SNAPSHOT_WEIGHT + math.ceil(max(limit, 0) / CANDLES_PER_EXTRA_WEIGHT)
+
+
+def hyperliquid_rate_limiter(weight_per_minute=HYPERLIQUID_WEIGHT_PER_MINUTE, burst=HYPERLIQUID_BURST_WEIGHT):
+    """
+    Token bucket matched to Hyperliquid's per-IP weight budget.
+
+    Args:
+        weight_per_minute: Sustained weight budget
+        burst: Weight that may be spent at once before throttling
+
+    Returns:
+        TokenBucket: Limiter to pass to ccxt_fetch_hyperliquid_daily_data
+    """
+    return TokenBucket(rate=weight_per_minute / 60.0, capacity=burst)
+
+
+def _print_symbol_table(symbol, df):
+    """Print a symbol's candles and a short summary."""
+    print(f"\n{symbol} - Last {len(df)} days:")
+    print(df.to_string(index=False))
+    print(f"\nSummary for {symbol}:")
+    print(f"  Price Range: ${df['low'].min():.2f} - ${df['high'].max():.2f}")
+    print(f"  Average Volume: {df['volume'].mean():.2f}")
+
+
+def _fetch_symbol_daily(exchange, symbol, since, limit, drop_partial_daily, max_retries, rate_limiter, verbose):
+    """
+    Fetch one symbol's daily candles, retrying transient errors.
+
+    Rate-limit and network errors are retried with 2**retry second backoff;
+    with a shared limiter a rate-limit backoff stalls the limiter instead of
+    sleeping, so every worker waits it out once. Other errors give up.
+
+    Returns:
+        DataFrame with OHLCV_COLUMNS, or None if the fetch failed
+    """
+    retry_count = 0
+
+    while retry_count < max_retries:
+        try:
+            if verbose:
+                print(f"\nFetching data for {symbol}...")
+
+            if rate_limiter is not None:
+                rate_limiter.acquire(candle_request_weight(limit))
+
+            # Fetch OHLCV data (timeframe='1d' for daily)
+            ohlcv = exchange.fetch_ohlcv(
+                symbol=symbol,
+                timeframe="1d",
+                since=since,
+                limit=limit,
+            )
+
+            # Convert to DataFrame
+            df = pd.DataFrame(
+                ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
+            )
+
+            # Convert timestamp to UTC date (naive UTC) and add symbol column
+            df["date"] = (
+                pd.to_datetime(df["timestamp"], unit="ms", utc=True).dt.tz_localize(None).astype("datetime64[ns]")
+            )
+            df["symbol"] = symbol
+            df = df[OHLCV_COLUMNS]
+
+            # Drop potential partial current UTC daily candle
+            if drop_partial_daily and not df.empty:
+                today_utc = datetime.now(timezone.utc).date()
+                df = df[df["date"].dt.date != today_utc]
+
+            if verbose:
+                _print_symbol_table(symbol, df)
+
+            return df
+
+        except (ccxt.RateLimitExceeded, ccxt.NetworkError) as e:
+            retry_count += 1
+            reason = "Rate limit exceeded" if isinstance(e, ccxt.RateLimitExceeded) else f"Network error ({e})"
+            if retry_count < max_retries:
+                # Exponential backoff: 2^retry_count seconds
+                backoff_delay = 2 ** retry_count
+                print(f"{reason} for {symbol}. Retry {retry_count}/{max_retries} after {backoff_delay}s...")
+                if rate_limiter is not None and isinstance(e, ccxt.RateLimitExceeded):
+                    # The next acquire() waits out the penalty
+                    rate_limiter.penalize(backoff_delay)
+                else:
+                    time.sleep(backoff_delay)
+            else:
+                print(f"{reason} for {symbol} after {max_retries} retries. Skipping.")
+
+        except Exception as e:
+            print(f"Error fetching data for {symbol}: {str(e)}")
+            break  # Don't retry on non-transient errors
+
+    return None
+
+
+def _fetch_symbol_daily_cached(exchange, symbol, days, drop_partial_daily, max_retries, rate_limiter, verbose, cache, now_utc):
+    """
+    Serve one symbol's daily window from the OHLCV cache, fetching only the
+    missing bars: one request per contiguous missing range (gaps and bars
+    after the last cached complete UTC day). Gaps the exchange has already
+    returned empty are not requested again.
+
+    If a fetch fails, whatever the cache holds for the window is returned.
+
+    Returns:
+        tuple: (DataFrame with OHLCV_COLUMNS or None if nothing is available,
+        whether any request was sent)
+    """
+    today = pd.Timestamp(now_utc).tz_convert(None).normalize()
+    # Same window as the uncached fetch: `days` bars ending yesterday, or
+    # ending with today's partial bar when it is kept
+    window_start = today - timedelta(days=days if drop_partial_daily else days - 1)
+
+    ranges = cache.missing_ranges(symbol, window_start, now=now_utc)
+    if not drop_partial_daily:
+        if ranges and ranges[-1][1] == today - timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], today)
+        else:
+            ranges.append((today, today))
+
+    partial = None
+    failed = False
+    for fetch_from, fetch_to in ranges:
+        since = int(fetch_from.tz_localize("UTC").timestamp() * 1000)
+        limit = (fetch_to - fetch_from).days + 1
+        fetched = _fetch_symbol_daily(
+            exchange, symbol, since, limit, False, max_retries, rate_limiter, verbose=False
+        )
+        if fetched is None:
+            failed = True
+            continue
+        cache.append(symbol, fetched, requested_from=fetch_from, requested_to=fetch_to, now=now_utc)
+        if fetch_to >= today:
+            partial = fetched[fetched["date"] >= today]
+
+    if failed:
+        if cache.load(symbol, start_date=window_start).empty:
+            return None, True
+        print(f"Using cached data for {symbol} (fetch failed)")
+
+    df = cache.load(symbol, start_date=window_start, end_date=today - timedelta(days=1))
+    if partial is not None and not partial.empty:
+        df = pd.concat([df, partial[OHLCV_COLUMNS]], ignore_index=True)
+
+    if verbose:
+        _print_symbol_table(symbol, df)
+
+    return df, bool(ranges)
+
 
 def ccxt_fetch_hyperliquid_daily_data(
     symbols=["BTC/USDC:USDC", "ETH/USDC:USDC", "SOL/USDC:USDC"],
@@ -10,94 +195,105 @@ def ccxt_fetch_hyperliquid_daily_data(
     drop_partial_daily: bool = True,
     rate_limit_delay: float = 0.1,
     max_retries: int = 3,
+    max_workers: int = 1,
+    verbose: bool = True,
+    rate_limiter=None,
+    cache=None,
 ):
     """
     Fetch daily OHLCV data from Hyperliquid for specified symbols.
 
+    With max_workers=1 symbols are fetched one by one with a fixed delay
+    between calls. With max_workers > 1 they are fetched from a thread pool
+    and paced by a token bucket matched to Hyperliquid's weight budget
+    (see hyperliquid_rate_limiter) instead of the fixed delay.
+
     Args:
         symbols: List of trading pairs to fetch
         days: Number of days of historical data to retrieve
         drop_partial_daily: If True, drop the current (potentially incomplete) UTC daily candle
-        rate_limit_delay: Delay in seconds between API calls (default 0.1s = 10 req/s)
-                         Hyperliquid limits: 1200 req/min, 20 req/sec
-        max_retries: Maximum number of retries for rate limit errors (default 3)
+        rate_limit_delay: Delay in seconds between API calls when fetching
+                         sequentially without a rate_limiter (default 0.1s)
+        max_retries: Maximum number of attempts per symbol for rate limit and
+                     network errors (default 3)
+        max_workers: Number of concurrent fetches (default 1 = sequential)
+        verbose: If True, print each symbol's table and summary; if False,
+                 print only errors and a one-line summary
+        rate_limiter: Optional common.rate_limit.TokenBucket shared by all
+                      requests (default: hyperliquid_rate_limiter() when
+                      max_workers > 1)
+        cache: Optional OHLCVCache (data/scripts/ohlcv_cache.py). When given,
+               complete bars are served from the cache and only bars after
+               the last cached complete UTC day (plus any gaps not known to
+               be empty) are fetched
 
     Returns:
         DataFrame with columns: date, symbol, open, high, low, close, volume
     """
-    # Initialize Hyperliquid exchange
-    exchange = ccxt.hyperliquid(
-        {
-            "enableRateLimit": True,
-        }
-    )
+    if rate_limiter is None and max_workers > 1:
+        rate_limiter = hyperliquid_rate_limiter()
+
+    # Initialize Hyperliquid exchange; the token bucket replaces ccxt's own
+    # (serializing) throttle when one is in use
+    exchange_config = {
+        "enableRateLimit": rate_limiter is None,
+    }
+    exchange = ccxt.hyperliquid(exchange_config)
 
     # Calculate timestamp for 'days' ago (UTC)
     now_utc = datetime.now(timezone.utc)
     since_dt = now_utc - timedelta(days=days + (1 if drop_partial_daily else 0))
     since = exchange.parse8601(since_dt.isoformat())
+    # Fetch an extra bar in case we drop the partial day
+    limit = days + (1 if drop_partial_daily else 0)
 
-    all_data = []
+    def fetch(symbol, exchange=exchange):
+        """Returns (DataFrame or None, whether a request was sent)"""
+        if cache is not None:
+            return _fetch_symbol_daily_cached(
+                exchange, symbol, days, drop_partial_daily, max_retries, rate_limiter, verbose, cache, now_utc
+            )
+        df = _fetch_symbol_daily(
+            exchange, symbol, since, limit, drop_partial_daily, max_retries, rate_limiter, verbose
+        )
+        return df, True
 
-    for i, symbol in enumerate(symbols):
-        retry_count = 0
-        success = False
-        
-        while retry_count < max_retries and not success:
-            try:
-                print(f"\nFetching data for {symbol}...")
+    start_time = time.time()
+    results = {}
 
-                # Fetch OHLCV data (timeframe='1d' for daily)
-                ohlcv = exchange.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe="1d",
-                    since=since,
-                    # Fetch an extra bar in case we drop the partial day
-                    limit=days + (1 if drop_partial_daily else 0),
-                )
-
-                # Convert to DataFrame
-                df = pd.DataFrame(
-                    ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"]
-                )
-
-                # Convert timestamp to UTC date (naive UTC) and add symbol column
-                df["date"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True).dt.tz_localize(None)
-                df["symbol"] = symbol
-                df = df[["date", "symbol", "open", "high", "low", "close", "volume"]]
-
-                # Drop potential partial current UTC daily candle
-                if drop_partial_daily and not df.empty:
-                    today_utc = datetime.now(timezone.utc).date()
-                    df = df[df["date"].dt.date != today_utc]
-
-                all_data.append(df)
-
-                print(f"\n{symbol} - Last {len(df)} days:")
-                print(df.to_string(index=False))
-                print(f"\nSummary for {symbol}:")
-                print(f"  Price Range: ${df['low'].min():.2f} - ${df['high'].max():.2f}")
-                print(f"  Average Volume: {df['volume'].mean():.2f}")
-                
-                success = True
-
-            except ccxt.RateLimitExceeded as e:
-                retry_count += 1
-                if retry_count < max_retries:
-                    # Exponential backoff: 2^retry_count seconds
-                    backoff_delay = 2 ** retry_count
-                    print(f"Rate limit exceeded for {symbol}. Retry {retry_count}/{max_retries} after {backoff_delay}s...")
-                    time.sleep(backoff_delay)
-                else:
-                    print(f"Rate limit exceeded for {symbol} after {max_retries} retries. Skipping.")
-                    
-            except Exception as e:
-                print(f"Error fetching data for {symbol}: {str(e)}")
-                break  # Don't retry on non-rate-limit errors
-        
-        # Add delay between API calls to respect rate limits (except for last symbol)
-        if i < len(symbols) - 1 and success:
-            time.sleep(rate_limit_delay)
+    if max_workers > 1 and len(symbols) > 1:
+        # Load markets once up front so worker threads don't all trigger it
+        exchange.load_markets()
+        # ccxt's sync client keeps one requests.Session, which is not thread-safe,
+        # so each worker gets its own client sharing the markets loaded above
+        local = threading.local()
+
+        def fetch_in_worker(symbol):
+            client = getattr(local, "exchange", None)
+            if client is None:
+                client = local.exchange = ccxt.hyperliquid(exchange_config)
+                client.set_markets(exchange.markets, exchange.currencies)
+            return fetch(symbol, client)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for symbol, (df, _) in zip(symbols, pool.map(fetch_in_worker, symbols)):
+                results[symbol] = df
+    else:
+        for i, symbol in enumerate(symbols):
+            results[symbol], requested = fetch(symbol)
+
+            # Add delay between API calls to respect rate limits (except for last
+            # symbol); symbols served entirely from the cache made no call
+            if rate_limiter is None and i < len(symbols) - 1 and requested and results[symbol] is not None:
+                time.sleep(rate_limit_delay)
+
+    all_data = [df for df in results.values() if df is not None]
+
+    if not verbose:
+        print(
+            f"Fetched daily data for {len(all_data)}/{len(symbols)} symbols "
+            f"in {time.time() - start_time:.1f}s"
+        )
 
     # Combine all data into a single DataFrame
     if all_data:
@@ -106,7 +302,7 @@ def ccxt_fetch_hyperliquid_daily_data(
         return combined_df
     else:
         # Return empty DataFrame with correct schema if no data was fetched
-        return pd.DataFrame(columns=["date", "symbol", "open", "high", "low", "close", "volume"])
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
 
 
 if __name__ == "__main__":
@@ -2,18 +2,49 @@
 """
 Coinalyze Data Cache
 Caches funding rates and open interest data to avoid repeated API calls
+
+Layout:
+    data/.cache/coinalyze/funding_rates_<exchange>.parquet
+    data/.cache/coinalyze/oi_history_<exchange>_days<N>.parquet
+    data/.cache/coinalyze/_index.json        fetch time, symbols, date range, dtypes
+
+Frames are stored as parquet (CSV if pyarrow is not installed), so dtypes such
+as datetime columns survive a round trip, and every write is an atomic replace.
+The index records which universe each entry was fetched for, so a request for
+a subset of those symbols, or (for OI) fewer days of history, is served from a
+cached entry instead of re-fetching.
+
+Validity is still based on the file modification time: funding rates use the
+TTL, OI history is also invalidated when the date changes.
 """
-import os
+import sys
 import json
+import threading
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 import logging
 
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.storage import PYARROW_AVAILABLE, write_atomic
+from common.symbols import base_asset
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+INDEX_FILE = "_index.json"
+CACHE_VERSION = 1
+CACHE_SUFFIXES = (".parquet", ".csv", ".json")
+# Columns naming the coin of each row (OI history, funding rates)
+SYMBOL_COLUMNS = ("coin_symbol", "base")
+
+_index_lock = threading.Lock()
+
 
 class CoinalyzeCache:
     """Cache manager for Coinalyze API data"""
@@ -39,7 +70,29 @@ class CoinalyzeCache:
 
     def _get_cache_path(self, data_type: str, exchange_code: str = "all") -> Path:
         """Get cache file path for a given data type"""
-        return self.cache_dir / f"{data_type}_{exchange_code}.json"
+        suffix = "parquet" if PYARROW_AVAILABLE else "csv"
+        return self.cache_dir / f"{data_type}_{exchange_code}.{suffix}"
+
+    def _read_index(self) -> Dict[str, Any]:
+        index_path = self.cache_dir / INDEX_FILE
+        if index_path.exists():
+            try:
+                with open(index_path, "r") as f:
+                    index = json.load(f)
+                if index.get("version") == CACHE_VERSION:
+                    return index
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Unreadable Coinalyze cache index {index_path}: {e}")
+        return {"version": CACHE_VERSION, "entries": {}}
+
+    def _update_index(self, update) -> None:
+        """Apply update(entries) to the index and write it back (atomic)"""
+        with _index_lock:
+            index = self._read_index()
+            update(index["entries"])
+            write_atomic(
+                self.cache_dir / INDEX_FILE, lambda p: p.write_text(json.dumps(index, indent=2))
+            )
 
     def _is_cache_valid(self, cache_path: Path) -> bool:
         """Check if cache file exists and is not stale"""
@@ -90,99 +143,226 @@ class CoinalyzeCache:
         logger.info(f"Cache valid: {cache_path.name} (age: {age}, same day)")
         return True
 
-    def save_funding_rates(self, data: pd.DataFrame, exchange_code: str = "all"):
-        """Save funding rates to cache"""
-        cache_path = self._get_cache_path("funding_rates", exchange_code)
-
-        cache_data = {
-            "timestamp": datetime.now().isoformat(),
-            "exchange_code": exchange_code,
-            "data": data.to_dict(orient="records"),
+    def _save(
+        self, data: pd.DataFrame, cache_path: Path, symbols: Optional[Iterable[str]], **meta
+    ):
+        """Write a frame and record its metadata in the index"""
+        if cache_path.suffix == ".parquet":
+            write_atomic(cache_path, lambda p: data.to_parquet(p, index=False))
+        else:
+            write_atomic(cache_path, lambda p: data.to_csv(p, index=False))
+
+        entry = {
+            **meta,
+            "fetched_at": datetime.now().isoformat(),
+            "symbols": sorted(set(symbols)) if symbols is not None else None,
+            "rows": len(data),
+            "dtypes": {col: str(dtype) for col, dtype in data.dtypes.items()},
         }
+        if "date" in data.columns and not data.empty:
+            dates = pd.to_datetime(data["date"])
+            entry["start"] = dates.min().isoformat()
+            entry["end"] = dates.max().isoformat()
+
+        def update(entries):
+            entries[cache_path.name] = entry
 
-        with open(cache_path, "w") as f:
-            json.dump(cache_data, f, indent=2)
+        self._update_index(update)
 
+    def _load(self, cache_path: Path, entry: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """Read a cached frame (restoring datetime columns of CSV files)"""
+        try:
+            if cache_path.suffix == ".parquet":
+                return pd.read_parquet(cache_path)
+            dates = [c for c, t in entry.get("dtypes", {}).items() if t.startswith("datetime64")]
+            return pd.read_csv(cache_path, parse_dates=dates)
+        except Exception as e:
+            logger.error(f"Error loading cache: {e}")
+            return None
+
+    @staticmethod
+    def _covers(entry: Dict[str, Any], symbols: Optional[Iterable[str]]) -> bool:
+        """Whether an entry was fetched for (a superset of) the requested symbols"""
+        cached = entry.get("symbols")
+        if symbols is None or cached is None:
+            return True
+        return set(symbols) <= set(cached)
+
+    @staticmethod
+    def _select_symbols(
+        df: pd.DataFrame, entry: Dict[str, Any], symbols: Optional[Iterable[str]]
+    ) -> pd.DataFrame:
+        """Rows of the requested symbols when the entry holds a larger universe"""
+        if symbols is None or entry.get("symbols") is None:
+            return df
+        symbols = set(symbols)
+        if symbols == set(entry["symbols"]):
+            return df
+        column = next((c for c in SYMBOL_COLUMNS if c in df.columns), None)
+        if column is None:
+            return df
+        bases = {base_asset(s) for s in symbols}
+        return df[df[column].isin(bases)].reset_index(drop=True)
+
+    def save_funding_rates(
+        self, data: pd.DataFrame, exchange_code: str = "all", symbols: Optional[List[str]] = None
+    ):
+        """
+        Save funding rates to cache
+
+        Args:
+            data: Funding rates
+            exchange_code: Coinalyze exchange code (or "aggregated")
+            symbols: Trading symbols the data was fetched for
+        """
+        cache_path = self._get_cache_path("funding_rates", exchange_code)
+        self._save(
+            data, cache_path, symbols, data_type="funding_rates", exchange_code=exchange_code
+        )
         logger.info(f"Saved funding rates to cache: {cache_path.name} ({len(data)} records)")
 
-    def load_funding_rates(self, exchange_code: str = "all") -> Optional[pd.DataFrame]:
-        """Load funding rates from cache if valid"""
+    def load_funding_rates(
+        self, exchange_code: str = "all", symbols: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load funding rates from cache if valid
+
+        Args:
+            exchange_code: Coinalyze exchange code (or "aggregated")
+            symbols: Trading symbols wanted; a cache fetched for a universe that
+                does not contain all of them is a miss
+
+        Returns:
+            DataFrame restricted to the requested symbols, or None on a miss
+        """
         cache_path = self._get_cache_path("funding_rates", exchange_code)
 
         if not self._is_cache_valid(cache_path):
             return None
 
-        try:
-            with open(cache_path, "r") as f:
-                cache_data = json.load(f)
+        entry = self._read_index()["entries"].get(cache_path.name, {})
+        if not self._covers(entry, symbols):
+            logger.info(f"Cache miss: {cache_path.name} does not cover the requested symbols")
+            return None
 
-            df = pd.DataFrame(cache_data["data"])
-            logger.info(f"Loaded funding rates from cache: {cache_path.name} ({len(df)} records)")
-            return df
-        except Exception as e:
-            logger.error(f"Error loading cache: {e}")
+        df = self._load(cache_path, entry)
+        if df is None:
             return None
+        df = self._select_symbols(df, entry, symbols)
+        logger.info(f"Loaded funding rates from cache: {cache_path.name} ({len(df)} records)")
+        return df
+
+    def save_oi_history(
+        self,
+        data: pd.DataFrame,
+        exchange_code: str,
+        days: int,
+        symbols: Optional[List[str]] = None,
+    ):
+        """
+        Save open interest history to cache
 
-    def save_oi_history(self, data: pd.DataFrame, exchange_code: str, days: int):
-        """Save open interest history to cache"""
+        Args:
+            data: OI history
+            exchange_code: Coinalyze exchange code
+            days: Days of history fetched
+            symbols: Trading symbols the data was fetched for
+        """
         cache_key = f"{exchange_code}_days{days}"
         cache_path = self._get_cache_path("oi_history", cache_key)
-
-        cache_data = {
-            "timestamp": datetime.now().isoformat(),
-            "exchange_code": exchange_code,
-            "days": days,
-            "data": data.to_dict(orient="records"),
-        }
-
-        with open(cache_path, "w") as f:
-            json.dump(cache_data, f, indent=2)
-
+        data = data.copy()
+        if "date" in data.columns:
+            data["date"] = pd.to_datetime(data["date"])
+        self._save(
+            data,
+            cache_path,
+            symbols,
+            data_type="oi_history",
+            exchange_code=exchange_code,
+            days=days,
+        )
         logger.info(f"Saved OI history to cache: {cache_path.name} ({len(data)} records)")
 
-    def load_oi_history(self, exchange_code: str, days: int) -> Optional[pd.DataFrame]:
-        """Load open interest history from cache if valid (with date-change detection)"""
-        cache_key = f"{exchange_code}_days{days}"
-        cache_path = self._get_cache_path("oi_history", cache_key)
+    def load_oi_history(
+        self, exchange_code: str, days: int, symbols: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load open interest history from cache if valid (with date-change detection)
 
-        # Use OI-specific cache validation (checks date change + TTL)
-        if not self._is_oi_cache_valid(cache_path):
-            return None
+        Any valid entry of the exchange with at least `days` of history fetched
+        for (a superset of) `symbols` serves the request, trimmed to the
+        requested days and symbols.
 
-        try:
-            with open(cache_path, "r") as f:
-                cache_data = json.load(f)
+        Args:
+            exchange_code: Coinalyze exchange code
+            days: Days of history wanted
+            symbols: Trading symbols wanted (None: whatever the entry holds)
 
-            df = pd.DataFrame(cache_data["data"])
-            # Convert date column to datetime if present
+        Returns:
+            DataFrame or None on a miss
+        """
+        entries = self._read_index()["entries"]
+        exact = self._get_cache_path("oi_history", f"{exchange_code}_days{days}").name
+        candidates = sorted(
+            (
+                (entry.get("days", 0), name != exact, name)
+                for name, entry in entries.items()
+                if entry.get("data_type") == "oi_history"
+                and entry.get("exchange_code") == exchange_code
+                and entry.get("days", 0) >= days
+                and self._covers(entry, symbols)
+            )
+        )
+        for cached_days, _, name in candidates:
+            cache_path = self.cache_dir / name
+            # Use OI-specific cache validation (checks date change + TTL)
+            if not self._is_oi_cache_valid(cache_path):
+                continue
+
+            entry = entries[name]
+            df = self._load(cache_path, entry)
+            if df is None:
+                continue
             if "date" in df.columns:
                 df["date"] = pd.to_datetime(df["date"])
+                if cached_days > days:
+                    df = df[df["date"] >= datetime.now() - timedelta(days=days)]
+            df = self._select_symbols(df.reset_index(drop=True), entry, symbols)
 
             logger.info(f"Loaded OI history from cache: {cache_path.name} ({len(df)} records)")
             return df
-        except Exception as e:
-            logger.error(f"Error loading cache: {e}")
-            return None
+        return None
+
+    def _cache_files(self, data_type: Optional[str] = None) -> List[Path]:
+        """Data files in the cache directory (legacy JSON files included)"""
+        pattern = f"{data_type}_*" if data_type else "*"
+        return sorted(
+            f
+            for f in self.cache_dir.glob(pattern)
+            if f.suffix in CACHE_SUFFIXES and f.name != INDEX_FILE
+        )
 
     def clear_cache(self, data_type: Optional[str] = None):
         """Clear cache files"""
-        if data_type:
-            pattern = f"{data_type}_*.json"
-            files = list(self.cache_dir.glob(pattern))
-        else:
-            files = list(self.cache_dir.glob("*.json"))
+        files = self._cache_files(data_type)
 
         for f in files:
             f.unlink()
             logger.info(f"Deleted cache file: {f.name}")
 
+        def update(entries):
+            for f in files:
+                entries.pop(f.name, None)
+
+        self._update_index(update)
         logger.info(f"Cleared {len(files)} cache files")
 
     def get_cache_info(self) -> Dict[str, Any]:
         """Get information about cached files"""
         info = {"cache_dir": str(self.cache_dir), "ttl_hours": self.ttl_hours, "files": []}
+        entries = self._read_index()["entries"]
 
-        for cache_file in self.cache_dir.glob("*.json"):
+        for cache_file in self._cache_files():
             mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
             age = datetime.now() - mtime
             now = datetime.now()
@@ -201,6 +381,7 @@ class CoinalyzeCache:
                 is_valid = age <= timedelta(hours=self.ttl_hours)
                 validation_reason = "ttl_expired" if not is_valid else "valid"
 
+            entry = entries.get(cache_file.name, {})
             info["files"].append(
                 {
                     "name": cache_file.name,
@@ -209,6 +390,10 @@ class CoinalyzeCache:
                     "age_hours": age.total_seconds() / 3600,
                     "is_valid": is_valid,
                     "validation_reason": validation_reason,
+                    "rows": entry.get("rows"),
+                    "symbols": len(entry["symbols"]) if entry.get("symbols") else None,
+                    "start": entry.get("start"),
+                    "end": entry.get("end"),
                 }
             )
 
@@ -234,7 +419,7 @@ def fetch_coinalyze_funding_rates_cached(
     cache = CoinalyzeCache(ttl_hours=cache_ttl_hours)
 
     # Try to load from cache
-    df_cached = cache.load_funding_rates(exchange_code)
+    df_cached = cache.load_funding_rates(exchange_code, symbols=universe_symbols)
     if df_cached is not None:
         logger.info(f"Using cached funding rates for exchange {exchange_code}")
         return df_cached
@@ -250,7 +435,7 @@ def fetch_coinalyze_funding_rates_cached(
 
         if df is not None and not df.empty:
             # Save to cache
-            cache.save_funding_rates(df, exchange_code)
+            cache.save_funding_rates(df, exchange_code, symbols=universe_symbols)
             logger.info(f"Fetched and cached {len(df)} funding rates")
             return df
         else:
@@ -281,7 +466,7 @@ def fetch_coinalyze_aggregated_funding_cached(
     cache = CoinalyzeCache(ttl_hours=cache_ttl_hours)
 
     # Try to load from cache
-    df_cached = cache.load_funding_rates("aggregated")
+    df_cached = cache.load_funding_rates("aggregated", symbols=universe_symbols)
     if df_cached is not None:
         logger.info(f"Using cached aggregated funding rates (.A suffix)")
         return df_cached
@@ -296,7 +481,7 @@ def fetch_coinalyze_aggregated_funding_cached(
 
         if df is not None and not df.empty:
             # Save to cache
-            cache.save_funding_rates(df, "aggregated")
+            cache.save_funding_rates(df, "aggregated", symbols=universe_symbols)
             logger.info(f"Fetched and cached {len(df)} aggregated funding rates")
             return df
         else:
@@ -333,7 +518,7 @@ def fetch_oi_history_cached(
     cache = CoinalyzeCache(ttl_hours=cache_ttl_hours)
 
     # Try to load from cache
-    df_cached = cache.load_oi_history(exchange_code, days)
+    df_cached = cache.load_oi_history(exchange_code, days, symbols=universe_symbols)
     if df_cached is not None:
         logger.info(f"Using cached OI history for exchange {exchange_code} ({days} days)")
         return df_cached
@@ -359,7 +544,7 @@ def fetch_oi_history_cached(
 
         if df is not None and not df.empty:
             # Save to cache
-            cache.save_oi_history(df, exchange_code, days)
+            cache.save_oi_history(df, exchange_code, days, symbols=universe_symbols)
             logger.info(f"Fetched and cached {len(df)} OI history records")
             return df
         else:
@@ -4,44 +4,130 @@ Coinalyze API Client - Complete Implementation
 Based on official API documentation
 """
 import os
+import sys
 import requests
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from datetime import datetime, timedelta
+import asyncio
+import itertools
 import logging
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.tracing import count_api_call
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# History endpoints accept up to 20 comma-separated symbols per request
+MAX_SYMBOLS_PER_REQUEST = 20
+# Points per symbol requested in one history window; longer ranges are split
+MAX_HISTORY_POINTS = 5000
+# Concurrent history requests; the global limiter still bounds the call rate per key,
+# so workers spend an idle key's window at once and overlap response latency
+HISTORY_FETCH_WORKERS = 4
+
+INTERVAL_SECONDS = {
+    "1min": 60,
+    "5min": 300,
+    "15min": 900,
+    "30min": 1800,
+    "1hour": 3600,
+    "2hour": 7200,
+    "4hour": 14400,
+    "6hour": 21600,
+    "12hour": 43200,
+    "daily": 86400,
+}
+
+
+# Server limit per API key. The server counts calls in a trailing minute, so the
+# limiter admits a call whenever fewer than 40 fall in the last 60 s: an idle key
+# bursts 40 calls at once and sustained throughput is the full 40/min
+COINALYZE_CALLS_PER_MINUTE = 40
+COINALYZE_WINDOW_SECONDS = 60.0
+
+
 # Global rate limiter shared across all CoinalyzeClient instances
 class GlobalRateLimiter:
     """
     Global rate limiter to coordinate API calls across all CoinalyzeClient instances.
     Rate Limit: 40 API calls per minute per API key
+
+    Sliding window per API key: a deque holds the times of the key's last
+    calls_per_minute calls, and a new call is scheduled no earlier than 60 s
+    after the oldest of them, so no 60 s window ever holds more than
+    calls_per_minute calls. Slots are reserved under the lock and waited for
+    outside it, so concurrent threads only wait for their own slot.
+
+    Args:
+        calls_per_minute: Calls allowed per key in any 60 s window
+        window: Window length in seconds
+        clock: Monotonic clock returning seconds (injectable for tests)
+        sleep: Sleep function (injectable for tests)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        calls_per_minute: int = COINALYZE_CALLS_PER_MINUTE,
+        window: float = COINALYZE_WINDOW_SECONDS,
+        clock=None,
+        sleep=None,
+    ):
+        if calls_per_minute < 1:
+            raise ValueError(f"calls_per_minute must be at least 1, got {calls_per_minute}")
         self._lock = threading.Lock()
-        self._last_request_time = 0
-        self._min_request_interval = 1.5  # 40 calls/min = 1.5s per call
+        self._limit = int(calls_per_minute)
+        self._window = float(window)
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._calls: Dict[str, deque] = {}
+        self._blocked_until: Dict[str, float] = {}
         self._call_count = 0
 
-    def wait(self):
-        """Wait if necessary to respect rate limit"""
+    def _reserve(self, api_key: str) -> float:
+        """Reserve the next call slot of api_key; returns the seconds until it starts"""
         with self._lock:
-            elapsed = time.time() - self._last_request_time
-            if elapsed < self._min_request_interval:
-                sleep_time = self._min_request_interval - elapsed
-                logger.debug(
-                    f"Rate limiting: waiting {sleep_time:.2f}s (call #{self._call_count + 1})"
-                )
-                time.sleep(sleep_time)
-            self._last_request_time = time.time()
+            now = self._clock()
+            calls = self._calls.setdefault(api_key, deque(maxlen=self._limit))
+            start = max(now, self._blocked_until.get(api_key, now))
+            if len(calls) == self._limit:
+                start = max(start, calls[0] + self._window)
+            calls.append(start)
             self._call_count += 1
             if self._call_count % 10 == 0:
                 logger.info(f"Coinalyze API calls made: {self._call_count}")
+            return start - now
+
+    def wait(self, api_key: str = "") -> float:
+        """Wait until api_key may make a call; returns the seconds waited"""
+        waited = self._reserve(api_key)
+        if waited > 0:
+            logger.debug(f"Rate limiting: waited {waited:.2f}s (call #{self._call_count})")
+            self._sleep(waited)
+        return waited
+
+    async def wait_async(self, api_key: str = "") -> float:
+        """wait() for asyncio code"""
+        waited = self._reserve(api_key)
+        if waited > 0:
+            await asyncio.sleep(waited)
+        return waited
+
+    def penalize(self, api_key: str, seconds: float):
+        """Hold back every new call of api_key for `seconds` (e.g. Retry-After of a 429)"""
+        with self._lock:
+            until = self._clock() + seconds
+            self._blocked_until[api_key] = max(self._blocked_until.get(api_key, until), until)
+        logger.warning(f"Coinalyze key paused for {seconds:.1f}s")
 
 
 # Global instance shared by all clients
@@ -57,93 +143,159 @@ class CoinalyzeClient:
     - Spot: BTCUSD.C (symbol.exchange_code)
 
     Rate Limit: 40 API calls per minute per API key
-    Note: Uses global rate limiter to coordinate across all instances
+    Note: Uses global rate limiter to coordinate across all instances. With several
+    API keys, requests rotate round-robin over the keys, each with its own budget.
     """
 
     BASE_URL = "https://api.coinalyze.net/v1"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, api_keys: Optional[Sequence[str]] = None):
         """
         Initialize Coinalyze API client
 
         Args:
             api_key: API key for authentication. If None, uses COINALYZE_API env var
+                (comma-separated for several keys)
+            api_keys: Several API keys to rotate over (takes precedence over api_key)
         """
-        self.api_key = api_key or os.environ.get("COINALYZE_API")
-        if not self.api_key:
+        if not api_keys:
+            raw = api_key or os.environ.get("COINALYZE_API") or ""
+            api_keys = [k.strip() for k in raw.split(",") if k.strip()]
+        if not api_keys:
             raise ValueError(
                 "API key required. Set COINALYZE_API env var or pass api_key parameter"
             )
 
-        self.session = requests.Session()
-        self.session.headers.update({"api_key": self.api_key})
-
-    def _rate_limit(self):
+        self.api_keys = list(api_keys)
+        self.api_key = self.api_keys[0]
+        self._keys = itertools.cycle(self.api_keys)
+        self._keys_lock = threading.Lock()
+        # requests.Session is not thread-safe, and batched history fetches and
+        # request_async() call from worker threads, so each thread gets its own
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session of the calling thread"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update({"api_key": self.api_key})
+        return session
+
+    def _next_key(self) -> str:
+        """Next API key in round-robin order"""
+        with self._keys_lock:
+            return next(self._keys)
+
+    def _rate_limit(self, api_key: Optional[str] = None):
         """Implement rate limiting between requests using global rate limiter"""
-        _global_rate_limiter.wait()
+        _global_rate_limiter.wait(api_key or self.api_key)
 
     def _request(
         self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3
     ) -> tuple[bool, Any]:
         """Make API request with rate limiting, error handling, and automatic retries"""
-        url = f"{self.BASE_URL}/{endpoint}"
+        for attempt in range(max_retries):
+            api_key = self._next_key()
+            self._rate_limit(api_key)
+            result = self._attempt(endpoint, params, api_key, attempt, max_retries)
+            if result is not None:
+                return result
+
+        return False, {"error": "max_retries", "message": "Maximum retry attempts exceeded"}
 
+    async def request_async(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3
+    ) -> tuple[bool, Any]:
+        """
+        _request() for asyncio code
+
+        Waits for the rate limiter without blocking the event loop and runs the
+        HTTP call in a worker thread, so many requests can be in flight from
+        one event loop (e.g. with asyncio.gather) within the per-key budget.
+        """
         for attempt in range(max_retries):
-            self._rate_limit()
-
-            try:
-                response = self.session.get(url, params=params, timeout=10)
-
-                if response.status_code == 200:
-                    return True, response.json()
-                elif response.status_code == 429:
-                    # Rate limited - wait longer and retry
-                    retry_after = response.headers.get("Retry-After")
-                    if retry_after:
-                        wait_time = float(retry_after)
-                    else:
-                        # Exponential backoff: 2, 4, 8 seconds
-                        wait_time = 2 ** (attempt + 1)
-
-                    logger.warning(
-                        f"Rate limited (attempt {attempt + 1}/{max_retries}). Waiting {wait_time}s before retry..."
-                    )
-                    time.sleep(wait_time)
-
-                    if attempt < max_retries - 1:
-                        continue  # Retry
-                    else:
-                        return False, {"error": "rate_limited", "message": "Max retries exceeded"}
-
-                elif response.status_code == 400:
-                    logger.error(f"Bad request: {response.text}")
-                    return False, {"error": "bad_request", "message": response.text}
-                elif response.status_code == 401:
-                    logger.error("Invalid/missing API key")
-                    return False, {"error": "unauthorized", "message": "Invalid/missing API key"}
-                elif response.status_code == 404:
-                    logger.error(f"Endpoint not found: {endpoint}")
-                    return False, {"error": "not_found", "message": "Endpoint not found"}
-                else:
-                    logger.error(f"API error {response.status_code}: {response.text}")
-                    return False, {
-                        "error": f"http_{response.status_code}",
-                        "message": response.text,
-                    }
-
-            except requests.exceptions.Timeout:
-                logger.error("Request timeout")
-                if attempt < max_retries - 1:
-                    logger.info(f"Retrying after timeout (attempt {attempt + 1}/{max_retries})...")
-                    time.sleep(2)
-                    continue
-                return False, {"error": "timeout", "message": "Request timeout"}
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed: {str(e)}")
-                return False, {"error": "request_failed", "message": str(e)}
+            api_key = self._next_key()
+            await _global_rate_limiter.wait_async(api_key)
+            result = await asyncio.to_thread(
+                self._attempt, endpoint, params, api_key, attempt, max_retries
+            )
+            if result is not None:
+                return result
 
         return False, {"error": "max_retries", "message": "Maximum retry attempts exceeded"}
 
+    def _attempt(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        api_key: str,
+        attempt: int,
+        max_retries: int,
+    ) -> Optional[tuple[bool, Any]]:
+        """
+        One HTTP attempt of a request
+
+        Returns:
+            (success, data), or None if the request should be retried
+        """
+        url = f"{self.BASE_URL}/{endpoint}"
+        count_api_call("coinalyze", endpoint)
+
+        try:
+            response = self.session.get(
+                url, params=params, headers={"api_key": api_key}, timeout=10
+            )
+
+            if response.status_code == 200:
+                return True, response.json()
+            elif response.status_code == 429:
+                # Rate limited - pause the key so every caller using it waits
+                retry_after = response.headers.get("Retry-After")
+                if retry_after:
+                    wait_time = float(retry_after)
+                else:
+                    # Exponential backoff: 2, 4, 8 seconds
+                    wait_time = 2 ** (attempt + 1)
+
+                logger.warning(
+                    f"Rate limited (attempt {attempt + 1}/{max_retries}). "
+                    f"Key paused for {wait_time}s before retry..."
+                )
+                _global_rate_limiter.penalize(api_key, wait_time)
+
+                if attempt < max_retries - 1:
+                    return None  # Retry
+                return False, {"error": "rate_limited", "message": "Max retries exceeded"}
+
+            elif response.status_code == 400:
+                logger.error(f"Bad request: {response.text}")
+                return False, {"error": "bad_request", "message": response.text}
+            elif response.status_code == 401:
+                logger.error("Invalid/missing API key")
+                return False, {"error": "unauthorized", "message": "Invalid/missing API key"}
+            elif response.status_code == 404:
+                logger.error(f"Endpoint not found: {endpoint}")
+                return False, {"error": "not_found", "message": "Endpoint not found"}
+            else:
+                logger.error(f"API error {response.status_code}: {response.text}")
+                return False, {
+                    "error": f"http_{response.status_code}",
+                    "message": response.text,
+                }
+
+        except requests.exceptions.Timeout:
+            logger.error("Request timeout")
+            if attempt < max_retries - 1:
+                logger.info(f"Retrying after timeout (attempt {attempt + 1}/{max_retries})...")
+                time.sleep(2)
+                return None
+            return False, {"error": "timeout", "message": "Request timeout"}
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {str(e)}")
+            return False, {"error": "request_failed", "message": str(e)}
+
     # ==================== MARKET INFORMATION ====================
 
     def get_exchanges(self) -> Optional[List[Dict[str, str]]]:
@@ -325,6 +477,106 @@ class CoinalyzeClient:
         return data if success else None
 
 
+def plan_history_requests(
+    symbols: Sequence[str],
+    interval: str,
+    from_ts: int,
+    to_ts: int,
+    max_points: int = MAX_HISTORY_POINTS,
+) -> List[Tuple[str, int, int]]:
+    """
+    Split a history fetch into API requests.
+
+    Symbols are packed MAX_SYMBOLS_PER_REQUEST per request and the time range is
+    cut into windows of at most max_points intervals.
+
+    Args:
+        symbols: Coinalyze symbols
+        interval: History interval (key of INTERVAL_SECONDS)
+        from_ts: From timestamp (inclusive), UNIX seconds
+        to_ts: To timestamp (inclusive), UNIX seconds
+        max_points: Maximum points per symbol in one request
+
+    Returns:
+        [(comma-separated symbols, from_ts, to_ts), ...]
+    """
+    symbols = list(dict.fromkeys(symbols))
+    step = INTERVAL_SECONDS[interval] * max_points
+    windows = [(start, min(start + step - 1, to_ts)) for start in range(from_ts, to_ts + 1, step)]
+    return [
+        (",".join(symbols[i : i + MAX_SYMBOLS_PER_REQUEST]), start, end)
+        for i in range(0, len(symbols), MAX_SYMBOLS_PER_REQUEST)
+        for start, end in windows
+    ]
+
+
+def fetch_history_batched(
+    client: "CoinalyzeClient",
+    kind: str,
+    symbols: Sequence[str],
+    interval: str,
+    from_ts: int,
+    to_ts: int,
+    max_points: int = MAX_HISTORY_POINTS,
+    max_workers: int = HISTORY_FETCH_WORKERS,
+    **kwargs,
+) -> Dict[str, List[Dict]]:
+    """
+    Fetch history for many symbols with as few requests as the API allows.
+
+    Requests (see plan_history_requests) run concurrently on a small thread
+    pool, each worker with its own HTTP session; every request still goes
+    through the client's global rate limiter.
+
+    Args:
+        client: CoinalyzeClient
+        kind: History type, the X of client.get_X_history ("open_interest",
+            "funding_rate", "predicted_funding_rate", "liquidation", "long_short_ratio")
+        symbols: Coinalyze symbols
+        interval: History interval (key of INTERVAL_SECONDS)
+        from_ts: From timestamp (inclusive), UNIX seconds
+        to_ts: To timestamp (inclusive), UNIX seconds
+        max_points: Maximum points per symbol in one request
+        max_workers: Concurrent requests
+        **kwargs: Extra endpoint arguments (e.g. convert_to_usd=True)
+
+    Returns:
+        {symbol: history points sorted by "t"}; symbols without data map to [],
+        symbols with a failed request (after the client's retries) are omitted
+    """
+    fetch = getattr(client, f"get_{kind}_history")
+    plan = plan_history_requests(symbols, interval, from_ts, to_ts, max_points)
+
+    def run(request):
+        batch, start, end = request
+        return fetch(symbols=batch, interval=interval, from_ts=start, to_ts=end, **kwargs)
+
+    if max_workers <= 1 or len(plan) <= 1:
+        results = [run(request) for request in plan]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(plan))) as pool:
+            results = list(pool.map(run, plan))
+
+    histories: Dict[str, Dict[int, Dict]] = {}
+    failed = set()
+    for (batch, start, end), result in zip(plan, results):
+        if result is None:
+            logger.warning(f"Failed to fetch {kind} history for {batch} ({start}-{end})")
+            failed.update(batch.split(","))
+            continue
+        for symbol in batch.split(","):
+            histories.setdefault(symbol, {})
+        for item in result:
+            points = histories.setdefault(item["symbol"], {})
+            for point in item.get("history") or []:
+                points[point["t"]] = point
+    return {
+        symbol: [points[t] for t in sorted(points)]
+        for symbol, points in histories.items()
+        if symbol not in failed
+    }
+
+
 def main():
     """Example usage with all endpoints"""
 
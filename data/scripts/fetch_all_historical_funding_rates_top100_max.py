@@ -2,11 +2,17 @@
 """
 Fetch ALL Historical Funding Rates - Top 100 Coins - Maximum Available Data
 Fetches daily funding rates from 2019 to present for top 100 coins
+
+By default only the days after each symbol's last stored date are fetched and
+merged into the canonical data/raw/historical_funding_rates_daily.csv
+(incremental_datasets.py). --full re-pulls everything into a new timestamped file.
 """
+import argparse
 import pandas as pd
 import os
 from datetime import datetime, timedelta
-from coinalyze_client import CoinalyzeClient
+from coinalyze_client import CoinalyzeClient, fetch_history_batched, plan_history_requests
+from incremental_datasets import refresh_coinalyze_dataset
 import time
 import logging
 
@@ -74,136 +80,83 @@ def find_perpetual_symbols(client, coin_symbols):
     return symbol_map
 
 
-def fetch_max_history_for_symbol(client, symbol, start_year=2019):
-    """
-    Fetch maximum available history for a single symbol
-    Daily data is retained indefinitely, so we can go back to when perps started
-
-    Args:
-        client: CoinalyzeClient instance
-        symbol: Coinalyze symbol (e.g., 'BTCUSDT_PERP.A')
-        start_year: Year to start fetching from (default 2019 when most perps launched)
-
-    Returns:
-        List of data dictionaries
-    """
-    # Set date range: from start_year to present
-    start_ts = int(datetime(start_year, 1, 1).timestamp())
-    end_ts = int(datetime.now().timestamp())
-
-    logger.info(
-        f"  Fetching {symbol} from {datetime.fromtimestamp(start_ts).date()} to {datetime.fromtimestamp(end_ts).date()}"
-    )
-
-    data_points = []
-
-    try:
-        result = client.get_funding_rate_history(
-            symbols=symbol,
-            interval="daily",  # Daily data has unlimited retention
-            from_ts=start_ts,
-            to_ts=end_ts,
-        )
-
-        if result and len(result) > 0:
-            history = result[0].get("history", [])
-
-            if history:
-                logger.info(f"  ✓ {symbol}: {len(history)} days of data")
-
-                # Find actual date range
-                first_date = datetime.fromtimestamp(history[0]["t"]).date()
-                last_date = datetime.fromtimestamp(history[-1]["t"]).date()
-                logger.info(f"    Data range: {first_date} to {last_date}")
-
-                # Convert to our format
-                for point in history:
-                    data_points.append(
-                        {
-                            "symbol": symbol,
-                            "timestamp": point["t"],
-                            "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
-                            "funding_rate": point["c"],
-                            "funding_rate_pct": point["c"] * 100,
-                            "fr_open": point.get("o"),
-                            "fr_high": point.get("h"),
-                            "fr_low": point.get("l"),
-                        }
-                    )
-            else:
-                logger.warning(f"  ⚠ {symbol}: No data returned")
-        else:
-            logger.warning(f"  ⚠ {symbol}: Failed to fetch data")
-
-    except Exception as e:
-        logger.error(f"  ✗ {symbol}: Error - {e}")
-
-    return data_points
-
-
 def fetch_all_funding_rates_max_history(client, symbols, start_year=2019, max_retries=3):
     """
     Fetch maximum available history for all symbols
-    Uses daily interval which has unlimited data retention
+    Uses daily interval which has unlimited data retention. Symbols are fetched
+    20 per request (fetch_history_batched); symbols whose request failed are
+    retried in a new batch.
 
     Args:
         client: CoinalyzeClient instance
         symbols: List of Coinalyze symbols
         start_year: Year to start from (when perpetual futures launched)
-        max_retries: Maximum retries per symbol
+        max_retries: Maximum attempts per symbol
     """
+    start_ts = int(datetime(start_year, 1, 1).timestamp())
+    end_ts = int(datetime.now().timestamp())
+
     logger.info(f"\n{'='*80}")
     logger.info(f"FETCHING MAXIMUM AVAILABLE HISTORY")
     logger.info(f"{'='*80}")
     logger.info(f"Start date: {start_year}-01-01")
     logger.info(f"End date: {datetime.now().date()}")
     logger.info(f"Total symbols: {len(symbols)}")
+    logger.info(f"Requests: {len(plan_history_requests(symbols, 'daily', start_ts, end_ts))}")
     logger.info(f"{'='*80}\n")
 
+    histories = {}
+    pending = list(symbols)
+    for attempt in range(1, max_retries + 1):
+        histories.update(
+            fetch_history_batched(client, "funding_rate", pending, "daily", start_ts, end_ts)
+        )
+        pending = [s for s in pending if s not in histories]
+        if not pending:
+            break
+        if attempt < max_retries:
+            logger.warning(
+                f"  Retrying {len(pending)} symbol(s) (attempt {attempt+1}/{max_retries})"
+            )
+    for symbol in pending:
+        logger.error(f"  ✗ {symbol}: Failed after {max_retries} attempts")
+
     all_data = []
-    wait_time = 3  # seconds between requests
-
-    for idx, symbol in enumerate(symbols, 1):
-        logger.info(f"\n[{idx}/{len(symbols)}] Processing {symbol}")
-
-        # Retry logic
-        success = False
-        retry_count = 0
-
-        while not success and retry_count < max_retries:
-            try:
-                data = fetch_max_history_for_symbol(client, symbol, start_year)
-
-                if data:
-                    all_data.extend(data)
-                    success = True
-                else:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        wait = 10 * retry_count
-                        logger.warning(
-                            f"  Retrying in {wait}s (attempt {retry_count+1}/{max_retries})..."
-                        )
-                        time.sleep(wait)
-
-            except Exception as e:
-                retry_count += 1
-                if retry_count < max_retries:
-                    wait = 10 * retry_count
-                    logger.warning(f"  Error: {e}, retrying in {wait}s...")
-                    time.sleep(wait)
-                else:
-                    logger.error(f"  Failed after {max_retries} attempts")
-
-        # Rate limiting between symbols
-        if idx < len(symbols):
-            logger.info(f"  Waiting {wait_time}s before next symbol...")
-            time.sleep(wait_time)
+    for symbol in symbols:
+        history = histories.get(symbol)
+        if not history:
+            if symbol in histories:
+                logger.warning(f"  ⚠ {symbol}: No data returned")
+            continue
+        first_date = datetime.fromtimestamp(history[0]["t"]).date()
+        last_date = datetime.fromtimestamp(history[-1]["t"]).date()
+        logger.info(f"  ✓ {symbol}: {len(history)} days of data ({first_date} to {last_date})")
+        for point in history:
+            all_data.append(
+                {
+                    "symbol": symbol,
+                    "timestamp": point["t"],
+                    "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
+                    "funding_rate": point["c"],
+                    "funding_rate_pct": point["c"] * 100,
+                    "fr_open": point.get("o"),
+                    "fr_high": point.get("h"),
+                    "fr_low": point.get("l"),
+                }
+            )
 
     return pd.DataFrame(all_data)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch historical funding rates (top 100)")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-pull full history into a new timestamped CSV instead of refreshing incrementally",
+    )
+    args = parser.parse_args()
+
     print("=" * 80)
     print("FETCH ALL HISTORICAL FUNDING RATES - TOP 100 COINS - MAXIMUM AVAILABLE DATA")
     print("=" * 80)
@@ -241,15 +194,26 @@ def main():
     # Step 3: Fetch ALL available history (from 2019)
     print("\n" + "=" * 80)
     print("Starting to fetch maximum historical data...")
-    print("This may take 5-10 minutes depending on API rate limits")
     print("=" * 80 + "\n")
 
     start_time = time.time()
 
     coinalyze_symbols = list(symbol_map.values())
-    funding_df = fetch_all_funding_rates_max_history(
-        client, coinalyze_symbols, start_year=2019  # Most perpetuals launched 2019-2020
-    )
+    if args.full:
+        funding_df = fetch_all_funding_rates_max_history(
+            client, coinalyze_symbols, start_year=2019  # Most perpetuals launched 2019-2020
+        )
+    else:
+        # Only days after each symbol's last stored date
+        result = refresh_coinalyze_dataset(
+            "funding_rates",
+            client,
+            {v: k for k, v in symbol_map.items()},
+            datetime(2019, 1, 1),
+        )
+        logger.info(f"{result['requests']} request(s), {result['new_rows']} new row(s)")
+        funding_df = pd.read_csv(result["path"])
+        funding_df = funding_df[funding_df["symbol"].isin(coinalyze_symbols)]
 
     elapsed_time = time.time() - start_time
 
@@ -286,11 +250,13 @@ def main():
         ]
     ].sort_values(["rank", "date"])
 
-    # Step 5: Save to CSV
+    # Step 5: Save to CSV (incremental runs already merged into the canonical dataset)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"historical_funding_rates_top100_ALL_HISTORY_{timestamp}.csv"
-
-    funding_df.to_csv(output_file, index=False)
+    if args.full:
+        output_file = f"historical_funding_rates_top100_ALL_HISTORY_{timestamp}.csv"
+        funding_df.to_csv(output_file, index=False)
+    else:
+        output_file = result["path"]
 
     print("\n" + "=" * 80)
     print("RESULTS - COMPLETE HISTORICAL DATA")
@@ -14,7 +14,7 @@ from typing import Dict, List
 
 import pandas as pd
 
-from coinalyze_client import CoinalyzeClient
+from coinalyze_client import CoinalyzeClient, fetch_history_batched, plan_history_requests
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,102 +85,69 @@ def find_perpetual_symbols(client: CoinalyzeClient, coin_symbols: List[str]) ->
     return symbol_map
 
 
-def fetch_max_history_for_symbol(
-    client: CoinalyzeClient,
-    symbol: str,
-    start_year: int = 2019,
-) -> List[Dict]:
-    from datetime import datetime as _dt
-
-    start_ts = int(_dt(start_year, 1, 1).timestamp())
-    end_ts = int(_dt.now().timestamp())
-
-    logger.info(
-        f"  Fetching {symbol} from {_dt.fromtimestamp(start_ts).date()} to {_dt.fromtimestamp(end_ts).date()}"
-    )
-
-    rows: List[Dict] = []
-
-    try:
-        result = client.get_open_interest_history(
-            symbols=symbol,
-            interval="daily",
-            from_ts=start_ts,
-            to_ts=end_ts,
-            convert_to_usd=True,
-        )
-        if result and len(result) > 0:
-            history = result[0].get("history", [])
-            if history:
-                logger.info(f"  ✓ {symbol}: {len(history)} days of data")
-                for point in history:
-                    rows.append(
-                        {
-                            "symbol": symbol,
-                            "timestamp": point["t"],
-                            "date": _dt.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
-                            "oi_open": point.get("o"),
-                            "oi_high": point.get("h"),
-                            "oi_low": point.get("l"),
-                            "oi_close": point.get("c"),
-                        }
-                    )
-            else:
-                logger.warning(f"  ⚠ {symbol}: No data returned")
-        else:
-            logger.warning(f"  ⚠ {symbol}: Failed to fetch data")
-    except Exception as e:
-        logger.error(f"  ✗ {symbol}: Error - {e}")
-
-    return rows
-
-
 def fetch_all_open_interest_max_history(
     client: CoinalyzeClient,
     symbols: List[str],
     start_year: int = 2019,
     max_retries: int = 3,
 ) -> pd.DataFrame:
+    start_ts = int(datetime(start_year, 1, 1).timestamp())
+    end_ts = int(datetime.now().timestamp())
+
     logger.info(f"\n{'='*80}")
     logger.info("FETCHING MAXIMUM AVAILABLE DAILY OI HISTORY (USD)")
     logger.info(f"{'='*80}")
     logger.info(f"Start date: {start_year}-01-01")
     logger.info(f"End date: {datetime.now().date()}")
     logger.info(f"Total symbols: {len(symbols)}")
+    logger.info(f"Requests: {len(plan_history_requests(symbols, 'daily', start_ts, end_ts))}")
     logger.info(f"{'='*80}\n")
 
+    # 20 symbols per request; symbols whose request failed are retried in a new batch
+    histories: Dict[str, List[Dict]] = {}
+    pending = list(symbols)
+    for attempt in range(1, max_retries + 1):
+        histories.update(
+            fetch_history_batched(
+                client,
+                "open_interest",
+                pending,
+                "daily",
+                start_ts,
+                end_ts,
+                convert_to_usd=True,
+            )
+        )
+        pending = [s for s in pending if s not in histories]
+        if not pending:
+            break
+        if attempt < max_retries:
+            logger.warning(
+                f"  Retrying {len(pending)} symbol(s) (attempt {attempt+1}/{max_retries})"
+            )
+    for symbol in pending:
+        logger.error(f"  ✗ {symbol}: Failed after {max_retries} attempts")
+
     all_rows: List[Dict] = []
-    wait_time = 3
-
-    for idx, symbol in enumerate(symbols, 1):
-        logger.info(f"\n[{idx}/{len(symbols)}] Processing {symbol}")
-        success = False
-        retry_count = 0
-        while not success and retry_count < max_retries:
-            try:
-                data = fetch_max_history_for_symbol(client, symbol, start_year)
-                if data:
-                    all_rows.extend(data)
-                    success = True
-                else:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        wait = 10 * retry_count
-                        logger.warning(
-                            f"  Retrying in {wait}s (attempt {retry_count+1}/{max_retries})..."
-                        )
-                        time.sleep(wait)
-            except Exception as e:
-                retry_count += 1
-                if retry_count < max_retries:
-                    wait = 10 * retry_count
-                    logger.warning(f"  Error: {e}, retrying in {wait}s...")
-                    time.sleep(wait)
-                else:
-                    logger.error(f"  Failed after {max_retries} attempts")
-        if idx < len(symbols):
-            logger.info(f"  Waiting {wait_time}s before next symbol...")
-            time.sleep(wait_time)
+    for symbol in symbols:
+        history = histories.get(symbol)
+        if not history:
+            if symbol in histories:
+                logger.warning(f"  ⚠ {symbol}: No data returned")
+            continue
+        logger.info(f"  ✓ {symbol}: {len(history)} days of data")
+        for point in history:
+            all_rows.append(
+                {
+                    "symbol": symbol,
+                    "timestamp": point["t"],
+                    "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
+                    "oi_open": point.get("o"),
+                    "oi_high": point.get("h"),
+                    "oi_low": point.get("l"),
+                    "oi_close": point.get("c"),
+                }
+            )
 
     return pd.DataFrame(all_rows)
 
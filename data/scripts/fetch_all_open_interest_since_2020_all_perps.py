@@ -5,17 +5,26 @@ Fetch Historical Open Interest (OI) since 2020 for all perpetual bases
 - Universe: All futures markets marked is_perpetual across major USD/USDT/USDC quotes
 - Saves detailed CSV to data/raw
 
+By default only the days after each symbol's last stored date are fetched and
+merged into the canonical data/raw/historical_open_interest_daily.csv
+(incremental_datasets.py). --full re-pulls everything into a new timestamped file.
+
 Requires env: COINALYZE_API
 """
+import argparse
 import os
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
 import pandas as pd
 
-from data.scripts.coinalyze_client import CoinalyzeClient
+from data.scripts.coinalyze_client import (
+    MAX_SYMBOLS_PER_REQUEST,
+    CoinalyzeClient,
+    fetch_history_batched,
+)
+from data.scripts.incremental_datasets import refresh_coinalyze_dataset
 
 
 def resolve_output_dir() -> Path:
@@ -62,42 +71,48 @@ def get_all_perp_symbols(client: CoinalyzeClient) -> Dict[str, str]:
 
 
 def fetch_oi_daily_history(
-    client: CoinalyzeClient, symbol: str, start_year: int = 2020
+    client: CoinalyzeClient, base_to_symbol: Dict[str, str], start_year: int = 2020
 ) -> List[Dict]:
-    from datetime import datetime as _dt
-
-    start_ts = int(_dt(start_year, 1, 1).timestamp())
-    end_ts = int(_dt.now().timestamp())
-
-    try:
-        res = client.get_open_interest_history(
-            symbols=symbol,
-            interval="daily",
-            from_ts=start_ts,
-            to_ts=end_ts,
-            convert_to_usd=True,
-        )
-        rows: List[Dict] = []
-        if res and len(res) > 0:
-            hist = res[0].get("history", [])
-            for pt in hist:
-                rows.append(
-                    {
-                        "symbol": symbol,
-                        "timestamp": pt["t"],
-                        "date": _dt.fromtimestamp(pt["t"]).strftime("%Y-%m-%d"),
-                        "oi_open": pt.get("o"),
-                        "oi_high": pt.get("h"),
-                        "oi_low": pt.get("l"),
-                        "oi_close": pt.get("c"),
-                    }
-                )
-        return rows
-    except Exception:
-        return []
+    """Daily OI rows for every base, fetched 20 symbols per request."""
+    start_ts = int(datetime(start_year, 1, 1).timestamp())
+    end_ts = int(datetime.now().timestamp())
+    histories = fetch_history_batched(
+        client,
+        "open_interest",
+        list(base_to_symbol.values()),
+        "daily",
+        start_ts,
+        end_ts,
+        convert_to_usd=True,
+    )
+
+    rows: List[Dict] = []
+    for base, c_sym in sorted(base_to_symbol.items()):
+        for pt in histories.get(c_sym, []):
+            rows.append(
+                {
+                    "coin_symbol": base,
+                    "symbol": c_sym,
+                    "timestamp": pt["t"],
+                    "date": datetime.fromtimestamp(pt["t"]).strftime("%Y-%m-%d"),
+                    "oi_open": pt.get("o"),
+                    "oi_high": pt.get("h"),
+                    "oi_low": pt.get("l"),
+                    "oi_close": pt.get("c"),
+                }
+            )
+    return rows
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Fetch daily OI since 2020 for all perps")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-pull full history into a new timestamped CSV instead of refreshing incrementally",
+    )
+    args = parser.parse_args()
+
     print("=" * 80)
     print("FETCH OI SINCE 2020 - ALL PERPETUAL BASES")
     print("=" * 80)
@@ -113,16 +128,16 @@ def main():
     base_to_symbol = get_all_perp_symbols(client)
     print(f"Bases with perps: {len(base_to_symbol)}")
 
-    all_rows: List[Dict] = []
-    wait_s = 2
-    for i, (base, c_sym) in enumerate(sorted(base_to_symbol.items())):
-        print(f"[{i+1}/{len(base_to_symbol)}] {base}: {c_sym}")
-        rows = fetch_oi_daily_history(client, c_sym, start_year=2020)
-        if rows:
-            for r in rows:
-                r["coin_symbol"] = base
-            all_rows.extend(rows)
-        time.sleep(wait_s)
+    if not args.full:
+        symbols = {c_sym: base for base, c_sym in sorted(base_to_symbol.items())}
+        result = refresh_coinalyze_dataset("open_interest", client, symbols, datetime(2020, 1, 1))
+        print("\nSaved:", result["path"])
+        print("Requests:", result["requests"])
+        print("New rows:", result["new_rows"])
+        return
+
+    print(f"Fetching in batches of {MAX_SYMBOLS_PER_REQUEST} symbols...")
+    all_rows = fetch_oi_daily_history(client, base_to_symbol, start_year=2020)
 
     if not all_rows:
         print("No data fetched.")
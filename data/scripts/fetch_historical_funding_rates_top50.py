@@ -6,8 +6,7 @@ Uses Coinalyze API + CoinMarketCap data
 import pandas as pd
 import os
 from datetime import datetime, timedelta
-from coinalyze_client import CoinalyzeClient
-import time
+from coinalyze_client import CoinalyzeClient, fetch_history_batched
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -104,57 +103,30 @@ def fetch_funding_rate_history(client, symbols, days=90):
     )
     logger.info(f"Time range: {days} days")
 
-    all_data = []
+    histories = fetch_history_batched(client, "funding_rate", symbols, "daily", start_ts, end_ts)
+    failed = [s for s in symbols if s not in histories]
+    if failed:
+        logger.warning(f"  Failed to fetch data for {failed}")
 
-    # Process in batches of 5 to be safe with rate limits
-    batch_size = 5
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i : i + batch_size]
-        batch_str = ",".join(batch)
-
-        logger.info(
-            f"\nProcessing batch {i//batch_size + 1}/{(len(symbols)-1)//batch_size + 1}: {batch}"
-        )
-
-        try:
-            # Fetch funding rate history for this batch
-            result = client.get_funding_rate_history(
-                symbols=batch_str,
-                interval="daily",  # Daily funding rates
-                from_ts=start_ts,
-                to_ts=end_ts,
+    all_data = []
+    for symbol, history in histories.items():
+        logger.info(f"  {symbol}: {len(history)} data points")
+
+        # Convert to DataFrame format
+        for point in history:
+            all_data.append(
+                {
+                    "symbol": symbol,
+                    "timestamp": point["t"],
+                    "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
+                    "funding_rate": point["c"],  # Close value
+                    "funding_rate_pct": point["c"] * 100,
+                    "fr_open": point.get("o"),
+                    "fr_high": point.get("h"),
+                    "fr_low": point.get("l"),
+                }
             )
 
-            if result:
-                for item in result:
-                    symbol = item["symbol"]
-                    history = item.get("history", [])
-
-                    logger.info(f"  {symbol}: {len(history)} data points")
-
-                    # Convert to DataFrame format
-                    for point in history:
-                        all_data.append(
-                            {
-                                "symbol": symbol,
-                                "timestamp": point["t"],
-                                "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
-                                "funding_rate": point["c"],  # Close value
-                                "funding_rate_pct": point["c"] * 100,
-                                "fr_open": point.get("o"),
-                                "fr_high": point.get("h"),
-                                "fr_low": point.get("l"),
-                            }
-                        )
-            else:
-                logger.warning(f"  Failed to fetch data for batch")
-
-        except Exception as e:
-            logger.error(f"  Error fetching batch: {e}")
-
-        # Rate limiting - wait between batches
-        time.sleep(2)
-
     return pd.DataFrame(all_data)
 
 
@@ -9,7 +9,6 @@ Fetch Historical Open Interest (OI) for Top N Coins since 2020
 Requires env var: COINALYZE_API
 """
 import os
-import time
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -17,7 +16,7 @@ from typing import Dict, List
 
 import pandas as pd
 
-from coinalyze_client import CoinalyzeClient
+from coinalyze_client import CoinalyzeClient, fetch_history_batched
 
 
 logging.basicConfig(level=logging.INFO)
@@ -121,45 +120,34 @@ def fetch_oi_history_range(
     )
     logger.info(f"Interval: {interval}")
 
+    histories = fetch_history_batched(
+        client,
+        "open_interest",
+        symbols,
+        interval,
+        start_ts,
+        end_ts,
+        convert_to_usd=convert_to_usd,
+    )
+    failed = [s for s in symbols if s not in histories]
+    if failed:
+        logger.warning(f"  Failed to fetch data for {failed}")
+
     all_rows: List[Dict] = []
-    batch_size = 5  # conservative vs API max 20
-
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i : i + batch_size]
-        batch_str = ",".join(batch)
-        logger.info(
-            f"\nProcessing batch {i // batch_size + 1}/{(len(symbols)-1) // batch_size + 1}: {batch}"
-        )
-        try:
-            result = client.get_open_interest_history(
-                symbols=batch_str,
-                interval=interval,
-                from_ts=start_ts,
-                to_ts=end_ts,
-                convert_to_usd=convert_to_usd,
+    for sym, history in histories.items():
+        logger.info(f"  {sym}: {len(history)} data points")
+        for point in history:
+            all_rows.append(
+                {
+                    "symbol": sym,
+                    "timestamp": point["t"],
+                    "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
+                    "oi_open": point.get("o"),
+                    "oi_high": point.get("h"),
+                    "oi_low": point.get("l"),
+                    "oi_close": point.get("c"),
+                }
             )
-            if result:
-                for item in result:
-                    sym = item.get("symbol")
-                    history = item.get("history", [])
-                    logger.info(f"  {sym}: {len(history)} data points")
-                    for point in history:
-                        all_rows.append(
-                            {
-                                "symbol": sym,
-                                "timestamp": point["t"],
-                                "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
-                                "oi_open": point.get("o"),
-                                "oi_high": point.get("h"),
-                                "oi_low": point.get("l"),
-                                "oi_close": point.get("c"),
-                            }
-                        )
-            else:
-                logger.warning("  Failed to fetch data for batch")
-        except Exception as e:
-            logger.error(f"  Error fetching batch: {e}")
-        time.sleep(2)  # rate-limit between batches
 
     return pd.DataFrame(all_rows)
 
@@ -6,8 +6,7 @@ then download funding rate history for missing symbols.
 import pandas as pd
 import os
 from datetime import datetime, timedelta
-from coinalyze_client import CoinalyzeClient
-import time
+from coinalyze_client import CoinalyzeClient, fetch_history_batched
 import logging
 from typing import Set, Dict, List
 
@@ -257,77 +256,39 @@ def fetch_funding_rate_history_with_retry(
     )
     logger.info(f"Time range: {days} days")
 
-    all_data = []
-
-    # Process in batches of 3 to avoid rate limits
-    batch_size = 3
-    batch_wait_time = 5
-
-    for i in range(0, len(symbols), batch_size):
-        batch = symbols[i : i + batch_size]
-        batch_str = ",".join(batch)
-
-        logger.info(
-            f"\nProcessing batch {i//batch_size + 1}/{(len(symbols)-1)//batch_size + 1}: {batch}"
+    # 20 symbols per request; symbols whose request failed are retried in a new batch
+    histories = {}
+    pending = list(symbols)
+    for attempt in range(1, max_retries + 1):
+        histories.update(
+            fetch_history_batched(client, "funding_rate", pending, "daily", start_ts, end_ts)
         )
+        pending = [s for s in pending if s not in histories]
+        if not pending:
+            break
+        if attempt < max_retries:
+            logger.warning(
+                f"  ⚠ Retrying {len(pending)} symbol(s) (attempt {attempt+1}/{max_retries})..."
+            )
+    if pending:
+        logger.error(f"  ✗ Failed to fetch {pending} after {max_retries} attempts")
 
-        # Retry logic
-        success = False
-        retry_count = 0
-
-        while not success and retry_count < max_retries:
-            try:
-                result = client.get_funding_rate_history(
-                    symbols=batch_str, interval="daily", from_ts=start_ts, to_ts=end_ts
-                )
-
-                if result:
-                    for item in result:
-                        symbol = item["symbol"]
-                        history = item.get("history", [])
-
-                        logger.info(f"  ✓ {symbol}: {len(history)} data points")
-
-                        for point in history:
-                            all_data.append(
-                                {
-                                    "symbol": symbol,
-                                    "timestamp": point["t"],
-                                    "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
-                                    "funding_rate": point["c"],
-                                    "funding_rate_pct": point["c"] * 100,
-                                    "fr_open": point.get("o"),
-                                    "fr_high": point.get("h"),
-                                    "fr_low": point.get("l"),
-                                }
-                            )
-                    success = True
-                else:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        wait_time = 10 * retry_count
-                        logger.warning(
-                            f"  ⚠ Failed to fetch batch, retrying in {wait_time}s (attempt {retry_count+1}/{max_retries})..."
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        logger.error(f"  ✗ Failed to fetch batch after {max_retries} attempts")
-
-            except Exception as e:
-                retry_count += 1
-                if retry_count < max_retries:
-                    wait_time = 10 * retry_count
-                    logger.warning(
-                        f"  ⚠ Error: {e}, retrying in {wait_time}s (attempt {retry_count+1}/{max_retries})..."
-                    )
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"  ✗ Error after {max_retries} attempts: {e}")
-
-        # Wait between batches to respect rate limits
-        if i + batch_size < len(symbols):
-            logger.info(f"  Waiting {batch_wait_time}s before next batch...")
-            time.sleep(batch_wait_time)
+    all_data = []
+    for symbol, history in histories.items():
+        logger.info(f"  ✓ {symbol}: {len(history)} data points")
+        for point in history:
+            all_data.append(
+                {
+                    "symbol": symbol,
+                    "timestamp": point["t"],
+                    "date": datetime.fromtimestamp(point["t"]).strftime("%Y-%m-%d"),
+                    "funding_rate": point["c"],
+                    "funding_rate_pct": point["c"] * 100,
+                    "fr_open": point.get("o"),
+                    "fr_high": point.get("h"),
+                    "fr_low": point.get("l"),
+                }
+            )
 
     return pd.DataFrame(all_data)
 
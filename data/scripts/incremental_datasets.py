@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Incremental Historical Datasets
+Keeps one canonical CSV per historical dataset (Coinalyze funding rates and open
+interest, CoinMarketCap monthly market cap snapshots) and refreshes it by
+fetching only the intervals after each symbol's high-water mark, instead of
+re-pulling full history into a new timestamped file on every refresh.
+
+Layout:
+    data/raw/<dataset file>.csv              canonical dataset (stable path)
+    data/raw/<dataset file>.manifest.json    per-symbol high-water marks
+
+Rows are deduplicated on (symbol, date), keeping the newest fetch, so the
+still-open last day that was stored by the previous refresh is overwritten
+with its final value. Datasets whose symbols are not unique per date add
+columns to the key (market cap snapshots use (Symbol, Name, snapshot_date),
+since CoinMarketCap lists distinct coins under one ticker). The manifest also
+records how far each symbol has been checked, so symbols that return no data
+are not re-requested from the start.
+
+If the canonical file does not exist yet it is seeded from the newest legacy
+timestamped export (e.g. historical_open_interest_all_perps_since2020_*.csv),
+so the first incremental refresh does not re-pull full history either.
+
+Consumers should resolve paths through latest_dataset_path(), which returns the
+canonical file, or the newest legacy export until the first refresh.
+
+Usage:
+    python data/scripts/incremental_datasets.py                  # status of all datasets
+    python data/scripts/incremental_datasets.py refresh open_interest
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from glob import glob
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+# Add workspace root to path for imports
+WORKSPACE_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(WORKSPACE_ROOT) not in sys.path:
+    sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from common.storage import write_atomic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DATA_RAW_DIR = WORKSPACE_ROOT / "data" / "raw"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+class DatasetSpec(NamedTuple):
+    """Where a dataset lives and how its rows are keyed."""
+
+    file: str
+    legacy_pattern: str
+    symbol_column: str
+    date_column: str
+    date_format: str
+    columns: Tuple[str, ...]
+    key_columns: Tuple[str, ...] = ()
+
+
+DATASETS: Dict[str, DatasetSpec] = {
+    "funding_rates": DatasetSpec(
+        file="historical_funding_rates_daily.csv",
+        legacy_pattern="historical_funding_rates_top100_ALL_HISTORY_2*.csv",
+        symbol_column="symbol",
+        date_column="date",
+        date_format="%Y-%m-%d",
+        columns=(
+            "rank",
+            "coin_name",
+            "coin_symbol",
+            "symbol",
+            "date",
+            "timestamp",
+            "funding_rate",
+            "funding_rate_pct",
+            "fr_open",
+            "fr_high",
+            "fr_low",
+        ),
+    ),
+    "open_interest": DatasetSpec(
+        file="historical_open_interest_daily.csv",
+        legacy_pattern="historical_open_interest_all_perps_since2020_2*.csv",
+        symbol_column="symbol",
+        date_column="date",
+        date_format="%Y-%m-%d",
+        columns=(
+            "coin_symbol",
+            "symbol",
+            "date",
+            "timestamp",
+            "oi_open",
+            "oi_high",
+            "oi_low",
+            "oi_close",
+        ),
+    ),
+    "market_cap": DatasetSpec(
+        file="coinmarketcap_monthly_snapshots.csv",
+        legacy_pattern="coinmarketcap_monthly_all_snapshots.csv",
+        symbol_column="Symbol",
+        date_column="snapshot_date",
+        date_format="%Y%m%d",
+        columns=(),
+        key_columns=("Name",),
+    ),
+}
+
+
+def latest_dataset_path(name: str, data_dir: Optional[str] = None) -> str:
+    """
+    Stable handle to a dataset: the canonical file, or the newest legacy export.
+
+    Args:
+        name: Dataset name (key of DATASETS)
+        data_dir: Directory holding the raw datasets (default: data/raw)
+
+    Returns:
+        str: Path to read; the canonical path if neither exists yet
+    """
+    spec = DATASETS[name]
+    directory = Path(data_dir) if data_dir else DATA_RAW_DIR
+    canonical = directory / spec.file
+    if canonical.exists():
+        return str(canonical)
+    legacy = sorted(glob(str(directory / spec.legacy_pattern)), reverse=True)
+    return legacy[0] if legacy else str(canonical)
+
+
+class IncrementalDataset:
+    """Canonical, deduplicated dataset with per-symbol high-water marks"""
+
+    def __init__(self, name: str, data_dir: Optional[str] = None):
+        """
+        Initialize dataset handle
+
+        Args:
+            name: Dataset name (key of DATASETS)
+            data_dir: Directory holding the raw datasets (default: data/raw)
+        """
+        self.name = name
+        self.spec = DATASETS[name]
+        self.data_dir = Path(data_dir) if data_dir else DATA_RAW_DIR
+        self.path = self.data_dir / self.spec.file
+        self.manifest_path = self.data_dir / (Path(self.spec.file).stem + MANIFEST_SUFFIX)
+        self._marks: Optional[Dict[str, Dict[str, str]]] = None
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Key columns as strings (date in the dataset's own format) so keys compare equal"""
+        spec = self.spec
+        df = df.copy()
+        df[spec.symbol_column] = df[spec.symbol_column].astype(str)
+        dates = df[spec.date_column].astype(str)
+        if spec.date_format == "%Y%m%d":
+            dates = dates.str.replace("-", "", regex=False).str[:8]
+        df[spec.date_column] = pd.to_datetime(dates, format=spec.date_format).dt.strftime(
+            spec.date_format
+        )
+        return df
+
+    def load(self) -> pd.DataFrame:
+        """Read the canonical dataset (empty frame if it does not exist)"""
+        if not self.path.exists():
+            return pd.DataFrame(columns=list(self.spec.columns))
+        return pd.read_csv(self.path)
+
+    def bootstrap(self) -> bool:
+        """Seed the canonical file from the newest legacy export; True if seeded"""
+        if self.path.exists():
+            return False
+        legacy = latest_dataset_path(self.name, str(self.data_dir))
+        if not os.path.exists(legacy):
+            return False
+        logger.info(f"Seeding {self.path.name} from {os.path.basename(legacy)}")
+        self.append(pd.read_csv(legacy))
+        return True
+
+    def _read_manifest(self) -> Optional[Dict]:
+        if not self.manifest_path.exists():
+            return None
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        # The dataset was rewritten outside this module: marks are rebuilt from the file
+        if not self.path.exists() or manifest.get("file_mtime") != self.path.stat().st_mtime:
+            return None
+        return manifest
+
+    def _write_manifest(self, symbols: Dict[str, Dict[str, str]], rows: int):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "dataset": self.name,
+            "file": self.spec.file,
+            "file_mtime": self.path.stat().st_mtime,
+            "rows": rows,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "symbols": symbols,
+        }
+        write_atomic(self.manifest_path, lambda p: p.write_text(json.dumps(manifest, indent=2)))
+
+    def _marks_from_frame(self, df: pd.DataFrame) -> Dict[str, Dict[str, str]]:
+        if df.empty:
+            return {}
+        last = df.groupby(self.spec.symbol_column)[self.spec.date_column].max()
+        return {symbol: {"last_date": date} for symbol, date in last.items()}
+
+    def high_water_marks(self) -> Dict[str, Dict[str, str]]:
+        """
+        Per-symbol marks: last_date stored and checked_through (last date requested)
+
+        Returns:
+            dict: {symbol: {"last_date": "...", "checked_through": "..."}}, dates in
+            the dataset's date format
+        """
+        if self._marks is None:
+            manifest = self._read_manifest()
+            if manifest is not None:
+                self._marks = manifest["symbols"]
+            else:
+                df = self.load()
+                self._marks = self._marks_from_frame(self._normalize(df)) if not df.empty else {}
+        return self._marks
+
+    def tracked_symbols(self) -> Dict[str, str]:
+        """{symbol: coin_symbol} of the symbols stored in the dataset"""
+        df = self.load()
+        if df.empty or "coin_symbol" not in df.columns:
+            return {symbol: symbol for symbol in self.high_water_marks()}
+        last = df.drop_duplicates(self.spec.symbol_column, keep="last")
+        return dict(zip(last[self.spec.symbol_column].astype(str), last["coin_symbol"]))
+
+    def last_date(self, symbol: Optional[str] = None) -> Optional[pd.Timestamp]:
+        """Latest stored date for a symbol, or across the whole dataset"""
+        marks = self.high_water_marks()
+        entries = [marks.get(symbol, {})] if symbol is not None else marks.values()
+        dates = [m["last_date"] for m in entries if m.get("last_date")]
+        if not dates:
+            return None
+        return pd.to_datetime(max(dates), format=self.spec.date_format)
+
+    def fetch_start(self, symbol: str, default_start: datetime) -> pd.Timestamp:
+        """
+        First date to request for a symbol.
+
+        The last stored date is requested again (its daily value may have been
+        stored before the day closed); symbols with no rows resume from the last
+        date checked.
+        """
+        mark = self.high_water_marks().get(symbol, {})
+        resume = mark.get("last_date") or mark.get("checked_through")
+        if resume:
+            return pd.to_datetime(resume, format=self.spec.date_format)
+        return pd.Timestamp(default_start)
+
+    def append(self, rows: pd.DataFrame, checked: Optional[Dict[str, datetime]] = None) -> int:
+        """
+        Merge new rows into the canonical dataset.
+
+        Rows replace stored rows with the same (symbol, date) plus the
+        dataset's key_columns. Columns the new rows lack (e.g. rank,
+        coin_name) are carried forward from the symbol's previous rows.
+
+        Args:
+            rows: New rows (may overlap the stored history)
+            checked: {symbol: date requested through}, recorded even when a
+                symbol returned no rows
+
+        Returns:
+            int: Number of (symbol, date) keys that were not stored before
+        """
+        spec = self.spec
+        key = [spec.symbol_column, *spec.key_columns, spec.date_column]
+        marks = {symbol: dict(mark) for symbol, mark in self.high_water_marks().items()}
+        for symbol, through in (checked or {}).items():
+            marks.setdefault(symbol, {})["checked_through"] = pd.Timestamp(through).strftime(
+                spec.date_format
+            )
+
+        if rows.empty:
+            # Nothing new: only the checked-through marks change, the data file is kept
+            if self.path.exists():
+                manifest = self._read_manifest()
+                stored = manifest["rows"] if manifest is not None else len(self.load())
+                self._write_manifest(marks, stored)
+            self._marks = marks
+            return 0
+
+        existing = self.load()
+        existing = self._normalize(existing) if not existing.empty else existing
+        rows = self._normalize(rows).drop_duplicates(subset=key, keep="last")
+        if existing.empty:
+            new_keys = len(rows)
+        else:
+            known = pd.MultiIndex.from_frame(existing[key])
+            new_keys = int((~pd.MultiIndex.from_frame(rows[key]).isin(known)).sum())
+
+        carried = [c for c in existing.columns if c not in rows.columns]
+        frames = [frame for frame in (existing, rows) if not frame.empty]
+        merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else rows.copy()
+        merged = merged.drop_duplicates(subset=key, keep="last")
+        merged = merged.sort_values(key, kind="stable").reset_index(drop=True)
+        if carried:
+            merged[carried] = merged.groupby(spec.symbol_column)[carried].ffill()
+        order = [c for c in spec.columns if c in merged.columns]
+        merged = merged[order + [c for c in merged.columns if c not in order]]
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, lambda p: merged.to_csv(p, index=False))
+        for symbol, mark in self._marks_from_frame(merged).items():
+            # Dates stored now take over; checked_through recorded above is kept
+            marks.setdefault(symbol, {}).update(mark)
+        self._write_manifest(marks, len(merged))
+        self._marks = marks
+        return new_keys
+
+    def get_info(self) -> Dict:
+        """Summary of the dataset for status reports"""
+        marks = self.high_water_marks()
+        last = self.last_date()
+        return {
+            "name": self.name,
+            "path": latest_dataset_path(self.name, str(self.data_dir)),
+            "canonical": self.path.exists(),
+            "symbols": len(marks),
+            "last_date": last.date() if last is not None else None,
+        }
+
+
+def _utc_date(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _funding_row(symbol: str, point: Dict) -> Dict:
+    return {
+        "symbol": symbol,
+        "timestamp": point["t"],
+        "date": _utc_date(point["t"]),
+        "funding_rate": point["c"],
+        "funding_rate_pct": point["c"] * 100,
+        "fr_open": point.get("o"),
+        "fr_high": point.get("h"),
+        "fr_low": point.get("l"),
+    }
+
+
+def _open_interest_row(symbol: str, point: Dict) -> Dict:
+    return {
+        "symbol": symbol,
+        "timestamp": point["t"],
+        "date": _utc_date(point["t"]),
+        "oi_open": point.get("o"),
+        "oi_high": point.get("h"),
+        "oi_low": point.get("l"),
+        "oi_close": point.get("c"),
+    }
+
+
+# Dataset -> (history kind for fetch_history_batched, endpoint arguments, row builder)
+COINALYZE_SOURCES: Dict[str, Tuple[str, Dict, Callable[[str, Dict], Dict]]] = {
+    "funding_rates": ("funding_rate", {}, _funding_row),
+    "open_interest": ("open_interest", {"convert_to_usd": True}, _open_interest_row),
+}
+
+
+def refresh_coinalyze_dataset(
+    name: str,
+    client,
+    symbols: Dict[str, str],
+    start: datetime,
+    now: Optional[datetime] = None,
+    data_dir: Optional[str] = None,
+    force: bool = False,
+) -> Dict:
+    """
+    Fetch only the days after each symbol's high-water mark and merge them in.
+
+    Symbols resuming from the same date are fetched together in batched
+    requests (coinalyze_client.fetch_history_batched), so a daily refresh of
+    the whole universe takes one request per 20 symbols. Symbols already
+    requested today are skipped unless force is set, so repeated refreshes on
+    the same day make no requests.
+
+    Args:
+        name: "funding_rates" or "open_interest"
+        client: CoinalyzeClient
+        symbols: {coinalyze_symbol: coin_symbol}
+        start: First date requested for symbols the dataset has never seen
+        now: Current time (default: now, UTC)
+        data_dir: Directory holding the raw datasets (default: data/raw)
+        force: Request symbols already checked today again
+
+    Returns:
+        dict: path, requests, new_rows, symbols_updated
+    """
+    from data.scripts.coinalyze_client import fetch_history_batched, plan_history_requests
+
+    kind, endpoint_args, build_row = COINALYZE_SOURCES[name]
+    dataset = IncrementalDataset(name, data_dir)
+    dataset.bootstrap()
+
+    now = now or datetime.now(timezone.utc)
+    today = pd.Timestamp(now.date())
+    end_ts = int(now.timestamp())
+    checked_today = today.strftime(dataset.spec.date_format)
+    marks = dataset.high_water_marks()
+
+    groups: Dict[pd.Timestamp, List[str]] = {}
+    for symbol in symbols:
+        if not force and marks.get(symbol, {}).get("checked_through", "") >= checked_today:
+            continue
+        groups.setdefault(dataset.fetch_start(symbol, start), []).append(symbol)
+
+    frames = []
+    checked = {}
+    requests = 0
+    for start_date, group in sorted(groups.items()):
+        from_ts = int(start_date.tz_localize("UTC").timestamp())
+        requests += len(plan_history_requests(group, "daily", from_ts, end_ts))
+        histories = fetch_history_batched(
+            client, kind, group, "daily", from_ts, end_ts, **endpoint_args
+        )
+        logger.info(f"  {len(histories)}/{len(group)} symbol(s) fetched from {start_date.date()}")
+        for symbol, history in histories.items():
+            if symbol not in symbols:
+                continue
+            checked[symbol] = today
+            if history:
+                rows = [build_row(symbol, point) for point in history]
+                frames.append(pd.DataFrame(rows).assign(coin_symbol=symbols[symbol]))
+
+    new_rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    added = dataset.append(new_rows, checked=checked)
+    return {
+        "path": str(dataset.path),
+        "requests": requests,
+        "new_rows": added,
+        "symbols_updated": len(frames),
+    }
+
+
+def _month_starts(
+    after: Optional[pd.Timestamp], until: pd.Timestamp, first: pd.Timestamp
+) -> List[str]:
+    start = (after + pd.offsets.MonthBegin(1)) if after is not None else first
+    return [d.strftime("%Y%m%d") for d in pd.date_range(start, until, freq="MS")]
+
+
+def refresh_market_cap_snapshots(
+    fetch_snapshot: Optional[Callable[[str], Optional[pd.DataFrame]]] = None,
+    now: Optional[datetime] = None,
+    first_month: str = "2020-01-01",
+    data_dir: Optional[str] = None,
+) -> Dict:
+    """
+    Fetch the monthly CoinMarketCap snapshots newer than the last stored one.
+
+    Args:
+        fetch_snapshot: Callable(YYYYMMDD) -> DataFrame or None (default:
+            fetch_monthly_coinmarketcap_snapshots.fetch_historical_snapshot)
+        now: Current time (default: now, UTC)
+        first_month: First snapshot for an empty dataset
+        data_dir: Directory holding the raw datasets (default: data/raw)
+
+    Returns:
+        dict: path, requests, new_rows, snapshots
+    """
+    if fetch_snapshot is None:
+        from data.scripts.fetch_monthly_coinmarketcap_snapshots import fetch_historical_snapshot
+
+        fetch_snapshot = fetch_historical_snapshot
+
+    dataset = IncrementalDataset("market_cap", data_dir)
+    dataset.bootstrap()
+    now = now or datetime.now(timezone.utc)
+    dates = _month_starts(dataset.last_date(), pd.Timestamp(now.date()), pd.Timestamp(first_month))
+
+    frames = []
+    for date_str in dates:
+        df = fetch_snapshot(date_str)
+        if df is not None and not df.empty:
+            frames.append(df.assign(snapshot_date=date_str))
+
+    new_rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    added = dataset.append(new_rows)
+    return {
+        "path": str(dataset.path),
+        "requests": len(dates),
+        "new_rows": added,
+        "snapshots": len(frames),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental historical datasets")
+    parser.add_argument(
+        "command", nargs="?", default="info", choices=["info", "refresh"], help="Command"
+    )
+    parser.add_argument(
+        "datasets", nargs="*", default=list(DATASETS), help="Datasets (default: all)"
+    )
+    parser.add_argument(
+        "--start", type=str, default="2020-01-01", help="First date for symbols never fetched"
+    )
+    parser.add_argument(
+        "--all-perps",
+        action="store_true",
+        help="Also fetch Coinalyze perpetuals not in the dataset yet (default: tracked symbols)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Request symbols already checked today again"
+    )
+    args = parser.parse_args()
+
+    if args.command == "info":
+        for name in args.datasets:
+            info = IncrementalDataset(name).get_info()
+            print(f"{name}:")
+            for k, v in info.items():
+                if k != "name":
+                    print(f"  {k}: {v}")
+        return
+
+    client = None
+    for name in args.datasets:
+        print(f"\nRefreshing {name}...")
+        if name == "market_cap":
+            result = refresh_market_cap_snapshots(first_month=args.start)
+        else:
+            if client is None:
+                from data.scripts.coinalyze_client import CoinalyzeClient
+
+                client = CoinalyzeClient()
+            symbols = IncrementalDataset(name).tracked_symbols()
+            if args.all_perps or not symbols:
+                from data.scripts.refresh_oi_data import get_all_perp_symbols
+
+                universe = get_all_perp_symbols(client)
+                symbols.update({symbol: base for base, symbol in sorted(universe.items())})
+            result = refresh_coinalyze_dataset(
+                name, client, symbols, pd.Timestamp(args.start), force=args.force
+            )
+        print(
+            f"  ✓ {result['new_rows']} new row(s) from {result['requests']} request(s) "
+            f"→ {result['path']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Incremental OHLCV Cache
+Persists exchange candles per (exchange, timeframe, symbol) so daily runs only
+request the bars that are not on disk yet.
+
+Layout:
+    data/.cache/ohlcv/<exchange>/<timeframe>/<symbol>.parquet
+    data/.cache/ohlcv/<exchange>/<timeframe>/_manifest.json
+
+Only complete bars are stored (a bar is complete once its period has fully
+elapsed in UTC), so cached rows never change and the files are append-only.
+Columns are typed: date (datetime64, naive UTC) and float64 OHLCV.
+
+The manifest records, per symbol, the earliest bar ever requested. Bars
+before the first cached bar but after that request are known not to exist
+(e.g. the symbol was listed later), so they are not re-requested as "missing".
+It also records known-empty ranges: bars inside a requested range that the
+exchange did not return although it has later bars (a trading halt or an
+outage), so permanent gaps are not re-requested on every run.
+
+If pyarrow is not installed the files are written as CSV instead.
+
+Usage:
+    python data/scripts/ohlcv_cache.py          # freshness report
+"""
+import sys
+import json
+import threading
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+import logging
+
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.storage import PYARROW_AVAILABLE, write_atomic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "_manifest.json"
+CACHE_VERSION = 1
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+TIMEFRAME_FREQ = {"1m": "1min", "5m": "5min", "15m": "15min", "1h": "1h", "4h": "4h", "1d": "1D"}
+
+
+def _symbol_file_stem(symbol: str) -> str:
+    """File-system safe name for a market symbol (BTC/USDC:USDC -> BTC-USDC_USDC)"""
+    return symbol.replace("/", "-").replace(":", "_")
+
+
+def _contiguous_runs(bars: pd.DatetimeIndex, freq: pd.Timedelta) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Split sorted bar open times into (first, last) runs of consecutive bars"""
+    if len(bars) == 0:
+        return []
+    breaks = [i for i in range(1, len(bars)) if bars[i] - bars[i - 1] != freq]
+    starts = [0] + breaks
+    ends = [i - 1 for i in breaks] + [len(bars) - 1]
+    return [(bars[s], bars[e]) for s, e in zip(starts, ends)]
+
+
+class OHLCVCache:
+    """Append-only per-symbol candle store for one exchange and timeframe"""
+
+    def __init__(self, cache_dir: Optional[str] = None, exchange: str = "hyperliquid", timeframe: str = "1d"):
+        """
+        Initialize OHLCV cache
+
+        Args:
+            cache_dir: Root directory of the cache. Defaults to workspace/data/.cache/ohlcv
+            exchange: Exchange id the candles come from
+            timeframe: Candle timeframe (ccxt notation, e.g. '1d')
+        """
+        if timeframe not in TIMEFRAME_FREQ:
+            raise ValueError(f"Unsupported timeframe '{timeframe}'. Use one of {list(TIMEFRAME_FREQ)}")
+
+        if cache_dir is None:
+            workspace_root = Path(__file__).parent.parent.parent
+            cache_dir = workspace_root / "data" / ".cache" / "ohlcv"
+
+        self.exchange = exchange
+        self.timeframe = timeframe
+        self.freq = pd.Timedelta(TIMEFRAME_FREQ[timeframe])
+        self.cache_dir = Path(cache_dir) / exchange / timeframe
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _get_cache_path(self, symbol: str) -> Path:
+        """Get cache file path for a symbol"""
+        suffix = "parquet" if PYARROW_AVAILABLE else "csv"
+        return self.cache_dir / f"{_symbol_file_stem(symbol)}.{suffix}"
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        manifest_path = self.cache_dir / MANIFEST_FILE
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r") as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == CACHE_VERSION:
+                    return manifest
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Unreadable OHLCV manifest {manifest_path}: {e}")
+        return {"version": CACHE_VERSION, "symbols": {}}
+
+    def last_complete_bar(self, now: Optional[datetime] = None) -> pd.Timestamp:
+        """
+        Open time of the most recent bar whose period has fully elapsed.
+
+        Args:
+            now: Current time (default: now, UTC)
+
+        Returns:
+            pd.Timestamp: Naive UTC open time
+        """
+        now = pd.Timestamp(now or datetime.now(timezone.utc))
+        if now.tzinfo is not None:
+            now = now.tz_convert(None)
+        return now.floor(self.freq) - self.freq
+
+    def _known_empty(self, entry: Dict[str, Any]) -> pd.DatetimeIndex:
+        """Bars recorded in a manifest entry as not existing on the exchange"""
+        ranges = [pd.date_range(start, end, freq=self.freq) for start, end in entry.get("empty_ranges", [])]
+        if not ranges:
+            return pd.DatetimeIndex([])
+        return ranges[0].append(ranges[1:]).unique().sort_values()
+
+    def symbols(self) -> List[str]:
+        """Symbols with cached candles"""
+        return sorted(self._read_manifest()["symbols"])
+
+    def load(self, symbol: str, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Load cached candles for a symbol.
+
+        Args:
+            symbol: Market symbol (e.g. 'BTC/USDC:USDC')
+            start_date: Inclusive lower bound on 'date'
+            end_date: Inclusive upper bound on 'date'
+
+        Returns:
+            pd.DataFrame: date, symbol, open, high, low, close, volume sorted by
+            date (empty if nothing is cached)
+        """
+        path = self._get_cache_path(symbol)
+        df = None
+        if path.exists():
+            try:
+                if path.suffix == ".parquet":
+                    df = pd.read_parquet(path)
+                else:
+                    df = pd.read_csv(path, parse_dates=["date"])
+            except Exception as e:
+                logger.error(f"Error reading OHLCV cache {path.name}: {e}")
+
+        if df is None:
+            df = pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]")})
+            for col in PRICE_COLUMNS:
+                df[col] = pd.Series(dtype="float64")
+
+        if start_date is not None:
+            df = df[df["date"] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df["date"] <= pd.Timestamp(end_date)]
+
+        df = df.reset_index(drop=True)
+        df.insert(1, "symbol", symbol)
+        return df
+
+    def append(
+        self,
+        symbol: str,
+        candles: pd.DataFrame,
+        requested_from=None,
+        requested_to=None,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """
+        Add fetched candles for a symbol.
+
+        Incomplete bars (the current period) are discarded. Bars already cached
+        are kept as they are, so the stored history is append-only.
+
+        Args:
+            symbol: Market symbol
+            candles: DataFrame with date and OHLCV columns
+            requested_from: Open time of the first bar that was requested
+                (recorded so bars before a late listing are not re-requested)
+            requested_to: Open time of the last bar that was requested. Bars in
+                the requested range that are still not cached but precede a
+                cached bar are recorded as known-empty
+            now: Current time (default: now, UTC)
+
+        Returns:
+            int: Number of new bars written
+        """
+        last_complete = self.last_complete_bar(now)
+        new = candles[["date"] + PRICE_COLUMNS].copy()
+        new["date"] = pd.to_datetime(new["date"]).astype("datetime64[ns]")
+        new[PRICE_COLUMNS] = new[PRICE_COLUMNS].astype("float64")
+        new = new[new["date"] <= last_complete]
+
+        with self._lock:
+            existing = self.load(symbol).drop(columns="symbol")
+            new = new[~new["date"].isin(existing["date"])]
+
+            if not new.empty:
+                frames = [f for f in (existing, new) if not f.empty]
+                merged = pd.concat(frames, ignore_index=True)
+                merged = merged.drop_duplicates("date").sort_values("date").reset_index(drop=True)
+                path = self._get_cache_path(symbol)
+                if path.suffix == ".parquet":
+                    write_atomic(path, lambda p: merged.to_parquet(p, index=False))
+                else:
+                    write_atomic(path, lambda p: merged.to_csv(p, index=False))
+
+            if not new.empty or requested_from is not None:
+                manifest = self._read_manifest()
+                entry = manifest["symbols"].setdefault(symbol, {"file": self._get_cache_path(symbol).name})
+                if requested_from is not None:
+                    requested_from = pd.Timestamp(requested_from)
+                    previous = entry.get("requested_from")
+                    if previous is None or requested_from < pd.Timestamp(previous):
+                        entry["requested_from"] = requested_from.isoformat()
+
+                    # Bars after the last cached one may just not be published
+                    # yet, so only bars followed by a cached bar count as empty
+                    cached = pd.DatetimeIndex(existing["date"]).append(pd.DatetimeIndex(new["date"]))
+                    if len(cached):
+                        first = max(requested_from, cached.min())
+                        last = cached.max() - self.freq
+                        if requested_to is not None:
+                            last = min(last, pd.Timestamp(requested_to))
+                        empty = pd.date_range(first, last, freq=self.freq).difference(cached)
+                        if len(empty):
+                            empty = empty.union(self._known_empty(entry))
+                            entry["empty_ranges"] = [
+                                [s.isoformat(), e.isoformat()] for s, e in _contiguous_runs(empty, self.freq)
+                            ]
+                entry["updated"] = datetime.now().isoformat()
+
+                manifest_path = self.cache_dir / MANIFEST_FILE
+                write_atomic(manifest_path, lambda p: p.write_text(json.dumps(manifest, indent=2)))
+
+        return len(new)
+
+    def missing_bars(self, symbol: str, start_date, end_date=None, now: Optional[datetime] = None) -> pd.DatetimeIndex:
+        """
+        Bars in [start_date, end_date] that are not cached and may exist.
+
+        Includes gaps inside the cached history as well as bars after the last
+        cached one. Bars before the first cached bar are skipped if an earlier
+        request already showed they do not exist, and so are gaps an earlier
+        request showed to be empty.
+
+        Args:
+            symbol: Market symbol
+            start_date: First bar wanted
+            end_date: Last bar wanted (default: last complete bar)
+            now: Current time (default: now, UTC)
+
+        Returns:
+            pd.DatetimeIndex: Open times of the missing bars
+        """
+        start = pd.Timestamp(start_date).floor(self.freq)
+        end = pd.Timestamp(end_date) if end_date is not None else self.last_complete_bar(now)
+        end = min(end, self.last_complete_bar(now))
+
+        dates = self.load(symbol)["date"]
+        entry = self._read_manifest()["symbols"].get(symbol, {})
+        if not dates.empty:
+            requested_from = entry.get("requested_from")
+            if requested_from is not None and pd.Timestamp(requested_from) <= dates.min():
+                start = max(start, dates.min())
+
+        if start > end:
+            return pd.DatetimeIndex([])
+        expected = pd.date_range(start, end, freq=self.freq)
+        return expected.difference(pd.DatetimeIndex(dates)).difference(self._known_empty(entry))
+
+    def missing_ranges(
+        self, symbol: str, start_date, end_date=None, now: Optional[datetime] = None
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Missing bars (see missing_bars) grouped into contiguous ranges.
+
+        Returns:
+            list: (first, last) open times of each range, oldest first
+        """
+        return _contiguous_runs(self.missing_bars(symbol, start_date, end_date, now), self.freq)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Delete cached candles for one symbol, or for all symbols"""
+        with self._lock:
+            manifest = self._read_manifest()
+            targets = [symbol] if symbol else list(manifest["symbols"])
+            for sym in targets:
+                path = self._get_cache_path(sym)
+                if path.exists():
+                    path.unlink()
+                manifest["symbols"].pop(sym, None)
+            manifest_path = self.cache_dir / MANIFEST_FILE
+            write_atomic(manifest_path, lambda p: p.write_text(json.dumps(manifest, indent=2)))
+        logger.info(f"Cleared OHLCV cache for {len(targets)} symbols")
+
+    def get_cache_info(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Freshness report for every cached symbol.
+
+        A symbol is valid when its last cached bar is the last complete bar and
+        its history has no gaps other than known-empty ranges.
+
+        Returns:
+            dict: cache_dir, exchange, timeframe, last_complete_bar and one
+            entry per symbol under 'files'
+        """
+        last_complete = self.last_complete_bar(now)
+        info = {
+            "cache_dir": str(self.cache_dir),
+            "exchange": self.exchange,
+            "timeframe": self.timeframe,
+            "last_complete_bar": last_complete.isoformat(),
+            "files": [],
+        }
+
+        manifest = self._read_manifest()
+        for symbol in self.symbols():
+            path = self._get_cache_path(symbol)
+            dates = self.load(symbol)["date"]
+            if dates.empty:
+                continue
+
+            first, last = dates.min(), dates.max()
+            expected = pd.date_range(first, last, freq=self.freq).difference(pd.DatetimeIndex(dates))
+            gaps = len(expected.difference(self._known_empty(manifest["symbols"].get(symbol, {}))))
+            bars_behind = max(0, int((last_complete - last) / self.freq))
+
+            if bars_behind > 0:
+                reason = "stale"
+            elif gaps > 0:
+                reason = "gaps"
+            else:
+                reason = "valid"
+
+            info["files"].append(
+                {
+                    "name": path.name,
+                    "symbol": symbol,
+                    "size": path.stat().st_size if path.exists() else 0,
+                    "rows": len(dates),
+                    "first_bar": first.isoformat(),
+                    "last_bar": last.isoformat(),
+                    "bars_behind": bars_behind,
+                    "gaps": gaps,
+                    "is_valid": reason == "valid",
+                    "validation_reason": reason,
+                }
+            )
+
+        return info
+
+
+if __name__ == "__main__":
+    cache = OHLCVCache()
+    info = cache.get_cache_info()
+
+    print("=" * 80)
+    print("OHLCV CACHE FRESHNESS")
+    print("=" * 80)
+    print(f"\nCache directory: {info['cache_dir']}")
+    print(f"Last complete bar: {info['last_complete_bar']}")
+    print(f"\nCached symbols: {len(info['files'])}")
+
+    for f in info["files"]:
+        status = "✓ VALID" if f["is_valid"] else f"✗ {f['validation_reason'].upper()}"
+        print(
+            f"  {status:10s} {f['symbol']:20s} rows={f['rows']:5d} last={f['last_bar'][:10]} "
+            f"behind={f['bars_behind']} gaps={f['gaps']}"
+        )
+
+    print("\n" + "=" * 80)
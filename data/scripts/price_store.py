@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Columnar Price Store
+Caches the raw CSV datasets (daily OHLCV, market cap snapshots, funding rates,
+open interest) as typed, partitioned Parquet so backtests and signal scripts
+stop re-parsing the same multi-hundred-MB CSVs on every run.
+
+Layout:
+    data/.cache/price_store/<dataset>/year=<YYYY>/part-0.parquet
+    data/.cache/price_store/<dataset>/_manifest.json
+
+Rows inside each year are sorted by (symbol, date) and written in small row
+groups, so symbol filters are served from row-group statistics without paying
+for thousands of per-symbol files on full-universe loads. Pass
+partition_cols=("symbol", "year") to build() for one directory per symbol.
+
+Reads support column pushdown (only requested columns are decoded) and
+date-range / symbol pushdown (whole partitions and row groups are skipped). If pyarrow is
+not installed, or no fresh store exists for a CSV, the loader falls back to
+reading the CSV directly with the same filters applied.
+
+Usage:
+    python data/scripts/price_store.py build data/raw/combined_coinbase_coinmarketcap_daily.csv
+    python data/scripts/price_store.py info
+"""
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Sequence, Union
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    ds = None
+    PYARROW_AVAILABLE = False
+
+MANIFEST_FILE = "_manifest.json"
+STORE_VERSION = 1
+ROW_GROUP_SIZE = 16384
+
+DateLike = Union[str, datetime, pd.Timestamp, None]
+
+
+def normalize_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ensure a typed 'date' column exists.
+
+    Handles the three date encodings used by the raw datasets:
+    - 'date' as ISO strings (OHLCV, funding, OI)
+    - 'snapshot_date' as YYYYMMDD integers (CoinMarketCap snapshots)
+    - 'timestamp' as parsed by pd.to_datetime (Coinalyze exports without a date column)
+
+    Args:
+        df: Raw DataFrame as read from CSV
+
+    Returns:
+        pd.DataFrame: Same frame with a datetime64 'date' column
+    """
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"])
+    elif "snapshot_date" in df.columns:
+        df["date"] = pd.to_datetime(df["snapshot_date"].astype(str), format="%Y%m%d")
+    elif "timestamp" in df.columns:
+        df["date"] = pd.to_datetime(df["timestamp"])
+    return df
+
+
+def _to_timestamp(value: DateLike) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    return pd.Timestamp(value)
+
+
+def _filter_frame(
+    df: pd.DataFrame,
+    start_date: DateLike = None,
+    end_date: DateLike = None,
+    symbols: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Apply date-range and symbol filters to an in-memory frame."""
+    start = _to_timestamp(start_date)
+    end = _to_timestamp(end_date)
+    mask = pd.Series(True, index=df.index)
+    if start is not None and "date" in df.columns:
+        mask &= df["date"] >= start
+    if end is not None and "date" in df.columns:
+        mask &= df["date"] <= end
+    if symbols is not None and "symbol" in df.columns:
+        mask &= df["symbol"].isin(list(symbols))
+    if mask.all():
+        return df
+    return df[mask].reset_index(drop=True)
+
+
+def read_csv_filtered(
+    filepath: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    start_date: DateLike = None,
+    end_date: DateLike = None,
+    symbols: Optional[Sequence[str]] = None,
+    categorical_symbols: bool = False,
+) -> pd.DataFrame:
+    """
+    Read a raw CSV with the same column/date/symbol semantics as the store.
+
+    Used as the fallback path when no fresh store exists (or pyarrow is missing).
+    Only the requested columns are parsed.
+
+    Args:
+        filepath: Path to CSV file
+        columns: Columns to return (date/symbol are always kept). None = all
+        start_date: Inclusive lower bound on 'date'
+        end_date: Inclusive upper bound on 'date'
+        symbols: Only return these symbols
+        categorical_symbols: Return 'symbol' as a pandas Categorical
+
+    Returns:
+        pd.DataFrame: Filtered DataFrame with a typed 'date' column
+    """
+    usecols = None
+    if columns is not None:
+        header = pd.read_csv(filepath, nrows=0).columns
+        wanted = set(columns) | {"date", "symbol", "snapshot_date", "timestamp"}
+        usecols = [c for c in header if c in wanted]
+
+    df = pd.read_csv(filepath, usecols=usecols)
+    df = normalize_dates(df)
+    df = _filter_frame(df, start_date, end_date, symbols)
+
+    if columns is not None:
+        keep = _ordered_columns(df.columns, columns)
+        df = df[keep]
+    if categorical_symbols and "symbol" in df.columns:
+        df["symbol"] = df["symbol"].astype(str).astype("category")
+    return df
+
+
+def _ordered_columns(available: Sequence[str], requested: Sequence[str]) -> List[str]:
+    """date/symbol first, then requested columns that actually exist."""
+    keep = [c for c in ("date", "symbol") if c in available]
+    keep += [c for c in requested if c in available and c not in keep]
+    return keep
+
+
+class PriceStore:
+    """Partitioned Parquet store for the raw CSV datasets"""
+
+    def __init__(self, store_dir: Optional[str] = None):
+        """
+        Initialize price store
+
+        Args:
+            store_dir: Directory holding the datasets. Defaults to workspace/data/.cache/price_store
+        """
+        if store_dir is None:
+            workspace_root = Path(__file__).parent.parent.parent
+            store_dir = workspace_root / "data" / ".cache" / "price_store"
+
+        self.store_dir = Path(store_dir)
+
+    @staticmethod
+    def dataset_name(source_path: Union[str, Path]) -> str:
+        """
+        Dataset name for a source CSV: file stem plus a hash of its directory,
+        so CSVs with the same name in different directories do not collide
+        """
+        path = Path(source_path).resolve()
+        digest = hashlib.sha1(str(path.parent).encode()).hexdigest()[:8]
+        return f"{path.stem}-{digest}"
+
+    def dataset_path(self, name: str) -> Path:
+        """Directory of a dataset inside the store"""
+        return self.store_dir / name
+
+    def _read_manifest(self, name: str) -> Optional[Dict[str, Any]]:
+        manifest_path = self.dataset_path(name) / MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Unreadable manifest for {name}: {e}")
+            return None
+
+    def is_fresh(self, source_path: Union[str, Path], name: Optional[str] = None) -> bool:
+        """
+        Check whether the stored dataset matches the current source CSV.
+
+        The store is considered fresh when it was built from the same absolute
+        path and the CSV's size and modification time have not changed since.
+        """
+        name = name or self.dataset_name(source_path)
+        manifest = self._read_manifest(name)
+        if manifest is None or manifest.get("version") != STORE_VERSION:
+            return False
+        if not os.path.exists(source_path):
+            return False
+
+        stat = os.stat(source_path)
+        return (
+            manifest.get("source_path") == str(Path(source_path).resolve())
+            and manifest.get("source_size") == stat.st_size
+            and manifest.get("source_mtime") == stat.st_mtime
+        )
+
+    def build(
+        self,
+        source_path: Union[str, Path],
+        name: Optional[str] = None,
+        partition_cols: Sequence[str] = ("year",),
+    ) -> Path:
+        """
+        Convert a CSV into a partitioned Parquet dataset.
+
+        Dates are stored as timestamps, symbols as dictionary-encoded strings,
+        and rows are partitioned by calendar year and sorted by (symbol, date).
+        Partition columns missing from the source (e.g. 'symbol' for
+        CoinMarketCap snapshots) are skipped.
+
+        Args:
+            source_path: CSV file to convert
+            name: Dataset name (defaults to dataset_name(source_path))
+            partition_cols: Partition hierarchy
+
+        Returns:
+            Path: Dataset directory
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to build the price store: pip install pyarrow")
+
+        name = name or self.dataset_name(source_path)
+        target = self.dataset_path(name)
+        logger.info(f"Building price store dataset '{name}' from {source_path}")
+
+        stat = os.stat(source_path)
+        df = normalize_dates(pd.read_csv(source_path))
+        if "date" not in df.columns:
+            raise ValueError(f"No date column found in {source_path}")
+
+        df["year"] = df["date"].dt.year.astype("int16")
+        if "symbol" in df.columns:
+            df["symbol"] = df["symbol"].astype(str).astype("category")
+        partitioning = [c for c in partition_cols if c in df.columns]
+        df = df.sort_values([c for c in ("symbol", "date") if c in df.columns])
+
+        # Write into a temp dir and swap, so readers never see a half-built dataset
+        tmp_target = target.with_name(f".{name}.tmp")
+        if tmp_target.exists():
+            shutil.rmtree(tmp_target)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        ds.write_dataset(
+            table,
+            str(tmp_target),
+            format="parquet",
+            partitioning=partitioning,
+            partitioning_flavor="hive",
+            existing_data_behavior="overwrite_or_ignore",
+            min_rows_per_group=ROW_GROUP_SIZE,
+            max_rows_per_group=ROW_GROUP_SIZE,
+        )
+
+        manifest = {
+            "version": STORE_VERSION,
+            "source_path": str(Path(source_path).resolve()),
+            "source_size": stat.st_size,
+            "source_mtime": stat.st_mtime,
+            "built_at": datetime.now().isoformat(),
+            "rows": int(len(df)),
+            "columns": [c for c in df.columns if c != "year"],
+            "partitioning": partitioning,
+            "date_min": df["date"].min().isoformat() if len(df) else None,
+            "date_max": df["date"].max().isoformat() if len(df) else None,
+        }
+        with open(tmp_target / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if target.exists():
+            shutil.rmtree(target)
+        tmp_target.rename(target)
+
+        logger.info(f"Built {target} ({len(df):,} rows, partitioned by {partitioning})")
+        return target
+
+    def load(
+        self,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        start_date: DateLike = None,
+        end_date: DateLike = None,
+        symbols: Optional[Sequence[str]] = None,
+        categorical_symbols: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Read a dataset with column, date-range and symbol pushdown.
+
+        Args:
+            name: Dataset name
+            columns: Columns to return (date/symbol are always kept). None = all
+            start_date: Inclusive lower bound on 'date'
+            end_date: Inclusive upper bound on 'date'
+            symbols: Only return these symbols
+            categorical_symbols: Return 'symbol' as a pandas Categorical
+
+        Returns:
+            pd.DataFrame: Rows sorted by symbol and date
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to read the price store: pip install pyarrow")
+
+        manifest = self._read_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"No price store dataset named '{name}' in {self.store_dir}")
+
+        dataset = ds.dataset(
+            str(self.dataset_path(name)),
+            format="parquet",
+            partitioning="hive",
+            exclude_invalid_files=True,
+        )
+        schema_names = dataset.schema.names
+
+        start = _to_timestamp(start_date)
+        end = _to_timestamp(end_date)
+        filter_expr = None
+
+        def _and(expr):
+            nonlocal filter_expr
+            filter_expr = expr if filter_expr is None else filter_expr & expr
+
+        # Year filters prune whole partitions; date filters trim within them
+        if start is not None:
+            _and(ds.field("date") >= pa.scalar(start.to_datetime64()))
+            if "year" in schema_names:
+                _and(ds.field("year") >= start.year)
+        if end is not None:
+            _and(ds.field("date") <= pa.scalar(end.to_datetime64()))
+            if "year" in schema_names:
+                _and(ds.field("year") <= end.year)
+        if symbols is not None and "symbol" in schema_names:
+            _and(ds.field("symbol").isin([str(s) for s in symbols]))
+
+        if columns is None:
+            read_columns = [c for c in manifest["columns"] if c in schema_names]
+        else:
+            read_columns = _ordered_columns(schema_names, columns)
+
+        table = dataset.to_table(columns=read_columns, filter=filter_expr)
+        df = table.to_pandas()
+
+        if "symbol" in df.columns:
+            df["symbol"] = df["symbol"].astype("category" if categorical_symbols else str)
+        sort_cols = [c for c in ("symbol", "date") if c in df.columns]
+        if sort_cols:
+            df = df.sort_values(sort_cols).reset_index(drop=True)
+        return df
+
+    def get_store_info(self) -> Dict[str, Any]:
+        """Get information about stored datasets"""
+        info = {"store_dir": str(self.store_dir), "datasets": []}
+        if not self.store_dir.exists():
+            return info
+
+        for dataset_dir in sorted(self.store_dir.iterdir()):
+            if not dataset_dir.is_dir() or dataset_dir.name.startswith("."):
+                continue
+            manifest = self._read_manifest(dataset_dir.name)
+            if manifest is None:
+                continue
+            size = sum(p.stat().st_size for p in dataset_dir.rglob("*.parquet"))
+            source = manifest.get("source_path", "")
+            info["datasets"].append(
+                {
+                    "name": dataset_dir.name,
+                    "rows": manifest.get("rows"),
+                    "size": size,
+                    "date_min": manifest.get("date_min"),
+                    "date_max": manifest.get("date_max"),
+                    "built_at": manifest.get("built_at"),
+                    "source_path": source,
+                    "is_fresh": self.is_fresh(source, dataset_dir.name) if source else False,
+                }
+            )
+        return info
+
+
+def load_dataset(
+    filepath: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    start_date: DateLike = None,
+    end_date: DateLike = None,
+    symbols: Optional[Sequence[str]] = None,
+    use_store: bool = True,
+    build_if_stale: bool = False,
+    store: Optional[PriceStore] = None,
+    categorical_symbols: bool = False,
+) -> pd.DataFrame:
+    """
+    Load a raw CSV dataset, served from the columnar store when possible.
+
+    Resolution order:
+    1. Fresh store dataset for this CSV -> Parquet read with pushdown
+    2. build_if_stale=True -> (re)build the store from the CSV, then 1.
+    3. Otherwise -> filtered CSV read (same result, just slower)
+
+    Args:
+        filepath: Path to the source CSV
+        columns: Columns to return (date/symbol are always kept). None = all
+        start_date: Inclusive lower bound on 'date'
+        end_date: Inclusive upper bound on 'date'
+        symbols: Only return these symbols
+        use_store: Set False to always read the CSV
+        build_if_stale: Build/refresh the store when it is missing or stale
+        store: PriceStore instance (default store location if None)
+        categorical_symbols: Return 'symbol' as a pandas Categorical. Off by
+            default: filtering keeps unused categories, so groupby() over the
+            result would also yield the filtered-out symbols as empty groups
+
+    Returns:
+        pd.DataFrame: Data with a typed 'date' column
+    """
+    if use_store and PYARROW_AVAILABLE:
+        store = store or PriceStore()
+        name = store.dataset_name(filepath)
+        try:
+            if not store.is_fresh(filepath, name) and build_if_stale:
+                store.build(filepath, name)
+            if store.is_fresh(filepath, name):
+                return store.load(
+                    name,
+                    columns=columns,
+                    start_date=start_date,
+                    end_date=end_date,
+                    symbols=symbols,
+                    categorical_symbols=categorical_symbols,
+                )
+        except (OSError, ValueError, pa.ArrowException) as e:
+            logger.warning(f"Price store unavailable for {filepath} ({e}); reading CSV")
+
+    return read_csv_filtered(filepath, columns, start_date, end_date, symbols, categorical_symbols)
+
+
+def load_price_data(
+    filepath: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+    start_date: DateLike = None,
+    end_date: DateLike = None,
+    symbols: Optional[Sequence[str]] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Load daily OHLCV data sorted by symbol and date.
+
+    Thin wrapper over load_dataset() that guarantees the (symbol, date) sort
+    order every backtest's load_data() relied on.
+    """
+    df = load_dataset(filepath, columns, start_date, end_date, symbols, **kwargs)
+    return df.sort_values(["symbol", "date"]).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the columnar price store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build store datasets from CSV files")
+    build_parser.add_argument("csv_files", nargs="+", help="Source CSV files")
+    build_parser.add_argument("--store-dir", type=str, default=None, help="Store directory")
+
+    info_parser = subparsers.add_parser("info", help="Show stored datasets")
+    info_parser.add_argument("--store-dir", type=str, default=None, help="Store directory")
+
+    args = parser.parse_args()
+    store = PriceStore(args.store_dir)
+
+    if args.command == "build":
+        for csv_file in args.csv_files:
+            if store.is_fresh(csv_file):
+                print(f"  ✓ {csv_file}: store is up to date")
+                continue
+            store.build(csv_file)
+        return
+
+    info = store.get_store_info()
+    print("=" * 80)
+    print("PRICE STORE")
+    print("=" * 80)
+    print(f"\nStore directory: {info['store_dir']}")
+    print(f"Datasets: {len(info['datasets'])}")
+    for d in info["datasets"]:
+        status = "✓ FRESH" if d["is_fresh"] else "✗ STALE"
+        print(
+            f"  {status} {d['name']}: {d['rows']:,} rows, {d['size'] / 1e6:.1f} MB, "
+            f"{d['date_min']} to {d['date_max']}"
+        )
+    print("\n" + "=" * 80)
+
+
+if __name__ == "__main__":
+    main()
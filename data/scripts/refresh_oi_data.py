@@ -7,7 +7,10 @@ Triggered automatically by the trading system when:
 - OI data is 1+ days behind current date
 - OI data file is >8 hours old
 
-Integrates with the existing fetch_all_open_interest_since_2020_all_perps.py script.
+Refreshes are incremental (data/scripts/incremental_datasets.py): only the days
+after each symbol's last stored date are requested and merged into the canonical
+data/raw/historical_open_interest_daily.csv, instead of re-pulling history since
+2020 into a new timestamped file.
 """
 import os
 import sys
@@ -15,7 +18,6 @@ import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
-from glob import glob
 
 import pandas as pd
 
@@ -25,6 +27,7 @@ if str(WORKSPACE_ROOT) not in sys.path:
     sys.path.insert(0, str(WORKSPACE_ROOT))
 
 from data.scripts.coinalyze_client import CoinalyzeClient
+from data.scripts.incremental_datasets import latest_dataset_path, refresh_coinalyze_dataset
 
 
 def get_oi_data_status() -> Dict:
@@ -40,22 +43,18 @@ def get_oi_data_status() -> Dict:
     - file_path: Path to OI data file
     """
     try:
-        # Find OI data file
-        oi_data_dir = WORKSPACE_ROOT / "data" / "raw"
-        pattern = str(oi_data_dir / "historical_open_interest_all_perps_since2020_*.csv")
-        oi_files = sorted(glob(pattern), reverse=True)
+        # Canonical OI dataset (or the newest legacy export before the first refresh)
+        oi_file = Path(latest_dataset_path("open_interest"))
 
-        if not oi_files:
+        if not oi_file.exists():
             return {"status": "missing", "needs_refresh": True, "reason": "No OI data file found"}
 
-        oi_file = Path(oi_files[0])
-
         # Check file modification time
         file_mtime = datetime.fromtimestamp(oi_file.stat().st_mtime)
         file_age_hours = (datetime.now() - file_mtime).total_seconds() / 3600
 
         # Read data and check content date
-        df = pd.read_csv(oi_file, usecols=["date"], nrows=100000)
+        df = pd.read_csv(oi_file, usecols=["date"])
         df["date"] = pd.to_datetime(df["date"])
         max_date = df["date"].max()
         today = pd.Timestamp(datetime.now().date())
@@ -94,14 +93,6 @@ def get_oi_data_status() -> Dict:
         }
 
 
-def resolve_output_dir() -> Path:
-    """Find appropriate output directory for OI data."""
-    for c in [Path("data/raw"), WORKSPACE_ROOT / "data" / "raw", Path(".")]:
-        if c.exists() and c.is_dir():
-            return c
-    return Path(".")
-
-
 def get_all_perp_symbols(client: CoinalyzeClient) -> Dict[str, str]:
     """
     Return map base_symbol -> preferred Coinalyze perp symbol.
@@ -142,51 +133,22 @@ def get_all_perp_symbols(client: CoinalyzeClient) -> Dict[str, str]:
     return best
 
 
-def fetch_oi_daily_history(
-    client: CoinalyzeClient, symbol: str, start_year: int = 2020
-) -> List[Dict]:
-    """Fetch daily OI history for a single symbol since start_year."""
-    start_ts = int(datetime(start_year, 1, 1).timestamp())
-    end_ts = int(datetime.now().timestamp())
-
-    try:
-        res = client.get_open_interest_history(
-            symbols=symbol,
-            interval="daily",
-            from_ts=start_ts,
-            to_ts=end_ts,
-            convert_to_usd=True,
-        )
-        rows: List[Dict] = []
-        if res and len(res) > 0:
-            hist = res[0].get("history", [])
-            for pt in hist:
-                rows.append(
-                    {
-                        "symbol": symbol,
-                        "timestamp": pt["t"],
-                        "date": datetime.fromtimestamp(pt["t"]).strftime("%Y-%m-%d"),
-                        "oi_open": pt.get("o"),
-                        "oi_high": pt.get("h"),
-                        "oi_low": pt.get("l"),
-                        "oi_close": pt.get("c"),
-                    }
-                )
-        return rows
-    except Exception as e:
-        print(f"  ⚠️  Error fetching {symbol}: {e}")
-        return []
+def download_fresh_oi_data(start_year: int = 2020, force: bool = False) -> Optional[Path]:
+    """
+    Fetch OI days missing from the canonical dataset and merge them in.
 
+    Only the days since each symbol's last stored date are requested; symbols
+    never seen before are fetched from start_year.
 
-def download_fresh_oi_data(start_year: int = 2020) -> Optional[Path]:
-    """
-    Download fresh OI data from Coinalyze and save to data/raw.
+    Args:
+        start_year: Start year for symbols with no stored history
+        force: Re-request symbols already refreshed today (intraday update)
 
     Returns:
-        Path to saved file, or None if download failed
+        Path to the canonical OI dataset, or None if the refresh failed
     """
     print("\n" + "=" * 80)
-    print("DOWNLOADING FRESH OI DATA")
+    print("REFRESHING OI DATA (INCREMENTAL)")
     print("=" * 80)
 
     # Check for API key
@@ -204,65 +166,27 @@ def download_fresh_oi_data(start_year: int = 2020) -> Optional[Path]:
             print("❌ ERROR: Could not load perpetual markets universe")
             return None
 
-        # Fetch OI history for all symbols
-        all_rows: List[Dict] = []
-        wait_s = 1.5  # Rate limiting: 40 calls/min = 1.5s per call
-        total_symbols = len(base_to_symbol)
-
-        print(f"\n  Fetching OI data for {total_symbols} symbols (rate limited to 40/min)")
-        estimated_time = (total_symbols * wait_s) / 60
-        print(f"  Estimated time: {estimated_time:.1f} minutes")
-        print("")
+        symbols = {c_sym: base for base, c_sym in sorted(base_to_symbol.items())}
+        print(f"\n  Refreshing OI data for {len(symbols)} symbols")
 
         start_time = time.time()
-        for i, (base, c_sym) in enumerate(sorted(base_to_symbol.items()), 1):
-            # Progress indicator
-            if i % 10 == 0 or i == 1:
-                elapsed = (time.time() - start_time) / 60
-                remaining = ((total_symbols - i) * wait_s) / 60
-                print(
-                    f"  [{i:4d}/{total_symbols}] {base:8s}: {c_sym:25s} | Elapsed: {elapsed:.1f}m | Remaining: {remaining:.1f}m"
-                )
-
-            rows = fetch_oi_daily_history(client, c_sym, start_year=start_year)
-            if rows:
-                for r in rows:
-                    r["coin_symbol"] = base
-                all_rows.extend(rows)
-
-            time.sleep(wait_s)
-
-        if not all_rows:
+        result = refresh_coinalyze_dataset(
+            "open_interest", client, symbols, datetime(start_year, 1, 1), force=force
+        )
+        out_path = Path(result["path"])
+        if not out_path.exists():
             print("❌ ERROR: No OI data fetched")
             return None
 
-        # Build DataFrame
-        df = pd.DataFrame(all_rows)
-        df = df[
-            [
-                "coin_symbol",
-                "symbol",
-                "date",
-                "timestamp",
-                "oi_open",
-                "oi_high",
-                "oi_low",
-                "oi_close",
-            ]
-        ]
-        df = df.sort_values(["coin_symbol", "date"]).reset_index(drop=True)
-
-        # Save to file with timestamp
-        out_dir = resolve_output_dir()
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        out_path = out_dir / f"historical_open_interest_all_perps_since2020_{ts}.csv"
-        df.to_csv(out_path, index=False)
+        df = pd.read_csv(out_path, usecols=["coin_symbol", "date"])
 
         # Print summary
         print("\n" + "=" * 80)
-        print("✓ OI DATA DOWNLOAD COMPLETE")
+        print("✓ OI DATA REFRESH COMPLETE")
         print("=" * 80)
         print(f"  File: {out_path}")
+        print(f"  Requests: {result['requests']} ({result['symbols_updated']} symbols with data)")
+        print(f"  New rows: {result['new_rows']:,}")
         print(f"  Date range: {df['date'].min()} → {df['date'].max()}")
         print(f"  Unique bases: {df['coin_symbol'].nunique()}")
         print(f"  Total rows: {len(df):,}")
@@ -332,7 +256,9 @@ def check_and_refresh_oi_data(force: bool = False, start_year: int = 2020) -> Di
         print(f"\n🔄 AUTOMATIC REFRESH triggered: {status.get('reason')}")
 
     print("\nStarting OI data download...")
-    new_file = download_fresh_oi_data(start_year=start_year)
+    # An intraday refresh (stale file, current content) re-requests today's values
+    intraday = force or status.get("status") == "stale_file"
+    new_file = download_fresh_oi_data(start_year=start_year, force=intraday)
 
     if new_file:
         print("\n✓ OI data successfully refreshed")
@@ -11,7 +11,7 @@ import tempfile
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-import json
+import pandas as pd
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -40,8 +40,7 @@ def test_date_change_invalidation():
             "data": [{"date": "2025-10-26", "value": 100}],
         }
 
-        with open(cache_path, "w") as f:
-            json.dump(mock_data, f)
+        cache.save_oi_history(pd.DataFrame(mock_data["data"]), "A", 30)
 
         # Set file modification time to yesterday (but <8h ago - e.g., 6 hours ago)
         yesterday = datetime.now() - timedelta(hours=6)
@@ -101,8 +100,7 @@ def test_same_day_cache():
             "data": [{"date": "2025-10-27", "value": 100}],
         }
 
-        with open(cache_path, "w") as f:
-            json.dump(mock_data, f)
+        cache.save_oi_history(pd.DataFrame(mock_data["data"]), "A", 30)
 
         # Set file modification time to 2 hours ago (same day, within TTL)
         two_hours_ago = datetime.now() - timedelta(hours=2)
@@ -154,8 +152,7 @@ def test_ttl_expiration():
             "data": [{"date": "2025-10-27", "value": 100}],
         }
 
-        with open(cache_path, "w") as f:
-            json.dump(mock_data, f)
+        cache.save_oi_history(pd.DataFrame(mock_data["data"]), "A", 30)
 
         # Set file modification time to 2 hours ago (same day but beyond 1h TTL)
         two_hours_ago = datetime.now() - timedelta(hours=2)
@@ -5,11 +5,12 @@ For a collection of orders {symbol: notional_amount}:
 1. Calculate position size based on notional / (last + spread * 2) to ensure sufficient budget
 2. Send initial limit orders at best bid (buy) or ask (sell)
 3. Continuously monitor (tick-based) and walk price ladder:
-   - Poll prices every tick_interval seconds
+   - Poll prices every tick_interval seconds (read from memory when a
+     streaming feed is registered, see market_data.py / --ws)
    - For buys: gradually increase price from bid towards max_price (last + spread * 2)
    - For sells: gradually decrease price from ask towards min_price (last - spread * 2)
    - Walk 20% of remaining distance to max/min price each tick
-   - Check if orders are filled
+   - Check if orders are filled (one account-wide poll per tick, see fill_tracker.py)
 4. Continue until orders are filled or max_time is reached
 5. Optionally cross spread with limit orders for remaining unfilled
    - Buy orders: moved to ASK price (crosses spread)
@@ -22,40 +23,42 @@ progressively moving towards max acceptable price (NOT taking market orders).
 
 import argparse
 import os
+import sys
 import time
-import ccxt
+from contextlib import nullcontext
 from typing import Dict, List, Optional
+
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.tracing import span
 from get_bid_ask import get_bid_ask
+from price_snapshot import get_market_data_feed, get_price_snapshot
+from exchange_session import get_exchange as get_session_exchange
 from ccxt_make_order import ccxt_make_order
 from modify_order import modify_order
+from order_batch import OrderBatch
+from fill_tracker import FillTracker
+from market_data import streaming_market_data
+import numpy as np
 import pandas as pd
 
 
 def get_exchange():
     """
-    Initialize and return Hyperliquid exchange instance.
+    Return the pooled authenticated Hyperliquid exchange instance.
 
     Returns:
         ccxt.Exchange: Configured Hyperliquid exchange
     """
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
-        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
-
-    return ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
+    return get_session_exchange()
 
 
 def get_prices_with_last(symbols):
     """
-    Fetch bid/ask/last prices for symbols.
+    Fetch bid/ask/last prices for symbols from the shared bulk price snapshot.
 
     Args:
         symbols: List of trading symbols
@@ -63,42 +66,28 @@ def get_prices_with_last(symbols):
     Returns:
         DataFrame with columns: symbol, bid, ask, last, spread, spread_pct, max_price
     """
-    exchange = ccxt.hyperliquid(
+    snapshot = get_price_snapshot(symbols)
+
+    # Require bid, ask and last (all non-zero)
+    valid = snapshot.has_bid_ask & ~np.isnan(snapshot.last)
+    valid &= (snapshot.bid != 0) & (snapshot.ask != 0) & (snapshot.last != 0)
+    if not valid.any():
+        return None
+
+    spread = snapshot.spread[valid]
+    return pd.DataFrame(
         {
-            "enableRateLimit": True,
+            "symbol": snapshot.symbols[valid].astype(str),
+            "bid": snapshot.bid[valid],
+            "ask": snapshot.ask[valid],
+            "last": snapshot.last[valid],
+            "spread": spread,
+            "spread_pct": snapshot.spread_pct[valid],
+            # Max acceptable price: last + (spread * 2)
+            "max_price": snapshot.last[valid] + spread * 2,
         }
     )
 
-    price_data = []
-    for symbol in symbols:
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            bid = ticker.get("bid")
-            ask = ticker.get("ask")
-            last = ticker.get("last")
-
-            if bid and ask and last:
-                spread = ask - bid
-                spread_pct = (spread / bid * 100) if bid > 0 else 0
-                # Calculate max acceptable price: last + (spread * 2)
-                max_price = last + (spread * 2)
-
-                price_data.append(
-                    {
-                        "symbol": symbol,
-                        "bid": bid,
-                        "ask": ask,
-                        "last": last,
-                        "spread": spread,
-                        "spread_pct": spread_pct,
-                        "max_price": max_price,
-                    }
-                )
-        except Exception as e:
-            print(f"  Warning: Could not fetch prices for {symbol}: {e}")
-
-    return pd.DataFrame(price_data) if price_data else None
-
 
 def get_all_open_orders(exchange):
     """
@@ -149,17 +138,18 @@ def cancel_all_open_orders(exchange, dry_run=True):
             print(f"  [DRY RUN] Would cancel {len(open_orders)} order(s)")
             return len(open_orders)
 
-        # Cancel all orders
-        canceled = 0
+        # Cancel all orders in bulk requests
+        batch = OrderBatch(exchange)
         for order in open_orders:
-            try:
-                symbol = order.get("symbol")
-                order_id = order.get("id")
-                exchange.cancel_order(order_id, symbol)
+            batch.cancel(order.get("id"), order.get("symbol"), key=order.get("id"))
+
+        canceled = 0
+        for order_id, result in batch.submit()["cancel"].items():
+            if result["success"]:
                 canceled += 1
-                print(f"    ✓ Canceled {symbol} order {order_id}")
-            except Exception as e:
-                print(f"    ✗ Failed to cancel order {order_id}: {e}")
+                print(f"    ✓ Canceled {result['symbol']} order {order_id}")
+            else:
+                print(f"    ✗ Failed to cancel order {order_id}: {result['error']}")
 
         return canceled
 
@@ -170,7 +160,10 @@ def cancel_all_open_orders(exchange, dry_run=True):
 
 def check_order_fills(exchange, order_ids: Dict[str, str]) -> Dict[str, dict]:
     """
-    Check fill status of multiple orders.
+    Check fill status of multiple orders with one fetch_order call each.
+
+    The execution loop uses FillTracker (two account-wide requests per poll);
+    this is kept for one-off checks of specific order ids.
 
     Args:
         exchange: ccxt exchange instance
@@ -253,6 +246,8 @@ def move_order_to_best_bid_ask(
             symbol=symbol,
             new_price=target_price,
             new_amount=None,  # Keep same amount
+            exchange=exchange,
+            existing_order=order_info,
         )
 
         return {
@@ -270,35 +265,41 @@ def move_order_to_best_bid_ask(
         return None
 
 
-def cross_spread_with_limit_order(
-    exchange, symbol: str, order_info: dict, price_dict: dict
-) -> Optional[dict]:
+def cross_spread_with_limit_orders(
+    exchange, order_statuses: Dict[str, dict], price_dict: dict
+) -> Dict[str, dict]:
     """
-    Cross the spread by placing a limit order on the opposite side.
+    Cross the spread for several orders by placing limit orders on the opposite side.
     For buy orders: place limit at ASK (crosses spread)
     For sell orders: place limit at BID (crosses spread)
 
+    All resting orders are cancelled in one bulk request and the replacement
+    limit orders are placed in another (see order_batch.py). An order whose
+    cancel fails is not crossed, since it may still fill at its old price.
+
     Args:
         exchange: ccxt exchange instance
-        symbol: Trading symbol
-        order_info: Current order information
+        order_statuses: Dictionary mapping symbol to current order information
         price_dict: Dictionary with current bid/ask prices
 
     Returns:
-        New order info or None if error
+        Dict mapping symbol to new order info (symbols that failed are omitted)
     """
-    try:
+    cancels = OrderBatch(exchange)
+    crosses = {}  # symbol -> (cross_price, remaining)
+
+    for symbol, order_info in order_statuses.items():
         side = order_info["side"]
         remaining = order_info.get("remaining", 0)
 
         if remaining <= 0:
             print(f"  {symbol}: No remaining amount to fill")
-            return None
+            continue
 
         # Get current bid/ask
         if symbol not in price_dict:
             print(f"  {symbol}: Error - No price data available")
-            return None
+            continue
 
         bid = price_dict[symbol]["bid"]
         ask = price_dict[symbol]["ask"]
@@ -318,24 +319,68 @@ def cross_spread_with_limit_order(
         print(f"           Moving from ${old_price:.4f} to ${cross_price:.4f} ({price_type})")
         print(f"           Remaining: {remaining:.6f} (~${remaining_notional:.2f})")
 
-        # Cancel the existing limit order first
-        try:
-            exchange.cancel_order(order_info["id"], symbol)
-            print(f"  {symbol}: Cancelled limit order {order_info['id']}")
-        except Exception as e:
-            print(f"  {symbol}: Warning - could not cancel order: {e}")
+        cancels.cancel(order_info["id"], symbol)
+        crosses[symbol] = (cross_price, remaining)
 
-        # Place limit order at the opposite side of spread (crosses spread)
-        new_order = exchange.create_order(
-            symbol=symbol, type="limit", side=side, amount=remaining, price=cross_price
-        )
+    if not crosses:
+        return {}
+
+    # Cancel the existing limit orders first, then place at the opposite side of
+    # the spread only where the cancel went through
+    cancelled = cancels.submit()["cancel"]
+    creates = OrderBatch(exchange)
+
+    for symbol, (cross_price, remaining) in crosses.items():
+        cancel = cancelled[symbol]
+        if not cancel["success"]:
+            print(f"  {symbol}: Could not cancel order ({cancel['error']}), not crossing")
+            continue
+        print(f"  {symbol}: Cancelled limit order {order_statuses[symbol]['id']}")
+        creates.create(symbol, order_statuses[symbol]["side"], remaining, cross_price)
+
+    if not len(creates):
+        return {}
+
+    created_orders = creates.submit()["create"]
+    new_orders = {}
+
+    for symbol, created in created_orders.items():
+        cross_price, remaining = crosses[symbol]
+        if not created["success"]:
+            print(f"  {symbol}: Error placing limit order: {created['error']}")
+            continue
+
+        # Bulk responses only carry the order id and fill state
+        new_order = dict(created["order"])
+        new_order["price"] = new_order.get("price") or cross_price
+        new_order["amount"] = new_order.get("amount") or remaining
+        new_orders[symbol] = new_order
 
         print(
             f"  {symbol}: ✓ Limit order placed at ${cross_price:.4f} (crosses spread) - ID: {new_order.get('id')}"
         )
 
-        return new_order
+    return new_orders
+
 
+def cross_spread_with_limit_order(
+    exchange, symbol: str, order_info: dict, price_dict: dict
+) -> Optional[dict]:
+    """
+    Cross the spread for a single order (see cross_spread_with_limit_orders).
+
+    Args:
+        exchange: ccxt exchange instance
+        symbol: Trading symbol
+        order_info: Current order information
+        price_dict: Dictionary with current bid/ask prices
+
+    Returns:
+        New order info or None if error
+    """
+    try:
+        new_orders = cross_spread_with_limit_orders(exchange, {symbol: order_info}, price_dict)
+        return new_orders.get(symbol)
     except Exception as e:
         print(f"  {symbol}: Error placing limit order: {e}")
         return None
@@ -437,6 +482,8 @@ def aggressive_execute_orders(
 
     order_ids = {}  # Track order IDs for each symbol
     order_info_dict = {}  # Track full order info
+    pending_orders = {}  # Queued initial orders awaiting the bulk submit
+    batch = OrderBatch(exchange)
 
     for symbol, notional_amount in trades.items():
         if notional_amount == 0:
@@ -484,46 +531,48 @@ def aggressive_execute_orders(
         print(f"  Position Size: {position_size:.6f}")
         print(f"  Initial Price: ${initial_price:,.4f} (best {side})")
 
+        order_info = {
+            "side": side,
+            "price": initial_price,
+            "amount": position_size,
+            "target_amount": position_size,
+            "max_price": max_price if side == "buy" else max_price_for_sell,
+            "min_price": min_price if side == "buy" else min_price_for_sell,
+        }
+
         if dry_run:
             print(f"  Status:        [DRY RUN] Would place {side.upper()} limit order")
             order_ids[symbol] = f"DRY_RUN_{symbol}"
+            order_info_dict[symbol] = {"id": f"DRY_RUN_{symbol}", **order_info, "status": "open"}
+        else:
+            # Queued; all initial orders go out in bulk requests below
+            batch.create(symbol, side, position_size, initial_price)
+            pending_orders[symbol] = order_info
+            print("  Status:        Queued")
+
+    if pending_orders:
+        print(f"\nSubmitting {len(pending_orders)} orders in bulk...")
+        placed = batch.submit()["create"]
+        for symbol, order_info in pending_orders.items():
+            result = placed[symbol]
+            if not result["success"]:
+                print(f"  {symbol}: ✗ Error: {result['error']}")
+                continue
+
+            order = result["order"]
+            order_id = order.get("id")
+            filled = order.get("filled") or 0
+            remaining = order.get("remaining")
+            order_ids[symbol] = order_id
             order_info_dict[symbol] = {
-                "id": f"DRY_RUN_{symbol}",
-                "side": side,
-                "price": initial_price,
-                "amount": position_size,
-                "target_amount": position_size,
-                "max_price": max_price if side == "buy" else max_price_for_sell,
-                "min_price": min_price if side == "buy" else min_price_for_sell,
-                "status": "open",
+                "id": order_id,
+                **order_info,
+                "filled": filled,
+                "remaining": order_info["amount"] - filled if remaining is None else remaining,
+                "status": order.get("status") or "open",
             }
-        else:
-            try:
-                # Place order with calculated position size at initial price
-                order = exchange.create_order(
-                    symbol=symbol,
-                    type="limit",
-                    side=side,
-                    amount=position_size,
-                    price=initial_price,
-                )
-                order_id = order.get("id")
-                order_ids[symbol] = order_id
-                order_info_dict[symbol] = {
-                    "id": order_id,
-                    "side": side,
-                    "price": initial_price,
-                    "amount": position_size,
-                    "target_amount": position_size,
-                    "max_price": max_price if side == "buy" else max_price_for_sell,
-                    "min_price": min_price if side == "buy" else min_price_for_sell,
-                    "filled": order.get("filled", 0),
-                    "remaining": order.get("remaining", position_size),
-                    "status": order.get("status", "open"),
-                }
-                print(f"  Status:        ✓ Order placed - ID: {order_id}")
-            except Exception as e:
-                print(f"  Status:        ✗ Error: {e}")
+            print(f"  {symbol}: ✓ Order placed - ID: {order_id}")
+        print(f"  ({batch.requests_sent} signed request(s))")
 
     if not order_ids:
         print("\n✗ No orders were placed")
@@ -531,6 +580,23 @@ def aggressive_execute_orders(
 
     print(f"\n✓ Placed {len(order_ids)} initial orders")
 
+    # Order status comes from account-wide polls (open orders + fills), not per-order fetches;
+    # a streaming feed with the account's orders answers them from memory
+    tracker = None
+    if not dry_run:
+        feed = get_market_data_feed()
+        tracker = FillTracker(feed if feed is not None and feed.has_user_data else exchange)
+        for symbol, info in order_info_dict.items():
+            tracker.track(
+                symbol,
+                info["id"],
+                info["side"],
+                info["amount"],
+                info["price"],
+                filled=info["filled"],
+                status=info["status"],
+            )
+
     # STEP 3: Tick-based monitoring loop with price ladder
     print(
         f"\n[3/5] Starting price ladder execution (polling every {tick_interval}s for max {max_time}s)..."
@@ -562,122 +628,127 @@ def aggressive_execute_orders(
 
         tick_count += 1
         print(f"\n--- Tick {tick_count} (elapsed: {elapsed_time:.1f}s) ---")
+        with span("execution.tick", tick=tick_count, open_orders=len(unfilled_symbols)):
+            if not dry_run:
+                # Fetch current prices for unfilled symbols
+                try:
+                    current_prices = get_prices_with_last(list(unfilled_symbols))
+                    if current_prices is not None and not current_prices.empty:
+                        for _, row in current_prices.iterrows():
+                            price_dict[row["symbol"]] = {
+                                "bid": row["bid"],
+                                "ask": row["ask"],
+                                "last": row["last"],
+                                "spread": row["spread"],
+                                "spread_pct": row["spread_pct"],
+                                "max_price": row["max_price"],
+                            }
+                except Exception as e:
+                    print(f"  Warning: Could not fetch prices: {e}")
 
-        if not dry_run:
-            # Fetch current prices for unfilled symbols
-            try:
-                current_prices = get_prices_with_last(list(unfilled_symbols))
-                if current_prices is not None and not current_prices.empty:
-                    for _, row in current_prices.iterrows():
-                        price_dict[row["symbol"]] = {
-                            "bid": row["bid"],
-                            "ask": row["ask"],
-                            "last": row["last"],
-                            "spread": row["spread"],
-                            "spread_pct": row["spread_pct"],
-                            "max_price": row["max_price"],
-                        }
-            except Exception as e:
-                print(f"  Warning: Could not fetch prices: {e}")
-
-            # Check order fills and walk up price ladder if needed
-            order_status = check_order_fills(exchange, {s: order_ids[s] for s in unfilled_symbols})
-
-            for symbol in list(unfilled_symbols):
-                if symbol not in order_status:
-                    continue
-
-                status = order_status[symbol]
-
-                # Check for errors
-                if "error" in status:
-                    print(f"  {symbol}: Error checking order - {status['error']}")
-                    continue
-
-                # Check if filled
-                if status.get("status") in ["closed", "filled"]:
-                    filled_symbols.add(symbol)
-                    unfilled_symbols.discard(symbol)
-                    print(f"  {symbol}: ✓ FILLED")
-                    continue
-
-                # Check partial fills
-                filled_amt = status.get("filled", 0)
-                total_amt = status.get("amount", 0)
-                if filled_amt > 0:
-                    print(f"  {symbol}: Partially filled - {filled_amt:.6f} / {total_amt:.6f}")
-
-                # Walk up price ladder towards max_price (for buys) or down (for sells)
-                if symbol in price_dict and symbol in order_info_dict:
-                    current_order_price = status.get("price")
-                    side = status.get("side")
-                    max_acceptable = order_info_dict[symbol].get("max_price")
-                    min_acceptable = order_info_dict[symbol].get("min_price")
-
-                    if side == "buy":
-                        # For buys, walk up from bid towards max_price
-                        # Increase price by 20% of remaining distance to max_price
-                        if current_order_price and current_order_price < max_acceptable:
-                            price_increment = (max_acceptable - current_order_price) * 0.2
-                            new_price = min(current_order_price + price_increment, max_acceptable)
-
-                            # Only move if significantly different (more than 0.1%)
-                            if (new_price - current_order_price) / current_order_price > 0.001:
-                                print(
-                                    f"  {symbol}: Walking up price ladder ${current_order_price:.4f} → ${new_price:.4f} (max: ${max_acceptable:.4f})"
-                                )
-                                try:
-                                    modified_order = modify_order(
-                                        order_id=status["id"],
-                                        symbol=symbol,
-                                        new_price=new_price,
-                                        new_amount=None,
-                                    )
-                                    if modified_order:
-                                        order_ids[symbol] = modified_order.get("id")
-                                        order_info_dict[symbol]["price"] = new_price
-                                        print(f"  {symbol}: ✓ Price updated")
-                                except Exception as e:
-                                    print(f"  {symbol}: Error modifying order: {e}")
-                            else:
-                                print(f"  {symbol}: At max price ${current_order_price:.4f}")
-                        elif current_order_price and current_order_price >= max_acceptable:
-                            print(f"  {symbol}: Already at max price ${current_order_price:.4f}")
-                    else:
-                        # For sells, walk down from ask towards min_price
-                        if current_order_price and current_order_price > min_acceptable:
-                            price_decrement = (current_order_price - min_acceptable) * 0.2
-                            new_price = max(current_order_price - price_decrement, min_acceptable)
+                # Check order fills and walk up price ladder if needed
+                order_status = tracker.poll(unfilled_symbols)
+                ladder_prices = {}  # New price per symbol, edited in bulk after the loop
 
-                            if (current_order_price - new_price) / current_order_price > 0.001:
-                                print(
-                                    f"  {symbol}: Walking down price ladder ${current_order_price:.4f} → ${new_price:.4f} (min: ${min_acceptable:.4f})"
-                                )
-                                try:
-                                    modified_order = modify_order(
-                                        order_id=status["id"],
-                                        symbol=symbol,
-                                        new_price=new_price,
-                                        new_amount=None,
+                for symbol in list(unfilled_symbols):
+                    if symbol not in order_status:
+                        continue
+
+                    status = order_status[symbol]
+
+                    # Check for errors
+                    if "error" in status:
+                        print(f"  {symbol}: Error checking order - {status['error']}")
+                        continue
+
+                    # Check if filled
+                    if status.get("status") in ["closed", "filled"]:
+                        filled_symbols.add(symbol)
+                        unfilled_symbols.discard(symbol)
+                        print(f"  {symbol}: ✓ FILLED")
+                        continue
+
+                    # Check partial fills
+                    filled_amt = status.get("filled", 0)
+                    total_amt = status.get("amount", 0)
+                    if filled_amt > 0:
+                        print(f"  {symbol}: Partially filled - {filled_amt:.6f} / {total_amt:.6f}")
+
+                    # Walk up price ladder towards max_price (for buys) or down (for sells)
+                    if symbol in price_dict and symbol in order_info_dict:
+                        current_order_price = status.get("price")
+                        side = status.get("side")
+                        max_acceptable = order_info_dict[symbol].get("max_price")
+                        min_acceptable = order_info_dict[symbol].get("min_price")
+
+                        if side == "buy":
+                            # For buys, walk up from bid towards max_price
+                            # Increase price by 20% of remaining distance to max_price
+                            if current_order_price and current_order_price < max_acceptable:
+                                price_increment = (max_acceptable - current_order_price) * 0.2
+                                new_price = min(current_order_price + price_increment, max_acceptable)
+
+                                # Only move if significantly different (more than 0.1%)
+                                if (new_price - current_order_price) / current_order_price > 0.001:
+                                    print(
+                                        f"  {symbol}: Walking up price ladder ${current_order_price:.4f} → ${new_price:.4f} (max: ${max_acceptable:.4f})"
                                     )
-                                    if modified_order:
-                                        order_ids[symbol] = modified_order.get("id")
-                                        order_info_dict[symbol]["price"] = new_price
-                                        print(f"  {symbol}: ✓ Price updated")
-                                except Exception as e:
-                                    print(f"  {symbol}: Error modifying order: {e}")
-                            else:
-                                print(f"  {symbol}: At min price ${current_order_price:.4f}")
-                        elif current_order_price and current_order_price <= min_acceptable:
-                            print(f"  {symbol}: Already at min price ${current_order_price:.4f}")
-        else:
-            print(f"  [DRY RUN] Would monitor {len(unfilled_symbols)} orders")
-            # Simulate some fills in dry run
-            if tick_count > 2 and unfilled_symbols:
-                filled = list(unfilled_symbols)[0]
-                filled_symbols.add(filled)
-                unfilled_symbols.discard(filled)
-                print(f"  {filled}: ✓ FILLED (simulated)")
+                                    batch.edit(
+                                        status["id"], symbol, side, status["remaining"], new_price
+                                    )
+                                    ladder_prices[symbol] = new_price
+                                else:
+                                    print(f"  {symbol}: At max price ${current_order_price:.4f}")
+                            elif current_order_price and current_order_price >= max_acceptable:
+                                print(f"  {symbol}: Already at max price ${current_order_price:.4f}")
+                        else:
+                            # For sells, walk down from ask towards min_price
+                            if current_order_price and current_order_price > min_acceptable:
+                                price_decrement = (current_order_price - min_acceptable) * 0.2
+                                new_price = max(current_order_price - price_decrement, min_acceptable)
+
+                                if (current_order_price - new_price) / current_order_price > 0.001:
+                                    print(
+                                        f"  {symbol}: Walking down price ladder ${current_order_price:.4f} → ${new_price:.4f} (min: ${min_acceptable:.4f})"
+                                    )
+                                    batch.edit(
+                                        status["id"], symbol, side, status["remaining"], new_price
+                                    )
+                                    ladder_prices[symbol] = new_price
+                                else:
+                                    print(f"  {symbol}: At min price ${current_order_price:.4f}")
+                            elif current_order_price and current_order_price <= min_acceptable:
+                                print(f"  {symbol}: Already at min price ${current_order_price:.4f}")
+
+                # One bulk modify for every ladder step this tick
+                if ladder_prices:
+                    edited = batch.submit()["edit"]
+                    for symbol, result in edited.items():
+                        if result["success"]:
+                            order_ids[symbol] = result["order"].get("id") or order_ids[symbol]
+                            order_info_dict[symbol]["price"] = ladder_prices[symbol]
+                            # The replacement covers only what was left of the order
+                            tracker.track(
+                                symbol,
+                                order_ids[symbol],
+                                order_status[symbol]["side"],
+                                order_status[symbol]["remaining"],
+                                ladder_prices[symbol],
+                                filled=result["order"].get("filled") or 0.0,
+                                status=result["order"].get("status") or "open",
+                                prior_filled=order_status[symbol]["filled"],
+                            )
+                            print(f"  {symbol}: ✓ Price updated")
+                        else:
+                            print(f"  {symbol}: Error modifying order: {result['error']}")
+            else:
+                print(f"  [DRY RUN] Would monitor {len(unfilled_symbols)} orders")
+                # Simulate some fills in dry run
+                if tick_count > 2 and unfilled_symbols:
+                    filled = list(unfilled_symbols)[0]
+                    filled_symbols.add(filled)
+                    unfilled_symbols.discard(filled)
+                    print(f"  {filled}: ✓ FILLED (simulated)")
 
     # STEP 4: Handle remaining unfilled orders
     print(f"\n[4/5] Handling remaining unfilled orders...")
@@ -708,10 +779,9 @@ def aggressive_execute_orders(
                     print(f"Warning: Could not refresh prices: {e}")
 
                 # Check final status and cross spread
-                final_status = check_order_fills(
-                    exchange, {s: order_ids[s] for s in unfilled_symbols}
-                )
+                final_status = tracker.poll(unfilled_symbols)
 
+                to_cross = {}
                 for symbol in list(unfilled_symbols):
                     if symbol not in final_status or "error" in final_status[symbol]:
                         continue
@@ -721,31 +791,43 @@ def aggressive_execute_orders(
 
                     if remaining > 0:
                         print(f"\n{symbol}: Crossing spread for {remaining:.6f} remaining")
-
-                        cross_order = cross_spread_with_limit_order(
-                            exchange, symbol, status, price_dict
-                        )
-
-                        if cross_order:
-                            crossed_spread_symbols.add(symbol)
-                            # Update order tracking with new crossed-spread order
-                            order_ids[symbol] = cross_order.get("id")
-                            order_info_dict[symbol].update(
-                                {
-                                    "id": cross_order.get("id"),
-                                    "price": cross_order.get("price"),
-                                    "amount": cross_order.get("amount"),
-                                    "filled": cross_order.get("filled", 0),
-                                    "remaining": cross_order.get(
-                                        "remaining", cross_order.get("amount", 0)
-                                    ),
-                                }
-                            )
+                        to_cross[symbol] = status
                     else:
                         print(f"\n{symbol}: ✓ Order filled")
                         filled_symbols.add(symbol)
                         unfilled_symbols.discard(symbol)
 
+                # One bulk cancel and one bulk create for all symbols
+                try:
+                    cross_orders = cross_spread_with_limit_orders(exchange, to_cross, price_dict)
+                except Exception as e:
+                    print(f"Error crossing spread: {e}")
+                    cross_orders = {}
+
+                for symbol, cross_order in cross_orders.items():
+                    crossed_spread_symbols.add(symbol)
+                    # Update order tracking with new crossed-spread order
+                    order_ids[symbol] = cross_order.get("id")
+                    order_info_dict[symbol].update(
+                        {
+                            "id": cross_order.get("id"),
+                            "price": cross_order.get("price"),
+                            "amount": cross_order.get("amount"),
+                            "filled": cross_order.get("filled") or 0,
+                            "remaining": cross_order.get("remaining")
+                            or cross_order.get("amount", 0),
+                        }
+                    )
+                    tracker.track(
+                        symbol,
+                        cross_order.get("id"),
+                        to_cross[symbol]["side"],
+                        cross_order.get("amount"),
+                        cross_order.get("price"),
+                        filled=cross_order.get("filled") or 0.0,
+                        status=cross_order.get("status") or "open",
+                    )
+
                 # STEP 4b: Monitor crossed-spread orders for a short period
                 if crossed_spread_symbols:
                     print(f"\n[4b] Monitoring crossed-spread orders for 15 seconds...")
@@ -777,9 +859,7 @@ def aggressive_execute_orders(
                         )
 
                         # Check if crossed-spread orders filled
-                        cross_status = check_order_fills(
-                            exchange, {s: order_ids[s] for s in crossed_spread_symbols}
-                        )
+                        cross_status = tracker.poll(crossed_spread_symbols)
 
                         for symbol in list(crossed_spread_symbols):
                             if symbol not in cross_status:
@@ -815,9 +895,7 @@ def aggressive_execute_orders(
                         print("-" * 80)
 
                         # Check final status one more time
-                        final_cross_status = check_order_fills(
-                            exchange, {s: order_ids[s] for s in crossed_spread_symbols}
-                        )
+                        final_cross_status = tracker.poll(crossed_spread_symbols)
 
                         for symbol in crossed_spread_symbols:
                             if (
@@ -1007,6 +1085,11 @@ Environment Variables Required (for live trading):
         action="store_true",
         help="Do not cross spread after max time (keep limit orders open)",
     )
+    parser.add_argument(
+        "--ws",
+        action="store_true",
+        help="Stream books and fills over WebSocket instead of polling REST each tick",
+    )
     parser.add_argument("--verbose", "-v", action="store_true", help="Show verbose output")
 
     args = parser.parse_args()
@@ -1038,13 +1121,17 @@ Environment Variables Required (for live trading):
 
     try:
         # Execute orders
-        result = aggressive_execute_orders(
-            trades=trades,
-            tick_interval=args.tick_interval,
-            max_time=args.max_time,
-            cross_spread_after=not args.no_cross_spread,
-            dry_run=dry_run,
+        market_data = (
+            streaming_market_data(list(trades), user=not dry_run) if args.ws else nullcontext()
         )
+        with market_data:
+            result = aggressive_execute_orders(
+                trades=trades,
+                tick_interval=args.tick_interval,
+                max_time=args.max_time,
+                cross_spread_after=not args.no_cross_spread,
+                dry_run=dry_run,
+            )
 
         if not result.get("success"):
             print(f"\n✗ Execution failed: {result.get('error', 'Unknown error')}")
@@ -0,0 +1,620 @@
+"""
+Asyncio Execution Engine - Event-driven price ladder for aggressive execution
+
+aggressive_execute_orders runs every symbol in one synchronous loop: each tick
+fetches prices, checks fills and modifies orders one after another and then
+sleeps, so one slow request delays every symbol and the tick period drifts by
+however long the work took. This engine runs the same strategy on asyncio:
+
+- One ccxt.async_support client (enableRateLimit) shared by all tasks
+- One task per symbol walking its own price ladder
+- Ticks are scheduled on fixed deadlines (start + k * tick_interval); a tick
+  that overruns skips ahead instead of pushing every later tick back
+- Market data and order status are shared: tasks waking on the same tick
+  reuse one fetch_tickers and one open-orders + fills poll (FillTracker)
+- Order actions queued by different tasks within BATCH_WINDOW seconds go out
+  as one bulk request (OrderBatch.submit_async)
+- Each symbol crosses the spread as soon as its own deadline passes
+- With a streaming MarketDataFeed (--ws-market-data), prices, open orders and
+  fills are read from memory wherever the feed covers them
+
+Input (trades dict) and output (summary dict) match aggressive_execute_orders,
+so main.py can switch engines with --async-execution.
+
+Usage:
+    from async_execution import aggressive_execute_orders_async
+    result = aggressive_execute_orders_async(trades, tick_interval=2.0, max_time=60)
+"""
+
+import asyncio
+import math
+import os
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import ccxt.async_support as ccxt_async
+import numpy as np
+
+# Add workspace root to path for the shared common/ utilities
+WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from common.tracing import span
+
+from fill_tracker import FillTracker
+from order_batch import OrderBatch
+from price_snapshot import PriceSnapshot, get_market_data_feed
+
+# Seconds order actions from different tasks are collected before one bulk submit
+BATCH_WINDOW = 0.05
+
+# Seconds a crossed-spread order is monitored, and the poll interval while waiting
+CROSS_SPREAD_WAIT = 15.0
+CROSS_SPREAD_POLL_INTERVAL = 2.0
+
+# Each tick moves this fraction of the remaining distance to the max/min price
+LADDER_STEP = 0.2
+
+# Smaller relative moves are not worth an edit
+MIN_PRICE_MOVE = 0.001
+
+
+def create_async_exchange():
+    """
+    Hyperliquid ccxt.async_support client for the HL_API / HL_SECRET account.
+
+    Async clients are bound to the event loop that uses them, so one is
+    created per run (not pooled like exchange_session) and closed afterwards.
+    Without credentials the client is public (market data only).
+
+    Returns:
+        ccxt.async_support.Exchange
+    """
+    config = {"enableRateLimit": True}
+    api_key = os.getenv("HL_API")
+    secret_key = os.getenv("HL_SECRET")
+    if api_key and secret_key:
+        config.update({"privateKey": secret_key, "walletAddress": api_key})
+    return ccxt_async.hyperliquid(config)
+
+
+def ladder_price(
+    side: str, current_price: float, max_price: float, min_price: float, step: float = LADDER_STEP
+):
+    """
+    Next price on the ladder (same rule as aggressive_execute_orders).
+
+    Buys walk up towards max_price, sells walk down towards min_price, by
+    `step` (default LADDER_STEP) of the remaining distance.
+
+    Returns:
+        float or None: New price, or None if the move is below MIN_PRICE_MOVE
+    """
+    if not current_price:
+        return None
+    if side == "buy":
+        if current_price >= max_price:
+            return None
+        new_price = min(current_price + (max_price - current_price) * step, max_price)
+    else:
+        if current_price <= min_price:
+            return None
+        new_price = max(current_price - (current_price - min_price) * step, min_price)
+
+    if abs(new_price - current_price) / current_price <= MIN_PRICE_MOVE:
+        return None
+    return new_price
+
+
+class SharedPoll:
+    """Awaitable fetch shared by concurrent callers"""
+
+    def __init__(self, fetch: Callable[[], Awaitable], max_age: float):
+        """
+        Args:
+            fetch: Coroutine function performing the request
+            max_age: A fetch that started at most this many seconds before a
+                     caller arrived is reused for that caller
+        """
+        self._fetch = fetch
+        self.max_age = max_age
+        self.fetches = 0
+        self._value = None
+        self._started: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, max_age: Optional[float] = None):
+        """Latest result, fetching only if none is recent enough"""
+        max_age = self.max_age if max_age is None else max_age
+        loop = asyncio.get_running_loop()
+        arrived = loop.time()
+
+        async with self._lock:
+            if self._started is None or self._started < arrived - max_age:
+                started = loop.time()
+                self._value = await self._fetch()
+                self._started = started
+                self.fetches += 1
+            return self._value
+
+
+class OrderActionBatcher:
+    """Coalesces order actions from concurrent tasks into bulk requests"""
+
+    def __init__(self, exchange, window: float = BATCH_WINDOW):
+        """
+        Args:
+            exchange: ccxt.async_support exchange instance
+            window: Seconds to collect actions before submitting them together
+        """
+        self.exchange = exchange
+        self.window = window
+        self.requests_sent = 0
+        self._batch = OrderBatch(exchange)
+        self._waiters: Dict[tuple, asyncio.Future] = {}
+        self._flush: Optional[asyncio.Task] = None
+
+    async def submit(self, action: str, *args, **kwargs) -> dict:
+        """
+        Queue an action ('create', 'edit' or 'cancel' with OrderBatch's
+        arguments) and wait for its result.
+
+        Returns:
+            dict: {'symbol', 'success', 'order', 'error'} (see OrderBatch.submit)
+        """
+        key = getattr(self._batch, action)(*args, **kwargs)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[(action, key)] = future
+        if self._flush is None:
+            self._flush = asyncio.ensure_future(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window)
+        batch, waiters = self._batch, self._waiters
+        self._batch, self._waiters, self._flush = OrderBatch(self.exchange), {}, None
+
+        try:
+            results = await batch.submit_async()
+            error = "No status returned for order"
+        except Exception as e:
+            results, error = None, str(e)
+        self.requests_sent += batch.requests_sent
+
+        for (action, key), future in waiters.items():
+            result = (results or {}).get(action, {}).get(key)
+            if result is None:
+                result = {"symbol": None, "success": False, "order": None, "error": error}
+            if not future.done():
+                future.set_result(result)
+
+
+class AsyncExecutionEngine:
+    """Runs one price-ladder task per symbol on a shared async client"""
+
+    def __init__(
+        self,
+        exchange,
+        tick_interval: float = 2.0,
+        max_time: float = 60,
+        cross_spread_after: bool = True,
+        dry_run: bool = True,
+        cross_spread_wait: float = CROSS_SPREAD_WAIT,
+        batch_window: float = BATCH_WINDOW,
+        ladder_step: float = LADDER_STEP,
+        clock: Optional[Callable[[], float]] = None,
+        market_data=None,
+    ):
+        """
+        Args:
+            exchange: ccxt.async_support exchange instance
+            tick_interval: Seconds between ladder steps
+            max_time: Seconds before a symbol crosses the spread
+            cross_spread_after: Cross the spread for unfilled orders after max_time
+            dry_run: Only print the initial orders
+            cross_spread_wait: Seconds a crossed-spread order is monitored
+            batch_window: Seconds order actions are collected per bulk request
+            ladder_step: Fraction of the remaining distance walked each tick
+            clock: Wall clock in seconds since the epoch for fill windows
+                   (default: time.time; the execution simulator passes its virtual clock)
+            market_data: Streaming MarketDataFeed serving prices, open orders and fills
+                         where it covers them (default: the feed registered with
+                         price_snapshot.set_market_data_feed, if any)
+        """
+        self.exchange = exchange
+        self.tick_interval = tick_interval
+        self.max_time = max_time
+        self.cross_spread_after = cross_spread_after
+        self.dry_run = dry_run
+        self.cross_spread_wait = cross_spread_wait
+        self.cross_poll_interval = min(CROSS_SPREAD_POLL_INTERVAL, tick_interval)
+        self.ladder_step = ladder_step
+        self._clock = clock or time.time
+        self.market_data = market_data if market_data is not None else get_market_data_feed()
+        self._symbols = []
+
+        self.tracker = FillTracker(exchange, clock=self._clock)
+        self.orders = OrderActionBatcher(exchange, batch_window)
+        # Tasks waking on the same tick share one request
+        self.prices = SharedPoll(self._fetch_prices, tick_interval / 2)
+        self.statuses = SharedPoll(self._fetch_statuses, tick_interval / 2)
+
+    async def _fetch_prices(self) -> PriceSnapshot:
+        feed = self.market_data
+        if feed is not None and self._symbols and feed.covers(self._symbols):
+            return feed.snapshot(self._symbols)
+        return PriceSnapshot.from_tickers(await self.exchange.fetch_tickers())
+
+    async def _fetch_statuses(self) -> Dict[str, dict]:
+        started_ms = int(self._clock() * 1000)
+        feed = self.market_data
+        if feed is not None and feed.has_user_data:
+            open_orders = feed.fetch_open_orders()
+            trades = feed.fetch_my_trades(since=self.tracker.fills_since_ms)
+        else:
+            open_orders = await self.exchange.fetch_open_orders()
+            trades = await self.exchange.fetch_my_trades(since=self.tracker.fills_since_ms)
+        return self.tracker.apply(open_orders, trades, started_ms)
+
+    @staticmethod
+    def plan_order(notional: float, prices: dict) -> dict:
+        """
+        Initial order and price bounds (same sizing as aggressive_execute_orders).
+
+        Buys are sized at max_price = last + spread * 2 and start at the bid;
+        sells are sized at min_price = last - spread * 2 and start at the ask.
+        """
+        bid, ask, last, spread = prices["bid"], prices["ask"], prices["last"], prices["spread"]
+        if notional > 0:
+            max_price = last + spread * 2
+            return {
+                "side": "buy",
+                "amount": notional / max_price,
+                "price": bid,
+                "max_price": max_price,
+                "min_price": bid,
+            }
+        min_price = last - spread * 2
+        return {
+            "side": "sell",
+            "amount": abs(notional) / min_price,
+            "price": ask,
+            "max_price": ask,
+            "min_price": min_price,
+        }
+
+    async def _status(self, symbol: str, max_age: Optional[float] = None) -> Optional[dict]:
+        try:
+            return (await self.statuses.get(max_age)).get(symbol)
+        except Exception as e:
+            print(f"  {symbol}: Warning - could not poll order status: {e}")
+            return None
+
+    async def _sleep_until(self, deadline: float):
+        await asyncio.sleep(max(0.0, deadline - asyncio.get_running_loop().time()))
+
+    async def _run_symbol(self, symbol: str, plan: dict, deadline: float) -> dict:
+        """Place, walk the ladder until the deadline, then cross the spread"""
+        loop = asyncio.get_running_loop()
+        side = plan["side"]
+        outcome = {"symbol": symbol, "status": "error", "placed": False, "ticks": 0}
+
+        if self.dry_run:
+            limit = plan["max_price"] if side == "buy" else plan["min_price"]
+            print(
+                f"  {symbol}: [DRY RUN] Would place {side.upper()} {plan['amount']:.6f} "
+                f"@ ${plan['price']:.4f}, walking towards ${limit:.4f}"
+            )
+            outcome["status"] = "dry_run"
+            return outcome
+
+        result = await self.orders.submit("create", symbol, side, plan["amount"], plan["price"])
+        if not result["success"]:
+            print(f"  {symbol}: ✗ Error placing order: {result['error']}")
+            return outcome
+
+        order = result["order"]
+        order_id = order.get("id")
+        self.tracker.track(
+            symbol,
+            order_id,
+            side,
+            plan["amount"],
+            plan["price"],
+            filled=order.get("filled") or 0.0,
+            status=order.get("status") or "open",
+        )
+        outcome.update({"status": "open", "placed": True})
+        print(f"  {symbol}: ✓ {side.upper()} placed @ ${plan['price']:.4f} - ID: {order_id}")
+
+        next_tick = loop.time()
+        while True:
+            next_tick += self.tick_interval
+            now = loop.time()
+            if next_tick < now:
+                # Overran: skip the ticks already missed instead of bunching them up
+                next_tick += math.ceil((now - next_tick) / self.tick_interval) * self.tick_interval
+            if next_tick >= deadline:
+                break
+            await self._sleep_until(next_tick)
+            outcome["ticks"] += 1
+            with span("execution.tick", symbol=symbol, tick=outcome["ticks"]):
+                if await self._ladder_tick(symbol, plan, outcome):
+                    return outcome
+
+        await self._sleep_until(deadline)
+        if self.cross_spread_after:
+            await self._cross_spread(symbol, plan, outcome)
+        return outcome
+
+    async def _ladder_tick(self, symbol: str, plan: dict, outcome: dict) -> bool:
+        """Check the order and walk it one ladder step; True once it is filled or canceled"""
+        side = plan["side"]
+        status = await self._status(symbol)
+        if status is not None and status.get("id") != self.tracker.order_id(symbol):
+            # A shared poll from before our last edit describes the replaced order
+            status = await self._status(symbol, max_age=0)
+        if status is None or "error" in status:
+            return False
+        if status["id"] != self.tracker.order_id(symbol):
+            return False
+        if status["status"] == "closed":
+            print(f"  {symbol}: ✓ FILLED")
+            outcome["status"] = "filled"
+            return True
+        if status["status"] == "canceled":
+            print(f"  {symbol}: ✗ Order canceled externally")
+            outcome["status"] = "canceled"
+            return True
+
+        new_price = ladder_price(
+            side, status["price"], plan["max_price"], plan["min_price"], self.ladder_step
+        )
+        if new_price is None:
+            return False
+
+        # The replacement is sized to what is left; earlier fills stay with the symbol
+        remaining = status["remaining"]
+        if remaining <= 0:
+            return False
+        result = await self.orders.submit("edit", status["id"], symbol, side, remaining, new_price)
+        if result["success"]:
+            new_id = result["order"].get("id") or status["id"]
+            self.tracker.track(
+                symbol,
+                new_id,
+                side,
+                remaining,
+                new_price,
+                filled=result["order"].get("filled") or 0.0,
+                status=result["order"].get("status") or "open",
+                prior_filled=status["filled"],
+            )
+            print(f"  {symbol}: Ladder ${status['price']:.4f} → ${new_price:.4f}")
+        else:
+            print(f"  {symbol}: Error modifying order: {result['error']}")
+        return False
+
+    async def _cross_spread(self, symbol: str, plan: dict, outcome: dict):
+        """Replace the resting order with a limit order at the opposite side of the book"""
+        loop = asyncio.get_running_loop()
+        side = plan["side"]
+
+        # Only a poll started after the deadline is trusted here
+        status = await self._status(symbol, max_age=0)
+        if status is None or "error" in status:
+            return
+        if status["status"] == "closed" or status["remaining"] <= 0:
+            print(f"  {symbol}: ✓ FILLED")
+            outcome["status"] = "filled"
+            return
+
+        try:
+            prices = (await self.prices.get()).get(symbol)
+        except Exception as e:
+            print(f"  {symbol}: Error - could not fetch prices to cross spread: {e}")
+            return
+        cross_price = prices and (prices["ask"] if side == "buy" else prices["bid"])
+        if not cross_price or np.isnan(cross_price):
+            print(f"  {symbol}: Error - No price data available")
+            return
+
+        cancel = await self.orders.submit("cancel", status["id"], symbol)
+        if not cancel["success"]:
+            # Usually means it filled meanwhile; a new order could overfill
+            print(f"  {symbol}: Could not cancel order ({cancel['error']}), not crossing")
+            return
+
+        remaining = status["remaining"]
+        created = await self.orders.submit("create", symbol, side, remaining, cross_price)
+        if not created["success"]:
+            print(f"  {symbol}: Error placing limit order: {created['error']}")
+            return
+
+        order = created["order"]
+        self.tracker.track(
+            symbol,
+            order.get("id"),
+            side,
+            remaining,
+            cross_price,
+            filled=order.get("filled") or 0.0,
+            status=order.get("status") or "open",
+            prior_filled=status["filled"],
+        )
+        outcome["status"] = "crossed"
+        print(f"  {symbol}: Crossed spread - {remaining:.6f} @ ${cross_price:.4f}")
+
+        wait_deadline = loop.time() + self.cross_spread_wait
+        next_poll = loop.time()
+        while True:
+            next_poll += self.cross_poll_interval
+            if next_poll > wait_deadline:
+                break
+            await self._sleep_until(next_poll)
+            status = await self._status(symbol)
+            if status is not None and status.get("status") == "closed":
+                print(f"  {symbol}: ✓ FILLED (crossed spread)")
+                outcome["status"] = "filled"
+                return
+
+        print(f"  {symbol}: Crossed-spread order still open (left resting, no market orders)")
+
+    async def run(self, trades: Dict[str, float]) -> dict:
+        """
+        Execute trades.
+
+        Args:
+            trades: Dictionary mapping symbol to notional amount (positive = buy)
+
+        Returns:
+            dict: Same summary as aggressive_execute_orders
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self._symbols = list(trades)
+
+        try:
+            snapshot = await self.prices.get()
+        except Exception as e:
+            print(f"\n✗ Failed to fetch prices: {e}")
+            return {"success": False, "error": str(e)}
+
+        plans = {}
+        for symbol, notional in trades.items():
+            if notional == 0:
+                print(f"{symbol}: SKIP (amount is zero)")
+                continue
+            prices = snapshot.get(symbol)
+            if prices is None or not all(prices[k] > 0 for k in ("bid", "ask", "last")):
+                print(f"{symbol}: ERROR - No price data")
+                continue
+            plans[symbol] = self.plan_order(notional, prices)
+
+        deadline = start + self.max_time
+        outcomes = await asyncio.gather(
+            *(self._run_symbol(symbol, plan, deadline) for symbol, plan in plans.items()),
+            return_exceptions=True,
+        )
+
+        results = []
+        for symbol, outcome in zip(plans, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"  {symbol}: ✗ Task failed: {outcome}")
+                outcome = {"symbol": symbol, "status": "error", "placed": False, "ticks": 0}
+            results.append(outcome)
+
+        placed = [o for o in results if o["placed"]]
+        if not self.dry_run and not placed:
+            print("\n✗ No orders were placed")
+            return {"success": False, "error": "No orders placed"}
+
+        filled = [o for o in placed if o["status"] == "filled"]
+        return {
+            "success": True,
+            "total_trades": len(trades),
+            "orders_placed": len(placed) if not self.dry_run else len(results),
+            "filled": len(filled),
+            "remaining": len(placed) - len(filled),
+            "ticks": max((o["ticks"] for o in results), default=0),
+            "elapsed_time": loop.time() - start,
+        }
+
+
+async def run_aggressive_execution(
+    trades: Dict[str, float],
+    tick_interval: float = 2.0,
+    max_time: float = 60,
+    cross_spread_after: bool = True,
+    dry_run: bool = True,
+    exchange=None,
+    **kwargs,
+) -> dict:
+    """
+    Coroutine form of aggressive_execute_orders_async.
+
+    Args:
+        exchange: ccxt.async_support client (default: created from HL_API /
+                  HL_SECRET and closed when done)
+        **kwargs: Passed to AsyncExecutionEngine (cross_spread_wait, batch_window,
+                  ladder_step, clock, market_data)
+    """
+    print("=" * 80)
+    print("AGGRESSIVE ORDER EXECUTION - ASYNC ENGINE")
+    print("=" * 80)
+    print(f"Mode: {'DRY RUN' if dry_run else 'LIVE TRADING'}")
+    print(f"Tick interval: {tick_interval}s")
+    print(f"Max time: {max_time}s")
+    print(f"Cross spread after max time: {cross_spread_after}")
+    print("=" * 80)
+
+    if not trades:
+        print("\nNo trades to execute.")
+        return {"success": False, "error": "No trades provided"}
+
+    owns_exchange = exchange is None
+    if owns_exchange:
+        exchange = create_async_exchange()
+
+    try:
+        engine = AsyncExecutionEngine(
+            exchange,
+            tick_interval=tick_interval,
+            max_time=max_time,
+            cross_spread_after=cross_spread_after,
+            dry_run=dry_run,
+            **kwargs,
+        )
+        result = await engine.run(trades)
+    finally:
+        if owns_exchange:
+            await exchange.close()
+
+    if result.get("success"):
+        print("\n" + "=" * 80)
+        print("EXECUTION SUMMARY")
+        print("=" * 80)
+        print(f"Orders placed:   {result['orders_placed']}")
+        print(f"Filled:          {result['filled']}")
+        print(f"Remaining:       {result['remaining']}")
+        print(f"Elapsed time:    {result['elapsed_time']:.1f}s")
+        if not dry_run:
+            print(f"Order requests:  {engine.orders.requests_sent} (bulk)")
+        print("=" * 80)
+    return result
+
+
+def aggressive_execute_orders_async(
+    trades: Dict[str, float],
+    tick_interval: float = 2.0,
+    max_time: float = 60,
+    cross_spread_after: bool = True,
+    dry_run: bool = True,
+    **kwargs,
+) -> dict:
+    """
+    Drop-in replacement for aggressive_execute_orders running on asyncio.
+
+    Args:
+        trades: Dictionary mapping symbol to notional amount
+                Positive = buy, Negative = sell
+        tick_interval: Seconds between ladder steps (default: 2.0)
+        max_time: Seconds before each symbol crosses the spread (default: 60)
+        cross_spread_after: Cross spread for remaining orders after max_time (default: True)
+        dry_run: If True, only prints actions without executing
+
+    Returns:
+        dict: Summary of execution results
+    """
+    return asyncio.run(
+        run_aggressive_execution(
+            trades,
+            tick_interval=tick_interval,
+            max_time=max_time,
+            cross_spread_after=cross_spread_after,
+            dry_run=dry_run,
+            **kwargs,
+        )
+    )
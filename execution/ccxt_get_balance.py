@@ -1,35 +1,34 @@
-import ccxt
 import os
+import sys
 from pprint import pprint
 
+# Import the session pool by one module name, so every caller shares its pool
+EXECUTION_DIR = os.path.dirname(os.path.abspath(__file__))
+if EXECUTION_DIR not in sys.path:
+    sys.path.insert(0, EXECUTION_DIR)
 
-def ccxt_get_hyperliquid_balance():
+from exchange_session import get_exchange
+
+
+def ccxt_get_hyperliquid_balance(exchange=None):
     """
     Fetch account balance from Hyperliquid exchange.
     Fetches both perp (swap) and spot account balances.
 
-    Requires environment variables:
+    Args:
+        exchange: ccxt exchange instance (default: pooled client, see exchange_session.py)
+
+    Requires environment variables (when no exchange is passed):
         HL_API: Hyperliquid API key (wallet address)
         HL_SECRET: Hyperliquid secret key
 
     Returns:
         Dictionary containing both perp and spot account balance information
     """
-    # Get API credentials from environment variables
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
-        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
-
-    # Initialize Hyperliquid exchange with authentication
-    exchange = ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
+    # Pooled authenticated client (raises ValueError without HL_API / HL_SECRET)
+    if exchange is None:
+        exchange = get_exchange()
+    api_key = exchange.walletAddress
 
     try:
         # Fetch perp (swap) account balance - includes marginSummary
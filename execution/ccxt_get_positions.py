@@ -1,29 +1,30 @@
-import ccxt
 import os
+import sys
 
+# Import the session pool by one module name, so every caller shares its pool
+EXECUTION_DIR = os.path.dirname(os.path.abspath(__file__))
+if EXECUTION_DIR not in sys.path:
+    sys.path.insert(0, EXECUTION_DIR)
 
-def ccxt_get_positions():
+from exchange_session import get_exchange
+
+
+def ccxt_get_positions(exchange=None):
     """
     Fetch account positions from Hyperliquid using API credentials.
 
+    Args:
+        exchange: ccxt exchange instance (default: pooled client, see exchange_session.py)
+
     Returns:
         List of position dictionaries containing position details
     """
-    # Get API credentials from environment variables
-    api_key = os.getenv("HL_API")
-    api_secret = os.getenv("HL_SECRET")
-
-    if not api_key or not api_secret:
-        raise ValueError("HL_API and HL_SECRET environment variables must be set")
-
-    # Initialize Hyperliquid exchange with authentication
-    exchange = ccxt.hyperliquid(
-        {
-            "privateKey": api_secret,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
+    if exchange is None:
+        if not os.getenv("HL_API") or not os.getenv("HL_SECRET"):
+            raise ValueError("HL_API and HL_SECRET environment variables must be set")
+
+        # Pooled authenticated client
+        exchange = get_exchange()
 
     try:
         # Fetch account positions (for perp/swap markets)
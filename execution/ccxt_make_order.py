@@ -1,10 +1,17 @@
-import ccxt
-import os
 import argparse
+import os
+import sys
 from pprint import pprint
 
+# Import the session pool by one module name, so every caller shares its pool
+EXECUTION_DIR = os.path.dirname(os.path.abspath(__file__))
+if EXECUTION_DIR not in sys.path:
+    sys.path.insert(0, EXECUTION_DIR)
+
+from exchange_session import get_exchange
+
 
-def ccxt_make_order(symbol, notional_amount, side, order_type, price=None):
+def ccxt_make_order(symbol, notional_amount, side, order_type, price=None, exchange=None):
     """
     Place a market or limit order on Hyperliquid exchange.
 
@@ -14,20 +21,18 @@ def ccxt_make_order(symbol, notional_amount, side, order_type, price=None):
         side: 'buy' or 'sell'
         order_type: 'market' or 'limit'
         price: Price for limit orders (required for limit, ignored for market)
+        exchange: ccxt exchange instance (default: pooled client, see exchange_session.py)
 
-    Requires environment variables:
+    Requires environment variables (when no exchange is passed):
         HL_API: Hyperliquid API key (wallet address)
         HL_SECRET: Hyperliquid secret key
 
     Returns:
         Dictionary containing order response
     """
-    # Get API credentials from environment variables
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
-        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
+    # Pooled authenticated client (raises ValueError without HL_API / HL_SECRET)
+    if exchange is None:
+        exchange = get_exchange()
 
     # Validate inputs
     side = side.lower()
@@ -44,15 +49,6 @@ def ccxt_make_order(symbol, notional_amount, side, order_type, price=None):
     if notional_amount <= 0:
         raise ValueError("Notional amount must be positive")
 
-    # Initialize Hyperliquid exchange with authentication
-    exchange = ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
-
     try:
         # Fetch current market price and ticker to calculate amount
         ticker = exchange.fetch_ticker(symbol)
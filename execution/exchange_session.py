@@ -0,0 +1,127 @@
+"""
+Exchange Session Pool - One long-lived Hyperliquid client per account
+
+Execution helpers used to build a fresh ccxt.hyperliquid(...) on every call,
+which re-loads markets (two info requests) and opens new HTTP connections
+each time; modify_order did this for every ladder step. The pool keeps one
+client per account (plus one unauthenticated client for public data) for
+the life of the process:
+
+- ccxt's requests.Session is reused, so HTTP keep-alive connections persist
+- load_markets() runs once per client and is refreshed after `markets_ttl`
+  seconds (new listings / tick size changes), not on every call
+- Every execution function accepts an optional `exchange` argument; when it
+  is omitted the pooled client for the HL_API / HL_SECRET account is used
+
+Usage:
+    from exchange_session import get_exchange
+    exchange = get_exchange()          # authenticated, from environment
+    exchange = get_public_exchange()   # market data only
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import ccxt
+
+# Seconds before a client's markets are reloaded
+DEFAULT_MARKETS_TTL = 3600.0
+
+
+class ExchangeSessionPool:
+    """Process-wide cache of exchange clients keyed by account"""
+
+    def __init__(self, exchange_id: str = "hyperliquid", markets_ttl: float = DEFAULT_MARKETS_TTL):
+        """
+        Args:
+            exchange_id: ccxt exchange id
+            markets_ttl: Seconds before load_markets() is refreshed
+        """
+        self.exchange_id = exchange_id
+        self.markets_ttl = markets_ttl
+        self._clients: Dict[Tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def _refresh_markets(self, entry: dict):
+        """Load markets on first use and again once they are older than the TTL."""
+        # Per-client lock: a slow venue only blocks callers of the same client
+        with entry["lock"]:
+            loaded_at = entry["markets_loaded_at"]
+            if loaded_at is not None and time.time() - loaded_at <= self.markets_ttl:
+                return
+            try:
+                entry["client"].load_markets(reload=loaded_at is not None)
+                entry["markets_loaded_at"] = time.time()
+            except Exception as e:
+                # Keep serving the client; ccxt loads markets lazily if still missing
+                print(f"  Warning: Could not load markets for {self.exchange_id}: {e}")
+
+    def get(self, wallet_address: Optional[str] = None, private_key: Optional[str] = None):
+        """
+        Pooled client for an account (or the public client when no credentials).
+
+        Args:
+            wallet_address: Account wallet address (HL_API)
+            private_key: Account private key (HL_SECRET)
+
+        Returns:
+            ccxt.Exchange: Long-lived client with markets loaded
+        """
+        # The class is part of the key so patched/replaced clients get their own entry
+        factory = getattr(ccxt, self.exchange_id)
+        key = (factory, wallet_address, private_key)
+
+        # The pool lock only guards the dict; markets load outside it
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                config = {"enableRateLimit": True}
+                if wallet_address and private_key:
+                    config.update({"privateKey": private_key, "walletAddress": wallet_address})
+                entry = self._clients[key] = {
+                    "client": factory(config),
+                    "markets_loaded_at": None,
+                    "lock": threading.Lock(),
+                }
+        self._refresh_markets(entry)
+        return entry["client"]
+
+    def clear(self):
+        """Drop all pooled clients (e.g. after rotating credentials)"""
+        with self._lock:
+            self._clients.clear()
+
+
+# One pool per process; callers import this module as "exchange_session"
+_pool = ExchangeSessionPool()
+
+
+def get_session_pool() -> ExchangeSessionPool:
+    """The process-wide pool"""
+    return _pool
+
+
+def get_exchange():
+    """
+    Pooled authenticated Hyperliquid client for the HL_API / HL_SECRET account.
+
+    Raises:
+        ValueError: If the credentials are not set
+
+    Returns:
+        ccxt.Exchange: Authenticated client
+    """
+    api_key = os.getenv("HL_API")
+    secret_key = os.getenv("HL_SECRET")
+
+    if not api_key or not secret_key:
+        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
+
+    return _pool.get(api_key, secret_key)
+
+
+def get_public_exchange():
+    """Pooled unauthenticated Hyperliquid client for market data"""
+    return _pool.get()
@@ -0,0 +1,804 @@
+"""
+Execution Simulator - Replay recorded order books through the execution code
+
+Dry runs only print orders, so they say nothing about how the ladder
+parameters (tick_interval, max_time, ladder step, cross-spread wait) or the
+patient-mode spread multipliers trade fill rate against slippage. This
+simulator replays recorded L2 books and fills orders with a queue-position
+model, deterministically and in virtual time:
+
+- SimulatedExchange implements the async exchange calls the asyncio engine
+  (async_execution.py) makes: fetch_tickers, create_orders, edit_orders,
+  cancel_orders_for_symbols, fetch_open_orders, fetch_my_trades. The engine
+  runs unchanged, exactly as with --async-execution.
+- The engine runs on an event loop with a virtual clock: asyncio.sleep
+  advances the clock instead of waiting, so a 75 second rebalance replays in
+  milliseconds.
+- sweep_parameters() runs a parameter grid over many rebalance start times
+  in a process pool and reports fill rate and slippage per combination.
+
+Book sources (load_book_timeline):
+- .jsonl: sessions recorded by MarketDataFeed(record_path=...) (full L2)
+- .csv:   collect_liquidity_snapshots.py output. It only has summary
+          columns, so each row becomes a two-level book: the best level, and
+          the rest of the depth at its average price.
+
+Fill model (per resting order, applied at every recorded book update):
+- Marketable orders (buy >= best ask, sell <= best bid) fill as taker
+  against the displayed levels up to the limit price. Recorded books do
+  not show our own trades, so size taken from a level stays taken until
+  the displayed size drops below it.
+- A passive order joins the back of the queue at its price level
+  (queue_ahead = displayed size; 0 when it improves the book). When the
+  displayed size at that level shrinks, TRADE_FRACTION of the decrease is
+  counted as trades: it consumes the queue ahead first, then fills the
+  order at its limit price. The rest counts as cancellations spread
+  evenly through the queue. Size added to the level queues behind us.
+- An edit is a cancel and replace, so the order loses its queue position.
+- Edits and cancels meet the book `latency` seconds after they are sent; an
+  order that fills in between is reported as already filled.
+
+Usage:
+    timeline = load_book_timeline("data/raw/liquidity_snapshots.csv")
+    result = simulate_rebalance(timeline, trades, start_time, {"tick_interval": 1.0})
+
+    python3 execution_simulator.py --books session.jsonl \\
+        --trades "BTC/USDC:USDC:500" "ETH/USDC:USDC:-300" \\
+        --grid '{"tick_interval": [1, 2], "ladder_step": [0.1, 0.2, 0.4]}' \\
+        --starts 200 --output backtests/results/ladder_sweep.csv
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import selectors
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from async_execution import CROSS_SPREAD_WAIT, run_aggressive_execution
+from market_data import OrderBook
+from send_spread_offset_orders import spread_offset_price
+
+# Share of a displayed-size decrease at our level counted as trades (rest: cancels)
+TRADE_FRACTION = 0.5
+
+# Hyperliquid base tier fees
+MAKER_FEE = 0.00015
+TAKER_FEE = 0.00045
+
+# Levels kept per side from recorded sessions
+BOOK_DEPTH = 20
+
+# Patient mode splits orders of at least this notional across two offsets (as main.py)
+PATIENT_SPLIT_NOTIONAL = 20.0
+
+# Seconds a patient-mode order is given to fill
+PATIENT_HORIZON = 300.0
+
+# Parameters simulate_rebalance accepts for each strategy
+LADDER_PARAMS = (
+    "tick_interval",
+    "max_time",
+    "cross_spread_after",
+    "cross_spread_wait",
+    "ladder_step",
+)
+PATIENT_PARAMS = ("patient", "horizon")
+
+# (price, size) levels per side, best first
+Book = Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]
+
+
+class BookTimeline:
+    """Recorded L2 books per symbol, indexed by time"""
+
+    def __init__(self, books: Dict[str, Tuple[Sequence[float], Sequence[Book]]]):
+        """
+        Args:
+            books: {symbol: (times in seconds since the epoch, books)} with
+                   books as (bids, asks) lists of (price, size), best first
+        """
+        self.times: Dict[str, np.ndarray] = {}
+        self.books: Dict[str, List[Book]] = {}
+        for symbol, (times, symbol_books) in books.items():
+            order = np.argsort(np.asarray(times, dtype=float), kind="stable")
+            self.times[symbol] = np.asarray(times, dtype=float)[order]
+            self.books[symbol] = [symbol_books[i] for i in order]
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.books)
+
+    @property
+    def start(self) -> float:
+        return min(times[0] for times in self.times.values())
+
+    @property
+    def end(self) -> float:
+        return max(times[-1] for times in self.times.values())
+
+    def index_at(self, symbol: str, timestamp: float) -> int:
+        """Index of the latest book at or before timestamp (-1 if none)"""
+        return int(np.searchsorted(self.times[symbol], timestamp, side="right")) - 1
+
+    def book_at(self, symbol: str, timestamp: float) -> Optional[Book]:
+        if symbol not in self.books:
+            return None
+        i = self.index_at(symbol, timestamp)
+        return self.books[symbol][i] if i >= 0 else None
+
+    def start_times(self, count: int, duration: float) -> List[float]:
+        """`count` evenly spaced start times leaving `duration` seconds of data"""
+        last = self.end - duration
+        if last < self.start:
+            return [self.start]
+        return list(np.linspace(self.start, last, count)) if count > 1 else [self.start]
+
+
+def _timeline_from_recording(path: str) -> BookTimeline:
+    """Books after every book message of a MarketDataFeed recording"""
+    live: Dict[str, OrderBook] = {}
+    books: Dict[str, Tuple[list, list]] = {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if message.get("channel") != "book":
+                continue
+            symbol = message["symbol"]
+            received_at = message.get("received_at", 0.0)
+            book = live.setdefault(symbol, OrderBook(symbol))
+            book.apply(message, received_at)
+            if not book.in_sync:
+                continue
+            levels = book.levels(BOOK_DEPTH)
+            times, symbol_books = books.setdefault(symbol, ([], []))
+            times.append(received_at)
+            symbol_books.append(
+                (
+                    [tuple(level) for level in levels["bids"]],
+                    [tuple(level) for level in levels["asks"]],
+                )
+            )
+    return BookTimeline(books)
+
+
+def _timeline_from_liquidity_snapshots(path: str) -> BookTimeline:
+    """Two-level books from collect_liquidity_snapshots.py rows"""
+    df = pd.read_csv(path)
+    df["timestamp"] = (pd.to_datetime(df["timestamp"]) - pd.Timestamp(0)).dt.total_seconds()
+    books = {}
+    for symbol, rows in df.groupby("symbol", sort=False):
+
+        def side(best, best_size, avg, total_size):
+            levels = [(best, best_size)]
+            rest = total_size - best_size
+            if rest > 0 and avg != best:
+                levels.append((avg, rest))
+            return levels
+
+        symbol_books = [
+            (
+                side(r.best_bid, r.best_bid_size, r.avg_bid_price, r.total_bid_size),
+                side(r.best_ask, r.best_ask_size, r.avg_ask_price, r.total_ask_size),
+            )
+            for r in rows.itertuples()
+        ]
+        books[symbol] = (rows["timestamp"].to_numpy(), symbol_books)
+    return BookTimeline(books)
+
+
+def load_book_timeline(path: str) -> BookTimeline:
+    """
+    Load recorded books for replay.
+
+    Args:
+        path: MarketDataFeed recording (.jsonl) or liquidity snapshots (.csv)
+
+    Returns:
+        BookTimeline
+    """
+    if path.endswith(".csv"):
+        return _timeline_from_liquidity_snapshots(path)
+    return _timeline_from_recording(path)
+
+
+class VirtualClock:
+    """Simulated wall clock in seconds since the epoch"""
+
+    def __init__(self, start: float):
+        self.start = start
+        # Kept apart from start: sub-microsecond loop timeouts vanish when added to epoch seconds
+        self.elapsed = 0.0
+
+    @property
+    def now(self) -> float:
+        return self.start + self.elapsed
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _VirtualTimeSelector(selectors.DefaultSelector):
+    """Selector that advances the virtual clock instead of blocking"""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self._clock = clock
+
+    def select(self, timeout=None):
+        if timeout:
+            self._clock.elapsed += timeout
+        return super().select(0)
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time() is a VirtualClock: sleeps complete immediately"""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__(_VirtualTimeSelector(clock))
+        self._virtual_clock = clock
+
+    def time(self) -> float:
+        return self._virtual_clock.elapsed
+
+
+class SimulatedExchange:
+    """Async exchange stand-in filling orders against a BookTimeline"""
+
+    has = {"createOrders": True, "editOrders": True, "cancelOrdersForSymbols": True}
+
+    def __init__(
+        self,
+        timeline: BookTimeline,
+        clock: VirtualClock,
+        latency: float = 0.0,
+        trade_fraction: float = TRADE_FRACTION,
+    ):
+        """
+        Args:
+            timeline: Recorded books
+            clock: Virtual clock shared with the event loop
+            latency: Seconds between an order action and the book it meets
+            trade_fraction: Share of a level's size decrease counted as trades
+        """
+        self.timeline = timeline
+        self.clock = clock
+        self.latency = latency
+        self.trade_fraction = trade_fraction
+        self.orders: Dict[str, dict] = {}  # resting orders by id
+        self.fills: List[dict] = []
+        # (symbol, book side) -> {price: size our orders took from the displayed level}
+        self._consumed: Dict[Tuple[str, str], Dict[float, float]] = {}
+        self.requests = 0
+        self._next_id = 1
+
+    def _book(self, symbol: str, timestamp: float) -> Book:
+        book = self.timeline.book_at(symbol, timestamp)
+        if book is None:
+            raise ValueError(f"No recorded book for {symbol}")
+        return book
+
+    def _fill(
+        self, order: dict, amount: float, price: float, taker: bool, timestamp: float
+    ) -> float:
+        """Fill up to `amount` of the order; returns the amount filled"""
+        amount = min(amount, order["remaining"])
+        if amount <= 0:
+            return 0.0
+        order["remaining"] -= amount
+        order["filled"] += amount
+        self.fills.append(
+            {
+                "id": f"t{len(self.fills) + 1}",
+                "order": order["id"],
+                "symbol": order["symbol"],
+                "side": order["side"],
+                "amount": amount,
+                "price": price,
+                "taker": taker,
+                "timestamp": int(timestamp * 1000),
+            }
+        )
+        return amount
+
+    def _crossing_levels(self, order: dict, book: Book) -> List[Tuple[float, float]]:
+        """
+        Opposite-side levels at or through the order's limit, as (price, size
+        not yet taken by our orders).
+
+        A recorded book does not show our own trades, so the size taken from a
+        level is remembered per symbol and only what is displayed beyond it is
+        available. The taken size is capped at the displayed size, since a
+        recorded decrease includes our own trades, and a level that leaves
+        the book is forgotten.
+        """
+        buy = order["side"] == "buy"
+        opposite = book[1] if buy else book[0]
+        consumed = self._consumed_at(order)
+        sizes = dict(opposite)
+        for price in list(consumed):
+            if price in sizes:
+                consumed[price] = min(consumed[price], sizes[price])
+            else:
+                del consumed[price]
+
+        limit = order["price"]
+        levels = [(p, s) for p, s in opposite if (p <= limit if buy else p >= limit)]
+        return [(p, s - consumed.get(p, 0.0)) for p, s in levels if s > consumed.get(p, 0.0)]
+
+    def _consumed_at(self, order: dict) -> Dict[float, float]:
+        """Taken size per level of the book side an order trades against"""
+        key = (order["symbol"], "asks" if order["side"] == "buy" else "bids")
+        return self._consumed.setdefault(key, {})
+
+    def _consume(self, order: dict, price: float, amount: float):
+        """Record size our order took from an opposite-side level"""
+        consumed = self._consumed_at(order)
+        consumed[price] = consumed.get(price, 0.0) + amount
+
+    def _take(self, order: dict, book: Book, timestamp: float):
+        """Fill the marketable part of an order against the opposite side"""
+        for price, size in self._crossing_levels(order, book):
+            if order["remaining"] <= 0:
+                break
+            self._consume(order, price, self._fill(order, size, price, True, timestamp))
+
+    @staticmethod
+    def _at_touch(book: Book, side: str, price: float) -> bool:
+        """Whether price is the best level of its side in book"""
+        levels = book[0] if side == "buy" else book[1]
+        return bool(levels) and levels[0][0] == price
+
+    @staticmethod
+    def _behind_touch(book: Book, side: str, price: float) -> bool:
+        """Whether the best level of the side in book is better than price"""
+        levels = book[0] if side == "buy" else book[1]
+        if not levels:
+            return False
+        best = levels[0][0]
+        return best > price if side == "buy" else best < price
+
+    @staticmethod
+    def _level_size(book: Book, side: str, price: float) -> float:
+        for level_price, size in book[0] if side == "buy" else book[1]:
+            if level_price == price:
+                return size
+        return 0.0
+
+    def _place(self, symbol: str, side: str, amount: float, price: float) -> dict:
+        timestamp = self.clock.now + self.latency
+        book = self._book(symbol, timestamp)
+        order_id = str(self._next_id)
+        self._next_id += 1
+        order = {
+            "id": order_id,
+            "symbol": symbol,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "filled": 0.0,
+            "remaining": amount,
+            "status": "open",
+            "book_index": self.timeline.index_at(symbol, timestamp),
+        }
+        self._take(order, book, timestamp)
+        order["queue_ahead"] = self._level_size(book, side, price)
+        if order["remaining"] > amount * 1e-9:
+            self.orders[order_id] = order
+        else:
+            order["status"] = "closed"
+        return order
+
+    def _replay_queue(self, order: dict, previous: Book, book: Book, timestamp: float):
+        """Advance a resting order over one recorded book update"""
+        # A book that moves through a resting order trades against it at its own limit
+        levels = self._crossing_levels(order, book)
+        filled = self._fill(order, sum(s for _, s in levels), order["price"], False, timestamp)
+        for level_price, size in levels:
+            if filled <= 0:
+                break
+            taken = min(size, filled)
+            self._consume(order, level_price, taken)
+            filled -= taken
+        if order["remaining"] <= 0:
+            return
+
+        side, price = order["side"], order["price"]
+        # Size only trades away at the touch; a level that drops out of view
+        # behind a new, better best was canceled or truncated, not traded
+        if not self._at_touch(previous, side, price) or self._behind_touch(book, side, price):
+            return
+        before = self._level_size(previous, side, price)
+        depletion = before - self._level_size(book, side, price)
+        if depletion <= 0:
+            return
+
+        traded = depletion * self.trade_fraction
+        canceled = depletion - traded
+        queue_ahead = order["queue_ahead"]
+        if queue_ahead > 0:
+            queue_ahead = max(queue_ahead - canceled * queue_ahead / before, 0.0)
+        queue_ahead -= traded
+        if queue_ahead < 0:
+            self._fill(order, -queue_ahead, price, False, timestamp)
+            queue_ahead = 0.0
+        order["queue_ahead"] = queue_ahead
+
+    def advance(self, timestamp: Optional[float] = None):
+        """Apply every recorded book update up to timestamp (default: the virtual time)"""
+        timestamp = self.clock.now if timestamp is None else timestamp
+        for order_id, order in list(self.orders.items()):
+            symbol = order["symbol"]
+            times, books = self.timeline.times[symbol], self.timeline.books[symbol]
+            last = self.timeline.index_at(symbol, timestamp)
+            for i in range(max(order["book_index"], 0) + 1, last + 1):
+                self._replay_queue(order, books[i - 1], books[i], times[i])
+                if order["remaining"] <= order["amount"] * 1e-9:
+                    break
+            order["book_index"] = max(order["book_index"], last)
+            if order["remaining"] <= order["amount"] * 1e-9:
+                order["status"] = "closed"
+                del self.orders[order_id]
+
+    @staticmethod
+    def _public(order: dict) -> dict:
+        return {
+            k: order[k]
+            for k in ("id", "symbol", "side", "amount", "price", "filled", "remaining", "status")
+        }
+
+    async def fetch_tickers(self, symbols=None):
+        self.requests += 1
+        self.advance()
+        tickers = {}
+        for symbol in symbols or self.timeline.symbols:
+            book = self.timeline.book_at(symbol, self.clock.now)
+            if book is None or not book[0] or not book[1]:
+                continue
+            bid, ask = book[0][0][0], book[1][0][0]
+            tickers[symbol] = {"symbol": symbol, "bid": bid, "ask": ask, "last": (bid + ask) / 2}
+        return tickers
+
+    async def create_orders(self, requests: list):
+        self.requests += 1
+        self.advance()
+        return [
+            self._public(self._place(r["symbol"], r["side"], r["amount"], r["price"]))
+            for r in requests
+        ]
+
+    async def edit_orders(self, requests: list):
+        self.requests += 1
+        # Edits and cancels reach the book after the latency, so the order may fill first
+        self.advance(self.clock.now + self.latency)
+        results = []
+        for r in requests:
+            replaced = self.orders.pop(str(r["id"]), None)
+            if replaced is None:
+                error = {"error": "Order not found"}
+                results.append({"id": None, "status": "rejected", "info": error})
+                continue
+            # Size filled before the edit reached the book is not placed again
+            amount = min(r["amount"], replaced["remaining"])
+            order = self._place(r["symbol"], r["side"], amount, r["price"])
+            results.append(self._public(order))
+        return results
+
+    async def cancel_orders_for_symbols(self, requests: list):
+        self.requests += 1
+        self.advance(self.clock.now + self.latency)
+        statuses = [
+            "success"
+            if self.orders.pop(str(r["id"]), None) is not None
+            else {"error": "Order was never placed, already canceled, or filled."}
+            for r in requests
+        ]
+        return [{"info": {"response": {"data": {"statuses": statuses}}}}]
+
+    async def fetch_open_orders(self, symbol=None):
+        self.requests += 1
+        self.advance()
+        return [
+            self._public(o) for o in self.orders.values() if symbol is None or o["symbol"] == symbol
+        ]
+
+    async def fetch_my_trades(self, symbol=None, since=None):
+        self.requests += 1
+        self.advance()
+        return [
+            dict(t)
+            for t in self.fills
+            if (symbol is None or t["symbol"] == symbol)
+            and (since is None or t["timestamp"] >= since)
+        ]
+
+    async def close(self):
+        pass
+
+
+def _run_virtual(coro_factory, clock: VirtualClock):
+    loop = VirtualTimeEventLoop(clock)
+    try:
+        return loop.run_until_complete(coro_factory())
+    finally:
+        loop.close()
+
+
+def _split_patient(trades: Dict[str, float], patient: float) -> List[Tuple[float, dict]]:
+    """(spread multiplier, trades) legs of patient mode, split as in main.py"""
+    close, far = {}, {}
+    for symbol, amount in trades.items():
+        if abs(amount) < PATIENT_SPLIT_NOTIONAL:
+            close[symbol] = amount
+        else:
+            close[symbol] = far[symbol] = amount / 2.0
+    return [(patient, close), (2.0 * patient, far)]
+
+
+async def _run_patient(
+    exchange: SimulatedExchange, trades: Dict[str, float], patient: float, horizon: float
+):
+    """Place patient-mode spread offset orders and leave them for `horizon` seconds"""
+    tickers = await exchange.fetch_tickers(list(trades))
+    requests = []
+    for multiplier, leg in _split_patient(trades, patient):
+        for symbol, notional in leg.items():
+            if symbol not in tickers or notional == 0:
+                continue
+            side = "buy" if notional > 0 else "sell"
+            bid, ask = tickers[symbol]["bid"], tickers[symbol]["ask"]
+            price = spread_offset_price(side, bid, ask, multiplier)
+            if price > 0:
+                amount = abs(notional) / price
+                requests.append({"symbol": symbol, "side": side, "amount": amount, "price": price})
+    if requests:
+        await exchange.create_orders(requests)
+    await asyncio.sleep(horizon)
+    exchange.advance()
+
+
+def _metrics(exchange: SimulatedExchange, trades: Dict[str, float], start: float) -> dict:
+    """Fill rate, slippage against the arrival mid and fee cost of one rebalance"""
+    target = sum(abs(v) for v in trades.values())
+    filled_notional = slippage = fees = maker = 0.0
+    timeline = exchange.timeline
+    for fill in exchange.fills:
+        symbol = fill["symbol"]
+        book = timeline.book_at(symbol, max(start, timeline.times[symbol][0]))
+        arrival_mid = (book[0][0][0] + book[1][0][0]) / 2
+        notional = fill["amount"] * fill["price"]
+        sign = 1 if fill["side"] == "buy" else -1
+        filled_notional += notional
+        slippage += sign * (fill["price"] - arrival_mid) / arrival_mid * notional
+        fees += notional * (TAKER_FEE if fill["taker"] else MAKER_FEE)
+        maker += 0.0 if fill["taker"] else notional
+
+    filled_symbols = {
+        symbol
+        for symbol, notional in trades.items()
+        if sum(f["amount"] * f["price"] for f in exchange.fills if f["symbol"] == symbol)
+        >= abs(notional) * 0.99
+    }
+    return {
+        "fill_rate": filled_notional / target if target else np.nan,
+        "filled_symbols": len(filled_symbols),
+        "slippage_bps": slippage / filled_notional * 1e4 if filled_notional else np.nan,
+        "fee_bps": fees / filled_notional * 1e4 if filled_notional else np.nan,
+        "maker_share": maker / filled_notional if filled_notional else np.nan,
+        "requests": exchange.requests,
+    }
+
+
+def simulate_rebalance(
+    timeline: BookTimeline,
+    trades: Dict[str, float],
+    start_time: float,
+    params: Optional[dict] = None,
+    latency: float = 0.0,
+    trade_fraction: float = TRADE_FRACTION,
+    verbose: bool = False,
+) -> dict:
+    """
+    Replay one rebalance starting at `start_time`.
+
+    Args:
+        timeline: Recorded books
+        trades: Dictionary mapping symbol to notional amount (positive = buy)
+        start_time: Virtual start time (seconds since the epoch)
+        params: Ladder parameters (LADDER_PARAMS, run through the asyncio
+                engine) or patient-mode parameters (PATIENT_PARAMS)
+        latency: Seconds between an order action and the book it meets
+        trade_fraction: Share of a level's size decrease counted as trades
+        verbose: Show the engine's output
+
+    Returns:
+        dict: fill_rate, filled_symbols, slippage_bps (positive = cost),
+              fee_bps, maker_share, requests, elapsed_time
+    """
+    params = dict(params or {})
+    clock = VirtualClock(start_time)
+    exchange = SimulatedExchange(timeline, clock, latency=latency, trade_fraction=trade_fraction)
+
+    if params.get("patient") is not None:
+        horizon = params.get("horizon", PATIENT_HORIZON)
+
+        def coro():
+            return _run_patient(exchange, trades, params["patient"], horizon)
+
+    else:
+        unknown = set(params) - set(LADDER_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown ladder parameters: {sorted(unknown)}")
+
+        def coro():
+            return run_aggressive_execution(
+                trades, dry_run=False, exchange=exchange, clock=clock, **params
+            )
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        _run_virtual(coro, clock)
+
+    return {**_metrics(exchange, trades, start_time), "elapsed_time": clock.elapsed}
+
+
+def expand_grid(grid: Dict[str, list]) -> List[dict]:
+    """Cartesian product of a parameter grid, in grid order"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def _run_duration(params: dict) -> float:
+    if params.get("patient") is not None:
+        return params.get("horizon", PATIENT_HORIZON)
+    return params.get("max_time", 60) + params.get("cross_spread_wait", CROSS_SPREAD_WAIT)
+
+
+_worker_timeline: Optional[BookTimeline] = None
+
+
+def _init_worker(path: str):
+    global _worker_timeline
+    _worker_timeline = load_book_timeline(path)
+
+
+def _simulate_job(job: tuple) -> dict:
+    trades, start_time, params, latency, trade_fraction = job
+    result = simulate_rebalance(
+        _worker_timeline, trades, start_time, params, latency, trade_fraction
+    )
+    return {**params, "start_time": start_time, **result}
+
+
+def sweep_parameters(
+    books_path: str,
+    trades: Dict[str, float],
+    grid: Dict[str, list],
+    starts: int = 50,
+    processes: Optional[int] = None,
+    latency: float = 0.0,
+    trade_fraction: float = TRADE_FRACTION,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Simulate every grid combination at `starts` start times in a process pool.
+
+    Each worker loads the books once; jobs are (combination, start time) pairs.
+
+    Args:
+        books_path: Recorded books (see load_book_timeline)
+        trades: Dictionary mapping symbol to notional amount
+        grid: {parameter: [values]} (LADDER_PARAMS or PATIENT_PARAMS)
+        starts: Rebalance start times per combination
+        processes: Worker processes (default: CPU count)
+        latency: Seconds between an order action and the book it meets
+        trade_fraction: Share of a level's size decrease counted as trades
+
+    Returns:
+        tuple: (runs DataFrame, one row per run; summary DataFrame, mean
+               metrics per combination sorted by fill rate then slippage)
+    """
+    timeline = load_book_timeline(books_path)
+    combinations = expand_grid(grid)
+    jobs = [
+        (trades, start_time, params, latency, trade_fraction)
+        for params in combinations
+        for start_time in timeline.start_times(starts, _run_duration(params))
+    ]
+    print(f"Simulating {len(combinations)} combinations x {starts} starts = {len(jobs)} runs")
+
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(books_path,)) as pool:
+        runs = pd.DataFrame(list(pool.map(_simulate_job, jobs, chunksize=16)))
+
+    metrics = [
+        "fill_rate",
+        "slippage_bps",
+        "fee_bps",
+        "maker_share",
+        "filled_symbols",
+        "elapsed_time",
+    ]
+    summary = (
+        runs.groupby(list(grid), dropna=False)[metrics]
+        .mean()
+        .reset_index()
+        .sort_values(["fill_rate", "slippage_bps"], ascending=[False, True])
+        .reset_index(drop=True)
+    )
+    return runs, summary
+
+
+def main():
+    """Command-line interface for ladder parameter sweeps"""
+    from aggressive_order_execution import parse_trades_from_args
+
+    parser = argparse.ArgumentParser(
+        description="Replay recorded order books to tune execution parameters",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Ladder grid over 200 start times of a recorded session
+  python3 execution_simulator.py --books session.jsonl \\
+    --trades "BTC/USDC:USDC:500" "ETH/USDC:USDC:-300" \\
+    --grid '{"tick_interval": [1, 2], "ladder_step": [0.1, 0.2, 0.4]}' --starts 200
+
+  # Patient mode spread multipliers on liquidity snapshots
+  python3 execution_simulator.py --books data/raw/liquidity_snapshots.csv \\
+    --trades "BTC/USDC:USDC:500" --grid '{"patient": [0.5, 1, 2]}'
+        """,
+    )
+    parser.add_argument(
+        "--books", required=True, help="Recorded session (.jsonl) or liquidity snapshots (.csv)"
+    )
+    parser.add_argument("--trades", nargs="+", required=True, help="Trades in format SYMBOL:AMOUNT")
+    parser.add_argument("--grid", required=True, help="JSON object of parameter -> list of values")
+    parser.add_argument(
+        "--starts", type=int, default=50, help="Start times per combination (default: 50)"
+    )
+    parser.add_argument(
+        "--processes", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Order latency in seconds (default: 0)"
+    )
+    parser.add_argument(
+        "--trade-fraction",
+        type=float,
+        default=TRADE_FRACTION,
+        help=f"Share of queue depletion counted as trades (default: {TRADE_FRACTION})",
+    )
+    parser.add_argument("--output", default=None, help="CSV file for the per-run results")
+    args = parser.parse_args()
+
+    trades = parse_trades_from_args(args.trades)
+    runs, summary = sweep_parameters(
+        args.books,
+        trades,
+        json.loads(args.grid),
+        starts=args.starts,
+        processes=args.processes,
+        latency=args.latency,
+        trade_fraction=args.trade_fraction,
+    )
+
+    print("\n" + "=" * 80)
+    print("PARAMETER SWEEP SUMMARY (mean per combination)")
+    print("=" * 80)
+    print(summary.to_string(index=False))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        runs.to_csv(args.output, index=False)
+        print(f"\n✓ Saved {len(runs)} runs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
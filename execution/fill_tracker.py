@@ -0,0 +1,240 @@
+"""
+Fill Tracker - Account-wide order status polling for the price ladder
+
+check_order_fills calls fetch_order once per unfilled symbol every tick, so a
+60-symbol rebalance spends most of each tick waiting on status requests. The
+tracker keeps a local book of the orders we placed and refreshes it with two
+account-wide requests per tick, however many orders are tracked:
+
+- exchange.fetch_open_orders()          every resting order of the account
+- exchange.fetch_my_trades(since=...)   fills since the previous poll
+
+Each tracked order is diffed against them:
+- still resting                    -> 'open', filled/remaining/price from the book
+- gone, fills cover the amount     -> 'closed'
+- gone, fills do not cover it      -> 'open' for one more poll (the fill may not
+                                      be indexed yet), then 'canceled'
+
+poll() returns statuses in the same shape as check_order_fills, so the ladder
+logic consumes them unchanged.
+
+Usage:
+    tracker = FillTracker(exchange)
+    tracker.track(symbol, order["id"], "buy", amount, price)
+    statuses = tracker.poll()   # {symbol: {'id', 'filled', 'remaining', ...}}
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Overlap between consecutive fill windows (clock skew, late indexing)
+FILL_LOOKBACK_MS = 5000
+
+# Polls an order may be missing from the book without fills before it counts as canceled
+MISSING_POLLS_BEFORE_CANCELED = 2
+
+
+class FillTracker:
+    """Local book of our orders refreshed from account-wide open orders and fills"""
+
+    def __init__(self, exchange, clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            exchange: Authenticated ccxt exchange instance
+            clock: Wall clock returning seconds since the epoch (injectable for tests)
+        """
+        self.exchange = exchange
+        self._clock = clock or time.time
+        self._orders: Dict[str, dict] = {}
+        self._fills: Dict[str, Dict[str, tuple]] = {}  # order id -> {trade id: (amount, price)}
+        self._fills_since_ms = int(self._clock() * 1000)
+        self.requests_sent = 0
+
+    def track(
+        self,
+        symbol: str,
+        order_id,
+        side: str,
+        amount: float,
+        price: Optional[float],
+        filled: float = 0.0,
+        status: str = "open",
+        prior_filled: float = 0.0,
+    ):
+        """
+        Start tracking an order (replaces the order tracked for the symbol).
+
+        Pass the filled amount and status of the placement response: an order
+        that filled before the tracker's first fill window would otherwise
+        look canceled once it is missing from the open orders.
+
+        When an edit replaces a partially filled order with one for the
+        remaining size, pass the old order's fills as prior_filled: statuses
+        then keep reporting the symbol's total amount and cumulative fills.
+
+        Args:
+            symbol: Trading pair
+            order_id: Exchange order id
+            side: 'buy' or 'sell'
+            amount: Order quantity
+            price: Limit price
+            filled: Amount already filled when the order was placed
+            status: Order status reported at placement
+            prior_filled: Amount filled by the orders this one replaces
+        """
+        filled = filled or 0.0
+        prior_filled = prior_filled or 0.0
+        remaining = 0.0 if status == "closed" else max(amount - filled, 0.0)
+        self._orders[symbol] = {
+            "id": str(order_id),
+            "side": side,
+            "amount": prior_filled + amount,
+            "price": price,
+            "filled": prior_filled + (amount - remaining if status == "closed" else filled),
+            "remaining": remaining,
+            "status": status or "open",
+            "missing_polls": 0,
+            "prior_filled": prior_filled,
+        }
+
+    def untrack(self, symbol: str):
+        """Stop tracking the order for a symbol"""
+        self._orders.pop(symbol, None)
+
+    def symbols(self) -> List[str]:
+        """Symbols with a tracked order"""
+        return list(self._orders)
+
+    def order_id(self, symbol: str) -> Optional[str]:
+        """Id of the order currently tracked for a symbol (None if untracked)"""
+        tracked = self._orders.get(symbol)
+        return tracked["id"] if tracked else None
+
+    def _fill_summary(self, order_id: str) -> tuple:
+        """(filled amount, average price) from the fills seen for an order"""
+        fills = self._fills.get(order_id, {}).values()
+        filled = sum(amount for amount, _ in fills)
+        if filled <= 0:
+            return 0.0, None
+        return filled, sum(amount * price for amount, price in fills) / filled
+
+    def _record_fills(self, trades: list):
+        for trade in trades:
+            order_id = trade.get("order")
+            if order_id is None or not trade.get("amount"):
+                continue
+            trade_id = trade.get("id") or (trade.get("timestamp"), trade.get("amount"))
+            self._fills.setdefault(str(order_id), {})[trade_id] = (
+                float(trade["amount"]),
+                float(trade.get("price") or 0.0),
+            )
+
+    def _update(self, tracked: dict, resting: Optional[dict]):
+        """Diff one tracked order against the account's open orders and fills"""
+        filled, average = self._fill_summary(tracked["id"])
+        tracked["average"] = average
+        prior = tracked["prior_filled"]
+
+        if resting is not None:
+            # The exchange reports this order alone; replaced orders' fills are added back
+            amount = resting.get("amount") or tracked["amount"] - prior
+            remaining = resting.get("remaining")
+            if remaining is None:
+                remaining = max(amount - filled, 0.0)
+            tracked.update(
+                {
+                    "amount": prior + amount,
+                    "remaining": remaining,
+                    "filled": prior + (resting.get("filled") or max(amount - remaining, filled)),
+                    "price": resting.get("price") or tracked["price"],
+                    "status": "open",
+                    "missing_polls": 0,
+                }
+            )
+            return
+
+        amount = tracked["amount"] or 0.0
+        tracked["filled"] = max(prior + filled, tracked["filled"])
+        tracked["remaining"] = max(amount - tracked["filled"], 0.0)
+
+        if tracked["remaining"] <= amount * 1e-9:
+            tracked.update({"remaining": 0.0, "status": "closed"})
+            return
+
+        tracked["missing_polls"] += 1
+        if tracked["missing_polls"] >= MISSING_POLLS_BEFORE_CANCELED:
+            tracked["status"] = "canceled"
+
+    @property
+    def fills_since_ms(self) -> int:
+        """Start of the next fill window (ms since the epoch, including the overlap)"""
+        return self._fills_since_ms - FILL_LOOKBACK_MS
+
+    def apply(
+        self,
+        open_orders: list,
+        trades: list,
+        poll_started_ms: int,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> Dict[str, dict]:
+        """
+        Diff tracked orders against open orders and fills fetched by the caller.
+
+        poll() fetches and applies in one step; callers with their own client
+        (e.g. the asyncio engine) fetch both lists themselves and call this.
+
+        Args:
+            open_orders: Result of fetch_open_orders()
+            trades: Result of fetch_my_trades(since=self.fills_since_ms)
+            poll_started_ms: Time the open orders were requested (ms since the epoch)
+            symbols: Symbols to report (default: every tracked symbol)
+
+        Returns:
+            Dict mapping symbol to status (see poll)
+        """
+        symbols = self.symbols() if symbols is None else [s for s in symbols if s in self._orders]
+
+        self._record_fills(trades)
+        self._fills_since_ms = poll_started_ms
+        resting = {str(order.get("id")): order for order in open_orders}
+
+        statuses = {}
+        for symbol in symbols:
+            tracked = self._orders[symbol]
+            self._update(tracked, resting.get(tracked["id"]))
+            statuses[symbol] = {
+                key: tracked[key] for key in tracked if key not in ("missing_polls", "prior_filled")
+            }
+
+        return statuses
+
+    def poll(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """
+        Refresh tracked orders with one open-orders and one fills request.
+
+        Args:
+            symbols: Symbols to report (default: every tracked symbol)
+
+        Returns:
+            Dict mapping symbol to {'id', 'filled', 'remaining', 'status', 'price',
+            'side', 'amount', 'average'} ({'id', 'error'} if the poll failed)
+        """
+        symbols = self.symbols() if symbols is None else [s for s in symbols if s in self._orders]
+        if not symbols:
+            return {}
+
+        poll_started_ms = int(self._clock() * 1000)
+        try:
+            # Open orders first: an order that fills in between still has its fill
+            # in the second request, so it is never mistaken for a cancel
+            open_orders = self.exchange.fetch_open_orders()
+            self.requests_sent += 1
+            trades = self.exchange.fetch_my_trades(since=self.fills_since_ms)
+            self.requests_sent += 1
+        except Exception as e:
+            print(f"  Warning: Could not poll open orders and fills: {e}")
+            return {
+                symbol: {"id": self._orders[symbol]["id"], "error": str(e)} for symbol in symbols
+            }
+
+        return self.apply(open_orders, trades, poll_started_ms, symbols)
@@ -1,31 +1,29 @@
-import ccxt
-import pandas as pd
-from datetime import datetime
+from price_snapshot import get_snapshot_service
 
 
-def get_bid_ask(symbols=None):
+def get_bid_ask(symbols=None, max_age=None):
     """
     Fetch bid/ask prices for a list of instruments from Hyperliquid.
 
+    Prices come from one bulk ticker snapshot (see price_snapshot.py) shared
+    with other callers, rather than one fetch_ticker call per symbol.
+
     Args:
         symbols (list): List of trading pairs to fetch bid/ask for.
                        If None, fetches for all active markets.
                        Example: ['BTC/USDC:USDC', 'ETH/USDC:USDC', 'SOL/USDC:USDC']
+        max_age (float): Seconds a previous snapshot may be reused
+                        (default: price_snapshot.DEFAULT_MAX_AGE)
 
     Returns:
         DataFrame with columns: symbol, bid, ask, spread, spread_pct, timestamp
     """
-    # Initialize Hyperliquid exchange
-    exchange = ccxt.hyperliquid(
-        {
-            "enableRateLimit": True,
-        }
-    )
+    service = get_snapshot_service()
 
     # If no symbols provided, get all active markets
     if symbols is None:
         print("No symbols provided, fetching all active markets...")
-        markets = exchange.load_markets()
+        markets = service.get_exchange().load_markets()
         symbols = [
             symbol
             for symbol, market in markets.items()
@@ -33,55 +31,21 @@ def get_bid_ask(symbols=None):
         ]
         print(f"Found {len(symbols)} active perpetual markets")
 
-    bid_ask_data = []
-
     print(f"\nFetching bid/ask for {len(symbols)} instruments...")
     print("=" * 80)
 
-    for symbol in symbols:
-        try:
-            # Fetch ticker data which includes bid/ask
-            ticker = exchange.fetch_ticker(symbol)
-
-            bid = ticker.get("bid")
-            ask = ticker.get("ask")
-
-            if bid is not None and ask is not None:
-                spread = ask - bid
-                spread_pct = (spread / bid * 100) if bid > 0 else 0
-
-                bid_ask_data.append(
-                    {
-                        "symbol": symbol,
-                        "bid": bid,
-                        "ask": ask,
-                        "spread": spread,
-                        "spread_pct": spread_pct,
-                        "timestamp": (
-                            datetime.fromtimestamp(ticker["timestamp"] / 1000)
-                            if ticker.get("timestamp")
-                            else datetime.now()
-                        ),
-                    }
-                )
-
-                print(
-                    f"{symbol:20s} | Bid: ${bid:>12,.8f} | Ask: ${ask:>12,.8f} | Spread: ${spread:>8.8f} ({spread_pct:.4f}%)"
-                )
-            else:
-                print(f"{symbol:20s} | No bid/ask data available")
-
-        except Exception as e:
-            print(f"{symbol:20s} | Error: {str(e)}")
-
-    # Create DataFrame
-    if bid_ask_data:
-        df = pd.DataFrame(bid_ask_data)
-        df = df.sort_values("symbol").reset_index(drop=True)
-        return df
-    else:
-        # Return empty DataFrame with correct schema
-        return pd.DataFrame(columns=["symbol", "bid", "ask", "spread", "spread_pct", "timestamp"])
+    snapshot = service.snapshot(symbols, max_age=max_age)
+
+    for i, symbol in enumerate(snapshot.symbols):
+        if snapshot.has_bid_ask[i]:
+            print(
+                f"{symbol:20s} | Bid: ${snapshot.bid[i]:>12,.8f} | Ask: ${snapshot.ask[i]:>12,.8f} | "
+                f"Spread: ${snapshot.spread[i]:>8.8f} ({snapshot.spread_pct[i]:.4f}%)"
+            )
+        else:
+            print(f"{symbol:20s} | No bid/ask data available")
+
+    return snapshot.to_frame()
 
 
 def display_bid_ask_summary(df):
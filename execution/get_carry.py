@@ -4,6 +4,8 @@ from datetime import datetime
 from pprint import pprint
 from typing import List, Dict, Tuple
 
+from common.symbols import parse_symbol
+
 try:
     # Lazy import; only needed when using Coinalyze
     from data.scripts.coinalyze_client import CoinalyzeClient  # type: ignore
@@ -165,11 +167,7 @@ def _parse_trading_symbol(symbol: str) -> Tuple[str, str]:
     """
     Parse a trading symbol like 'BTC/USDC:USDC' into base and quote (e.g., ('BTC', 'USDC')).
     """
-    if not isinstance(symbol, str) or "/" not in symbol:
-        return symbol, ""
-    base, rhs = symbol.split("/", 1)
-    quote = rhs.split(":", 1)[0] if ":" in rhs else rhs
-    return base, quote
+    return parse_symbol(symbol)
 
 
 def _build_coinalyze_symbol(base: str, quote: str, exchange_code: str) -> str:
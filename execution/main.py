@@ -53,13 +53,17 @@ can update them without code changes. Example config structure:
 By default, the script uses weights from all_strategies_config.json. You can override
 this by providing a custom --signal-config path, or use --signals strategy1,strategy2
 to specify strategies with equal weights (e.g., --signals size,breakout,beta).
+
+Each run prints a per-stage timing table (wall time and API calls per step,
+strategy and execution tick) and writes the full timeline as JSON to --trace-dir.
 """
 
 import argparse
 import json
 import os
 import sys
-from collections import defaultdict
+import time
+from contextlib import nullcontext
 import pandas as pd
 
 # Add workspace root and necessary directories to Python path
@@ -75,6 +79,7 @@ if DATA_SCRIPTS_DIR not in sys.path:
 
 from ccxt_get_markets_by_volume import ccxt_get_markets_by_volume
 from ccxt_get_data import ccxt_fetch_hyperliquid_daily_data
+from ohlcv_cache import OHLCVCache
 from ccxt_get_balance import ccxt_get_hyperliquid_balance
 from ccxt_get_positions import ccxt_get_positions
 from check_positions import check_positions, get_position_weights
@@ -83,7 +88,20 @@ from data.scripts.fetch_coinmarketcap_data import (
     map_symbols_to_trading_pairs,
 )
 from aggressive_order_execution import aggressive_execute_orders
+from async_execution import aggressive_execute_orders_async
+from market_data import streaming_market_data
 from send_spread_offset_orders import send_spread_offset_orders
+from strategy_runner import DEFAULT_STRATEGY_WORKERS, run_strategies
+from common.tracing import span, stage, traced_run
+from weight_matrix import (
+    FIXED_WEIGHT_STRATEGIES,
+    build_contribution_matrix,
+    matrix_to_contributions,
+    net_positions,
+    reallocate_strategy_weights,
+    scale_contributions,
+    trade_frame,
+)
 
 # Import strategies from dedicated package
 from execution.strategies import (
@@ -104,6 +122,7 @@ from execution.strategies import (
     strategy_defi_emission_yield,
     strategy_defi_net_yield,
     strategy_defi_revenue_productivity,
+    StrategyFeatures,
 )
 
 # Import cache management
@@ -140,6 +159,21 @@ STRATEGY_REGISTRY = {
     "defi_revenue_productivity": strategy_defi_revenue_productivity,
 }
 
+# Strategies that accept the shared StrategyFeatures layer (features=...)
+FEATURE_STRATEGIES = {
+    "days_from_high",
+    "breakout",
+    "carry",
+    "mean_reversion",
+    "size",
+    "beta",
+    "kurtosis",
+    "volatility",
+}
+
+# Per-run timelines of stage latencies and API call counts (--trace-dir)
+DEFAULT_TRACE_DIR = os.path.join(WORKSPACE_ROOT, "backtests", "results", "traces")
+
 
 def _build_strategy_params(
     strategy_name: str,
@@ -633,6 +667,61 @@ def check_cache_freshness():
         return {"status": "error", "error": str(e)}
 
 
+def check_ohlcv_cache_freshness():
+    """
+    Check the freshness of the cached daily OHLCV candles.
+
+    Reports, per symbol, how many complete UTC days the cache is behind and
+    whether its history has gaps. Stale or gapped symbols are topped up
+    incrementally by get_200d_daily_data.
+
+    Returns:
+        dict: Cache status information
+    """
+    print("\n" + "=" * 80)
+    print("CHECKING CACHE FRESHNESS (Daily OHLCV)")
+    print("=" * 80)
+
+    try:
+        info = OHLCVCache().get_cache_info()
+
+        print(f"\nCache directory: {info['cache_dir']}")
+        print(f"Last complete bar: {info['last_complete_bar'][:10]}")
+
+        if not info["files"]:
+            print("\n??  No cached candles found")
+            print("   Daily data will be fetched in full from the exchange")
+            return {"status": "empty", "files": []}
+
+        stale = [f for f in info["files"] if f["validation_reason"] == "stale"]
+        gapped = [f for f in info["files"] if f["validation_reason"] == "gaps"]
+        valid_count = len(info["files"]) - len(stale) - len(gapped)
+
+        for f in stale + gapped:
+            print(
+                f"  ? {f['validation_reason'].upper():6s} {f['symbol']:25s} last={f['last_bar'][:10]} "
+                f"behind={f['bars_behind']}d gaps={f['gaps']}"
+            )
+
+        print(f"\nSummary: {valid_count} fresh, {len(stale)} stale, {len(gapped)} with gaps "
+              f"({len(info['files'])} symbols cached)")
+        if stale or gapped:
+            print("   Missing bars will be fetched incrementally")
+
+        return {
+            "status": "ok",
+            "total_files": len(info["files"]),
+            "valid_count": valid_count,
+            "stale_count": len(stale),
+            "gap_count": len(gapped),
+            "files": info["files"],
+        }
+
+    except Exception as e:
+        print(f"\n??  Error checking OHLCV cache: {e}")
+        return {"status": "error", "error": str(e)}
+
+
 def request_markets_by_volume(min_volume=100000):
     """
     Request markets by volume, filtered by minimum daily volume.
@@ -659,12 +748,17 @@ def request_markets_by_volume(min_volume=100000):
     return []
 
 
+# Concurrent daily OHLCV fetches; pacing is done by the Hyperliquid weight-budget limiter
+DAILY_DATA_FETCH_WORKERS = 8
+
+
 def get_200d_daily_data(symbols):
     """
     Get 200 days of daily data.
 
     Retrieves historical daily OHLCV data for the past 200 days
-    for the specified symbols.
+    for the specified symbols. Complete days are served from the local
+    OHLCV cache; only newer bars are requested from the exchange.
 
     Args:
         symbols (list): List of market symbols
@@ -672,15 +766,17 @@ def get_200d_daily_data(symbols):
     Returns:
         dict: Dictionary mapping symbols to their historical data
     """
-    df = ccxt_fetch_hyperliquid_daily_data(symbols=symbols, days=200)
+    df = ccxt_fetch_hyperliquid_daily_data(
+        symbols=symbols,
+        days=200,
+        max_workers=DAILY_DATA_FETCH_WORKERS,
+        verbose=False,
+        cache=OHLCVCache(),
+    )
 
     if df is not None and not df.empty:
         # Group by symbol and return as dictionary
-        result = {}
-        for symbol in df["symbol"].unique():
-            symbol_data = df[df["symbol"] == symbol].copy()
-            result[symbol] = symbol_data
-        return result
+        return {symbol: symbol_data.copy() for symbol, symbol_data in df.groupby("symbol", sort=False)}
 
     return {}
 
@@ -725,21 +821,9 @@ def calculate_difference_weights_positions(target_weights, current_positions):
     Returns:
         dict: Dictionary mapping symbols to weight differences
     """
-    # Get current position weights
-    current_weights = get_position_weights(current_positions)
-
-    # Calculate differences
-    differences = {}
-
-    # Check all target symbols
-    all_symbols = set(target_weights.keys()) | set(current_weights.keys())
-
-    for symbol in all_symbols:
-        target_weight = target_weights.get(symbol, 0)
-        current_weight = current_weights.get(symbol, 0)
-        differences[symbol] = target_weight - current_weight
-
-    return differences
+    current_weights = pd.Series(get_position_weights(current_positions), dtype=float)
+    targets = pd.Series(target_weights, dtype=float)
+    return targets.sub(current_weights, fill_value=0.0).to_dict()
 
 
 def get_account_notional_value():
@@ -780,14 +864,11 @@ def calculate_target_positions(weights, notional_value):
     Returns:
         dict: Dictionary of symbols to target notional position sizes
     """
-    target_positions = {}
+    targets = pd.Series(weights, dtype=float) * notional_value
+    for symbol, target_notional in targets.items():
+        print(f"  {symbol}: weight={weights[symbol]:.4f}, target=${target_notional:,.2f}")
 
-    for symbol, weight in weights.items():
-        target_notional = weight * notional_value
-        target_positions[symbol] = target_notional
-        print(f"  {symbol}: weight={weight:.4f}, target=${target_notional:,.2f}")
-
-    return target_positions
+    return targets.to_dict()
 
 
 def calculate_trade_amounts(target_positions, current_positions, notional_value, threshold=0.05):
@@ -814,23 +895,13 @@ def calculate_trade_amounts(target_positions, current_positions, notional_value,
     Returns:
         dict: Dictionary of symbols to trade amounts (positive = buy, negative = sell)
     """
-    import ccxt
     import os
+    from exchange_session import get_exchange
 
-    trades = {}
-
-    # Initialize exchange to fetch current prices if needed
-    api_key = os.getenv("HL_API")
-    api_secret = os.getenv("HL_SECRET")
+    # Pooled exchange to fetch current prices if needed
     exchange = None
-    if api_key and api_secret:
-        exchange = ccxt.hyperliquid(
-            {
-                "privateKey": api_secret,
-                "walletAddress": api_key,
-                "enableRateLimit": True,
-            }
-        )
+    if os.getenv("HL_API") and os.getenv("HL_SECRET"):
+        exchange = get_exchange()
 
     # Get current position notional values with proper sign handling
     # For SHORT positions: notional should be negative
@@ -876,41 +947,30 @@ def calculate_trade_amounts(target_positions, current_positions, notional_value,
             notional = abs(contracts) * mark_price
         current_notional[symbol] = notional
 
-    # Calculate all symbols to consider
-    all_symbols = set(target_positions.keys()) | set(current_notional.keys())
+    # Diff and threshold every symbol at once; neutralize flags held symbols not in targets
+    frame = trade_frame(
+        pd.Series(target_positions, dtype=float),
+        pd.Series(current_notional, dtype=float),
+        notional_value,
+        threshold,
+    )
+    trades = frame.loc[frame["trade"], "difference"].to_dict()
 
     print(
         f"\nCalculating trade amounts (threshold: {threshold*100:.0f}% of notional = ${notional_value * threshold:,.2f})"
     )
     print("=" * 80)
 
-    for symbol in all_symbols:
-        target = target_positions.get(symbol, 0)
-        current = current_notional.get(
-            symbol, 0
-        )  # Now signed: negative for short, positive for long
+    for symbol, row in zip(frame.index, frame.itertuples(index=False)):
         side = position_sides.get(symbol, "long")  # Default to 'long' if not tracked
-
-        # Calculate difference: positive means BUY, negative means SELL
-        # This works correctly now because current is signed:
-        # - Short position (current=-1000, target=0): diff = 0-(-1000) = +1000 (BUY to close)
-        # - Long position (current=+1000, target=0): diff = 0-(+1000) = -1000 (SELL to close)
-        difference = target - current
-
-        # Calculate percentage difference relative to total notional value
-        pct_difference = abs(difference) / notional_value if notional_value > 0 else 0
+        difference = row.difference
 
         print(f"\n{symbol}:")
-        print(f"  Current: ${abs(current):,.2f} ({side.upper()})")
-        print(f"  Target:  ${target:,.2f} (LONG)")
-        print(f"  Diff:    ${difference:,.2f} ({pct_difference*100:.2f}% of notional)")
-
-        # If position exists but is NOT in target weights, always neutralize it
-        if symbol not in target_positions and abs(current) > 0:
-            # The difference calculation now handles both short and long correctly:
-            # - Short: difference will be positive (need to BUY)
-            # - Long: difference will be negative (need to SELL)
-            trades[symbol] = difference
+        print(f"  Current: ${abs(row.current):,.2f} ({side.upper()})")
+        print(f"  Target:  ${row.target:,.2f} (LONG)")
+        print(f"  Diff:    ${difference:,.2f} ({row.pct_difference*100:.2f}% of notional)")
+
+        if row.neutralize:
             if side == "short":
                 print(
                     f"  ? NEUTRALIZE SHORT: Position not in target weights (BUY ${abs(difference):,.2f} to close short)"
@@ -919,9 +979,7 @@ def calculate_trade_amounts(target_positions, current_positions, notional_value,
                 print(
                     f"  ? NEUTRALIZE LONG: Position not in target weights (SELL ${abs(difference):,.2f})"
                 )
-        # Only trade if difference exceeds threshold
-        elif pct_difference > threshold:
-            trades[symbol] = difference
+        elif row.trade:
             print(
                 f"  ? Trade needed: ${abs(difference):,.2f} ({'BUY' if difference > 0 else 'SELL'})"
             )
@@ -994,7 +1052,9 @@ def load_signal_config(config_path):
 
 
 
-def send_orders_if_difference_exceeds_threshold(trades, dry_run=True, aggressive=True, patient=None):
+def send_orders_if_difference_exceeds_threshold(
+    trades, dry_run=True, aggressive=True, patient=None, use_async=False, market_data_ws=False
+):
     """
     Send orders to adjust positions based on calculated trade amounts.
 
@@ -1010,6 +1070,11 @@ def send_orders_if_difference_exceeds_threshold(trades, dry_run=True, aggressive
                                 Value determines closer spread multiplier (e.g., 1.0 = 1x spread).
                                 Second distance is automatically 2x the closer spread.
                                 For orders <$20, sends all at closer spread to avoid sub-$10 notional
+        use_async (bool): If True, aggressive execution runs on the asyncio engine
+                          (one ladder task per symbol, see async_execution.py)
+        market_data_ws (bool): If True, aggressive execution (either engine) reads books and
+                               fills from a WebSocket feed instead of polling REST
+                               (see market_data.py)
 
     Returns:
         list: List of order results (empty if dry_run=True) or dict for aggressive execution
@@ -1091,13 +1156,20 @@ def send_orders_if_difference_exceeds_threshold(trades, dry_run=True, aggressive
     # Use limit order execution if enabled (default)
     if aggressive:
         print("\nUsing LIMIT ORDER EXECUTION strategy (tick-based)...")
-        result = aggressive_execute_orders(
-            trades=trades,
-            tick_interval=2.0,  # Poll every 2 seconds
-            max_time=60,  # Run for max 60 seconds
-            cross_spread_after=True,  # Cross spread if not filled after max_time
-            dry_run=dry_run,
+        execute_orders = aggressive_execute_orders_async if use_async else aggressive_execute_orders
+        market_data = (
+            streaming_market_data(list(trades), user=not dry_run)
+            if market_data_ws
+            else nullcontext()
         )
+        with market_data:
+            result = execute_orders(
+                trades=trades,
+                tick_interval=2.0,  # Poll every 2 seconds
+                max_time=60,  # Run for max 60 seconds
+                cross_spread_after=True,  # Cross spread if not filled after max_time
+                dry_run=dry_run,
+            )
         return result
 
     # Market order execution (only if --market flag specified)
@@ -1128,6 +1200,63 @@ def send_orders_if_difference_exceeds_threshold(trades, dry_run=True, aggressive
     return orders
 
 
+def _compute_strategy_features(historical_data):
+    """Build the shared StrategyFeatures layer; None (strategies compute their own) on failure."""
+    start = time.perf_counter()
+    try:
+        features = StrategyFeatures(historical_data)
+    except Exception as e:
+        print(f"  WARNING: Shared feature computation failed ({e}); strategies compute their own")
+        return None
+    print(
+        f"Computed shared strategy features for {len(features.history_length)} symbols "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return features
+
+
+def _print_strategy_timing(results, wall_time, max_workers):
+    """Print per-strategy runtimes and the wall-clock time of the concurrent run."""
+    if not results:
+        return
+    print("\n" + "=" * 80)
+    print(f"STRATEGY TIMING ({max(1, min(max_workers, len(results)))} worker(s))")
+    print("=" * 80)
+    for name, result in sorted(results.items(), key=lambda item: -item[1].elapsed):
+        status = "✓" if result.error is None else "✗"
+        print(
+            f"  {status} {name:28s}: {result.elapsed:>7.2f}s  "
+            f"({len(result.contributions)} positions)"
+        )
+    total = sum(result.elapsed for result in results.values())
+    print(f"\n  Strategy time: {total:.2f}s | Wall clock: {wall_time:.2f}s")
+    print("=" * 80)
+
+
+def _print_portfolio_weights(title, targets, notional_value, empty_message):
+    """Print the top 20 netted weights and long/short totals for a target notional Series."""
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+    if not targets.empty:
+        weights = targets / notional_value if notional_value > 0 else targets * 0.0
+        top = weights.loc[weights.abs().sort_values(ascending=False, kind="stable").index]
+
+        print(f"\nTop 20 positions:")
+        for i, (symbol, weight) in enumerate(top.iloc[:20].items(), 1):
+            side = "LONG" if weight > 0 else ("SHORT" if weight < 0 else "FLAT")
+            print(f"  {i:2d}. {symbol:20s}: {weight:>8.3f} ({weight*100:>6.2f}%) {side:>5s}")
+
+        print(f"\nTotal positions: {len(weights)}")
+        print(f"Total weight (abs): {weights.abs().sum():.3f}")
+        print(f"Long weight: {weights[weights > 0].sum():.3f}")
+        print(f"Short weight: {weights[weights < 0].abs().sum():.3f}")
+    else:
+        print(empty_message)
+    print("=" * 80)
+
+
 def main():
     """
     Main execution function supporting multi-signal blending with external weights.
@@ -1179,6 +1308,18 @@ def main():
         default=True,
         help="Use limit order execution strategy (tick-based: continuously move limit orders to best bid/ask) - THIS IS THE DEFAULT",
     )
+    parser.add_argument(
+        "--async-execution",
+        action="store_true",
+        default=False,
+        help="Run limit order execution on the asyncio engine (one price ladder task per symbol)",
+    )
+    parser.add_argument(
+        "--ws-market-data",
+        action="store_true",
+        default=False,
+        help="Stream books and fills over WebSocket during limit order execution instead of polling REST",
+    )
     parser.add_argument(
         "--patient",
         type=float,
@@ -1191,6 +1332,12 @@ def main():
         "Example: --patient 2.0 uses 2x and 4x spread. "
         "Orders <$20 sent entirely at closer spread to avoid <$10 notional limit.",
     )
+    parser.add_argument(
+        "--strategy-workers",
+        type=int,
+        default=DEFAULT_STRATEGY_WORKERS,
+        help="Threads used to evaluate strategies concurrently (1 = one after another)",
+    )
     parser.add_argument(
         "--signals",
         type=str,
@@ -1203,8 +1350,21 @@ def main():
         default=os.path.join(EXECUTION_DIR, "all_strategies_config.json"),
         help="Path to JSON config file with strategy_weights and optional params (default: all_strategies_config.json)",
     )
+    parser.add_argument(
+        "--trace-dir",
+        type=str,
+        default=DEFAULT_TRACE_DIR,
+        help="Directory for the per-run JSON timeline of stage latencies and API calls "
+        "(empty string: print the summary only)",
+    )
     args = parser.parse_args()
 
+    with traced_run("rebalance", args.trace_dir or None):
+        _run_rebalance(args)
+
+
+def _run_rebalance(args):
+    """Run one rebalance (steps 1-7) with the parsed command-line arguments."""
     # Decide blending mode
     config = load_signal_config(args.signal_config) if args.signal_config else None
     configured_weights = (config or {}).get("strategy_weights") if config else None
@@ -1229,6 +1389,7 @@ def main():
 
     # Update market data and check cache freshness
     print("\n[Pre-flight checks]")
+    stage("preflight")
     update_market_data()
 
     # Check and auto-refresh factor data if leverage/dilution strategies are being used
@@ -1259,6 +1420,7 @@ def main():
                 print("?" * 80)
 
     check_cache_freshness()
+    check_ohlcv_cache_freshness()
 
     print(f"\nParameters:")
     print(f"  Days since high (Strategy 1 default): {args.days_since_high}")
@@ -1280,6 +1442,7 @@ def main():
 
     # Step 1: Request markets by volume
     print("\n[1/7] Requesting markets by volume (>$100k/day)...")
+    stage("markets")
     symbols = request_markets_by_volume(min_volume=100000)
     print(f"Selected {len(symbols)} markets")
 
@@ -1289,6 +1452,7 @@ def main():
 
     # Step 2: Get 200d daily data
     print("\n[2/7] Fetching 200 days of daily data...")
+    stage("ohlcv", symbols=len(symbols))
     historical_data = get_200d_daily_data(symbols)
     print(f"Retrieved data for {len(historical_data)} symbols")
 
@@ -1298,6 +1462,7 @@ def main():
 
     # Step 3: Get account notional and apply leverage
     print("\n[3/7] Getting account notional and applying leverage...")
+    stage("notional")
     try:
         base_notional_value = get_account_notional_value()
     except Exception as e:
@@ -1323,7 +1488,8 @@ def main():
 
     # Step 4: Build target positions either via blend or legacy 50/50
     print("\n[4/7] Building target positions from selected signals...")
-    target_positions = defaultdict(float)
+    stage("target_positions")
+    target_positions: dict[str, float] = {}
     # Track per-signal contributions for allocation breakdown
     per_signal_contribs: dict[str, dict[str, float]] = {}
     signal_names: list[str] = []
@@ -1332,9 +1498,36 @@ def main():
         # Use multi-signal blend
         signal_names = list(blend_weights.keys())
 
-        # First pass: Call all strategies with their initial weights
-        initial_contributions = {}
-        initial_contributions_original = {}  # Store unscaled contributions for comparison
+        # Shared features (returns, volatilities, 200d highs, regime) computed once
+        with span("strategy_features"):
+            features = _compute_strategy_features(historical_data)
+
+        # First pass: Evaluate all strategies with their initial weights (concurrently)
+        tasks = {}
+        for strategy_name, weight in blend_weights.items():
+            strategy_fn = STRATEGY_REGISTRY.get(strategy_name)
+            if weight <= 0 or not strategy_fn:
+                continue
+
+            # Build parameters for this strategy
+            strategy_args, strategy_kwargs = _build_strategy_params(
+                strategy_name=strategy_name,
+                historical_data=historical_data,
+                strategy_notional=notional_value * weight,
+                params=params,
+                cli_args=args,
+            )
+            if features is not None and strategy_name in FEATURE_STRATEGIES:
+                strategy_kwargs["features"] = features
+            tasks[strategy_name] = (strategy_fn, strategy_args, strategy_kwargs)
+
+        run_start = time.perf_counter()
+        with span("strategies", count=len(tasks), workers=args.strategy_workers):
+            results = run_strategies(tasks, max_workers=args.strategy_workers)
+        run_elapsed = time.perf_counter() - run_start
+
+        # Replay each strategy's log in blend order
+        initial_contributions_original = {}  # Unscaled contributions for comparison
         for strategy_name, weight in blend_weights.items():
             if weight <= 0:
                 continue
@@ -1345,89 +1538,45 @@ def main():
                 f"Strategy: {strategy_name} | Allocation: ${strategy_notional:,.2f} ({weight*100:.2f}%)"
             )
 
-            # Look up strategy function in registry
-            strategy_fn = STRATEGY_REGISTRY.get(strategy_name)
-            if not strategy_fn:
+            result = results.get(strategy_name)
+            if result is None:
                 print(f"  WARNING: Unknown strategy '{strategy_name}' not in registry, skipping.")
                 contrib = {}
             else:
-                # Build parameters for this strategy
-                strategy_args, strategy_kwargs = _build_strategy_params(
-                    strategy_name=strategy_name,
-                    historical_data=historical_data,
-                    strategy_notional=strategy_notional,
-                    params=params,
-                    cli_args=args,
-                )
-
-                # Execute strategy
-                try:
-                    contrib = strategy_fn(*strategy_args, **strategy_kwargs)
-                except Exception as e:
-                    print(f"  ERROR executing strategy '{strategy_name}': {e}")
-                    contrib = {}
+                sys.stdout.write(result.output)
+                if result.error is not None:
+                    print(f"  ERROR executing strategy '{strategy_name}': {result.error}")
+                contrib = result.contributions
 
-            # Store initial contributions (both original and working copy)
-            initial_contributions[strategy_name] = dict(contrib)
             initial_contributions_original[strategy_name] = dict(contrib)
 
-        # Print BEFORE reallocation weights
-        print("\n" + "=" * 80)
-        print("PORTFOLIO WEIGHTS BEFORE CAPITAL REALLOCATION")
-        print("=" * 80)
-        temp_positions_before = defaultdict(float)
-        for strategy_name, contrib in initial_contributions.items():
-            for sym, ntl in contrib.items():
-                temp_positions_before[sym] += ntl
-
-        if temp_positions_before:
-            # Convert to weights
-            weights_before = {}
-            for symbol, notional in temp_positions_before.items():
-                weight = notional / notional_value if notional_value > 0 else 0.0
-                weights_before[symbol] = weight
-
-            # Sort by absolute weight
-            sorted_weights = sorted(weights_before.items(), key=lambda x: abs(x[1]), reverse=True)
-
-            print(f"\nTop 20 positions:")
-            for i, (symbol, weight) in enumerate(sorted_weights[:20], 1):
-                side = "LONG" if weight > 0 else ("SHORT" if weight < 0 else "FLAT")
-                print(f"  {i:2d}. {symbol:20s}: {weight:>8.3f} ({weight*100:>6.2f}%) {side:>5s}")
-
-            total_weight = sum(abs(w) for w in weights_before.values())
-            total_long = sum(w for w in weights_before.values() if w > 0)
-            total_short = sum(abs(w) for w in weights_before.values() if w < 0)
-            print(f"\nTotal positions: {len(weights_before)}")
-            print(f"Total weight (abs): {total_weight:.3f}")
-            print(f"Long weight: {total_long:.3f}")
-            print(f"Short weight: {total_short:.3f}")
-        else:
-            print("\nNo positions before reallocation.")
-        print("=" * 80)
+        _print_strategy_timing(results, run_elapsed, args.strategy_workers)
+
+        # Align all contributions into one strategy x symbol matrix
+        contributions = build_contribution_matrix(initial_contributions_original)
+        weights = pd.Series(blend_weights, dtype=float)
+        active = pd.Series(
+            {name: bool(initial_contributions_original.get(name)) for name in weights.index}
+        )
+
+        _print_portfolio_weights(
+            "PORTFOLIO WEIGHTS BEFORE CAPITAL REALLOCATION",
+            net_positions(contributions),
+            notional_value,
+            "\nNo positions before reallocation.",
+        )
 
         # Check which strategies returned no positions and rebalance
-        # Fixed weight strategies that should maintain their allocation
+        # Fixed weight strategies (FIXED_WEIGHT_STRATEGIES) maintain their allocation
         # All other strategies are "flexible" and can receive reallocated capital
         # This includes regime-filtered strategies like kurtosis that may return no positions
-        FIXED_WEIGHT_STRATEGIES = {"breakout", "days_from_high"}
+        is_fixed = weights.index.isin(list(FIXED_WEIGHT_STRATEGIES))
 
-        active_strategies = {
-            name: weight
-            for name, weight in blend_weights.items()
-            if initial_contributions.get(name, {})
-        }
-        inactive_strategies = {
-            name: weight
-            for name, weight in blend_weights.items()
-            if not initial_contributions.get(name, {})
-        }
-
-        if inactive_strategies:
+        if not active.all():
             print("\n" + "=" * 80)
             print("CAPITAL REALLOCATION: Some strategies returned no positions")
             print("=" * 80)
-            for name, orig_weight in inactive_strategies.items():
+            for name, orig_weight in weights[~active].items():
                 # Special messaging for regime-filtered strategies
                 if name == "kurtosis":
                     print(f"  ? {name}: Regime filter blocked activation (original weight: {orig_weight*100:.2f}%)")
@@ -1435,33 +1584,18 @@ def main():
                 else:
                     print(f"  ? {name}: No positions found (original weight: {orig_weight*100:.2f}%)")
 
-            if active_strategies:
-                # Separate fixed and flexible strategies
-                fixed_active = {
-                    name: weight
-                    for name, weight in active_strategies.items()
-                    if name in FIXED_WEIGHT_STRATEGIES
-                }
-                flexible_active = {
-                    name: weight
-                    for name, weight in active_strategies.items()
-                    if name not in FIXED_WEIGHT_STRATEGIES
-                }
-
-                # Calculate capital to redistribute (from inactive strategies + inactive fixed strategies)
-                inactive_flexible = {
-                    name: weight
-                    for name, weight in inactive_strategies.items()
-                    if name not in FIXED_WEIGHT_STRATEGIES
-                }
-                capital_to_redistribute = sum(inactive_flexible.values())
+            if active.any():
+                fixed_active = weights[active & is_fixed]
+                flexible_active = weights[active & ~is_fixed]
+                inactive_flexible = weights[~active & ~is_fixed]
+                capital_to_redistribute = inactive_flexible.sum()
 
                 print(f"\n  Fixed allocations (maintaining original weights):")
                 for name, weight in fixed_active.items():
                     print(f"    {name}: {weight*100:.2f}% (fixed)")
 
                 # Show which strategies' capital is being redistributed
-                if inactive_flexible:
+                if not inactive_flexible.empty:
                     print(f"\n  Capital being redistributed from inactive flexible strategies:")
                     for name, weight in inactive_flexible.items():
                         if name == "kurtosis":
@@ -1469,45 +1603,33 @@ def main():
                         else:
                             print(f"    {name}: {weight*100:.2f}%")
 
-                if flexible_active and capital_to_redistribute > 0:
-                    # Renormalize only flexible strategies with the additional capital
-                    # New weight = original weight * (1 + capital_to_redistribute / sum(original flexible weights))
-                    original_flexible_total = sum(flexible_active.values())
-                    scale_factor = (
-                        original_flexible_total + capital_to_redistribute
-                    ) / original_flexible_total
+                rebalanced_weights = reallocate_strategy_weights(weights, active)
 
+                if not flexible_active.empty and capital_to_redistribute > 0:
                     print(
                         f"\n  Reallocating {capital_to_redistribute*100:.2f}% capital among flexible strategies:"
                     )
-
-                    rebalanced_weights = {}
-                    # Keep fixed weights unchanged
-                    for name, weight in fixed_active.items():
-                        rebalanced_weights[name] = weight
-
-                    # Scale up flexible weights proportionally
                     for name, weight in flexible_active.items():
-                        new_weight = weight * scale_factor
-                        rebalanced_weights[name] = new_weight
+                        new_weight = rebalanced_weights[name]
                         print(
                             f"    {name}: {weight*100:.2f}% ? {new_weight*100:.2f}% "
                             f"(+{(new_weight - weight)*100:.2f}pp)"
                         )
 
                     # Verify total sums to 1.0
-                    total_weight = sum(rebalanced_weights.values())
+                    total_weight = rebalanced_weights.sum()
                     if abs(total_weight - 1.0) > 0.0001:
                         print(
                             f"\n  ??  WARNING: Total weight = {total_weight*100:.2f}% (expected 100%)"
                         )
 
-                    # Recalculate positions with new weights
+                    # Scale every flexible strategy's row by its weight ratio in one step
                     print("\n  Recalculating positions with adjusted weights...")
                     print("-" * 80)
+                    contributions = scale_contributions(contributions, weights, rebalanced_weights)
 
                     for strategy_name, new_weight in rebalanced_weights.items():
-                        old_weight = blend_weights[strategy_name]
+                        old_weight = weights[strategy_name]
                         old_notional = notional_value * old_weight
                         new_notional = notional_value * new_weight
 
@@ -1515,86 +1637,52 @@ def main():
                             print(f"\n  Strategy: {strategy_name} (FIXED)")
                             print(f"    Allocation: ${old_notional:,.2f} (unchanged)")
                         else:
+                            ratio = new_weight / old_weight if old_weight > 0 else 0
                             print(f"\n  Strategy: {strategy_name}")
                             print(f"    Allocation: ${old_notional:,.2f} ? ${new_notional:,.2f}")
-
-                            # Scale the initial contributions by the weight ratio
-                            ratio = new_weight / old_weight if old_weight > 0 else 0
-                            old_contrib = initial_contributions[strategy_name]
-                            new_contrib = {
-                                sym: notional * ratio for sym, notional in old_contrib.items()
-                            }
-
-                            initial_contributions[strategy_name] = new_contrib
                             print(f"    Positions scaled by {ratio:.4f}x")
-
-                    # Update blend_weights to reflect rebalancing
-                    blend_weights = rebalanced_weights
                     print("=" * 80)
-                elif not flexible_active:
+                elif flexible_active.empty:
                     print(
                         f"\n  All active strategies have fixed weights (no flexible strategies to rebalance)"
                     )
-                    # Keep the fixed strategies at their original weights
-                    rebalanced_weights = fixed_active
-                    blend_weights = rebalanced_weights
                     print("=" * 80)
                 else:
                     print(f"\n  No capital to redistribute (all inactive strategies are fixed)")
                     print("=" * 80)
+
+                # Update blend_weights to reflect rebalancing
+                blend_weights = rebalanced_weights.to_dict()
             else:
                 print("\n  ??  WARNING: No strategies returned any positions!")
                 print("=" * 80)
 
-        # Build target positions from (potentially rebalanced) contributions
-        for strategy_name, contrib in initial_contributions.items():
-            per_signal_contribs[strategy_name] = dict(contrib)
-            for sym, ntl in contrib.items():
-                target_positions[sym] += ntl
-
-        # Print AFTER reallocation weights
-        print("\n" + "=" * 80)
-        print("PORTFOLIO WEIGHTS AFTER CAPITAL REALLOCATION")
-        print("=" * 80)
+        # Single netting step over the (potentially rebalanced) matrix
+        targets = net_positions(contributions)
+        target_positions = targets.to_dict()
+        per_signal_contribs = matrix_to_contributions(
+            contributions, initial_contributions_original
+        )
 
-        if target_positions:
-            # Convert to weights
-            weights_after = {}
-            for symbol, notional in target_positions.items():
-                weight = notional / notional_value if notional_value > 0 else 0.0
-                weights_after[symbol] = weight
-
-            # Sort by absolute weight
-            sorted_weights = sorted(weights_after.items(), key=lambda x: abs(x[1]), reverse=True)
-
-            print(f"\nTop 20 positions:")
-            for i, (symbol, weight) in enumerate(sorted_weights[:20], 1):
-                side = "LONG" if weight > 0 else ("SHORT" if weight < 0 else "FLAT")
-                print(f"  {i:2d}. {symbol:20s}: {weight:>8.3f} ({weight*100:>6.2f}%) {side:>5s}")
-
-            total_weight = sum(abs(w) for w in weights_after.values())
-            total_long = sum(w for w in weights_after.values() if w > 0)
-            total_short = sum(abs(w) for w in weights_after.values() if w < 0)
-            print(f"\nTotal positions: {len(weights_after)}")
-            print(f"Total weight (abs): {total_weight:.3f}")
-            print(f"Long weight: {total_long:.3f}")
-            print(f"Short weight: {total_short:.3f}")
-        else:
-            print("\nNo positions after reallocation.")
-        print("=" * 80)
+        _print_portfolio_weights(
+            "PORTFOLIO WEIGHTS AFTER CAPITAL REALLOCATION",
+            targets,
+            notional_value,
+            "\nNo positions after reallocation.",
+        )
 
         # Print combined positions
         if target_positions:
             print("\nCombined Target Positions (from multi-signal blend):")
             print("=" * 80)
-            for symbol, target in sorted(target_positions.items()):
+            for symbol, target in targets.sort_index().items():
                 side = "LONG" if target > 0 else ("SHORT" if target < 0 else "FLAT")
                 print(f"  {symbol}: {side} ${abs(target):,.2f}")
         else:
             print("\nNo target positions generated from selected signals.")
 
         # CRITICAL WARNING: Check capital utilization
-        total_allocated = sum(abs(v) for v in target_positions.values())
+        total_allocated = targets.abs().sum()
         utilization_pct = (total_allocated / notional_value * 100) if notional_value > 0 else 0
         print(f"\n{'='*80}")
         print(
@@ -1609,12 +1697,10 @@ def main():
                 f"    Expected ~100% utilization with leverage, but only {utilization_pct:.1f}% is allocated."
             )
             print(f"    This means most strategies are NOT finding signals:")
+            actual_allocs = contributions.abs().sum(axis=1)
             for strategy_name, weight in blend_weights.items():
                 expected_alloc = weight * notional_value
-                actual_alloc = sum(
-                    abs(per_signal_contribs.get(strategy_name, {}).get(sym, 0.0))
-                    for sym in target_positions.keys()
-                )
+                actual_alloc = actual_allocs.get(strategy_name, 0.0)
                 strat_util = (actual_alloc / expected_alloc * 100) if expected_alloc > 0 else 0
                 status = "?" if strat_util > 80 else "??" if strat_util > 20 else "?"
                 print(
@@ -1652,6 +1738,7 @@ def main():
 
     # Step 5: Get current positions
     print("\n[5/7] Getting current positions...")
+    stage("positions")
     try:
         current_positions = get_current_positions()
     except Exception as e:
@@ -1675,6 +1762,7 @@ def main():
 
     # Step 6: Calculate trade amounts
     print(f"\n[6/7] Calculating trade amounts (>{args.threshold*100:.0f}% threshold)...")
+    stage("trades")
     trades = calculate_trade_amounts(
         target_positions, current_positions, notional_value, threshold=args.threshold
     )
@@ -1695,6 +1783,7 @@ def main():
     print("\n" + "=" * 80)
     print("TRADE EXECUTION")
     print("=" * 80)
+    stage("execution", trades=len(trades))
 
     if trades:
         print(f"\n{len(trades)} trade(s) to execute:")
@@ -1710,7 +1799,11 @@ def main():
             )
         else:
             send_orders_if_difference_exceeds_threshold(
-                trades, dry_run=args.dry_run, aggressive=not args.market
+                trades,
+                dry_run=args.dry_run,
+                aggressive=not args.market,
+                use_async=args.async_execution,
+                market_data_ws=args.ws_market_data,
             )
 
         if args.dry_run:
@@ -278,23 +278,15 @@ def calculate_trade_amounts(target_positions, current_positions, notional_value,
     Returns:
         dict: Dictionary of symbols to trade amounts (positive = buy, negative = sell)
     """
-    import ccxt
     import os
+    from exchange_session import get_exchange
 
     trades = {}
 
-    # Initialize exchange to fetch current prices if needed
-    api_key = os.getenv("HL_API")
-    api_secret = os.getenv("HL_SECRET")
+    # Pooled exchange to fetch current prices if needed
     exchange = None
-    if api_key and api_secret:
-        exchange = ccxt.hyperliquid(
-            {
-                "privateKey": api_secret,
-                "walletAddress": api_key,
-                "enableRateLimit": True,
-            }
-        )
+    if os.getenv("HL_API") and os.getenv("HL_SECRET"):
+        exchange = get_exchange()
 
     # Get current position notional values with proper sign handling
     current_notional = {}
@@ -0,0 +1,558 @@
+"""
+Market Data Feed - Streamed order books and user fills for the execution loops
+
+The tick loop, move_limits and the aggressive ladder poll REST for prices
+(fetch_tickers) and order status (open orders + fills) every tick. A
+MarketDataFeed instead consumes a stream of messages and keeps the latest
+state in memory:
+
+- One L2 OrderBook per symbol, with sequence / gap detection
+- Last trade price per symbol
+- The account's resting orders and fills
+
+Readers take snapshots from memory without any request:
+
+- feed.snapshot(symbols)       -> PriceSnapshot (same API as price_snapshot.py)
+- feed.fetch_open_orders()     -> resting orders  } drop-in for the exchange
+- feed.fetch_my_trades(since)  -> fills           } in FillTracker(feed)
+
+Once a feed is registered with price_snapshot.set_market_data_feed(), every
+get_price_snapshot() call it can answer (all symbols in sync and fresh) is
+served from the feed; anything else falls back to the REST poll.
+
+Messages are plain dicts (one JSON object per line when recorded):
+
+    {"channel": "book", "symbol": s, "type": "snapshot" | "delta", "seq": n,
+     "bids": [[price, size], ...], "asks": [[price, size], ...]}
+    {"channel": "ticker", "symbol": s, "last": price}
+    {"channel": "fills", "trades": [ccxt trade, ...]}
+    {"channel": "orders", "snapshot": bool, "orders": [ccxt order, ...]}
+
+Sources:
+- HyperliquidWsSource: live WebSocket streams (ccxt.pro)
+- ReplaySource: recorded messages (JSON lines file or list), no network
+
+Usage:
+    with streaming_market_data(symbols, record_path="session.jsonl") as feed:
+        aggressive_execute_orders(trades, dry_run=False)  # reads from the feed
+
+    # Tests / research: replay a recorded session synchronously
+    feed = MarketDataFeed(ReplaySource("session.jsonl"))
+    feed.run()
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from price_snapshot import PriceSnapshot, set_market_data_feed
+
+# Books without an update for this many seconds are not served
+DEFAULT_STALE_AFTER = 10.0
+
+# Fills kept in memory (oldest dropped first)
+MAX_FILLS = 10000
+
+# Open order statuses; any other status removes the order from the book
+OPEN_STATUSES = (None, "open")
+
+
+class OrderBook:
+    """L2 order book for one symbol, maintained from snapshot and delta messages"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.seq: Optional[int] = None
+        self.in_sync = False
+        self.updated_at: Optional[float] = None
+
+    def apply(self, message: dict, received_at: float) -> bool:
+        """
+        Apply a book message.
+
+        Snapshots replace the book. A snapshot with a seq older than the
+        current one is dropped (out-of-order delivery). Deltas must carry
+        seq = previous seq + 1; otherwise the book is marked out of sync and
+        ignores deltas until the next snapshot.
+
+        Args:
+            message: Book message (see module docstring)
+            received_at: Receive time in seconds since the epoch
+
+        Returns:
+            bool: False if a sequence gap was detected
+        """
+        seq = message.get("seq")
+
+        if message.get("type", "snapshot") == "snapshot":
+            if seq is not None and self.seq is not None and seq < self.seq:
+                return True
+            self.bids = {float(p): float(s) for p, s in message.get("bids", []) if float(s) > 0}
+            self.asks = {float(p): float(s) for p, s in message.get("asks", []) if float(s) > 0}
+            self.seq = seq
+            self.in_sync = True
+            self.updated_at = received_at
+            return True
+
+        if not self.in_sync:
+            return True
+        if seq is None or self.seq is None or seq != self.seq + 1:
+            self.in_sync = False
+            return False
+
+        for levels, side in ((self.bids, "bids"), (self.asks, "asks")):
+            for price, size in message.get(side, []):
+                price, size = float(price), float(size)
+                if size > 0:
+                    levels[price] = size
+                else:
+                    levels.pop(price, None)
+        self.seq = seq
+        self.updated_at = received_at
+        return True
+
+    @property
+    def best_bid(self) -> float:
+        return max(self.bids) if self.bids else np.nan
+
+    @property
+    def best_ask(self) -> float:
+        return min(self.asks) if self.asks else np.nan
+
+    def levels(self, depth: int = 10) -> Dict[str, List[List[float]]]:
+        """Top `depth` levels per side, best first ({'bids': [[price, size]], 'asks': ...})"""
+        bids = sorted(self.bids.items(), reverse=True)[:depth]
+        asks = sorted(self.asks.items())[:depth]
+        return {"bids": [list(level) for level in bids], "asks": [list(level) for level in asks]}
+
+
+class MarketDataFeed:
+    """In-memory books, last prices, open orders and fills fed by a message source"""
+
+    def __init__(
+        self,
+        source=None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        record_path: Optional[str] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        """
+        Args:
+            source: Message source (HyperliquidWsSource, ReplaySource); None to
+                    feed messages with process()
+            stale_after: Seconds without an update before a book is not served
+            record_path: Append every processed message to this JSON lines
+                         file (replayable with ReplaySource)
+            clock: Wall clock returning seconds since the epoch (injectable for tests)
+        """
+        self.source = source
+        self.stale_after = stale_after
+        self.record_path = record_path
+        self._clock = clock or time.time
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._books: Dict[str, OrderBook] = {}
+        self._last: Dict[str, float] = {}
+        self._orders: Dict[str, dict] = {}
+        self._fills: List[dict] = []
+        self._fill_ids: Dict[object, None] = {}  # insertion-ordered set
+        self._record_file = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.messages = 0
+        self.gaps = 0
+        # True once an orders snapshot arrived (open orders are then authoritative)
+        self.has_user_data = False
+        self.error: Optional[Exception] = None
+
+    def process(self, message: dict):
+        """Apply one message (thread-safe)"""
+        channel = message.get("channel")
+        resync = None
+
+        with self._updated:
+            now = self._clock()
+            self.messages += 1
+
+            if channel == "book":
+                symbol = message["symbol"]
+                book = self._books.get(symbol)
+                if book is None:
+                    book = self._books[symbol] = OrderBook(symbol)
+                if not book.apply(message, now):
+                    self.gaps += 1
+                    resync = symbol
+            elif channel == "ticker":
+                if message.get("last") is not None:
+                    self._last[message["symbol"]] = float(message["last"])
+            elif channel == "fills":
+                self._record_fills(message.get("trades", []), now)
+            elif channel == "orders":
+                if message.get("snapshot"):
+                    self._orders = {}
+                    self.has_user_data = True
+                for order in message.get("orders", []):
+                    order_id = str(order.get("id"))
+                    if order.get("status") in OPEN_STATUSES and (order.get("remaining") or 0) > 0:
+                        self._orders[order_id] = order
+                    else:
+                        self._orders.pop(order_id, None)
+
+            if self._record_file is not None:
+                self._record_file.write(json.dumps({**message, "received_at": now}) + "\n")
+            self._updated.notify_all()
+
+        if resync is not None:
+            print(f"  Warning: {resync} order book sequence gap, waiting for a snapshot")
+            if hasattr(self.source, "resync"):
+                self.source.resync(resync)
+
+    def _record_fills(self, trades: list, now: float):
+        for trade in trades:
+            trade_id = trade.get("id") or (trade.get("order"), trade.get("timestamp"))
+            if trade_id in self._fill_ids:
+                continue
+            # One id per stored fill, in the same order, so both are trimmed together
+            self._fill_ids[trade_id] = None
+            if trade.get("timestamp") is None:
+                trade = {**trade, "timestamp": int(now * 1000)}
+            self._fills.append(trade)
+
+        if len(self._fills) > MAX_FILLS:
+            dropped = len(self._fills) - MAX_FILLS
+            self._fills = self._fills[dropped:]
+            for trade_id in list(itertools.islice(self._fill_ids, dropped)):
+                del self._fill_ids[trade_id]
+
+    async def _consume(self):
+        async for message in self.source.stream():
+            self.process(message)
+
+    def _open_record_file(self):
+        if self.record_path and self._record_file is None:
+            self._record_file = open(self.record_path, "a")
+
+    def _close_record_file(self):
+        with self._lock:
+            if self._record_file is not None:
+                self._record_file.close()
+                self._record_file = None
+
+    def run(self):
+        """Consume the source in the calling thread until it ends (replays)"""
+        self._open_record_file()
+        try:
+            asyncio.run(self._consume())
+        finally:
+            self._close_record_file()
+
+    def start(self):
+        """Consume the source in a background thread (live streams)"""
+        if self._thread is not None:
+            return
+        self._open_record_file()
+        started = threading.Event()
+
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.current_task()
+            started.set()
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                self.error = e
+                print(f"  ✗ Market data stream stopped: {e}")
+            finally:
+                if hasattr(self.source, "close"):
+                    await self.source.close()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread and close the source"""
+        if self._thread is None:
+            return
+        if self._thread.is_alive() and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(timeout)
+        self._thread = None
+        self._close_record_file()
+
+    def wait_until_ready(self, symbols: Iterable[str], timeout: float = 10.0) -> bool:
+        """
+        Block until every symbol has an in-sync book.
+
+        Returns:
+            bool: True if ready, False on timeout
+        """
+        symbols = list(symbols)
+        deadline = time.monotonic() + timeout
+        with self._updated:
+            while not all(self._is_fresh(symbol, self._clock()) for symbol in symbols):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.error is not None:
+                    return False
+                self._updated.wait(remaining)
+        return True
+
+    def _is_fresh(self, symbol: str, now: float) -> bool:
+        book = self._books.get(symbol)
+        return (
+            book is not None
+            and book.in_sync
+            and book.updated_at is not None
+            and now - book.updated_at <= self.stale_after
+        )
+
+    def covers(self, symbols: Iterable[str]) -> bool:
+        """True if every symbol has an in-sync, fresh book"""
+        with self._lock:
+            now = self._clock()
+            return all(self._is_fresh(symbol, now) for symbol in symbols)
+
+    def book(self, symbol: str, depth: int = 10) -> Optional[Dict[str, List[List[float]]]]:
+        """Top levels of a symbol's book (None if unknown or out of sync)"""
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None or not book.in_sync:
+                return None
+            return book.levels(depth)
+
+    def snapshot(self, symbols: Optional[List[str]] = None) -> PriceSnapshot:
+        """
+        Current top of book for symbols.
+
+        Symbols without a fresh, in-sync book get NaN prices. 'last' is the
+        last streamed trade price, or the mid price before the first one.
+
+        Args:
+            symbols: Symbols wanted (default: every symbol with a book)
+
+        Returns:
+            PriceSnapshot
+        """
+        with self._lock:
+            now = self._clock()
+            if symbols is None:
+                symbols = list(self._books)
+            bid = np.full(len(symbols), np.nan)
+            ask = np.full(len(symbols), np.nan)
+            last = np.full(len(symbols), np.nan)
+            for i, symbol in enumerate(symbols):
+                if not self._is_fresh(symbol, now):
+                    continue
+                book = self._books[symbol]
+                bid[i], ask[i] = book.best_bid, book.best_ask
+                last[i] = self._last.get(symbol, (bid[i] + ask[i]) / 2)
+
+        return PriceSnapshot(symbols, bid, ask, last, timestamp=now)
+
+    def fetch_open_orders(self, symbol: Optional[str] = None) -> List[dict]:
+        """Resting orders of the account (exchange.fetch_open_orders equivalent)"""
+        with self._lock:
+            orders = list(self._orders.values())
+        return [o for o in orders if symbol is None or o.get("symbol") == symbol]
+
+    def fetch_my_trades(
+        self, symbol: Optional[str] = None, since: Optional[int] = None
+    ) -> List[dict]:
+        """Fills of the account (exchange.fetch_my_trades equivalent)"""
+        with self._lock:
+            fills = list(self._fills)
+        return [
+            t
+            for t in fills
+            if (symbol is None or t.get("symbol") == symbol)
+            and (since is None or (t.get("timestamp") or 0) >= since)
+        ]
+
+
+class ReplaySource:
+    """Replays recorded messages (no network access)"""
+
+    def __init__(self, messages, speed: Optional[float] = None):
+        """
+        Args:
+            messages: Path to a JSON lines file, or an iterable of message dicts
+            speed: Replay speed relative to the recorded 'received_at' times
+                   (None = as fast as possible)
+        """
+        self.messages = messages
+        self.speed = speed
+
+    def _iter_messages(self):
+        if isinstance(self.messages, str):
+            with open(self.messages) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            yield from self.messages
+
+    async def stream(self):
+        previous = None
+        for message in self._iter_messages():
+            received_at = message.get("received_at")
+            if self.speed and received_at is not None and previous is not None:
+                await asyncio.sleep(max(received_at - previous, 0) / self.speed)
+            if received_at is not None:
+                previous = received_at
+            yield message
+
+
+class HyperliquidWsSource:
+    """Live Hyperliquid streams through ccxt.pro WebSockets"""
+
+    def __init__(self, symbols: List[str], user: bool = True, exchange=None):
+        """
+        Args:
+            symbols: Symbols to stream books and last prices for
+            user: Also stream the account's orders and fills (needs HL_API / HL_SECRET)
+            exchange: ccxt.pro exchange instance (default: created from the environment)
+        """
+        self.symbols = list(symbols)
+        self.user = user
+        self.exchange = exchange
+        self._queue: Optional[asyncio.Queue] = None
+
+    def _create_exchange(self):
+        import ccxt.pro as ccxt_pro
+
+        config = {"enableRateLimit": True}
+        api_key = os.getenv("HL_API")
+        secret_key = os.getenv("HL_SECRET")
+        if api_key and secret_key:
+            config.update({"privateKey": secret_key, "walletAddress": api_key})
+        return ccxt_pro.hyperliquid(config)
+
+    async def _watch(self, watch, to_message):
+        # ccxt.pro reconnects internally; a raised error is logged and retried
+        while True:
+            try:
+                result = await watch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"  Warning: WebSocket stream error: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            for message in to_message(result):
+                await self._queue.put(message)
+
+    def _watchers(self):
+        exchange = self.exchange
+
+        def book_watcher(symbol):
+            def to_message(book):
+                # Hyperliquid pushes full l2Book snapshots; the exchange time orders them
+                return [
+                    {
+                        "channel": "book",
+                        "symbol": symbol,
+                        "type": "snapshot",
+                        "seq": book.get("timestamp"),
+                        "bids": [list(level[:2]) for level in book["bids"]],
+                        "asks": [list(level[:2]) for level in book["asks"]],
+                    }
+                ]
+
+            return self._watch(lambda: exchange.watch_order_book(symbol), to_message)
+
+        watchers = [book_watcher(symbol) for symbol in self.symbols]
+        watchers.append(
+            self._watch(
+                lambda: exchange.watch_tickers(self.symbols),
+                lambda tickers: [
+                    {"channel": "ticker", "symbol": s, "last": t.get("last")}
+                    for s, t in tickers.items()
+                    if s in self.symbols
+                ],
+            )
+        )
+        if self.user:
+            watchers.append(
+                self._watch(
+                    exchange.watch_my_trades,
+                    lambda trades: [{"channel": "fills", "trades": [dict(t) for t in trades]}],
+                )
+            )
+            watchers.append(
+                self._watch(
+                    exchange.watch_orders,
+                    lambda orders: [{"channel": "orders", "orders": [dict(o) for o in orders]}],
+                )
+            )
+        return watchers
+
+    async def stream(self):
+        if self.exchange is None:
+            self.exchange = self._create_exchange()
+        self._queue = asyncio.Queue()
+
+        if self.user:
+            # Seed resting orders; the stream only reports changes
+            orders = await self.exchange.fetch_open_orders()
+            await self._queue.put({"channel": "orders", "snapshot": True, "orders": orders})
+
+        tasks = [asyncio.ensure_future(watcher) for watcher in self._watchers()]
+        try:
+            while True:
+                yield await self._queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def resync(self, symbol: str):
+        """Books are full snapshots on Hyperliquid, so the next message resyncs"""
+
+    async def close(self):
+        if self.exchange is not None:
+            await self.exchange.close()
+
+
+@contextmanager
+def streaming_market_data(
+    symbols: List[str], user: bool = True, record_path: Optional[str] = None, timeout: float = 10.0
+):
+    """
+    Stream Hyperliquid market data for the duration of a block.
+
+    Starts a MarketDataFeed on a HyperliquidWsSource and registers it with
+    price_snapshot, so get_price_snapshot() calls inside the block read from
+    it. The feed is unregistered and stopped on exit.
+
+    Args:
+        symbols: Symbols to stream
+        user: Also stream the account's orders and fills
+        record_path: Record the session to this JSON lines file
+        timeout: Seconds to wait for the first books
+
+    Yields:
+        MarketDataFeed
+    """
+    feed = MarketDataFeed(HyperliquidWsSource(symbols, user=user), record_path=record_path)
+    feed.start()
+    try:
+        if feed.wait_until_ready(symbols, timeout):
+            print(f"✓ Streaming market data for {len(symbols)} symbols")
+        else:
+            print("  Warning: Market data stream not ready, missing books are polled over REST")
+        set_market_data_feed(feed)
+        yield feed
+    finally:
+        set_market_data_feed(None)
+        feed.stop()
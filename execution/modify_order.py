@@ -1,10 +1,17 @@
-import ccxt
-import os
 import argparse
+import os
+import sys
 from pprint import pprint
 
+# Import the session pool by one module name, so every caller shares its pool
+EXECUTION_DIR = os.path.dirname(os.path.abspath(__file__))
+if EXECUTION_DIR not in sys.path:
+    sys.path.insert(0, EXECUTION_DIR)
+
+from exchange_session import get_exchange
+
 
-def modify_order(order_id, symbol, new_price=None, new_amount=None):
+def modify_order(order_id, symbol, new_price=None, new_amount=None, exchange=None, existing_order=None):
     """
     Modify an existing order on Hyperliquid exchange with new price and/or new amount.
 
@@ -13,20 +20,20 @@ def modify_order(order_id, symbol, new_price=None, new_amount=None):
         symbol: Trading pair (e.g., 'BTC/USDC:USDC', 'ETH/USDC:USDC')
         new_price: New price for the order (optional, keeps existing if not provided)
         new_amount: New notional amount in USD/USDC (optional, keeps existing if not provided)
+        exchange: ccxt exchange instance (default: pooled client, see exchange_session.py)
+        existing_order: Current order state (side, price, amount, status) if the
+                        caller already has it; skips the fetch_order round trip
 
-    Requires environment variables:
+    Requires environment variables (when no exchange is passed):
         HL_API: Hyperliquid API key (wallet address)
         HL_SECRET: Hyperliquid secret key
 
     Returns:
         Dictionary containing modified order response
     """
-    # Get API credentials from environment variables
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
-        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
+    # Pooled authenticated client (raises ValueError without HL_API / HL_SECRET)
+    if exchange is None:
+        exchange = get_exchange()
 
     # Validate inputs
     if not order_id:
@@ -44,19 +51,11 @@ def modify_order(order_id, symbol, new_price=None, new_amount=None):
     if new_amount is not None and new_amount <= 0:
         raise ValueError("New amount must be positive")
 
-    # Initialize Hyperliquid exchange with authentication
-    exchange = ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
-
     try:
-        # First, fetch the existing order to get current details
-        print(f"\nFetching existing order {order_id}...")
-        existing_order = exchange.fetch_order(order_id, symbol)
+        # First, fetch the existing order to get current details (unless provided)
+        if existing_order is None:
+            print(f"\nFetching existing order {order_id}...")
+            existing_order = exchange.fetch_order(order_id, symbol)
 
         print(f"\nCurrent order details:")
         print(f"  Order ID: {existing_order.get('id', 'N/A')}")
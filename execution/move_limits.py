@@ -5,12 +5,12 @@ For buy orders: moves to best bid price
 For sell orders: moves to best ask price
 """
 
-import ccxt
 import os
 import argparse
 from typing import List, Dict
-from get_bid_ask import get_bid_ask
-from modify_order import modify_order
+from price_snapshot import get_price_snapshot
+from order_batch import OrderBatch
+from exchange_session import get_exchange
 
 
 def get_all_open_orders():
@@ -20,21 +20,8 @@ def get_all_open_orders():
     Returns:
         list: List of open orders
     """
-    # Get API credentials from environment variables
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
-        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
-
-    # Initialize Hyperliquid exchange with authentication
-    exchange = ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
+    # Pooled authenticated client (raises ValueError without HL_API / HL_SECRET)
+    exchange = get_exchange()
 
     try:
         # Fetch all open orders (no symbol specified = all symbols)
@@ -103,24 +90,17 @@ def move_orders_to_best_prices(dry_run: bool = True, verbose: bool = False):
     symbols = list(set(order["symbol"] for order in open_orders if order.get("symbol")))
 
     try:
-        bid_ask_df = get_bid_ask(symbols)
+        # One bulk ticker call for all symbols, shared with other callers this tick
+        bid_ask_dict = get_price_snapshot(symbols).bid_ask_dict()
     except Exception as e:
         print(f"\n✗ Failed to fetch bid/ask prices: {e}")
         return {"success": False, "error": str(e)}
 
-    if bid_ask_df is None or bid_ask_df.empty:
+    if not bid_ask_dict:
         print("\n✗ Error: Could not fetch bid/ask prices")
         return {"success": False, "error": "No bid/ask data available"}
 
-    # Convert DataFrame to dictionary for easy lookup
-    bid_ask_dict = {}
-    for _, row in bid_ask_df.iterrows():
-        bid_ask_dict[row["symbol"]] = {
-            "bid": row["bid"],
-            "ask": row["ask"],
-            "spread": row["spread"],
-            "spread_pct": row["spread_pct"],
-        }
+    print(f"✓ Fetched bid/ask for {len(bid_ask_dict)}/{len(symbols)} symbols")
 
     # Step 3: Modify orders to best bid/ask
     print(f"\n[3/3] Moving orders to best bid/ask prices...")
@@ -129,6 +109,8 @@ def move_orders_to_best_prices(dry_run: bool = True, verbose: bool = False):
     modified_count = 0
     skipped_count = 0
     error_count = 0
+    batch = None if dry_run else OrderBatch(get_exchange())
+    pending = {}  # order_id -> (symbol, target_price) of queued edits
 
     for order in open_orders:
         order_id = order.get("id")
@@ -190,24 +172,30 @@ def move_orders_to_best_prices(dry_run: bool = True, verbose: bool = False):
             print(f"  Status:        [DRY RUN] Would modify to ${target_price:,.2f}")
             modified_count += 1
         else:
-            try:
-                # Modify the order to the new price
-                modified_order = modify_order(
-                    order_id=order_id,
-                    symbol=symbol,
-                    new_price=target_price,
-                    new_amount=None,  # Keep same amount
-                )
-                print(f"  Status:        ✓ Modified to ${target_price:,.2f}")
+            # Queued; all edits go out in bulk requests below
+            order_type = order.get("type") or "limit"
+            batch.edit(order_id, symbol, side, amount, target_price, order_type, key=order_id)
+            pending[order_id] = (symbol, target_price)
+            print(f"  Status:        Queued modify to ${target_price:,.2f}")
+
+    if pending:
+        print(f"\nSubmitting {len(pending)} order modification(s) in bulk...")
+        edited = batch.submit()["edit"]
+
+        for order_id, (symbol, target_price) in pending.items():
+            result = edited[order_id]
+            if result["success"]:
+                print(f"  {symbol}: ✓ Modified to ${target_price:,.2f}")
                 modified_count += 1
 
                 if verbose:
-                    print(f"  New Order ID:  {modified_order.get('id', 'N/A')}")
-
-            except Exception as e:
-                print(f"  Status:        ✗ Error: {str(e)}")
+                    print(f"  New Order ID:  {result['order'].get('id', 'N/A')}")
+            else:
+                print(f"  {symbol}: ✗ Error: {result['error']}")
                 error_count += 1
 
+        print(f"  ({batch.requests_sent} signed request(s))")
+
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY")
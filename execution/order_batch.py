@@ -0,0 +1,302 @@
+"""
+Order Batch - Submit a tick's order actions as bulk signed requests
+
+The execution scripts used to place, modify and cancel orders one symbol at
+a time, so a 60-symbol rebalance cost 60+ signed requests per tick. An
+OrderBatch collects every action for the tick and submits them with the
+exchange's bulk endpoints (on Hyperliquid one signed "order", "batchModify"
+or "cancel" action carries many orders):
+
+- create -> exchange.create_orders
+- edit   -> exchange.edit_orders
+- cancel -> exchange.cancel_orders_for_symbols
+
+Actions are chunked to MAX_ACTIONS_PER_REQUEST per request and submitted in
+the order cancels, edits, creates (cancels free margin for the new orders).
+Each action is queued under a key (default: its symbol) and the result of
+every action is mapped back to that key, including per-order rejections
+reported inside an otherwise successful bulk response.
+
+If the exchange does not support a bulk endpoint, the actions fall back to
+one create_order / edit_order / cancel_order call each.
+
+submit_async() does the same with a ccxt.async_support client (used by
+async_execution.py).
+
+Usage:
+    batch = OrderBatch(exchange)
+    batch.edit(order["id"], symbol, "buy", order["amount"], new_price)
+    batch.create("ETH/USDC:USDC", "sell", 0.05, 3500.0)
+    results = batch.submit()
+    results["edit"][symbol]  # {'success', 'order', 'error', ...}
+"""
+
+from typing import Dict, Hashable, List, Optional
+
+# Hyperliquid weighs a batch as 1 + floor(n / 40); 40 keeps each request at weight 1-2
+MAX_ACTIONS_PER_REQUEST = 40
+
+ACTIONS = ("cancel", "edit", "create")
+
+NO_STATUS_ERROR = "No status returned for order"
+
+# ccxt capability flag and per-order fallback for each action
+_BULK_METHODS = {
+    "create": ("createOrders", "create_orders"),
+    "edit": ("editOrders", "edit_orders"),
+    "cancel": ("cancelOrdersForSymbols", "cancel_orders_for_symbols"),
+}
+
+
+def _order_error(order) -> Optional[str]:
+    """Rejection message of a parsed order from a bulk response (None if accepted)"""
+    if not isinstance(order, dict):
+        return None
+    info = order.get("info")
+    if isinstance(info, dict) and info.get("error"):
+        return str(info["error"])
+    if isinstance(info, str) and info != "success":
+        # Cancel statuses are "success" or an error string
+        return info
+    if order.get("status") == "rejected":
+        return "Order rejected"
+    return None
+
+
+def _cancel_statuses(orders: list) -> list:
+    """
+    Per-cancel statuses from a cancel_orders_for_symbols response.
+
+    ccxt returns a single order wrapping the raw response; the individual
+    results are in response.data.statuses, in request order. The wrapper is
+    unpacked even for a single cancel, where ccxt also returns one entry.
+    """
+    if len(orders) == 1 and isinstance(orders[0], dict):
+        info = orders[0].get("info")
+        response = (info.get("response") or {}) if isinstance(info, dict) else {}
+        statuses = (response.get("data") or {}).get("statuses")
+        if isinstance(statuses, list):
+            return [{"info": status} for status in statuses]
+    return orders
+
+
+def _result(request: dict, order, error: Optional[str]) -> dict:
+    return {"symbol": request["symbol"], "success": error is None, "order": order, "error": error}
+
+
+class OrderBatch:
+    """Collects create/edit/cancel actions and submits them in bulk requests"""
+
+    def __init__(self, exchange, max_batch_size: int = MAX_ACTIONS_PER_REQUEST):
+        """
+        Args:
+            exchange: ccxt exchange instance
+            max_batch_size: Maximum actions per signed request
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+
+        self.exchange = exchange
+        self.max_batch_size = max_batch_size
+        self.requests_sent = 0
+        self._actions: Dict[str, List[tuple]] = {action: [] for action in ACTIONS}
+
+    def __len__(self):
+        return sum(len(queued) for queued in self._actions.values())
+
+    def _queue(self, action: str, key: Optional[Hashable], request: dict) -> Hashable:
+        key = request["symbol"] if key is None else key
+        if any(queued_key == key for queued_key, _ in self._actions[action]):
+            raise ValueError(f"Duplicate {action} action for key {key!r}")
+        self._actions[action].append((key, request))
+        return key
+
+    def create(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        order_type: str = "limit",
+        params: Optional[dict] = None,
+        key: Optional[Hashable] = None,
+    ) -> Hashable:
+        """
+        Queue a new order.
+
+        Args:
+            symbol: Trading pair (e.g. 'BTC/USDC:USDC')
+            side: 'buy' or 'sell'
+            amount: Order quantity in base currency
+            price: Limit price (Hyperliquid also needs it for market orders)
+            order_type: 'limit' or 'market'
+            params: Extra exchange parameters
+            key: Result key (default: symbol)
+
+        Returns:
+            The key the result will be stored under
+        """
+        request = {
+            "symbol": symbol,
+            "type": order_type,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "params": params or {},
+        }
+        return self._queue("create", key, request)
+
+    def edit(
+        self,
+        order_id: str,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: float,
+        order_type: str = "limit",
+        params: Optional[dict] = None,
+        key: Optional[Hashable] = None,
+    ) -> Hashable:
+        """
+        Queue a price/amount change of an open order.
+
+        Args:
+            order_id: Exchange order id
+            symbol: Trading pair
+            side: 'buy' or 'sell' (unchanged from the open order)
+            amount: New (or current) quantity
+            price: New (or current) price
+            order_type: Order type of the open order
+            params: Extra exchange parameters
+            key: Result key (default: symbol)
+
+        Returns:
+            The key the result will be stored under
+        """
+        request = {
+            "id": order_id,
+            "symbol": symbol,
+            "type": order_type,
+            "side": side,
+            "amount": amount,
+            "price": price,
+            "params": params or {},
+        }
+        return self._queue("edit", key, request)
+
+    def cancel(self, order_id: str, symbol: str, key: Optional[Hashable] = None) -> Hashable:
+        """
+        Queue a cancellation.
+
+        Args:
+            order_id: Exchange order id
+            symbol: Trading pair
+            key: Result key (default: symbol)
+
+        Returns:
+            The key the result will be stored under
+        """
+        return self._queue("cancel", key, {"id": order_id, "symbol": symbol})
+
+    def _submit_single(self, action: str, request: dict):
+        """Per-order fallback for exchanges without a bulk endpoint"""
+        self.requests_sent += 1
+        if action == "cancel":
+            return self.exchange.cancel_order(request["id"], request["symbol"])
+        if action == "edit":
+            return self.exchange.edit_order(
+                request["id"],
+                request["symbol"],
+                request["type"],
+                request["side"],
+                request["amount"],
+                request["price"],
+                request["params"],
+            )
+        return self.exchange.create_order(
+            request["symbol"],
+            request["type"],
+            request["side"],
+            request["amount"],
+            request["price"],
+            request["params"],
+        )
+
+    def _take(self) -> Dict[str, List[tuple]]:
+        """Queued actions (cleared from the batch)"""
+        queued, self._actions = self._actions, {action: [] for action in ACTIONS}
+        return queued
+
+    def _chunks(self, queued: List[tuple]):
+        for start in range(0, len(queued), self.max_batch_size):
+            yield queued[start : start + self.max_batch_size]
+
+    def _bulk_supported(self, action: str) -> bool:
+        has = getattr(self.exchange, "has", {}) or {}
+        return bool(has.get(_BULK_METHODS[action][0]))
+
+    @staticmethod
+    def _map_chunk(action: str, chunk: List[tuple], orders: list, chunk_error: str, results: dict):
+        """Store one result per action of a chunk, in request order"""
+        if action == "cancel":
+            orders = _cancel_statuses(orders)
+        for i, (key, request) in enumerate(chunk):
+            order = orders[i] if i < len(orders) else None
+            error = _order_error(order) if order is not None else chunk_error
+            results[action][key] = _result(request, order, error)
+
+    def submit(self) -> Dict[str, Dict[Hashable, dict]]:
+        """
+        Submit all queued actions and clear the batch.
+
+        A failed bulk request marks every action in that chunk as failed; it
+        is not retried order by order, since the exchange may have applied it.
+
+        Returns:
+            dict: {'cancel' | 'edit' | 'create': {key: result}} where result is
+            {'symbol', 'success', 'order' (parsed ccxt order or None), 'error'}
+        """
+        results: Dict[str, Dict[Hashable, dict]] = {action: {} for action in ACTIONS}
+
+        for action, queued in self._take().items():
+            if not self._bulk_supported(action):
+                for key, request in queued:
+                    try:
+                        order = self._submit_single(action, request)
+                        error = _order_error(order)
+                    except Exception as e:
+                        order, error = None, str(e)
+                    results[action][key] = _result(request, order, error)
+                continue
+
+            method = getattr(self.exchange, _BULK_METHODS[action][1])
+            for chunk in self._chunks(queued):
+                self.requests_sent += 1
+                try:
+                    orders, chunk_error = method([request for _, request in chunk]), None
+                except Exception as e:
+                    orders, chunk_error = [], str(e)
+                self._map_chunk(action, chunk, orders, chunk_error or NO_STATUS_ERROR, results)
+
+        return results
+
+    async def submit_async(self) -> Dict[str, Dict[Hashable, dict]]:
+        """
+        submit() for a ccxt.async_support exchange (bulk endpoints only).
+
+        Returns:
+            dict: Same structure as submit()
+        """
+        results: Dict[str, Dict[Hashable, dict]] = {action: {} for action in ACTIONS}
+
+        for action, queued in self._take().items():
+            method = getattr(self.exchange, _BULK_METHODS[action][1])
+            for chunk in self._chunks(queued):
+                self.requests_sent += 1
+                try:
+                    orders, chunk_error = await method([request for _, request in chunk]), None
+                except Exception as e:
+                    orders, chunk_error = [], str(e)
+                self._map_chunk(action, chunk, orders, chunk_error or NO_STATUS_ERROR, results)
+
+        return results
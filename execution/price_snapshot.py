@@ -0,0 +1,294 @@
+"""
+Price Snapshot Service - Bulk bid/ask/last prices for many symbols
+
+Fetches bid/ask/last prices for the whole universe in one bulk call
+(exchange.fetch_tickers; on Hyperliquid a single metaAndAssetCtxs request)
+instead of one fetch_ticker per symbol. On Hyperliquid the bid/ask are the
+impact prices (impactPxs) of each asset context, not the top of the book. Note that Hyperliquid's
+fetch_ticker is itself implemented as a full fetch_tickers call, so a
+serial loop over N symbols downloads the whole universe N times.
+
+Snapshots are NumPy-backed (one array per field, aligned to a symbols
+array) and are shared through a PriceSnapshotService, which reuses one
+exchange instance (markets loaded once) and serves repeat requests within
+`max_age` seconds from the last poll. This lets the tick loop, move_limits
+and send_spread_offset_orders share a single poll per tick.
+
+If the exchange does not support fetch_tickers, the service falls back to
+per-symbol fetch_ticker calls.
+
+When a streaming MarketDataFeed (market_data.py) is registered with
+set_market_data_feed(), get_price_snapshot() serves every request the feed
+covers (all symbols in sync and fresh) from memory without polling.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from exchange_session import get_public_exchange
+
+# Repeat requests within this many seconds are served from the last poll
+DEFAULT_MAX_AGE = 1.0
+
+BID_ASK_COLUMNS = ["symbol", "bid", "ask", "spread", "spread_pct", "timestamp"]
+
+
+class PriceSnapshot:
+    """Bid/ask/last prices for a set of symbols at one point in time"""
+
+    def __init__(self, symbols, bid, ask, last, timestamp: Optional[float] = None):
+        """
+        Args:
+            symbols: Symbols, aligned with the price arrays
+            bid: Best bid per symbol (NaN = unavailable)
+            ask: Best ask per symbol (NaN = unavailable)
+            last: Last trade price per symbol (NaN = unavailable)
+            timestamp: Poll time in seconds since the epoch (default: now)
+        """
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.bid = np.asarray(bid, dtype=float)
+        self.ask = np.asarray(ask, dtype=float)
+        self.last = np.asarray(last, dtype=float)
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_tickers(cls, tickers: Dict[str, dict], symbols: Optional[List[str]] = None, timestamp=None):
+        """
+        Build a snapshot from a ccxt {symbol: ticker} mapping.
+
+        Args:
+            tickers: Result of exchange.fetch_tickers()
+            symbols: Symbols to include (default: all tickers); symbols
+                     without a ticker get NaN prices
+            timestamp: Poll time in seconds since the epoch (default: now)
+        """
+        if symbols is None:
+            symbols = list(tickers)
+
+        def field(name):
+            values = [(tickers.get(symbol) or {}).get(name) for symbol in symbols]
+            return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+        return cls(symbols, field("bid"), field("ask"), field("last"), timestamp=timestamp)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._index
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.timestamp
+
+    @property
+    def spread(self) -> np.ndarray:
+        return self.ask - self.bid
+
+    @property
+    def spread_pct(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.bid > 0, self.spread / self.bid * 100, 0.0)
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self.bid + self.ask) / 2
+
+    @property
+    def has_bid_ask(self) -> np.ndarray:
+        """Mask of symbols with both a bid and an ask"""
+        return ~np.isnan(self.bid) & ~np.isnan(self.ask)
+
+    def subset(self, symbols: List[str]) -> "PriceSnapshot":
+        """Snapshot restricted to (and ordered by) the given symbols"""
+        rows = np.array([self._index.get(symbol, -1) for symbol in symbols], dtype=int)
+        found = rows >= 0
+
+        def take(values):
+            out = np.full(len(rows), np.nan)
+            out[found] = values[rows[found]]
+            return out
+
+        return PriceSnapshot(symbols, take(self.bid), take(self.ask), take(self.last), self.timestamp)
+
+    def get(self, symbol: str) -> Optional[Dict[str, float]]:
+        """
+        Prices for one symbol.
+
+        Returns:
+            dict: bid, ask, last, spread, spread_pct (None if the symbol is unknown)
+        """
+        i = self._index.get(symbol)
+        if i is None:
+            return None
+        return {
+            "bid": float(self.bid[i]),
+            "ask": float(self.ask[i]),
+            "last": float(self.last[i]),
+            "spread": float(self.spread[i]),
+            "spread_pct": float(self.spread_pct[i]),
+        }
+
+    def bid_ask_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        {symbol: {'bid', 'ask', 'spread', 'spread_pct'}} for symbols with both sides.
+
+        Same shape as tick.fetch_bid_ask_prices returns.
+        """
+        spread, spread_pct = self.spread, self.spread_pct
+        return {
+            self.symbols[i]: {
+                "bid": float(self.bid[i]),
+                "ask": float(self.ask[i]),
+                "spread": float(spread[i]),
+                "spread_pct": float(spread_pct[i]),
+            }
+            for i in np.flatnonzero(self.has_bid_ask)
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame of symbols with both sides, as get_bid_ask returns.
+
+        Returns:
+            DataFrame with columns: symbol, bid, ask, spread, spread_pct, timestamp
+        """
+        mask = self.has_bid_ask
+        df = pd.DataFrame(
+            {
+                "symbol": self.symbols[mask].astype(str),
+                "bid": self.bid[mask],
+                "ask": self.ask[mask],
+                "spread": self.spread[mask],
+                "spread_pct": self.spread_pct[mask],
+                "timestamp": datetime.fromtimestamp(self.timestamp),
+            },
+            columns=BID_ASK_COLUMNS,
+        )
+        return df.sort_values("symbol").reset_index(drop=True)
+
+
+class PriceSnapshotService:
+    """Polls bulk prices and shares recent snapshots between callers"""
+
+    def __init__(self, exchange=None, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Args:
+            exchange: CCXT exchange instance (default: pooled public Hyperliquid client)
+            max_age: Seconds a snapshot is reused before polling again
+        """
+        self.exchange = exchange
+        self.max_age = max_age
+        self._snapshot: Optional[PriceSnapshot] = None
+        # Requested symbols the last poll did not return (delisted, typos); they do
+        # not force another poll while that snapshot is fresh
+        self._missing: set = set()
+        self._lock = threading.Lock()
+
+    def get_exchange(self):
+        """Exchange used for polling (created on first use)"""
+        if self.exchange is None:
+            self.exchange = get_public_exchange()
+        return self.exchange
+
+    def _poll(self, symbols: Optional[List[str]]) -> PriceSnapshot:
+        exchange = self.get_exchange()
+        if exchange.has.get("fetchTickers"):
+            # One bulk call for the whole universe
+            return PriceSnapshot.from_tickers(exchange.fetch_tickers())
+
+        tickers = {}
+        for symbol in symbols or []:
+            try:
+                tickers[symbol] = exchange.fetch_ticker(symbol)
+            except Exception as e:
+                print(f"  Warning: Could not fetch prices for {symbol}: {e}")
+        return PriceSnapshot.from_tickers(tickers, symbols)
+
+    def snapshot(self, symbols: Optional[List[str]] = None, max_age: Optional[float] = None) -> PriceSnapshot:
+        """
+        Current prices, polling the exchange only if the last snapshot is too old.
+
+        Args:
+            symbols: Symbols wanted (default: every symbol of the last poll)
+            max_age: Override of the service's max_age (0 forces a poll)
+
+        Returns:
+            PriceSnapshot: Restricted to `symbols` when given
+        """
+        max_age = self.max_age if max_age is None else max_age
+
+        with self._lock:
+            current = self._snapshot
+            stale = current is None or current.age > max_age
+            if not stale and symbols is not None:
+                stale = any(
+                    symbol not in current and symbol not in self._missing for symbol in symbols
+                )
+            if stale:
+                current = self._snapshot = self._poll(symbols)
+                self._missing = {
+                    symbol for symbol in self._missing.union(symbols or []) if symbol not in current
+                }
+
+        return current if symbols is None else current.subset(symbols)
+
+
+_default_services: Dict[int, PriceSnapshotService] = {}
+_default_lock = threading.Lock()
+_market_data_feed = None
+
+
+def set_market_data_feed(feed):
+    """
+    Serve get_price_snapshot() from a streaming MarketDataFeed when it can.
+
+    Args:
+        feed: Started MarketDataFeed, or None to go back to REST polling only
+    """
+    global _market_data_feed
+    _market_data_feed = feed
+
+
+def get_market_data_feed():
+    """The registered MarketDataFeed (None if prices are polled)"""
+    return _market_data_feed
+
+
+def get_snapshot_service(exchange=None) -> PriceSnapshotService:
+    """
+    Shared service for an exchange instance (or the default public client).
+
+    Callers passing the same exchange (or none) share one snapshot cache.
+    """
+    key = 0 if exchange is None else id(exchange)
+    with _default_lock:
+        service = _default_services.get(key)
+        if service is None or (exchange is not None and service.exchange is not exchange):
+            service = _default_services[key] = PriceSnapshotService(exchange)
+        return service
+
+
+def get_price_snapshot(symbols: Optional[List[str]] = None, exchange=None, max_age: Optional[float] = None) -> PriceSnapshot:
+    """
+    Bid/ask/last prices for symbols from the shared snapshot service.
+
+    Args:
+        symbols: Trading pairs wanted (default: whole universe)
+        exchange: CCXT exchange instance (default: pooled public Hyperliquid client)
+        max_age: Seconds a previous poll may be reused (default: DEFAULT_MAX_AGE)
+
+    Returns:
+        PriceSnapshot
+    """
+    feed = _market_data_feed
+    if feed is not None and symbols is not None and feed.covers(symbols):
+        return feed.snapshot(symbols)
+    return get_snapshot_service(exchange).snapshot(symbols, max_age=max_age)
@@ -19,32 +19,40 @@ to place orders. For example:
 import argparse
 import os
 from typing import Dict
-import ccxt
-from get_bid_ask import get_bid_ask
-from ccxt_make_order import ccxt_make_order
+from price_snapshot import get_price_snapshot
+from exchange_session import get_exchange as get_session_exchange, get_public_exchange
+from order_batch import OrderBatch
 
 
 def get_exchange():
     """
-    Initialize and return Hyperliquid exchange instance.
+    Return the pooled Hyperliquid exchange instance.
 
     Returns:
         ccxt.Exchange: Configured Hyperliquid exchange
     """
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
+    if not os.getenv("HL_API") or not os.getenv("HL_SECRET"):
         # Return public exchange (read-only) if no credentials
-        return ccxt.hyperliquid({"enableRateLimit": True})
-
-    return ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
+        return get_public_exchange()
+
+    return get_session_exchange()
+
+
+def spread_offset_price(side: str, bid: float, ask: float, spread_multiplier: float) -> float:
+    """
+    Limit price offset from the best bid/ask by a multiple of the spread.
+
+    Args:
+        side: 'buy' (bid - spread * multiplier) or 'sell' (ask + spread * multiplier)
+        bid: Best bid
+        ask: Best ask
+        spread_multiplier: Offset in spreads
+
+    Returns:
+        float: Unrounded limit price
+    """
+    spread_offset = (ask - bid) * spread_multiplier
+    return bid - spread_offset if side == "buy" else ask + spread_offset
 
 
 def round_price_to_tick_size(exchange, symbol: str, price: float) -> float:
@@ -143,27 +151,19 @@ def send_spread_offset_orders(
     print(f"\n[1/2] Fetching bid/ask prices for {len(symbols)} symbols...")
     print("-" * 80)
 
-    bid_ask_df = get_bid_ask(symbols)
+    # One bulk ticker call for all symbols, shared with other callers this tick
+    bid_ask_dict = get_price_snapshot(symbols).bid_ask_dict()
 
-    if bid_ask_df is None or bid_ask_df.empty:
+    if not bid_ask_dict:
         print("\n? Error: Could not fetch bid/ask prices")
         return []
 
-    # Convert DataFrame to dictionary for easy lookup
-    bid_ask_dict = {}
-    for _, row in bid_ask_df.iterrows():
-        bid_ask_dict[row["symbol"]] = {
-            "bid": row["bid"],
-            "ask": row["ask"],
-            "spread": row["spread"],
-            "spread_pct": row["spread_pct"],
-        }
-
     # Step 2: Place limit orders with spread offset
     print(f"\n[2/2] Placing limit orders with {spread_multiplier}x spread offset...")
     print("-" * 80)
 
     orders = []
+    batch = OrderBatch(exchange)
 
     for symbol, notional_amount in trades.items():
         # Skip if amount is zero
@@ -188,13 +188,13 @@ def send_spread_offset_orders(
         if notional_amount > 0:
             # Buy order - place at BID - (spread * multiplier)
             side = "buy"
-            raw_price = bid - spread_offset
+            raw_price = spread_offset_price(side, bid, ask, spread_multiplier)
             abs_amount = notional_amount
             price_description = f"BID - {spread_multiplier}x spread"
         else:
             # Sell order - place at ASK + (spread * multiplier)
             side = "sell"
-            raw_price = ask + spread_offset
+            raw_price = spread_offset_price(side, bid, ask, spread_multiplier)
             abs_amount = abs(notional_amount)
             price_description = f"ASK + {spread_multiplier}x spread"
 
@@ -229,20 +229,23 @@ def send_spread_offset_orders(
                 f"  Status:         [DRY RUN] Would place {side.upper()} limit order at ${price:.4f}"
             )
         else:
-            try:
-                # Place limit order
-                order = ccxt_make_order(
-                    symbol=symbol,
-                    notional_amount=abs_amount,
-                    side=side,
-                    order_type="limit",
-                    price=price,
-                )
-                orders.append(order)
-                print(f"  Status:         ? Limit order placed successfully")
-                print(f"  Order ID:       {order.get('id', 'N/A')}")
-            except Exception as e:
-                print(f"  Status:         ? Error: {str(e)}")
+            # Queued; all orders go out in bulk requests below
+            batch.create(symbol, side, abs_amount / price, price)
+            print(f"  Status:         Queued {side.upper()} limit order at ${price:.4f}")
+
+    if len(batch):
+        print(f"\nSubmitting {len(batch)} limit orders in bulk...")
+        placed = batch.submit()["create"]
+
+        for symbol, result in placed.items():
+            if result["success"]:
+                orders.append(result["order"])
+                print(f"  {symbol}: ? Limit order placed successfully")
+                print(f"  Order ID:       {result['order'].get('id', 'N/A')}")
+            else:
+                print(f"  {symbol}: ? Error: {result['error']}")
+
+        print(f"  ({batch.requests_sent} signed request(s))")
 
     # Summary
     print("\n" + "=" * 80)
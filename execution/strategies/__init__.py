@@ -15,6 +15,7 @@ from .defi_fee_yield import strategy_defi_fee_yield
 from .defi_emission_yield import strategy_defi_emission_yield
 from .defi_net_yield import strategy_defi_net_yield
 from .defi_revenue_productivity import strategy_defi_revenue_productivity
+from .features import StrategyFeatures
 
 __all__ = [
     "strategy_days_from_high",
@@ -34,4 +35,5 @@ __all__ = [
     "strategy_defi_emission_yield",
     "strategy_defi_net_yield",
     "strategy_defi_revenue_productivity",
+    "StrategyFeatures",
 ]
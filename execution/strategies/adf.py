@@ -30,6 +30,27 @@ except ImportError:
     print("  pip install statsmodels")
     adfuller = None
 
+# The batched engine needs statsmodels too; import it only when statsmodels is there
+# so a failure inside the engine module still surfaces as itself
+if adfuller is not None:
+    from signals.calc_rolling_adf import ADFCache, clip_adf_stat, rolling_adf
+else:
+    ADFCache = clip_adf_stat = rolling_adf = None
+
+# Shared ADF cache, created on first use
+_adf_cache = None
+
+
+def _shared_adf_cache():
+    """Module-level ADFCache (None if its directory cannot be created)"""
+    global _adf_cache
+    if _adf_cache is None:
+        try:
+            _adf_cache = ADFCache()
+        except OSError:
+            return None
+    return _adf_cache
+
 
 def detect_regime(btc_data, lookback_days=5):
     """
@@ -124,67 +145,85 @@ def calculate_adf_signals(
     adf_window=60,
     regression="ct",
     volatility_window=30,
+    cache=None,
 ):
     """
     Calculate ADF signals for all symbols.
     
+    Args:
+        cache (ADFCache): Store of tested windows (default: the module's shared cache)
+    
     Returns:
         DataFrame with columns: symbol, adf_stat, adf_pvalue, volatility
     """
-    if adfuller is None:
+    if rolling_adf is None:
         return pd.DataFrame()
     
-    adf_results = []
-    
+    latest = {}
     for symbol in symbols:
         if symbol not in historical_data:
             continue
         
-        df = historical_data[symbol].copy()
+        df = historical_data[symbol]
         if len(df) < adf_window:
             continue
         
         # Sort by date
-        df = df.sort_values("date").reset_index(drop=True)
+        latest[symbol] = df.sort_values("date").reset_index(drop=True)
+    
+    if not latest:
+        return pd.DataFrame()
+    
+    # Run ADF on the most recent window of every symbol in one batch; windows
+    # already tested (by the backtests or an earlier run) come from the cache
+    windows = pd.concat(
+        [
+            pd.DataFrame({
+                "symbol": symbol,
+                "date": df["date"].iloc[-adf_window:].to_numpy(),
+                "close": df["close"].iloc[-adf_window:].to_numpy(),
+            })
+            for symbol, df in latest.items()
+        ],
+        ignore_index=True,
+    )
+    if cache is None:
+        cache = _shared_adf_cache()
+    adf = rolling_adf(
+        windows["close"].to_numpy(),
+        windows["symbol"].to_numpy(),
+        windows["date"].to_numpy(),
+        window=adf_window,
+        regression=regression,
+        autolag="AIC",
+        last_only=True,
+        cache=cache,
+    )
+    last_rows = adf.iloc[adf_window - 1 :: adf_window].reset_index(drop=True)
+    
+    adf_results = []
+    for (symbol, df), (_, row) in zip(latest.items(), last_rows.iterrows()):
+        # Cap extreme values
+        adf_stat = clip_adf_stat(row["adf_stat"])
+        adf_pvalue = row["adf_pvalue"]
         
-        # Calculate returns for volatility
-        df["daily_return"] = np.log(df["close"] / df["close"].shift(1))
+        # Calculate volatility
+        daily_return = np.log(df["close"] / df["close"].shift(1))
+        recent_returns = daily_return.iloc[-volatility_window:].dropna()
+        if len(recent_returns) >= int(volatility_window * 0.7):
+            volatility = recent_returns.std() * np.sqrt(365)
+        else:
+            volatility = np.nan
         
-        # Calculate ADF using most recent window
-        if len(df) >= adf_window:
-            window_prices = df["close"].iloc[-adf_window:].values
-            
-            try:
-                # Run ADF test
-                result = adfuller(window_prices, regression=regression, autolag="AIC")
-                adf_stat = result[0]
-                adf_pvalue = result[1]
-                
-                # Cap extreme values
-                if adf_stat < -20:
-                    adf_stat = -20
-                elif adf_stat > 0:
-                    adf_stat = 0
-                
-                # Calculate volatility
-                recent_returns = df["daily_return"].iloc[-volatility_window:].dropna()
-                if len(recent_returns) >= int(volatility_window * 0.7):
-                    volatility = recent_returns.std() * np.sqrt(365)
-                else:
-                    volatility = np.nan
-                
-                # Store result
-                if not np.isnan(adf_stat) and not np.isnan(volatility) and volatility > 0:
-                    adf_results.append({
-                        "symbol": symbol,
-                        "adf_stat": adf_stat,
-                        "adf_pvalue": adf_pvalue,
-                        "volatility": volatility,
-                        "is_stationary": adf_pvalue < 0.05,
-                    })
-            
-            except Exception:
-                continue
+        # Store result
+        if not np.isnan(adf_stat) and not np.isnan(volatility) and volatility > 0:
+            adf_results.append({
+                "symbol": symbol,
+                "adf_stat": adf_stat,
+                "adf_pvalue": adf_pvalue,
+                "volatility": volatility,
+                "is_stationary": adf_pvalue < 0.05,
+            })
     
     if not adf_results:
         return pd.DataFrame()
@@ -341,7 +380,7 @@ def strategy_adf(
     print(f"  Weighting: {weighting_method}")
     
     # Check if statsmodels is available
-    if adfuller is None:
+    if rolling_adf is None:
         print("  ⚠️  statsmodels not available - cannot calculate ADF")
         return {}
     
@@ -14,6 +14,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from .utils import get_log_returns_frame
+
 
 def strategy_beta(
     historical_data,
@@ -27,6 +29,7 @@ def strategy_beta(
     weighting_method="equal_weight",
     long_allocation=0.5,
     short_allocation=0.5,
+    features=None,
 ):
     """
     Beta factor strategy (Betting Against Beta).
@@ -43,6 +46,7 @@ def strategy_beta(
         weighting_method (str): Weighting method ('equal_weight' or 'risk_parity')
         long_allocation (float): Allocation to long side (default: 0.5)
         short_allocation (float): Allocation to short side (default: 0.5)
+        features (StrategyFeatures): Shared per-run features (log returns computed once)
     
     Returns:
         dict: Dictionary mapping symbols to notional positions (positive = long, negative = short)
@@ -76,16 +80,16 @@ def strategy_beta(
             print("  ⚠️  BTC data not found - cannot calculate beta")
             return {}
         
-        btc_data = historical_data[btc_symbol].copy()
-        if len(btc_data) < beta_window:
-            print(f"  ⚠️  Insufficient BTC data ({len(btc_data)} < {beta_window} days)")
+        btc_length = len(historical_data[btc_symbol])
+        if btc_length < beta_window:
+            print(f"  ⚠️  Insufficient BTC data ({btc_length} < {beta_window} days)")
             return {}
         
         print(f"  Using {btc_symbol} as benchmark")
         
         # Calculate BTC returns
-        btc_data = btc_data.sort_values("date").reset_index(drop=True)
-        btc_data["btc_return"] = np.log(btc_data["close"] / btc_data["close"].shift(1))
+        btc_data = get_log_returns_frame(historical_data, btc_symbol, features)
+        btc_data = btc_data.rename(columns={"daily_return": "btc_return"})
         
         # Step 2: Calculate beta for all symbols
         beta_results = []
@@ -94,15 +98,11 @@ def strategy_beta(
             if symbol not in historical_data or symbol == btc_symbol:
                 continue
             
-            df = historical_data[symbol].copy()
-            if len(df) < beta_window:
+            if len(historical_data[symbol]) < beta_window:
                 continue
             
-            # Sort by date
-            df = df.sort_values("date").reset_index(drop=True)
-            
-            # Calculate returns
-            df["daily_return"] = np.log(df["close"] / df["close"].shift(1))
+            # Date-sorted daily log returns
+            df = get_log_returns_frame(historical_data, symbol, features)
             
             # Merge with BTC returns
             df = df.merge(
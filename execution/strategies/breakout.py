@@ -1,7 +1,8 @@
-from typing import Dict
+from typing import Dict, Optional
 
 import pandas as pd
 
+from .features import StrategyFeatures
 from .utils import (
     calculate_breakout_signals_from_data,
     calculate_rolling_30d_volatility,
@@ -10,7 +11,9 @@ from .utils import (
 
 
 def strategy_breakout(
-    historical_data: Dict[str, pd.DataFrame], notional: float
+    historical_data: Dict[str, pd.DataFrame],
+    notional: float,
+    features: Optional[StrategyFeatures] = None,
 ) -> Dict[str, float]:
     signals = calculate_breakout_signals_from_data(historical_data)
     longs = [s for s, d in signals.items() if d == 1]
@@ -19,7 +22,7 @@ def strategy_breakout(
     target_positions: Dict[str, float] = {}
 
     if longs:
-        vola_long = calculate_rolling_30d_volatility(historical_data, longs)
+        vola_long = calculate_rolling_30d_volatility(historical_data, longs, features)
         w_long = calc_weights(vola_long) if vola_long else {}
         for symbol, w in w_long.items():
             target_positions[symbol] = target_positions.get(symbol, 0.0) + w * notional
@@ -28,7 +31,7 @@ def strategy_breakout(
         print("  No breakout LONG signals.")
 
     if shorts:
-        vola_short = calculate_rolling_30d_volatility(historical_data, shorts)
+        vola_short = calculate_rolling_30d_volatility(historical_data, shorts, features)
         w_short = calc_weights(vola_short) if vola_short else {}
         for symbol, w in w_short.items():
             target_positions[symbol] = target_positions.get(symbol, 0.0) - w * notional
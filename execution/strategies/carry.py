@@ -1,7 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
+from .features import StrategyFeatures
 from .utils import calculate_rolling_30d_volatility, calc_weights, get_base_symbol
 
 
@@ -12,6 +13,7 @@ def strategy_carry(
     exchange_id: str = "hyperliquid",
     top_n: int = 10,
     bottom_n: int = 10,
+    features: Optional[StrategyFeatures] = None,
 ) -> Dict[str, float]:
     """
     Carry strategy using AGGREGATED market-wide funding rates from Coinalyze.
@@ -144,7 +146,7 @@ def strategy_carry(
     target_positions: Dict[str, float] = {}
 
     if long_symbols:
-        vola_long = calculate_rolling_30d_volatility(historical_data, long_symbols)
+        vola_long = calculate_rolling_30d_volatility(historical_data, long_symbols, features)
         w_long = calc_weights(vola_long) if vola_long else {}
         for symbol, w in w_long.items():
             target_positions[symbol] = target_positions.get(symbol, 0.0) + w * notional
@@ -155,7 +157,7 @@ def strategy_carry(
         print("  No carry LONG candidates (negative funding).")
 
     if short_symbols:
-        vola_short = calculate_rolling_30d_volatility(historical_data, short_symbols)
+        vola_short = calculate_rolling_30d_volatility(historical_data, short_symbols, features)
         w_short = calc_weights(vola_short) if vola_short else {}
         for symbol, w in w_short.items():
             target_positions[symbol] = target_positions.get(symbol, 0.0) - w * notional
@@ -1,20 +1,24 @@
-from typing import Dict
+from typing import Dict, Optional
 
 import pandas as pd
 
+from .features import StrategyFeatures
 from .utils import calculate_days_from_200d_high, calculate_rolling_30d_volatility, calc_weights
 
 
 def strategy_days_from_high(
-    historical_data: Dict[str, pd.DataFrame], notional: float, max_days: int = 20
+    historical_data: Dict[str, pd.DataFrame],
+    notional: float,
+    max_days: int = 20,
+    features: Optional[StrategyFeatures] = None,
 ) -> Dict[str, float]:
-    days_from_high = calculate_days_from_200d_high(historical_data)
+    days_from_high = calculate_days_from_200d_high(historical_data, features)
     selected_symbols = [s for s, d in days_from_high.items() if d <= max_days]
     if not selected_symbols:
         print("  No symbols selected for days_from_high.")
         return {}
 
-    volatilities = calculate_rolling_30d_volatility(historical_data, selected_symbols)
+    volatilities = calculate_rolling_30d_volatility(historical_data, selected_symbols, features)
     if not volatilities:
         print("  No volatilities computed for days_from_high.")
         return {}
@@ -0,0 +1,152 @@
+"""
+Shared Strategy Features - computed once per run from historical_data
+
+Most strategies start from the same inputs: daily log returns, trailing
+volatility, days since the 200d high and the BTC regime. Computed inside each
+strategy, every blended run repeats the same concat/sort/groupby over the whole
+universe once per strategy. StrategyFeatures computes them once and strategies
+accept it as an optional ``features`` argument; without it they fall back to
+computing from historical_data as before (same results up to float rounding).
+
+Usage:
+    from execution.strategies.features import StrategyFeatures
+    features = StrategyFeatures(historical_data)
+    strategy_volatility(historical_data, symbols, notional, features=features)
+"""
+
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from signals.calc_vola import calculate_rolling_30d_volatility as calc_vola_func
+
+# Trailing volatility windows precomputed up front; others are computed on first use
+COMMON_VOLATILITY_WINDOWS = (30, 90)
+
+
+class StrategyFeatures:
+    """
+    Per-run feature layer shared (read-only) by all strategies.
+
+    Attributes:
+        panel: Long frame (date, symbol, close, daily_return, volatility_30d),
+            sorted by symbol and date; daily_return is the log return
+        history_length: Rows of history per symbol
+        latest_close: Last close per symbol
+        days_from_high: Days since the 200d high per symbol
+
+    Lazily computed values (other volatility windows, the log return matrix,
+    market regimes) are cached under a lock so strategies running in parallel
+    threads compute each at most once.
+    """
+
+    def __init__(
+        self,
+        historical_data: Dict[str, pd.DataFrame],
+        volatility_windows: Iterable[int] = COMMON_VOLATILITY_WINDOWS,
+    ):
+        self.historical_data = historical_data
+        self._lock = threading.Lock()
+        self._volatility: Dict[int, pd.Series] = {}
+        self._regimes: Dict[str, dict] = {}
+
+        frames = [
+            df if "symbol" in df.columns else df.assign(symbol=symbol)
+            for symbol, df in historical_data.items()
+            if df is not None and not df.empty
+        ]
+        combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+        if combined.empty:
+            self.panel = pd.DataFrame(
+                columns=["date", "symbol", "close", "daily_return", "volatility_30d"]
+            )
+            self.days_from_high: Dict[str, int] = {}
+        else:
+            self.panel = calc_vola_func(combined)
+            self.days_from_high = _days_from_200d_high(combined)
+
+        grouped = self.panel.groupby("symbol", sort=False)
+        self.history_length = grouped.size()
+        self.latest_close = grouped["close"].last()
+        self._returns_by_symbol = {symbol: frame for symbol, frame in grouped}
+        self._rolling_30d = self._compute_rolling_30d_volatility()
+
+        for window in volatility_windows:
+            self.latest_volatility(window)
+
+    def returns_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Date-sorted (date, symbol, close, daily_return, volatility_30d) rows of one symbol.
+
+        Returns a copy, so callers may modify it without affecting other strategies.
+        """
+        return self._returns_by_symbol[symbol].copy()
+
+    def latest_volatility(self, window: int) -> pd.Series:
+        """
+        Annualized std of each symbol's last `window` log returns.
+
+        Matches ``df.tail(window)["daily_return"].std() * sqrt(365)`` per symbol
+        (the first row's return is NaN, as when computed from the symbol's frame).
+        """
+        with self._lock:
+            if window not in self._volatility:
+                recent = self.panel.groupby("symbol", sort=False).tail(window)
+                self._volatility[window] = recent.groupby("symbol", sort=False)[
+                    "daily_return"
+                ].std() * np.sqrt(365)
+            return self._volatility[window]
+
+    def rolling_30d_volatility(self, symbols: List[str]) -> Dict[str, float]:
+        """Latest 30d volatility per symbol, as utils.calculate_rolling_30d_volatility."""
+        return {s: self._rolling_30d[s] for s in symbols if s in self._rolling_30d}
+
+    def market_regime(self, reference_symbol: str = "BTC/USD") -> dict:
+        """BTC 50/200d MA regime (regime_filter.detect_market_regime), detected once per symbol."""
+        from execution.strategies.regime_filter import detect_market_regime
+
+        with self._lock:
+            if reference_symbol not in self._regimes:
+                self._regimes[reference_symbol] = detect_market_regime(
+                    self.historical_data, reference_symbol=reference_symbol
+                )
+            return self._regimes[reference_symbol]
+
+    def _compute_rolling_30d_volatility(self) -> Dict[str, float]:
+        """Last non-NaN volatility_30d per symbol, with the short-history fallback."""
+        valid = self.panel.dropna(subset=["volatility_30d"])
+        result = valid.groupby("symbol", sort=False)["volatility_30d"].last().astype(float)
+        volatilities = result.to_dict()
+
+        # Fallback: estimate simple volatility over available history if <30 days
+        for symbol in self.history_length.index.difference(result.index):
+            closes = self._returns_by_symbol[symbol]["close"].dropna()
+            if len(closes) >= 2:
+                ret = closes.pct_change().dropna()
+                if len(ret) >= 5:  # require at least 5 returns for a rough estimate
+                    volatilities[symbol] = float(ret.std() * (365**0.5))
+        return volatilities
+
+
+def _days_from_200d_high(combined: pd.DataFrame) -> Dict[str, int]:
+    """
+    Days since each symbol's latest high reached its rolling 200d high.
+
+    Vectorized form of signals.calc_days_from_high.get_current_days_since_high:
+    the counter resets on rows where high >= rolling 200d max, so the latest
+    value is the row count since the last reset.
+    """
+    df = combined[["date", "symbol", "high"]].copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
+
+    by_symbol = df.groupby("symbol", sort=False)
+    rolling_high = by_symbol["high"].rolling(window=200, min_periods=1).max()
+    position = by_symbol.cumcount()
+    resets = position.where(df["high"].to_numpy() >= rolling_high.to_numpy())
+    last_reset = resets.groupby(df["symbol"], sort=False).ffill().fillna(-1)
+    days = (position - last_reset).groupby(df["symbol"], sort=False).last()
+    return {symbol: int(value) for symbol, value in days.items()}
@@ -23,9 +23,12 @@ Low kurtosis = thin tails, more stable returns
 
 import pandas as pd
 import numpy as np
-from scipy import stats
 from datetime import datetime, timedelta
 
+from signals.calc_rolling_moments import calculate_rolling_moments
+
+from .utils import get_log_returns_frame
+
 # Import regime detection
 try:
     from execution.strategies.regime_filter import detect_market_regime, should_activate_strategy
@@ -53,6 +56,7 @@ def strategy_kurtosis(
     short_allocation=0.5,
     regime_filter="bear_only",  # regime filter (bear_only, bull_only, always)
     reference_symbol="BTC/USD",  # symbol for regime detection
+    features=None,
 ):
     """
     Kurtosis factor strategy with regime-based activation.
@@ -77,6 +81,7 @@ def strategy_kurtosis(
             - 'bull_only': Only activate in bull markets
             - 'always': Always active (no filter)
         reference_symbol (str): Symbol for regime detection (default: "BTC/USD")
+        features (StrategyFeatures): Shared per-run features (regime and log returns computed once)
     
     Returns:
         dict: Dictionary mapping symbols to notional positions (positive = long, negative = short)
@@ -104,7 +109,10 @@ def strategy_kurtosis(
     
     try:
         # Step 0: Check market regime
-        regime_info = detect_market_regime(historical_data, reference_symbol=reference_symbol)
+        if features is not None:
+            regime_info = features.market_regime(reference_symbol)
+        else:
+            regime_info = detect_market_regime(historical_data, reference_symbol=reference_symbol)
         should_activate, reason = should_activate_strategy(regime_info, strategy_type=regime_filter)
         
         if not should_activate:
@@ -137,49 +145,54 @@ def strategy_kurtosis(
     
     try:
         # Step 1: Calculate kurtosis for all symbols
-        kurtosis_results = []
+        recent_returns = {}
         
         for symbol in symbols:
             if symbol not in historical_data:
                 continue
             
-            df = historical_data[symbol].copy()
-            if len(df) < kurtosis_window + 10:
+            if len(historical_data[symbol]) < kurtosis_window + 10:
                 continue
             
-            # Sort by date
-            df = df.sort_values("date").reset_index(drop=True)
-            
-            # Calculate daily log returns
-            df["daily_return"] = np.log(df["close"] / df["close"].shift(1))
+            # Daily log returns over the most recent window
+            df = get_log_returns_frame(historical_data, symbol, features)
+            recent_returns[symbol] = df.tail(kurtosis_window)
+        
+        kurtosis_results = []
+        
+        if recent_returns:
+            # Kurtosis of every symbol's latest window in one batch
+            # Fisher: excess kurtosis (normal = 0, leptokurtic > 0, platykurtic < 0)
+            windows = pd.concat(
+                [recent[["daily_return"]].assign(symbol=symbol) for symbol, recent in recent_returns.items()],
+                ignore_index=True,
+            )
+            moments = calculate_rolling_moments(
+                windows,
+                window=kurtosis_window,
+                min_periods=kurtosis_window - 5,  # Allow a few missing values
+            )
+            latest_kurtosis = moments["kurtosis"].iloc[kurtosis_window - 1 :: kurtosis_window].to_numpy()
             
-            # Calculate rolling kurtosis using most recent window
-            if len(df) >= kurtosis_window:
-                recent_data = df.tail(kurtosis_window).copy()
-                returns = recent_data["daily_return"].dropna()
+            for (symbol, recent), kurt in zip(recent_returns.items(), latest_kurtosis):
+                returns = recent["daily_return"].dropna()
+                if len(returns) < kurtosis_window - 5:
+                    continue
+                
+                # Calculate volatility for risk parity weighting
+                volatility = returns.std() * np.sqrt(365)
+                
+                # Get latest price for reference
+                latest_price = recent["close"].iloc[-1]
                 
-                if len(returns) >= kurtosis_window - 5:  # Allow a few missing values
-                    try:
-                        # Fisher=True: excess kurtosis (normal = 0, leptokurtic > 0, platykurtic < 0)
-                        kurt = stats.kurtosis(returns, fisher=True, nan_policy="omit")
-                        
-                        # Calculate volatility for risk parity weighting
-                        volatility = returns.std() * np.sqrt(365)
-                        
-                        # Get latest price for reference
-                        latest_price = df["close"].iloc[-1]
-                        
-                        kurtosis_results.append({
-                            "symbol": symbol,
-                            "kurtosis": kurt,
-                            "volatility": volatility,
-                            "price": latest_price,
-                            "returns_mean": returns.mean(),
-                            "returns_std": returns.std(),
-                        })
-                    except Exception as e:
-                        # Skip symbols with calculation errors
-                        continue
+                kurtosis_results.append({
+                    "symbol": symbol,
+                    "kurtosis": kurt,
+                    "volatility": volatility,
+                    "price": latest_price,
+                    "returns_mean": returns.mean(),
+                    "returns_std": returns.std(),
+                })
         
         if not kurtosis_results:
             print("  ⚠️  No symbols with valid kurtosis calculations")
@@ -3,6 +3,7 @@ from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 
+from .features import StrategyFeatures
 from .utils import calculate_rolling_30d_volatility, calc_weights
 
 
@@ -88,6 +89,7 @@ def strategy_mean_reversion(
     period_days: int = 2,
     limit: int = 100,
     long_only: bool = True,
+    features: Optional[StrategyFeatures] = None,
 ) -> Dict[str, float]:
     """Mean reversion strategy: buy extreme dips with high volume.
 
@@ -112,6 +114,7 @@ def strategy_mean_reversion(
         period_days: Period for calculating returns (default 2 for 2-day returns)
         limit: Number of symbols to fetch from CoinMarketCap (default 100)
         long_only: If True, only take long positions (default True per backtest)
+        features: Shared per-run features (volatilities computed once)
 
     Returns:
         Dict mapping symbol to target position notional (positive = long)
@@ -178,7 +181,7 @@ def strategy_mean_reversion(
         return {}
 
     # Calculate volatility-based weights
-    vola_long = calculate_rolling_30d_volatility(historical_data, long_candidates)
+    vola_long = calculate_rolling_30d_volatility(historical_data, long_candidates, features)
     w_long = calc_weights(vola_long) if vola_long else {}
 
     if not w_long:
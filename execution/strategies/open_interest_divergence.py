@@ -5,38 +5,23 @@ from datetime import datetime, timedelta
 
 import pandas as pd
 
+from common.symbols import coinalyze_symbol, parse_symbol
 from .utils import get_base_symbol
 
 
 def _parse_trading_symbol(symbol: str) -> Tuple[str, str]:
-    if not isinstance(symbol, str) or "/" not in symbol:
-        return symbol, ""
-    base, rhs = symbol.split("/", 1)
-    quote = rhs.split(":", 1)[0] if ":" in rhs else rhs
-    return base, quote
+    return parse_symbol(symbol)
 
 
 def _build_coinalyze_symbol(base: str, quote: str = "USDT", exchange_code: str = "A") -> str:
     """
     Build Coinalyze symbol. Default format uses aggregate data across all exchanges.
 
-    Formats by exchange:
-    - Aggregate (A): {BASE}USDT_PERP.A (e.g., BTCUSDT_PERP.A) - RECOMMENDED for robust signals
-    - Hyperliquid (H): {BASE}.H  (e.g., BTC.H)
-    - Binance (default): {BASE}{QUOTE}_PERP (e.g., BTCUSDT_PERP)
-
-    Default is aggregate ('A') which provides OI data summed across all exchanges.
-    This gives more robust signals than single-exchange data.
+    Aggregate ('A', {BASE}USDT_PERP.A) provides OI data summed across all
+    exchanges, which gives more robust signals than single-exchange data.
+    See common.symbols.coinalyze_symbol for the per-exchange formats.
     """
-    if exchange_code == "A":
-        # Aggregate format: always use USDT
-        return f"{base}USDT_PERP.A"
-    elif exchange_code == "H":
-        # Hyperliquid format
-        return f"{base}.{exchange_code}"
-    else:
-        # Other exchanges (e.g., Binance)
-        return f"{base}{quote}_PERP.{exchange_code}"
+    return coinalyze_symbol(base, quote, exchange_code)
 
 
 def _prepare_price_df(historical_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
@@ -225,7 +210,11 @@ def _fetch_oi_history_for_universe(
     Returns columns: ['coin_symbol','coinalyze_symbol','date','oi_close']
     """
     try:
-        from data.scripts.coinalyze_client import CoinalyzeClient  # type: ignore
+        from data.scripts.coinalyze_client import (  # type: ignore
+            CoinalyzeClient,
+            fetch_history_batched,
+            plan_history_requests,
+        )
     except Exception:
         return pd.DataFrame()
 
@@ -256,53 +245,34 @@ def _fetch_oi_history_for_universe(
     print(f"    Using 'daily' interval with convert_to_usd=true")
     print(f"    Sample mappings: {list(base_to_csym.items())[:3]}")
 
-    rows: List[dict] = []
-    # Coinalyze allows up to 20 symbols per request
-    items = list(base_to_csym.items())
-    chunk = 20
-    num_chunks = (len(items) + chunk - 1) // chunk
-    estimated_time = num_chunks * 1.5
-    print(
-        f"    Rate limited to 40 calls/min: {num_chunks} API calls required (~{estimated_time:.0f}s total)"
-    )
+    # Batched 20 symbols per request, requests issued concurrently within the rate limit
+    plan = plan_history_requests(list(base_to_csym.values()), "daily", start_ts, end_ts)
+    print(f"    Rate limited to 40 calls/min: {len(plan)} API calls required")
+    try:
+        histories = fetch_history_batched(
+            client,
+            "open_interest",
+            list(base_to_csym.values()),
+            "daily",
+            start_ts,
+            end_ts,
+            convert_to_usd=True,
+        )
+    except Exception as e:
+        print(f"    Error fetching OI history: {e}")
+        histories = {}
 
-    for i in range(0, len(items), chunk):
-        batch = items[i : i + chunk]
-        symbols_param = ",".join(cs for _, cs in batch)
-        try:
-            data = client.get_open_interest_history(
-                symbols=symbols_param,
-                interval="daily",  # Use 'daily' as specified
-                from_ts=start_ts,
-                to_ts=end_ts,
-                convert_to_usd=True,  # Always convert to USD
+    rows: List[dict] = []
+    for base, csym in base_to_csym.items():
+        for pt in histories.get(csym, []):
+            rows.append(
+                {
+                    "coin_symbol": base,
+                    "coinalyze_symbol": csym,
+                    "date": datetime.fromtimestamp(pt["t"]).strftime("%Y-%m-%d"),
+                    "oi_close": pt.get("c"),
+                }
             )
-            if data:
-                print(f"      Batch {i//chunk + 1}: Got data for {len(data)} symbols")
-            else:
-                print(f"      Batch {i//chunk + 1}: No data returned")
-        except Exception as e:
-            print(f"    Error fetching OI history: {e}")
-            data = None
-        if not data:
-            continue
-        # Reverse map coinalyze_symbol -> base
-        csym_to_base = {cs: b for b, cs in batch}
-        for item in data:
-            csym = item.get("symbol")
-            hist = item.get("history", [])
-            base = csym_to_base.get(csym)
-            if not base:
-                continue
-            for pt in hist:
-                rows.append(
-                    {
-                        "coin_symbol": base,
-                        "coinalyze_symbol": csym,
-                        "date": datetime.fromtimestamp(pt["t"]).strftime("%Y-%m-%d"),
-                        "oi_close": pt.get("c"),
-                    }
-                )
     if not rows:
         print(f"    No OI history rows collected")
         return pd.DataFrame()
@@ -1,10 +1,11 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import os
 import json
 from datetime import datetime, timedelta
 
 import pandas as pd
 
+from .features import StrategyFeatures
 from .utils import calculate_rolling_30d_volatility, calc_weights
 
 
@@ -16,6 +17,7 @@ def strategy_size(
     bottom_n: int = 10,
     limit: int = 100,
     rebalance_days: int = 10,
+    features: Optional[StrategyFeatures] = None,
 ) -> Dict[str, float]:
     """Size factor via market capitalization (CoinMarketCap).
 
@@ -34,6 +36,7 @@ def strategy_size(
         bottom_n: Number of small caps to long
         limit: Number of coins to fetch from CMC
         rebalance_days: Days between rebalancing (default: 10, optimal per backtest)
+        features: Shared per-run features (volatilities computed once)
     
     Returns:
         Dictionary of symbol -> target notional (positive=long, negative=short)
@@ -117,7 +120,7 @@ def strategy_size(
     target_positions: Dict[str, float] = {}
 
     if long_symbols:
-        vola_long = calculate_rolling_30d_volatility(historical_data, long_symbols)
+        vola_long = calculate_rolling_30d_volatility(historical_data, long_symbols, features)
         w_long = calc_weights(vola_long) if vola_long else {}
         for symbol, w in w_long.items():
             target_positions[symbol] = target_positions.get(symbol, 0.0) + w * notional
@@ -128,7 +131,7 @@ def strategy_size(
         print("  No SIZE LONG candidates (small caps).")
 
     if short_symbols:
-        vola_short = calculate_rolling_30d_volatility(historical_data, short_symbols)
+        vola_short = calculate_rolling_30d_volatility(historical_data, short_symbols, features)
         w_short = calc_weights(vola_short) if vola_short else {}
         for symbol, w in w_short.items():
             target_positions[symbol] = target_positions.get(symbol, 0.0) - w * notional
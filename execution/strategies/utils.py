@@ -1,13 +1,21 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
+from common.symbols import base_asset
 from execution.select_insts import select_instruments_near_200d_high
+from execution.strategies.features import StrategyFeatures
 from signals.calc_breakout_signals import get_current_signals
 from signals.calc_vola import calculate_rolling_30d_volatility as calc_vola_func
 from signals.calc_weights import calculate_weights
 
 
-def calculate_days_from_200d_high(data: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+def calculate_days_from_200d_high(
+    data: Dict[str, pd.DataFrame], features: Optional[StrategyFeatures] = None
+) -> Dict[str, int]:
+    if features is not None:
+        return dict(features.days_from_high)
+
     from signals.calc_days_from_high import get_current_days_since_high
 
     combined_data = []
@@ -35,8 +43,13 @@ def select_instruments_by_days_from_high(data_source, threshold: int) -> pd.Data
 
 
 def calculate_rolling_30d_volatility(
-    data: Dict[str, pd.DataFrame], selected_symbols: List[str]
+    data: Dict[str, pd.DataFrame],
+    selected_symbols: List[str],
+    features: Optional[StrategyFeatures] = None,
 ) -> Dict[str, float]:
+    if features is not None:
+        return features.rolling_30d_volatility(selected_symbols)
+
     combined_data = []
     for symbol in selected_symbols:
         if symbol in data:
@@ -75,9 +88,7 @@ def calc_weights(volatilities: Dict[str, float]) -> Dict[str, float]:
 
 
 def get_base_symbol(symbol: str) -> str:
-    if not isinstance(symbol, str):
-        return symbol
-    return symbol.split("/")[0]
+    return base_asset(symbol)
 
 
 def calculate_breakout_signals_from_data(data: Dict[str, pd.DataFrame]) -> Dict[str, int]:
@@ -106,3 +117,15 @@ def calculate_breakout_signals_from_data(data: Dict[str, pd.DataFrame]) -> Dict[
             target_positions[symbol] = 0
 
     return target_positions
+
+
+def get_log_returns_frame(
+    data: Dict[str, pd.DataFrame], symbol: str, features: Optional[StrategyFeatures] = None
+) -> pd.DataFrame:
+    """Date-sorted frame of one symbol with its daily log return in 'daily_return'."""
+    if features is not None:
+        return features.returns_frame(symbol)
+
+    df = data[symbol].sort_values("date").reset_index(drop=True)
+    df["daily_return"] = np.log(df["close"] / df["close"].shift(1))
+    return df
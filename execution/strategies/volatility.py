@@ -29,6 +29,7 @@ def strategy_volatility(
     weighting_method="equal_weight",
     long_allocation=0.5,
     short_allocation=0.5,
+    features=None,
 ):
     """
     Volatility factor strategy (Low Volatility Anomaly).
@@ -45,6 +46,7 @@ def strategy_volatility(
         weighting_method (str): Weighting method ('equal_weight' or 'risk_parity')
         long_allocation (float): Allocation to long side (default: 0.5)
         short_allocation (float): Allocation to short side (default: 0.5)
+        features (StrategyFeatures): Shared per-run features (volatilities computed once)
     
     Returns:
         dict: Dictionary mapping symbols to notional positions (positive = long, negative = short)
@@ -65,37 +67,53 @@ def strategy_volatility(
         # Step 1: Calculate volatility for all symbols
         volatility_results = []
         
-        for symbol in symbols:
-            if symbol not in historical_data:
-                continue
-            
-            df = historical_data[symbol].copy()
-            if len(df) < volatility_window:
-                continue
-            
-            # Sort by date
-            df = df.sort_values("date").reset_index(drop=True)
-            
-            # Calculate daily log returns
-            df["daily_return"] = np.log(df["close"] / df["close"].shift(1))
-            
-            # Calculate rolling volatility (annualized)
-            if len(df) >= volatility_window:
-                # Use most recent window
-                recent_data = df.tail(volatility_window).copy()
-                
-                # Calculate volatility
-                volatility = recent_data["daily_return"].std() * np.sqrt(365)
-                
+        if features is not None:
+            # Latest-window volatility of every symbol from the shared feature layer
+            volatilities = features.latest_volatility(volatility_window)
+            for symbol in symbols:
+                if symbol not in historical_data or symbol not in volatilities.index:
+                    continue
+                if len(historical_data[symbol]) < volatility_window:
+                    continue
+                volatility = volatilities[symbol]
                 if not np.isnan(volatility) and volatility > 0:
-                    # Get latest price for reference
-                    latest_price = df["close"].iloc[-1]
-                    
                     volatility_results.append({
                         "symbol": symbol,
                         "volatility": volatility,
-                        "price": latest_price,
+                        "price": features.latest_close[symbol],
                     })
+        else:
+            for symbol in symbols:
+                if symbol not in historical_data:
+                    continue
+                
+                df = historical_data[symbol].copy()
+                if len(df) < volatility_window:
+                    continue
+                
+                # Sort by date
+                df = df.sort_values("date").reset_index(drop=True)
+                
+                # Calculate daily log returns
+                df["daily_return"] = np.log(df["close"] / df["close"].shift(1))
+                
+                # Calculate rolling volatility (annualized)
+                if len(df) >= volatility_window:
+                    # Use most recent window
+                    recent_data = df.tail(volatility_window).copy()
+                    
+                    # Calculate volatility
+                    volatility = recent_data["daily_return"].std() * np.sqrt(365)
+                    
+                    if not np.isnan(volatility) and volatility > 0:
+                        # Get latest price for reference
+                        latest_price = df["close"].iloc[-1]
+                        
+                        volatility_results.append({
+                            "symbol": symbol,
+                            "volatility": volatility,
+                            "price": latest_price,
+                        })
         
         if not volatility_results:
             print("  ⚠️  No symbols with valid volatility calculations")
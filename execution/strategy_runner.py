@@ -0,0 +1,120 @@
+"""
+Strategy Runner - Evaluate independent strategies concurrently
+
+main.py used to call every strategy in the blend one after another, so the
+pre-trade window was the sum of all strategy runtimes, most of it spent
+waiting on CoinMarketCap / Coinalyze requests and CSV reads. Strategies do
+not depend on each other, so run_strategies() evaluates them in a thread
+pool and returns each strategy's contributions with its runtime:
+
+- Threads (not processes): strategies share historical_data and the
+  StrategyFeatures layer in memory without pickling, and most of the time
+  is I/O that releases the GIL
+- Each strategy's prints are captured per thread and returned with its
+  result, so main.py can replay the logs in blend order instead of
+  interleaving them
+- A strategy that raises yields an empty contribution and its error
+- max_workers=1 evaluates them one after another in the calling thread
+- Each strategy runs in a "strategy.<name>" tracing span inside a copy of
+  the caller's context, so it nests under the caller's stage in the run
+  timeline and its API calls are counted against it
+
+Usage:
+    from strategy_runner import run_strategies
+    results = run_strategies({"size": (strategy_size, args, kwargs)}, max_workers=8)
+    results["size"].contributions, results["size"].elapsed
+"""
+
+import contextvars
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from common.tracing import span
+
+# Default thread count for concurrent strategy evaluation
+DEFAULT_STRATEGY_WORKERS = 8
+
+StrategyTask = Tuple[Callable, tuple, dict]
+
+
+class StrategyResult(NamedTuple):
+    """Outcome of one strategy evaluation."""
+
+    contributions: Dict[str, float]
+    elapsed: float
+    output: str
+    error: Optional[str]
+
+
+class _ThreadOutput(io.TextIOBase):
+    """stdout proxy writing to the current thread's buffer when one is set."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def _evaluate(name: str, task: StrategyTask, output: _ThreadOutput) -> StrategyResult:
+    fn, args, kwargs = task
+    buffer = output.capture()
+    start = time.perf_counter()
+    try:
+        with span(f"strategy.{name}"):
+            contributions = dict(fn(*args, **kwargs) or {})
+        error = None
+    except Exception as e:
+        contributions, error = {}, str(e)
+    finally:
+        elapsed = time.perf_counter() - start
+        output.release()
+    return StrategyResult(contributions, elapsed, buffer.getvalue(), error)
+
+
+def run_strategies(
+    tasks: Dict[str, StrategyTask], max_workers: int = DEFAULT_STRATEGY_WORKERS
+) -> Dict[str, StrategyResult]:
+    """
+    Evaluate strategies, concurrently when max_workers > 1.
+
+    Args:
+        tasks: {strategy_name: (strategy_fn, args, kwargs)}
+        max_workers: Thread pool size (1 = sequential in the calling thread)
+
+    Returns:
+        {strategy_name: StrategyResult} in the order of tasks
+    """
+    stdout = sys.stdout
+    output = _ThreadOutput(stdout)
+    sys.stdout = output
+    try:
+        if max_workers <= 1 or len(tasks) <= 1:
+            return {name: _evaluate(name, task, output) for name, task in tasks.items()}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+            futures = {
+                name: pool.submit(contextvars.copy_context().run, _evaluate, name, task, output)
+                for name, task in tasks.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+    finally:
+        sys.stdout = stdout
@@ -10,27 +10,17 @@ Modes:
 - 'leapfrog': For pairs of orders, move furthest order halfway between closer order and best bid/ask
 """
 
-import ccxt
 import os
 import argparse
 from typing import Dict, List, Tuple, Optional
+from price_snapshot import get_price_snapshot
+from exchange_session import get_exchange as get_session_exchange
+from order_batch import OrderBatch
 
 
 def get_exchange():
-    """Initialize and return authenticated Hyperliquid exchange instance."""
-    api_key = os.getenv("HL_API")
-    secret_key = os.getenv("HL_SECRET")
-
-    if not api_key or not secret_key:
-        raise ValueError("Missing required environment variables: HL_API and/or HL_SECRET")
-
-    return ccxt.hyperliquid(
-        {
-            "privateKey": secret_key,
-            "walletAddress": api_key,
-            "enableRateLimit": True,
-        }
-    )
+    """Return the pooled authenticated Hyperliquid exchange instance."""
+    return get_session_exchange()
 
 
 def fetch_all_open_orders(exchange):
@@ -66,27 +56,16 @@ def fetch_bid_ask_prices(exchange, symbols: List[str]) -> Dict[str, Dict[str, fl
     print("\n[2/3] Fetching current bid/ask prices...")
     print("-" * 80)
 
-    bid_ask_dict = {}
+    # One bulk ticker call for all symbols, shared with other callers this tick
+    snapshot = get_price_snapshot(symbols, exchange=exchange)
+    bid_ask_dict = snapshot.bid_ask_dict()
 
     for symbol in symbols:
-        try:
-            ticker = exchange.fetch_ticker(symbol)
-            bid = ticker.get("bid")
-            ask = ticker.get("ask")
-
-            if bid is not None and ask is not None:
-                bid_ask_dict[symbol] = {
-                    "bid": bid,
-                    "ask": ask,
-                    "spread": ask - bid,
-                    "spread_pct": ((ask - bid) / bid * 100) if bid > 0 else 0,
-                }
-                print(f"  {symbol:20s} | Bid: ${bid:>12,.8f} | Ask: ${ask:>12,.8f}")
-            else:
-                print(f"  {symbol:20s} | ✗ No bid/ask data available")
-
-        except Exception as e:
-            print(f"  {symbol:20s} | ✗ Error: {e}")
+        prices = bid_ask_dict.get(symbol)
+        if prices is not None:
+            print(f"  {symbol:20s} | Bid: ${prices['bid']:>12,.8f} | Ask: ${prices['ask']:>12,.8f}")
+        else:
+            print(f"  {symbol:20s} | ✗ No bid/ask data available")
 
     print(f"✓ Fetched bid/ask for {len(bid_ask_dict)}/{len(symbols)} symbols")
     return bid_ask_dict
@@ -97,7 +76,8 @@ def move_order_to_target_price(
     order: dict, 
     target_price: float,
     price_type: str,
-    dry_run: bool = True
+    dry_run: bool = True,
+    batch: Optional[OrderBatch] = None,
 ) -> dict:
     """
     Move a single order to a specific target price.
@@ -108,6 +88,8 @@ def move_order_to_target_price(
         target_price: The target price to move the order to
         price_type: Description of the price (e.g., "BID", "ASK", "MIDPOINT")
         dry_run: If True, only simulate the change
+        batch: If given, the edit is queued on this OrderBatch (keyed by order id)
+               and the result has status 'queued'; see resolve_queued_result
 
     Returns:
         dict: Result with 'status', 'message', and optionally 'modified_order'
@@ -139,6 +121,19 @@ def move_order_to_target_price(
             "price_change_pct": price_change_pct,
         }
 
+    message = f"Moved to {price_type} ${target_price:,.8f} ({price_change_pct:+.2f}%)"
+
+    if batch is not None:
+        order_type = order.get("type") or "limit"
+        batch.edit(order_id, symbol, side, amount, target_price, order_type, key=order_id)
+        return {
+            "status": "queued",
+            "message": message,
+            "target_price": target_price,
+            "price_change": price_change,
+            "price_change_pct": price_change_pct,
+        }
+
     # Actually modify the order
     try:
         modified_order = exchange.edit_order(
@@ -152,7 +147,7 @@ def move_order_to_target_price(
 
         return {
             "status": "success",
-            "message": f"Moved to {price_type} ${target_price:,.8f} ({price_change_pct:+.2f}%)",
+            "message": message,
             "target_price": target_price,
             "price_change": price_change,
             "price_change_pct": price_change_pct,
@@ -164,7 +159,11 @@ def move_order_to_target_price(
 
 
 def move_order_to_best_price(
-    exchange, order: dict, bid_ask_dict: Dict[str, Dict[str, float]], dry_run: bool = True
+    exchange,
+    order: dict,
+    bid_ask_dict: Dict[str, Dict[str, float]],
+    dry_run: bool = True,
+    batch: Optional[OrderBatch] = None,
 ) -> dict:
     """
     Move a single order to best bid/ask price.
@@ -174,6 +173,7 @@ def move_order_to_best_price(
         order: Order dictionary
         bid_ask_dict: Dictionary of bid/ask prices by symbol
         dry_run: If True, only simulate the change
+        batch: If given, queue the edit on this OrderBatch instead of sending it
 
     Returns:
         dict: Result with 'status', 'message', and optionally 'modified_order'
@@ -202,7 +202,25 @@ def move_order_to_best_price(
         return {"status": "skip", "message": f"Unknown side: {side}"}
 
     # Use the generic move function
-    return move_order_to_target_price(exchange, order, target_price, price_type, dry_run)
+    return move_order_to_target_price(exchange, order, target_price, price_type, dry_run, batch)
+
+
+def resolve_queued_result(result: dict, batch_result: Optional[dict]) -> dict:
+    """
+    Turn a 'queued' result into 'success' or 'error' once its batch is submitted.
+
+    Args:
+        result: Result returned by move_order_to_target_price with a batch
+        batch_result: Entry for the order in OrderBatch.submit()['edit']
+
+    Returns:
+        dict: Result with 'status', 'message', and optionally 'modified_order'
+    """
+    if batch_result is None:
+        return {"status": "error", "message": "Error: edit was not submitted"}
+    if not batch_result["success"]:
+        return {"status": "error", "message": f"Error: {batch_result['error']}"}
+    return {**result, "status": "success", "modified_order": batch_result["order"]}
 
 
 def process_leapfrog_mode(
@@ -347,98 +365,75 @@ def tick_orders(dry_run: bool = True, verbose: bool = False, mode: str = "best")
         skipped_count = 0
         error_count = 0
 
+        # Work out every move first; live edits are queued and sent in bulk requests
+        batch = None if dry_run else OrderBatch(exchange)
         if mode == "leapfrog":
             # Leapfrog mode: calculate targets for order pairs
             order_targets = process_leapfrog_mode(orders, bid_ask_dict)
-            
-            for i, order in enumerate(orders, 1):
-                order_id = order.get("id")
-                symbol = order.get("symbol")
-                side = order.get("side", "").lower()
-                current_price = order.get("price")
-                amount = order.get("amount")
-
-                print(f"\n[{i}/{len(orders)}] {symbol} (ID: {order_id})")
-                print(f"  Side:          {side.upper()}")
-                print(
-                    f"  Current Price: ${current_price:,.8f}"
-                    if current_price
-                    else "  Current Price: N/A"
-                )
-                print(f"  Amount:        {amount:.6f}" if amount else "  Amount: N/A")
 
+        results = []
+        for order in orders:
+            if mode == "leapfrog":
                 # Get target from leapfrog calculation
-                if order_id in order_targets:
-                    _, target_price, description = order_targets[order_id]
-                    
+                if order.get("id") not in order_targets:
+                    result = {"status": "skip", "message": "Order not in targets"}
+                else:
+                    _, target_price, description = order_targets[order.get("id")]
                     if target_price is None:
-                        print(f"  Result:        → SKIP - {description}")
-                        skipped_count += 1
+                        result = {"status": "skip", "message": description}
                     else:
                         # Move order to calculated target
                         result = move_order_to_target_price(
-                            exchange, order, target_price, description, dry_run
+                            exchange, order, target_price, description, dry_run, batch
                         )
-                        
-                        if result["status"] == "success":
-                            print(f"  Result:        ✓ {result['message']}")
-                            modified_count += 1
-                            if verbose and "modified_order" in result:
-                                print(f"  New Order ID:  {result['modified_order'].get('id', 'N/A')}")
-
-                        elif result["status"] == "dry_run":
-                            print(f"  Result:        [DRY RUN] {result['message']}")
-                            modified_count += 1
-
-                        elif result["status"] == "skip":
-                            print(f"  Result:        → SKIP - {result['message']}")
-                            skipped_count += 1
-
-                        elif result["status"] == "error":
-                            print(f"  Result:        ✗ {result['message']}")
-                            error_count += 1
-                else:
-                    print(f"  Result:        → SKIP - Order not in targets")
-                    skipped_count += 1
-        
-        else:  # mode == "best"
-            # Best bid/ask mode: move all orders to best prices
-            for i, order in enumerate(orders, 1):
-                order_id = order.get("id")
-                symbol = order.get("symbol")
-                side = order.get("side", "").lower()
-                current_price = order.get("price")
-                amount = order.get("amount")
-
-                print(f"\n[{i}/{len(orders)}] {symbol} (ID: {order_id})")
-                print(f"  Side:          {side.upper()}")
-                print(
-                    f"  Current Price: ${current_price:,.8f}"
-                    if current_price
-                    else "  Current Price: N/A"
-                )
-                print(f"  Amount:        {amount:.6f}" if amount else "  Amount: N/A")
-
-                # Move order
-                result = move_order_to_best_price(exchange, order, bid_ask_dict, dry_run)
-
-                if result["status"] == "success":
-                    print(f"  Result:        ✓ {result['message']}")
-                    modified_count += 1
-                    if verbose and "modified_order" in result:
-                        print(f"  New Order ID:  {result['modified_order'].get('id', 'N/A')}")
-
-                elif result["status"] == "dry_run":
-                    print(f"  Result:        [DRY RUN] {result['message']}")
-                    modified_count += 1
-
-                elif result["status"] == "skip":
-                    print(f"  Result:        → SKIP - {result['message']}")
-                    skipped_count += 1
-
-                elif result["status"] == "error":
-                    print(f"  Result:        ✗ {result['message']}")
-                    error_count += 1
+            else:  # mode == "best"
+                # Best bid/ask mode: move all orders to best prices
+                result = move_order_to_best_price(exchange, order, bid_ask_dict, dry_run, batch)
+            results.append(result)
+
+        if batch is not None and len(batch):
+            edited = batch.submit()["edit"]
+            print(f"Submitted {len(edited)} edit(s) in {batch.requests_sent} request(s)")
+            results = [
+                resolve_queued_result(result, edited.get(order.get("id")))
+                if result["status"] == "queued"
+                else result
+                for order, result in zip(orders, results)
+            ]
+
+        for i, (order, result) in enumerate(zip(orders, results), 1):
+            order_id = order.get("id")
+            symbol = order.get("symbol")
+            side = order.get("side", "").lower()
+            current_price = order.get("price")
+            amount = order.get("amount")
+
+            print(f"\n[{i}/{len(orders)}] {symbol} (ID: {order_id})")
+            print(f"  Side:          {side.upper()}")
+            print(
+                f"  Current Price: ${current_price:,.8f}"
+                if current_price
+                else "  Current Price: N/A"
+            )
+            print(f"  Amount:        {amount:.6f}" if amount else "  Amount: N/A")
+
+            if result["status"] == "success":
+                print(f"  Result:        ✓ {result['message']}")
+                modified_count += 1
+                if verbose and "modified_order" in result:
+                    print(f"  New Order ID:  {result['modified_order'].get('id', 'N/A')}")
+
+            elif result["status"] == "dry_run":
+                print(f"  Result:        [DRY RUN] {result['message']}")
+                modified_count += 1
+
+            elif result["status"] == "skip":
+                print(f"  Result:        → SKIP - {result['message']}")
+                skipped_count += 1
+
+            elif result["status"] == "error":
+                print(f"  Result:        ✗ {result['message']}")
+                error_count += 1
 
         # Summary
         print("\n" + "=" * 80)
@@ -0,0 +1,183 @@
+"""
+Strategy x Symbol Weight Matrix - Vectorized blend, net, diff and threshold
+
+main.py turns per-strategy notional contributions ({strategy: {symbol: notional}})
+into a trade list. Doing that on nested dicts means one pass per strategy per
+symbol for every step (blend, reallocation, netting, diffing, thresholding).
+Here the contributions are aligned once into a DataFrame (rows = strategies,
+columns = symbols, missing = 0) and every later step is a vectorized operation:
+
+- Reallocation scales whole rows by new_weight / old_weight
+- Netting is a single column sum
+- Diff and threshold are Series arithmetic over the union of target and
+  current symbols
+
+Usage:
+    from weight_matrix import build_contribution_matrix, net_positions, trade_frame
+    matrix = build_contribution_matrix(contributions)
+    targets = net_positions(matrix)
+    frame = trade_frame(targets, current_notional, notional_value, threshold=0.05)
+    trades = frame.loc[frame["trade"], "difference"].to_dict()
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Strategies that keep their configured weight when others return no positions
+FIXED_WEIGHT_STRATEGIES = frozenset({"breakout", "days_from_high"})
+
+
+def build_contribution_matrix(
+    contributions: Dict[str, Dict[str, float]], strategies: Optional[Iterable[str]] = None
+) -> pd.DataFrame:
+    """
+    Align per-strategy contributions into a strategy x symbol matrix.
+
+    Args:
+        contributions: {strategy: {symbol: notional}}
+        strategies: Row order (default: contribution order); strategies without
+            contributions get a row of zeros
+
+    Returns:
+        DataFrame of notionals, symbols in order of first appearance
+    """
+    names = list(contributions) if strategies is None else list(strategies)
+    symbols = list(dict.fromkeys(sym for contrib in contributions.values() for sym in contrib))
+    rows = {name: contrib for name, contrib in contributions.items() if contrib}
+    if not rows:
+        matrix = pd.DataFrame(0.0, index=names, columns=symbols)
+    else:
+        matrix = pd.DataFrame.from_dict(rows, orient="index", dtype=float)
+        matrix = matrix.reindex(index=names, columns=symbols).fillna(0.0)
+    matrix.index.name = "strategy"
+    matrix.columns.name = "symbol"
+    return matrix
+
+
+def matrix_to_contributions(
+    matrix: pd.DataFrame, like: Dict[str, Dict[str, float]]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Convert matrix rows back to the sparse dicts the reporting exports expect.
+
+    Args:
+        matrix: Strategy x symbol matrix
+        like: Contributions whose keys select the symbols kept per strategy
+
+    Returns:
+        {strategy: {symbol: notional}} with the same keys as like
+    """
+    return {
+        name: matrix.loc[name, list(contrib)].to_dict() if contrib else {}
+        for name, contrib in like.items()
+    }
+
+
+def reallocate_strategy_weights(
+    weights: pd.Series, active: pd.Series, fixed: Iterable[str] = FIXED_WEIGHT_STRATEGIES
+) -> pd.Series:
+    """
+    Redistribute the weight of inactive flexible strategies among active flexible ones.
+
+    Fixed strategies keep their weight whether active or not; inactive fixed
+    weight is not redistributed. Flexible active strategies are scaled by
+    (flexible total + redistributed) / flexible total.
+
+    Args:
+        weights: Blend weight per strategy
+        active: Boolean per strategy, True if it returned positions
+        fixed: Strategies that keep their configured weight
+
+    Returns:
+        Rebalanced weights of the active strategies, or weights unchanged when
+        every strategy is active, none is, or there is nothing to redistribute
+    """
+    active = active.reindex(weights.index, fill_value=False).astype(bool)
+    is_fixed = weights.index.isin(list(fixed))
+    if active.all() or not active.any():
+        return weights
+
+    flexible_active = active & ~is_fixed
+    capital = weights[~active & ~is_fixed].sum()
+    if not flexible_active.any():
+        return weights[active]
+    if capital <= 0:
+        return weights
+
+    scale = (weights[flexible_active].sum() + capital) / weights[flexible_active].sum()
+    return weights[active].where(~flexible_active[active], weights[active] * scale)
+
+
+def scale_contributions(
+    matrix: pd.DataFrame, old_weights: pd.Series, new_weights: pd.Series
+) -> pd.DataFrame:
+    """
+    Scale each strategy's row by new_weight / old_weight.
+
+    Strategies missing from new_weights (or with a non-positive old weight)
+    are left unchanged.
+
+    Args:
+        matrix: Strategy x symbol matrix
+        old_weights: Weights the contributions were computed with
+        new_weights: Rebalanced weights
+
+    Returns:
+        Scaled matrix
+    """
+    old = old_weights.reindex(matrix.index)
+    new = new_weights.reindex(matrix.index)
+    ratio = (new / old).where((old > 0) & new.notna(), 1.0)
+    return matrix.mul(ratio, axis=0)
+
+
+def net_positions(matrix: pd.DataFrame) -> pd.Series:
+    """
+    Net all strategies into one target notional per symbol.
+
+    Args:
+        matrix: Strategy x symbol matrix
+
+    Returns:
+        Series of target notionals indexed by symbol
+    """
+    return matrix.sum(axis=0)
+
+
+def trade_frame(
+    targets: pd.Series, current: pd.Series, notional_value: float, threshold: float = 0.05
+) -> pd.DataFrame:
+    """
+    Diff targets against current notionals and flag the trades to send.
+
+    A symbol held but absent from targets is always neutralized; otherwise a
+    trade is sent when |target - current| exceeds threshold * notional_value.
+
+    Args:
+        targets: Target notional per symbol (signed)
+        current: Current signed notional per symbol (negative = short)
+        notional_value: Total account notional value
+        threshold: Minimum difference as fraction of notional to trade
+
+    Returns:
+        DataFrame indexed by symbol with target, current, difference,
+        pct_difference, neutralize and trade columns
+    """
+    symbols = targets.index.append(current.index.difference(targets.index))
+    frame = pd.DataFrame(
+        {
+            "target": targets.reindex(symbols, fill_value=0.0).astype(float),
+            "current": current.reindex(symbols, fill_value=0.0).astype(float),
+        }
+    )
+    frame["difference"] = frame["target"] - frame["current"]
+    if notional_value > 0:
+        frame["pct_difference"] = frame["difference"].abs() / notional_value
+    else:
+        frame["pct_difference"] = 0.0
+    in_target = np.asarray(symbols.isin(targets.index))
+    frame["neutralize"] = ~in_target & (frame["current"].abs() > 0)
+    frame["trade"] = frame["neutralize"] | (in_target & (frame["pct_difference"] > threshold))
+    return frame
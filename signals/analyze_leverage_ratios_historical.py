@@ -15,6 +15,11 @@ from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from pathlib import Path
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from data.scripts.incremental_datasets import latest_dataset_path
 
 plt.style.use('seaborn-v0_8-whitegrid')
 plt.rcParams['figure.figsize'] = (16, 10)
@@ -33,21 +38,23 @@ def load_historical_oi_data():
     """Load historical open interest data (automatically finds latest file)"""
     print("Loading historical Open Interest data...")
     
-    # Try multiple patterns for OI data files
-    oi_patterns = [
-        "data/raw/historical_open_interest_all_perps_since2020_*.csv",
-        "data/raw/historical_open_interest_top50_*.csv",
-        "data/raw/historical_open_interest_top50_ALL_HISTORY_*.csv"
-    ]
-    
-    oi_file = None
-    for pattern in oi_patterns:
-        oi_file = find_latest_file(pattern)
-        if oi_file:
-            print(f"  Using OI data: {oi_file}")
-            break
-    
-    if not oi_file:
+    # Canonical incremental dataset (or its newest all-perps export)
+    oi_file = latest_dataset_path("open_interest")
+    if not Path(oi_file).exists():
+        # Older top-50 exports are not tracked by the incremental dataset
+        oi_patterns = [
+            "data/raw/historical_open_interest_top50_*.csv",
+            "data/raw/historical_open_interest_top50_ALL_HISTORY_*.csv"
+        ]
+        oi_file = None
+        for pattern in oi_patterns:
+            oi_file = find_latest_file(pattern)
+            if oi_file:
+                break
+    
+    if oi_file:
+        print(f"  Using OI data: {oi_file}")
+    else:
         raise FileNotFoundError(
             "No Open Interest data found. Run:\n"
             "  python3 data/scripts/refresh_oi_data.py"
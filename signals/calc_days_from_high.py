@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from data.scripts.price_store import load_price_data
 
 
 def calculate_days_since_200d_high(data_source):
@@ -20,7 +25,7 @@ def calculate_days_since_200d_high(data_source):
     """
     # Read the data - handle both CSV path and DataFrame
     if isinstance(data_source, str):
-        df = pd.read_csv(data_source)
+        df = load_price_data(data_source)
     elif isinstance(data_source, pd.DataFrame):
         df = data_source.copy()
     else:
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Batched Rolling ADF Engine
+
+Vectorized replacement for calling statsmodels.adfuller once per symbol per
+day. Every rolling window of a symbol is stacked into one batch and the
+Augmented Dickey-Fuller regressions are solved with batched QR least squares,
+reproducing adfuller's conventions:
+
+- maxlag defaults to min(nobs // 2 - ntrend - 1, ceil(12 * (nobs / 100) ** 0.25))
+- autolag="AIC" / "BIC" searches lags 0..maxlag on the common maxlag-trimmed
+  sample (one QR per window serves every nested lag), then re-runs the
+  regression with the selected lag on its longer sample
+- autolag=None uses a fixed lag (maxlag)
+- the statistic is the t-value of the lagged level; p-values use MacKinnon's
+  (1994) approximation, as statsmodels.tsa.adfvalues.mackinnonp does (its
+  N = 1 coefficients are copied below, vectorized over the statistics)
+
+Windows with NaN prices or constant prices give NaN (adfuller fails on them).
+Numerically rank-deficient windows fall back to adfuller itself.
+
+Results can be persisted in an ADFCache keyed by (symbol, window, regression,
+lag mode, window end date), so daily runs only compute windows that end on
+new dates. Each cached row also stores a fingerprint (hash) of the window's
+prices, and a row is only reused while the input window still hashes the
+same, so revised or backfilled prices are recomputed. Cached values are raw
+statistics (not clipped).
+
+Used by:
+- backtests/scripts/backtest_adf_factor.py (calculate_rolling_adf)
+- backtests/scripts/backtest_vectorized.py (prepare_factor_data('adf'))
+- execution/strategies/adf.py (live signals, through the shared cache)
+"""
+
+import os
+import sys
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from statsmodels.tsa.stattools import adfuller
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from common.storage import PYARROW_AVAILABLE, write_atomic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ADF_COLUMNS = ["adf_stat", "adf_pvalue", "used_lag"]
+CACHE_COLUMNS = ["symbol", "date", "fingerprint"] + ADF_COLUMNS
+
+# Windows solved per batch; bounds the (windows x nobs x columns) design arrays
+CHUNK_WINDOWS = 4096
+
+# Normalized |R| diagonal below this is treated as rank deficient
+RANK_TOL = 1e-10
+
+# Range the ADF strategies clip the statistic to
+ADF_STAT_MIN = -20.0
+ADF_STAT_MAX = 0.0
+
+# MacKinnon (1994) p-value coefficients for one variable (N = 1), copied from
+# statsmodels.tsa.adfvalues (BSD-3-Clause) with its scalings applied:
+# regression -> (tau_star, tau_min, tau_max, small-p poly, large-p poly),
+# polynomials in increasing powers of the statistic
+_MACKINNON_N1 = {
+    "n": (-1.04, -19.04, np.inf, [0.6344, 1.2378, 0.032496], [0.4797, 0.93557, -0.06999, 0.033066]),
+    "c": (-1.61, -18.83, 2.74, [2.1659, 1.4412, 0.038269], [1.7339, 0.93202, -0.12745, -0.010368]),
+    "ct": (-2.89, -16.18, 0.7, [3.2512, 1.6047, 0.049588], [2.5261, 0.61654, -0.37956, -0.060285]),
+    "ctt": (-3.21, -17.17, 0.54, [4.0003, 1.658, 0.048288], [3.0778, 0.49529, -0.41477, -0.059359]),
+}
+
+
+def _num_trend(regression: str) -> int:
+    if regression not in ("c", "ct", "ctt", "n"):
+        raise ValueError(f"regression must be one of 'c', 'ct', 'ctt', 'n' (got {regression!r})")
+    return 0 if regression == "n" else len(regression)
+
+
+def default_maxlag(nobs: int, regression: str = "ct") -> int:
+    """
+    Lag cap used by adfuller when maxlag is not given (Schwert 1989).
+
+    Args:
+        nobs: Number of prices in the window
+        regression: Deterministic terms ('c', 'ct', 'ctt', 'n')
+
+    Returns:
+        int: Maximum lag
+    """
+    ntrend = _num_trend(regression)
+    maxlag = int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+    maxlag = min(nobs // 2 - ntrend - 1, maxlag)
+    if maxlag < 0:
+        raise ValueError("sample size is too short to use selected regression component")
+    return maxlag
+
+
+def clip_adf_stat(stat):
+    """Cap ADF statistics to [-20, 0] as the ADF strategies do (NaN preserved)."""
+    return np.clip(stat, ADF_STAT_MIN, ADF_STAT_MAX)
+
+
+def mackinnon_pvalue(stat, regression: str = "ct") -> np.ndarray:
+    """
+    Vectorized MacKinnon (1994) p-value for ADF statistics (N = 1).
+
+    Args:
+        stat: ADF statistics (array-like, NaN allowed)
+        regression: Deterministic terms used in the test regression
+
+    Returns:
+        np.ndarray: p-values, NaN where stat is NaN
+    """
+    _num_trend(regression)
+    stat = np.asarray(stat, dtype=float)
+    tau_star, tau_min, tau_max, small, large = _MACKINNON_N1[regression]
+
+    pvalue = norm.cdf(
+        np.where(stat <= tau_star, np.polyval(small[::-1], stat), np.polyval(large[::-1], stat))
+    )
+    pvalue = np.where(stat > tau_max, 1.0, pvalue)
+    pvalue = np.where(stat < tau_min, 0.0, pvalue)
+    return np.where(np.isnan(stat), np.nan, pvalue)
+
+
+def _design(windows, xdiff, lag, regression, level_last):
+    """
+    Stacked ADF regression for a fixed lag.
+
+    Rows are t = lag..nobs-2 of each window: the dependent variable is
+    xdiff[t], regressors are the level x[t], xdiff[t-1..t-lag] and the
+    deterministic terms (prepended, as adfuller's AIC search does).
+
+    Returns:
+        tuple: (X (m, n, k), y (m, n))
+    """
+    m, w = windows.shape
+    n = w - 1 - lag
+    columns = []
+
+    if regression != "n":
+        trend = np.arange(1, n + 1, dtype=float)
+        columns.append(np.ones((m, n)))
+        if regression in ("ct", "ctt"):
+            columns.append(np.broadcast_to(trend, (m, n)))
+        if regression == "ctt":
+            columns.append(np.broadcast_to(trend**2, (m, n)))
+
+    level = windows[:, lag : w - 1]
+    lags = [xdiff[:, lag - j : w - 1 - j] for j in range(1, lag + 1)]
+    columns.extend(lags + [level] if level_last else [level] + lags)
+
+    return np.stack(columns, axis=2), xdiff[:, lag:]
+
+
+def _qr(X, y):
+    """
+    Batched reduced QR of column-normalized X.
+
+    Returns:
+        tuple: (Q'y (m, k), |R| diagonal signs and magnitudes (m, k), residual SSR (m,))
+    """
+    scale = np.sqrt((X * X).sum(axis=1, keepdims=True))
+    scale[scale == 0] = 1.0
+    Q, R = np.linalg.qr(X / scale)
+    qty = np.einsum("mnk,mn->mk", Q, y)
+    resid = y - np.einsum("mnk,mk->mn", Q, qty)
+    return qty, np.diagonal(R, axis1=1, axis2=2), (resid * resid).sum(axis=1)
+
+
+def _select_lag(windows, xdiff, maxlag, regression, autolag):
+    """Information-criterion lag search over 0..maxlag (smallest lag wins ties)."""
+    ntrend = _num_trend(regression)
+    X, y = _design(windows, xdiff, maxlag, regression, level_last=False)
+    qty, diag, ssr_full = _qr(X, y)
+    n = y.shape[1]
+
+    # SSR of the model using the first k columns: full residual plus the
+    # squared Q'y components of the dropped columns (nested by construction)
+    tail = np.cumsum((qty * qty)[:, ::-1], axis=1)[:, ::-1]
+    tail = np.concatenate([tail, np.zeros((len(tail), 1))], axis=1)
+
+    ncols = ntrend + 1 + np.arange(maxlag + 1)
+    ssr = ssr_full[:, None] + tail[:, ncols]
+    penalty = 2.0 if autolag == "AIC" else np.log(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ic = n * (np.log(2 * np.pi) + np.log(ssr / n) + 1.0) + penalty * ncols
+
+    degenerate = (np.abs(diag) < RANK_TOL).any(axis=1)
+    return np.argmin(ic, axis=1), degenerate
+
+
+def _level_tstat(windows, xdiff, lag, regression):
+    """t-value of the lagged level with `lag` difference lags."""
+    X, y = _design(windows, xdiff, lag, regression, level_last=True)
+    qty, diag, ssr = _qr(X, y)
+    dof = X.shape[1] - X.shape[2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tstat = qty[:, -1] * np.sign(diag[:, -1]) / np.sqrt(ssr / dof)
+    return tstat, (np.abs(diag) < RANK_TOL).any(axis=1)
+
+
+def adf_windows(windows, regression="ct", autolag="AIC", maxlag=None) -> Tuple[np.ndarray, ...]:
+    """
+    ADF statistic for each row of a (windows x nobs) price matrix.
+
+    Args:
+        windows (np.ndarray): (m, nobs) price levels, one window per row
+        regression (str): Deterministic terms ('c', 'ct', 'ctt', 'n')
+        autolag (str): 'AIC', 'BIC' or None for a fixed lag of maxlag
+        maxlag (int): Maximum (or fixed) lag (default: adfuller's rule)
+
+    Returns:
+        tuple: (adf_stat, adf_pvalue, used_lag) arrays of length m
+    """
+    if autolag not in ("AIC", "BIC", None):
+        raise ValueError(f"autolag must be 'AIC', 'BIC' or None (got {autolag!r})")
+
+    windows = np.asarray(windows, dtype=float)
+    m, nobs = windows.shape
+    ntrend = _num_trend(regression)
+    if maxlag is None:
+        maxlag = default_maxlag(nobs, regression)
+    elif maxlag > nobs // 2 - ntrend - 1:
+        raise ValueError("maxlag must be less than (nobs/2 - 1 - ntrend)")
+
+    stat = np.full(m, np.nan)
+    used_lag = np.full(m, np.nan)
+
+    ok = ~np.isnan(windows).any(axis=1) & (windows.max(axis=1, initial=-np.inf) != windows.min(axis=1, initial=np.inf))
+    for lo in range(0, m, CHUNK_WINDOWS):
+        rows = np.flatnonzero(ok[lo : lo + CHUNK_WINDOWS]) + lo
+        if len(rows) == 0:
+            continue
+        x = windows[rows]
+        xdiff = np.diff(x, axis=1)
+
+        if autolag is None:
+            lags = np.full(len(rows), maxlag)
+            fallback = np.zeros(len(rows), dtype=bool)
+        else:
+            lags, fallback = _select_lag(x, xdiff, maxlag, regression, autolag)
+
+        for lag in np.unique(lags):
+            sel = np.flatnonzero(lags == lag)
+            tstat, degenerate = _level_tstat(x[sel], xdiff[sel], int(lag), regression)
+            stat[rows[sel]] = tstat
+            used_lag[rows[sel]] = lag
+            fallback[sel] |= degenerate
+
+        # Rank-deficient designs: let statsmodels (pinv) decide
+        for i in np.flatnonzero(fallback):
+            try:
+                result = adfuller(x[i], maxlag=maxlag, regression=regression, autolag=autolag)
+                stat[rows[i]], used_lag[rows[i]] = result[0], result[2]
+            except Exception:
+                stat[rows[i]], used_lag[rows[i]] = np.nan, np.nan
+
+    return stat, mackinnon_pvalue(stat, regression), used_lag
+
+
+def window_fingerprints(values, ends, window) -> np.ndarray:
+    """
+    Hash of the prices in each window, used to detect changed inputs.
+
+    Args:
+        values (np.ndarray): Price levels
+        ends (np.ndarray): Row of the last price of each window
+        window (int): Window size in rows
+
+    Returns:
+        np.ndarray: int64 fingerprint per window
+    """
+    all_windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    hashes = []
+    for lo in range(0, len(ends), CHUNK_WINDOWS):
+        chunk = pd.DataFrame(all_windows[ends[lo : lo + CHUNK_WINDOWS] - window + 1])
+        hashes.append(pd.util.hash_pandas_object(chunk, index=False))
+    return np.concatenate([h.to_numpy() for h in hashes]).view(np.int64)
+
+
+def _adf_task(task):
+    """Worker entry point: ADF for selected window ends of one symbol."""
+    values, ends, window, regression, autolag, maxlag = task
+    all_windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    return adf_windows(all_windows[ends - window + 1], regression, autolag, maxlag)
+
+
+class ADFCache:
+    """Persistent store of rolling ADF results, one file per parameter set"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize ADF cache
+
+        Args:
+            cache_dir: Directory to store cache files. Defaults to workspace/data/.cache/adf
+        """
+        if cache_dir is None:
+            workspace_root = Path(__file__).parent.parent
+            cache_dir = workspace_root / "data" / ".cache" / "adf"
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_cache_path(self, window: int, regression: str, autolag: Optional[str], maxlag: Optional[int]) -> Path:
+        """Get cache file path for a parameter set"""
+        lag_mode = autolag.lower() if autolag else "fixed"
+        if maxlag is not None:
+            lag_mode += f"{maxlag}"
+        suffix = "parquet" if PYARROW_AVAILABLE else "csv"
+        return self.cache_dir / f"adf_w{window}_{regression}_{lag_mode}.{suffix}"
+
+    def load(self, window: int, regression: str, autolag: Optional[str], maxlag: Optional[int] = None) -> pd.DataFrame:
+        """
+        Load cached results for a parameter set.
+
+        Returns:
+            pd.DataFrame: symbol, date, fingerprint, adf_stat, adf_pvalue,
+            used_lag (empty if none)
+        """
+        path = self._get_cache_path(window, regression, autolag, maxlag)
+        if not path.exists():
+            return pd.DataFrame(columns=CACHE_COLUMNS)
+        try:
+            if path.suffix == ".parquet":
+                df = pd.read_parquet(path)
+            else:
+                df = pd.read_csv(path, parse_dates=["date"])
+        except Exception as e:
+            logger.error(f"Error reading ADF cache {path.name}: {e}")
+            return pd.DataFrame(columns=CACHE_COLUMNS)
+        if "fingerprint" not in df.columns:
+            # Files written before fingerprints were stored can't be validated
+            return pd.DataFrame(columns=CACHE_COLUMNS)
+        return df
+
+    def store(
+        self,
+        rows: pd.DataFrame,
+        window: int,
+        regression: str,
+        autolag: Optional[str],
+        maxlag: Optional[int] = None,
+    ) -> None:
+        """Merge new results into the cache file (atomic replace)."""
+        if rows.empty:
+            return
+        path = self._get_cache_path(window, regression, autolag, maxlag)
+        existing = self.load(window, regression, autolag, maxlag)
+        frames = [f for f in (existing, rows[CACHE_COLUMNS]) if not f.empty]
+        merged = pd.concat(frames, ignore_index=True)
+        merged["symbol"] = merged["symbol"].astype(str)
+        merged["date"] = pd.to_datetime(merged["date"])
+        merged["fingerprint"] = merged["fingerprint"].astype("int64")
+        merged = merged.drop_duplicates(["symbol", "date"], keep="last")
+        merged = merged.sort_values(["symbol", "date"]).reset_index(drop=True)
+
+        try:
+            if path.suffix == ".parquet":
+                write_atomic(path, lambda p: merged.to_parquet(p, index=False))
+            else:
+                write_atomic(path, lambda p: merged.to_csv(p, index=False))
+        except Exception as e:
+            logger.error(f"Error writing ADF cache {path.name}: {e}")
+
+    def clear(self) -> None:
+        """Delete all cached ADF results"""
+        for cache_file in self.cache_dir.glob("adf_*"):
+            cache_file.unlink()
+
+
+def _normalize_dates(dates) -> pd.Series:
+    dates = pd.Series(pd.to_datetime(np.asarray(dates)))
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(None)
+    return dates.astype("datetime64[ns]")
+
+
+def rolling_adf(
+    values,
+    group_ids,
+    dates=None,
+    window=60,
+    regression="ct",
+    autolag="AIC",
+    maxlag=None,
+    last_only=False,
+    workers=1,
+    cache=None,
+):
+    """
+    Rolling ADF test for many series at once.
+
+    The value at a row is the test on the `window` rows ending at (and
+    including) that row; rows with fewer than `window` rows of history are NaN.
+
+    Args:
+        values (array-like): Price levels ordered by (group, time)
+        group_ids (array-like): Group label per row (rows of a group contiguous)
+        dates (array-like): Date per row (required with a cache)
+        window (int): Rolling window size in rows
+        regression (str): Deterministic terms ('c', 'ct', 'ctt', 'n')
+        autolag (str): 'AIC', 'BIC' or None for a fixed lag
+        maxlag (int): Maximum (or fixed) lag (default: adfuller's rule)
+        last_only (bool): Only test the last window of each group
+        workers (int): Worker processes (symbols are distributed across them)
+        cache (ADFCache): Optional persistent cache of previous results
+
+    Returns:
+        pd.DataFrame: ADF_COLUMNS aligned to the input rows
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    out = {col: np.full(n, np.nan) for col in ADF_COLUMNS}
+    if n == 0:
+        return pd.DataFrame(out)
+    if maxlag is None:
+        default_maxlag(window, regression)  # validate window / regression early
+
+    # Group boundaries and the window-end rows to evaluate
+    group_ids = np.asarray(group_ids)
+    codes = pd.factorize(group_ids)[0]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    stops = np.r_[starts[1:], n]
+    if last_only:
+        ends = np.array([stop - 1 for start, stop in zip(starts, stops) if stop - start >= window], dtype=int)
+    else:
+        ends = np.concatenate(
+            [np.arange(start + window - 1, stop) for start, stop in zip(starts, stops)] + [np.array([], dtype=int)]
+        ).astype(int)
+    if len(ends) == 0:
+        return pd.DataFrame(out)
+
+    todo = np.ones(len(ends), dtype=bool)
+    if cache is not None:
+        if dates is None:
+            raise ValueError("dates are required when using an ADF cache")
+        requested = pd.DataFrame({
+            "symbol": group_ids[ends].astype(str),
+            "date": _normalize_dates(dates).to_numpy()[ends],
+            "fingerprint": window_fingerprints(values, ends, window),
+        })
+        cached = cache.load(window, regression, autolag, maxlag)
+        if not cached.empty:
+            cached = cached.drop_duplicates(["symbol", "date"], keep="last")
+            cached["symbol"] = cached["symbol"].astype(str)
+            cached["date"] = pd.to_datetime(cached["date"]).astype("datetime64[ns]")
+            cached["fingerprint"] = cached["fingerprint"].astype("int64")
+            # Rows whose window prices changed since they were cached miss
+            keys = ["symbol", "date", "fingerprint"]
+            hits = requested.merge(cached, on=keys, how="left", indicator=True)
+            todo = (hits["_merge"] == "left_only").to_numpy()
+            for col in ADF_COLUMNS:
+                out[col][ends[~todo]] = hits[col].to_numpy(dtype=float)[~todo]
+
+    # One task per symbol with windows left to compute
+    missing = ends[todo]
+    group_of = np.searchsorted(starts, missing, side="right") - 1
+    tasks = []
+    for g in np.unique(group_of):
+        start, stop = starts[g], stops[g]
+        tasks.append((values[start:stop], missing[group_of == g] - start, window, regression, autolag, maxlag))
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_adf_task, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    else:
+        results = [_adf_task(task) for task in tasks]
+
+    for g, result in zip(np.unique(group_of), results):
+        rows = missing[group_of == g]
+        for col, column_values in zip(ADF_COLUMNS, result):
+            out[col][rows] = column_values
+
+    if cache is not None and len(missing) > 0:
+        new_rows = requested[todo].assign(**{col: out[col][missing] for col in ADF_COLUMNS})
+        cache.store(new_rows, window, regression, autolag, maxlag)
+        logger.info(f"ADF cache: {len(ends) - len(missing)} windows reused, {len(missing)} computed")
+
+    return pd.DataFrame(out)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Rolling Higher-Moment (Skewness / Kurtosis) Kernel
+
+Vectorized replacement for rolling(...).apply(scipy.stats.skew / kurtosis)
+inside a groupby. All windows of all symbols are evaluated at once from
+centered window moments, with scipy.stats conventions:
+
+- bias=True (scipy default): population moments, skew = m3 / m2**1.5 and
+  kurtosis = m4 / m2**2; bias=False applies scipy's small-sample corrections
+- fisher=True (scipy default): excess kurtosis (normal = 0)
+- Zero-variance windows (m2 <= (eps * mean)**2) are NaN, as in scipy
+
+Windows are the last `window` rows of each symbol (row-based, not calendar).
+NaN values are dropped (nan_policy='omit') and at least `min_periods` valid
+values are required (default: the full window, i.e. pandas'
+rolling(window, min_periods=window) behaviour).
+
+Used by:
+- backtests/scripts/backtest_kurtosis_factor.py
+- backtests/scripts/backtest_skew_factor.py
+- backtests/scripts/backtest_vectorized.py (prepare_factor_data)
+- execution/strategies/kurtosis.py
+"""
+
+import numpy as np
+import pandas as pd
+
+MOMENT_COLUMNS = ["skewness", "kurtosis"]
+
+# Rows processed per block; bounds the (rows x window) working arrays
+CHUNK_ROWS = 65536
+
+
+def _moments_windows(windows, bias=True, fisher=True):
+    """
+    Skewness and kurtosis of each window row, ignoring NaN.
+
+    Args:
+        windows (np.ndarray): (rows, window) values, NaN = missing
+        bias (bool): If False, correct for statistical bias (as scipy)
+        fisher (bool): Return excess kurtosis
+
+    Returns:
+        tuple: (count, skewness, kurtosis) arrays
+    """
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=1).astype(float)
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        mean = np.where(valid, windows, 0.0).sum(axis=1) / count
+        dev = np.where(valid, windows - mean[:, None], 0.0)
+        dev2 = dev * dev
+
+        m2 = dev2.sum(axis=1) / count
+        m3 = (dev2 * dev).sum(axis=1) / count
+        m4 = (dev2 * dev2).sum(axis=1) / count
+
+        zero = m2 <= (np.finfo(float).eps * mean) ** 2
+        skewness = np.where(zero, np.nan, m3 / m2**1.5)
+        kurtosis = np.where(zero, np.nan, m4 / m2**2.0)
+
+        if not bias:
+            n = count
+            skewness = np.where(
+                ~zero & (n > 2), np.sqrt((n - 1.0) * n) / (n - 2.0) * m3 / m2**1.5, skewness
+            )
+            corrected = 1.0 / (n - 2) / (n - 3) * ((n**2 - 1.0) * m4 / m2**2.0 - 3 * (n - 1) ** 2.0) + 3.0
+            kurtosis = np.where(~zero & (n > 3), corrected, kurtosis)
+
+    if fisher:
+        kurtosis = kurtosis - 3.0
+
+    return count, skewness, kurtosis
+
+
+def rolling_higher_moments(values, group_ids, window=30, min_periods=None, bias=True, fisher=True):
+    """
+    Rolling skewness and kurtosis for many series at once.
+
+    Args:
+        values (array-like): Values (e.g. daily returns) ordered by (group, time)
+        group_ids (array-like): Group label per row (rows of a group contiguous)
+        window (int): Rolling window size in rows
+        min_periods (int): Minimum valid values per window (default: window)
+        bias (bool): If False, correct for statistical bias (as scipy)
+        fisher (bool): Return excess kurtosis (normal = 0)
+
+    Returns:
+        pd.DataFrame: MOMENT_COLUMNS aligned to the input rows
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if min_periods is None:
+        min_periods = window
+
+    out = {col: np.full(n, np.nan) for col in MOMENT_COLUMNS}
+    if n == 0 or window < 1:
+        return pd.DataFrame(out)
+
+    # Position of each row within its group; windows may not cross groups
+    codes = pd.factorize(np.asarray(group_ids))[0]
+    starts = np.r_[True, codes[1:] != codes[:-1]]
+    group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    position = np.arange(n) - group_start
+
+    # Left-pad so the first rows have a full (masked) window
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    all_windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+
+    for lo in range(0, n, CHUNK_ROWS):
+        hi = min(lo + CHUNK_ROWS, n)
+        rows = np.arange(lo, hi)
+        full = position[rows] >= window - 1
+        if not full.any():
+            continue
+        rows = rows[full]
+
+        count, skewness, kurtosis = _moments_windows(all_windows[rows], bias=bias, fisher=fisher)
+        ok = count >= max(min_periods, 1)
+
+        out["skewness"][rows[ok]] = skewness[ok]
+        out["kurtosis"][rows[ok]] = kurtosis[ok]
+
+    return pd.DataFrame(out)
+
+
+def calculate_rolling_moments(df, window=30, column="daily_return", min_periods=None, bias=True, fisher=True):
+    """
+    Rolling skewness and kurtosis per symbol of a long DataFrame.
+
+    Rows of each symbol are taken in their existing order, as
+    df.groupby('symbol')[column].rolling(...) would; rows without a symbol
+    get NaN.
+
+    Args:
+        df (pd.DataFrame): DataFrame with symbol and value columns
+        window (int): Rolling window size in rows
+        column (str): Column to compute moments of
+        min_periods (int): Minimum valid values per window (default: window)
+        bias (bool): If False, correct for statistical bias (as scipy)
+        fisher (bool): Return excess kurtosis (normal = 0)
+
+    Returns:
+        pd.DataFrame: MOMENT_COLUMNS aligned to df's rows (same index)
+    """
+    codes = pd.factorize(df["symbol"])[0]
+    order = np.argsort(codes, kind="stable")
+
+    moments = rolling_higher_moments(
+        df[column].to_numpy(dtype=float)[order],
+        codes[order],
+        window=window,
+        min_periods=min_periods,
+        bias=bias,
+        fisher=fisher,
+    )
+
+    out = {}
+    for col in MOMENT_COLUMNS:
+        values = np.empty(len(df))
+        values[order] = moments[col].to_numpy()
+        values[codes < 0] = np.nan
+        out[col] = values
+    return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Rolling Trendline (Linear Regression) Kernel
+
+Vectorized replacement for fitting scipy.stats.linregress on every rolling
+window of every symbol. All windows are evaluated at once from window sums,
+giving the same slope, intercept, R², standard error and p-value as
+linregress, with the trendline conventions used across the repo:
+
+- Windows are the last `window` rows of each symbol (row-based, not calendar)
+- NaN prices are dropped and the remaining prices are regressed on
+  x = 0..m-1, i.e. missing rows are skipped rather than left as gaps
+- At least int(window * 0.7) valid prices are required, otherwise all
+  outputs are NaN
+- predicted_price is the fitted value at the last valid x (end of window)
+
+Used by:
+- backtests/scripts/backtest_trendline_factor.py
+- backtests/scripts/backtest_trendline_breakout.py
+- backtests/scripts/backtest_trendline_reversal.py
+- signals/calc_trendline_breakout_signals.py (and the live
+  execution/strategies/trendline_breakout.py through it)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import special
+
+TRENDLINE_COLUMNS = ["slope", "intercept", "r_squared", "p_value", "std_err", "predicted_price"]
+
+# Rows processed per block; bounds the (rows x window) working arrays
+CHUNK_ROWS = 65536
+
+# Same guard scipy.stats.linregress uses when computing the t statistic
+TINY = 1.0e-20
+
+
+def _linregress_windows(windows):
+    """
+    Closed-form OLS of each window row against its compressed index.
+
+    Args:
+        windows (np.ndarray): (rows, window) prices, NaN = missing
+
+    Returns:
+        tuple: (count, slope, intercept, r, std_err, p_value, last_x) arrays
+    """
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=1).astype(float)
+
+    # Compressed x: position among the valid prices of the window
+    x = np.cumsum(valid, axis=1) - 1.0
+    y = np.where(valid, windows, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = (count - 1.0) / 2.0
+        y_mean = y.sum(axis=1) / count
+
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, y - y_mean[:, None], 0.0)
+
+        # Population (biased) moments, as in linregress
+        ssxm = (dx * dx).sum(axis=1) / count
+        ssym = (dy * dy).sum(axis=1) / count
+        ssxym = (dx * dy).sum(axis=1) / count
+
+        # Constant prices give r = NaN (0 / 0), as in current scipy
+        r = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+
+        slope = ssxym / ssxm
+        intercept = y_mean - slope * x_mean
+
+        dof = count - 2.0
+        t_stat = r * np.sqrt(dof / ((1.0 - r + TINY) * (1.0 + r + TINY)))
+        p_value = 2.0 * special.stdtr(dof, -np.abs(t_stat))
+        std_err = np.sqrt((1.0 - r**2) * ssym / ssxm / dof)
+
+    # Two points: perfect fit (linregress special case)
+    two = count == 2
+    if two.any():
+        std_err[two] = 0.0
+        p_value[two] = np.where(ssym[two] == 0.0, 1.0, 0.0)
+
+    return count, slope, intercept, r, std_err, p_value, count - 1.0
+
+
+def rolling_linregress(values, group_ids, window=30, min_periods=None):
+    """
+    Rolling linear regression of values on time for many series at once.
+
+    Args:
+        values (array-like): Prices ordered by (group, time)
+        group_ids (array-like): Group label per row (rows of a group contiguous)
+        window (int): Rolling window size in rows
+        min_periods (int): Minimum valid prices per window
+            (default: int(window * 0.7))
+
+    Returns:
+        pd.DataFrame: TRENDLINE_COLUMNS aligned to the input rows
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if min_periods is None:
+        min_periods = int(window * 0.7)
+
+    out = {col: np.full(n, np.nan) for col in TRENDLINE_COLUMNS}
+    if n == 0 or window < 1:
+        return pd.DataFrame(out)
+
+    # Position of each row within its group; windows may not cross groups
+    codes = pd.factorize(np.asarray(group_ids))[0]
+    starts = np.r_[True, codes[1:] != codes[:-1]]
+    group_start = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    position = np.arange(n) - group_start
+
+    # Left-pad so the first rows have a full (masked) window
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    all_windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+
+    for lo in range(0, n, CHUNK_ROWS):
+        hi = min(lo + CHUNK_ROWS, n)
+        rows = np.arange(lo, hi)
+        full = position[rows] >= window - 1
+        if not full.any():
+            continue
+        rows = rows[full]
+
+        count, slope, intercept, r, std_err, p_value, last_x = _linregress_windows(
+            all_windows[rows]
+        )
+        ok = count >= max(min_periods, 2)
+
+        out["slope"][rows[ok]] = slope[ok]
+        out["intercept"][rows[ok]] = intercept[ok]
+        out["r_squared"][rows[ok]] = r[ok] ** 2
+        out["p_value"][rows[ok]] = p_value[ok]
+        out["std_err"][rows[ok]] = std_err[ok]
+        out["predicted_price"][rows[ok]] = slope[ok] * last_x[ok] + intercept[ok]
+
+    return pd.DataFrame(out)
+
+
+def calculate_trendline_metrics(df, window=30, price_column="close"):
+    """
+    Rolling trendline metrics for a (symbol, date) sorted DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame sorted by symbol, date with a price column
+        window (int): Rolling window size for trendline calculation
+        price_column (str): Column to regress
+
+    Returns:
+        pd.DataFrame: TRENDLINE_COLUMNS aligned to df's rows (same index)
+    """
+    metrics = rolling_linregress(df[price_column].to_numpy(), df["symbol"].to_numpy(), window=window)
+    metrics.index = df.index
+    return metrics
@@ -1,5 +1,10 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from data.scripts.price_store import load_price_data
 
 
 def calculate_rolling_30d_volatility(data):
@@ -15,8 +20,8 @@ def calculate_rolling_30d_volatility(data):
     """
     # Handle both CSV file path and DataFrame input
     if isinstance(data, str):
-        # Read the CSV file
-        df = pd.read_csv(data)
+        # Read the CSV file (served from the columnar price store when built)
+        df = load_price_data(data)
     elif isinstance(data, pd.DataFrame):
         # Use the DataFrame directly (make a copy to avoid modifying original)
         df = data.copy()
@@ -57,8 +62,8 @@ def calculate_rolling_30d_volatility_simple(data):
     """
     # Handle both CSV file path and DataFrame input
     if isinstance(data, str):
-        # Read the CSV file
-        df = pd.read_csv(data)
+        # Read the CSV file (served from the columnar price store when built)
+        df = load_price_data(data)
     elif isinstance(data, pd.DataFrame):
         # Use the DataFrame directly (make a copy to avoid modifying original)
         df = data.copy()
@@ -205,25 +205,19 @@ def assign_top_bottom_n_vectorized(
     # When there aren't enough symbols, split proportionally between top and bottom
     df['selection'] = None
     
-    def assign_selection(group):
-        n = len(group)
-        # If we have enough symbols for both top_n and bottom_n
-        if n >= (top_n + bottom_n):
-            group.loc[group['rank'] <= bottom_n, 'selection'] = 'bottom'
-            group.loc[group['rank'] > (n - top_n), 'selection'] = 'top'
-        else:
-            # Not enough symbols - split proportionally
-            # Ratio of bottom:top requests
-            total_requested = top_n + bottom_n
-            bottom_fraction = bottom_n / total_requested
-            actual_bottom_n = max(1, int(n * bottom_fraction))
-            actual_top_n = max(1, n - actual_bottom_n)
-            
-            group.loc[group['rank'] <= actual_bottom_n, 'selection'] = 'bottom'
-            group.loc[group['rank'] > (n - actual_top_n), 'selection'] = 'top'
-        return group
+    n = df['count_per_date']
+    enough = n >= (top_n + bottom_n)
+
+    # Not enough symbols - split proportionally by the bottom:top request ratio
+    total_requested = top_n + bottom_n
+    actual_bottom_n = np.maximum(1, np.floor(n * bottom_n / total_requested))
+    actual_top_n = np.maximum(1, n - actual_bottom_n)
     
-    df = df.groupby('date', group_keys=False).apply(assign_selection)
+    bottom_limit = np.where(enough, bottom_n, actual_bottom_n)
+    top_limit = np.where(enough, top_n, actual_top_n)
+
+    df.loc[df['rank'] <= bottom_limit, 'selection'] = 'bottom'
+    df.loc[df['rank'] > (n - top_limit), 'selection'] = 'top'
     
     return df
 
@@ -580,21 +574,27 @@ def calculate_weights_vectorized(
     
     elif weighting_method == 'risk_parity':
         # Calculate risk parity weights separately for longs and shorts
-        def calc_risk_parity_weights(group):
-            if 'volatility' not in group.columns or group['volatility'].isna().all():
+        def calc_risk_parity_weights(side):
+            side = side.copy()
+            group_size = side.groupby('date')['signal'].transform('size')
+            if 'volatility' not in side.columns:
                 # Fall back to equal weight
-                group['weight'] = 1.0 / len(group)
-            else:
-                valid_vol = group['volatility'].fillna(group['volatility'].mean())
-                # Clip extreme volatilities
-                valid_vol = valid_vol.clip(lower=0.01, upper=10.0)
-                inv_vol = 1.0 / valid_vol
-                group['weight'] = inv_vol / inv_vol.sum()
-            return group
+                side['weight'] = 1.0 / group_size
+                return side
+            vol_by_date = side.groupby('date')['volatility']
+            valid_vol = side['volatility'].fillna(vol_by_date.transform('mean'))
+            # Clip extreme volatilities
+            valid_vol = valid_vol.clip(lower=0.01, upper=10.0)
+            inv_vol = 1.0 / valid_vol
+            side['weight'] = inv_vol / inv_vol.groupby(side['date']).transform('sum')
+            # Dates with no volatility at all fall back to equal weight
+            no_vol = vol_by_date.transform('count') == 0
+            side.loc[no_vol, 'weight'] = 1.0 / group_size[no_vol]
+            return side
         
         # Apply risk parity separately for longs and shorts on each date
-        longs = df[df['signal'] == 1].groupby('date', group_keys=False).apply(calc_risk_parity_weights)
-        shorts = df[df['signal'] == -1].groupby('date', group_keys=False).apply(calc_risk_parity_weights)
+        longs = calc_risk_parity_weights(df[df['signal'] == 1])
+        shorts = calc_risk_parity_weights(df[df['signal'] == -1])
         
         # Scale by allocations (only if positions exist)
         if not longs.empty:
@@ -935,8 +935,8 @@ def generate_adf_signals_vectorized(
     """
     Generate ADF factor signals for ALL dates at once (vectorized).
     
-    Note: ADF calculation itself cannot be vectorized (requires statsmodels adfuller),
-    but signal generation from pre-calculated ADF values can be vectorized.
+    Note: ADF values are pre-calculated by the batched engine in
+    signals/calc_rolling_adf.py; this step only turns them into signals.
     
     Args:
         adf_df: DataFrame with date, symbol, adf_stat columns (pre-calculated)
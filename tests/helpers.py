@@ -0,0 +1,27 @@
+"""
+Helpers shared by the test modules
+"""
+
+import contextlib
+import io
+
+
+class FakeClock:
+    """Manual clock; sleep() advances it and records the requested sleeps"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with its stdout discarded"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
@@ -0,0 +1,299 @@
+"""
+Tests for the asyncio execution engine
+Tests: ladder pricing, shared polls, bulk coalescing of per-symbol actions,
+per-symbol spread crossing, streaming market data and the summary returned to main.py
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+from async_execution import (
+    AsyncExecutionEngine,
+    SharedPoll,
+    ladder_price,
+    run_aggressive_execution,
+)
+from execution_simulator import VirtualClock, VirtualTimeEventLoop
+from market_data import MarketDataFeed
+
+SYMBOLS = [f"COIN{i}/USDC:USDC" for i in range(10)]
+
+
+class FakeAsyncExchange:
+    """
+    In-memory async exchange: orders rest until `fill_after` status polls;
+    with `partial_fill`, the first poll fills that fraction of each order
+    """
+
+    has = {"createOrders": True, "editOrders": True, "cancelOrdersForSymbols": True}
+
+    def __init__(self, fill_after=None, fill_symbols=None, reject_cancels=False, partial_fill=0.0):
+        self.fill_after = fill_after
+        self.fill_symbols = set(SYMBOLS if fill_symbols is None else fill_symbols)
+        self.reject_cancels = reject_cancels
+        self.partial_fill = partial_fill
+        self.calls = {}
+        self.edits = []  # edit requests in arrival order
+        self.open = {}  # order id -> order
+        self.fills = []
+        self.next_id = 1
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _new(self, request):
+        order_id = str(self.next_id)
+        self.next_id += 1
+        self.open[order_id] = {
+            "id": order_id,
+            "symbol": request["symbol"],
+            "side": request["side"],
+            "amount": request["amount"],
+            "remaining": request["amount"],
+            "price": request["price"],
+        }
+        return {"id": order_id, "info": {"resting": {"oid": int(order_id)}}}
+
+    async def fetch_tickers(self):
+        self._count("fetch_tickers")
+        return {s: {"bid": 10.0, "ask": 10.1, "last": 10.05} for s in SYMBOLS}
+
+    async def create_orders(self, requests):
+        self._count("create_orders")
+        return [self._new(r) for r in requests]
+
+    async def edit_orders(self, requests):
+        self._count("edit_orders")
+        self.edits.extend(requests)
+        results = []
+        for request in requests:
+            self.open.pop(request["id"], None)
+            results.append(self._new(request))
+        return results
+
+    async def cancel_orders_for_symbols(self, requests):
+        self._count("cancel_orders_for_symbols")
+        statuses = []
+        for request in requests:
+            found = None if self.reject_cancels else self.open.pop(request["id"], None)
+            statuses.append("success" if found else {"error": "Order was never placed"})
+        return [{"info": {"response": {"data": {"statuses": statuses}}}}]
+
+    async def fetch_open_orders(self):
+        self._count("fetch_open_orders")
+        if self.partial_fill and self.calls["fetch_open_orders"] == 1:
+            for order_id, order in self.open.items():
+                amount = order["remaining"] * self.partial_fill
+                order["remaining"] -= amount
+                fill = {"id": f"p{order_id}", "order": order_id, "price": order["price"]}
+                self.fills.append({**fill, "amount": amount})
+        if self.fill_after is not None and self.calls["fetch_open_orders"] > self.fill_after:
+            for order_id, order in list(self.open.items()):
+                if order["symbol"] in self.fill_symbols:
+                    fill = {"id": f"t{order_id}", "order": order_id, "price": order["price"]}
+                    self.fills.append({**fill, "amount": order["amount"]})
+                    del self.open[order_id]
+        return list(self.open.values())
+
+    async def fetch_my_trades(self, since=None):
+        self._count("fetch_my_trades")
+        return list(self.fills)
+
+
+def _run(exchange, trades, **kwargs):
+    """Run the engine in virtual time, so task interleaving does not depend on the host"""
+    params = {"tick_interval": 0.02, "max_time": 0.2, "cross_spread_wait": 0.05}
+    params.update({"batch_window": 0.005}, **kwargs)
+    clock = VirtualClock(1_700_000_000.0)
+    loop = VirtualTimeEventLoop(clock)
+    try:
+        return loop.run_until_complete(
+            run_aggressive_execution(
+                trades, dry_run=False, exchange=exchange, clock=clock, **params
+            )
+        )
+    finally:
+        loop.close()
+
+
+class TestLadderPrice(unittest.TestCase):
+    """Test the ladder step shared with the synchronous engine"""
+
+    def test_buy_and_sell_steps(self):
+        """Buys walk 20% towards the max, sells 20% towards the min"""
+        self.assertAlmostEqual(ladder_price("buy", 10.0, 11.0, 10.0), 10.2)
+        self.assertAlmostEqual(ladder_price("sell", 10.0, 10.0, 9.0), 9.8)
+
+    def test_no_move_at_bound_or_tiny_step(self):
+        """No edit at the bound or when the step is below 0.1%"""
+        self.assertIsNone(ladder_price("buy", 11.0, 11.0, 10.0))
+        self.assertIsNone(ladder_price("buy", 10.0, 10.004, 10.0))
+
+
+class TestSharedPoll(unittest.TestCase):
+    """Test request sharing between concurrent tasks"""
+
+    def test_concurrent_callers_share_one_fetch(self):
+        """Ten tasks waking together trigger one fetch"""
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async def main():
+            poll = SharedPoll(fetch, max_age=1.0)
+            shared = await asyncio.gather(*(poll.get() for _ in range(10)))
+            # max_age=0 only accepts a fetch started after the call
+            return shared, await poll.get(max_age=0)
+
+        shared, fresh = asyncio.run(main())
+        self.assertEqual(shared, [1] * 10)
+        self.assertEqual(fresh, 2)
+
+
+class TestAsyncExecutionEngine(unittest.TestCase):
+    """Test end-to-end execution against the in-memory exchange"""
+
+    def test_fills_with_bulk_requests(self):
+        """Ten symbols are placed with one bulk create and polled with shared requests"""
+        exchange = FakeAsyncExchange(fill_after=2)
+        trades = {symbol: 100.0 if i % 2 else -100.0 for i, symbol in enumerate(SYMBOLS)}
+
+        result = _run(exchange, trades)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["orders_placed"], 10)
+        self.assertEqual(result["filled"], 10)
+        self.assertEqual(result["remaining"], 0)
+        self.assertEqual(exchange.calls["create_orders"], 1)
+        # Ladder edits of all symbols on a tick share one request
+        self.assertLessEqual(exchange.calls["edit_orders"], 2)
+        self.assertLessEqual(exchange.calls["fetch_open_orders"], 4)
+
+    def test_unfilled_symbol_crosses_spread(self):
+        """An order still resting at the deadline is replaced at the opposite side"""
+        exchange = FakeAsyncExchange(fill_after=None)
+
+        result = _run(exchange, {SYMBOLS[0]: 100.0})
+
+        self.assertEqual(result["orders_placed"], 1)
+        self.assertEqual(result["filled"], 0)
+        self.assertEqual(exchange.calls["cancel_orders_for_symbols"], 1)
+        resting = list(exchange.open.values())
+        self.assertEqual(len(resting), 1)
+        self.assertEqual(resting[0]["price"], 10.1)  # buy crosses at the ask
+
+    def test_partial_fill_is_not_reopened(self):
+        """Ladder edits and the cross are sized to the remainder after a partial fill"""
+        exchange = FakeAsyncExchange(fill_after=None, partial_fill=0.4)
+
+        _run(exchange, {SYMBOLS[0]: 100.0})
+
+        amount = 100.0 / 10.25
+        self.assertGreater(len(exchange.edits), 0)
+        for edit in exchange.edits:
+            self.assertAlmostEqual(edit["amount"], amount * 0.6)
+        filled = sum(fill["amount"] for fill in exchange.fills)
+        resting = sum(order["remaining"] for order in exchange.open.values())
+        self.assertAlmostEqual(filled + resting, amount)
+
+    def test_failed_cancel_does_not_cross(self):
+        """A rejected single cancel leaves the resting order alone instead of doubling it"""
+        exchange = FakeAsyncExchange(fill_after=None, reject_cancels=True)
+
+        result = _run(exchange, {SYMBOLS[0]: 100.0})
+
+        self.assertEqual(exchange.calls["cancel_orders_for_symbols"], 1)
+        self.assertEqual(exchange.calls["create_orders"], 1)
+        resting = list(exchange.open.values())
+        self.assertEqual(len(resting), 1)
+        self.assertNotEqual(resting[0]["price"], 10.1)
+        self.assertEqual(result["orders_placed"], 1)
+
+    def test_stale_shared_poll_is_not_edited(self):
+        """A shared snapshot polled before the last edit is replaced by a fresh poll"""
+        exchange = FakeAsyncExchange()
+        clock = VirtualClock(1_700_000_000.0)
+        engine = AsyncExecutionEngine(exchange, dry_run=False, clock=clock)
+        symbol = SYMBOLS[0]
+        plan = {"side": "buy", "max_price": 11.0, "min_price": 10.0}
+        current = exchange._new({"symbol": symbol, "side": "buy", "amount": 1.0, "price": 10.0})
+        engine.tracker.track(symbol, current["id"], "buy", 1.0, 10.0)
+        stale = {symbol: {"id": "replaced", "status": "open", "price": 10.0, "amount": 1.0}}
+
+        async def get(max_age=None):
+            return stale if max_age is None else await engine._fetch_statuses()
+
+        engine.statuses.get = get
+        loop = VirtualTimeEventLoop(clock)
+        try:
+            loop.run_until_complete(engine._ladder_tick(symbol, plan, {"ticks": 1}))
+        finally:
+            loop.close()
+
+        self.assertEqual([edit["id"] for edit in exchange.edits], [current["id"]])
+        self.assertEqual(len(exchange.open), 1)
+
+    def test_streaming_feed_replaces_polls(self):
+        """With a feed covering the symbol, prices and fills never hit REST"""
+        feed = MarketDataFeed()
+        book = {"channel": "book", "symbol": SYMBOLS[0], "type": "snapshot", "seq": 1}
+        feed.process({**book, "bids": [[20.0, 5.0]], "asks": [[20.1, 5.0]]})
+        feed.process({"channel": "orders", "snapshot": True, "orders": []})
+        # Sized at mid + 2 * spread from the streamed book; order "1" is the first placed
+        amount = 100.0 / 20.25
+        fill = {"id": "t1", "order": "1", "symbol": SYMBOLS[0], "amount": amount, "price": 20.0}
+        feed.process({"channel": "fills", "trades": [fill]})
+        exchange = FakeAsyncExchange(fill_after=None)
+
+        result = _run(exchange, {SYMBOLS[0]: 100.0}, market_data=feed)
+
+        self.assertEqual(result["filled"], 1)
+        self.assertNotIn("fetch_tickers", exchange.calls)
+        self.assertNotIn("fetch_open_orders", exchange.calls)
+        self.assertEqual(exchange.next_id, 2)
+
+    def test_summary_keys_match_sync_engine(self):
+        """The summary has the keys main.py reads from aggressive_execute_orders"""
+        result = _run(FakeAsyncExchange(fill_after=0), {SYMBOLS[0]: 50.0})
+
+        self.assertEqual(
+            set(result),
+            {
+                "success",
+                "total_trades",
+                "orders_placed",
+                "filled",
+                "remaining",
+                "ticks",
+                "elapsed_time",
+            },
+        )
+
+    def test_no_trades(self):
+        """Empty trades short-circuit like the synchronous engine"""
+        result = _run(FakeAsyncExchange(), {})
+        self.assertEqual(result, {"success": False, "error": "No trades provided"})
+
+    def test_plan_order_matches_sync_sizing(self):
+        """Buys size at last + 2*spread, sells at last - 2*spread"""
+        prices = {"bid": 10.0, "ask": 10.1, "last": 10.05, "spread": 0.1}
+        buy = AsyncExecutionEngine.plan_order(100.0, prices)
+        sell = AsyncExecutionEngine.plan_order(-100.0, prices)
+
+        self.assertAlmostEqual(buy["amount"], 100.0 / 10.25)
+        self.assertEqual(buy["price"], 10.0)
+        self.assertAlmostEqual(sell["amount"], 100.0 / 9.85)
+        self.assertEqual(sell["price"], 10.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
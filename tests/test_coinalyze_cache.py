@@ -0,0 +1,110 @@
+"""
+Tests for the Coinalyze Data Cache
+Tests: typed round trips, the sidecar index, serving symbol and day subsets
+from a larger cached entry, and the TTL / date-change validity rules
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import pandas as pd
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data.scripts.coinalyze_cache import CoinalyzeCache
+
+UNIVERSE = ["BTC/USDC:USDC", "ETH/USDC:USDC", "SOL/USDC:USDC"]
+
+
+def _oi_history(days):
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=days - 1)
+    dates = pd.date_range(start, periods=days)
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "coin_symbol": coin,
+                    "coinalyze_symbol": f"{coin}USDT_PERP.A",
+                    "date": dates,
+                    "oi_close": float(k + 1),
+                }
+            )
+            for k, coin in enumerate(["BTC", "ETH", "SOL"])
+        ],
+        ignore_index=True,
+    )
+
+
+class TestCoinalyzeCache(unittest.TestCase):
+    """Test storage and lookups"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CoinalyzeCache(cache_dir=self.tmp.name, ttl_hours=8)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_oi_round_trip_keeps_dtypes_and_index(self):
+        self.cache.save_oi_history(_oi_history(30), "A", 30, symbols=UNIVERSE)
+        df = self.cache.load_oi_history("A", 30, symbols=UNIVERSE)
+
+        self.assertEqual(len(df), 90)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+        self.assertEqual(df["oi_close"].dtype, "float64")
+
+        (info,) = self.cache.get_cache_info()["files"]
+        self.assertTrue(info["is_valid"])
+        self.assertEqual((info["rows"], info["symbols"]), (90, 3))
+
+    def test_subset_served_from_larger_entry(self):
+        """Fewer days and a subset of symbols come from the 200-day entry"""
+        self.cache.save_oi_history(_oi_history(200), "A", 200, symbols=UNIVERSE)
+        df = self.cache.load_oi_history("A", 30, symbols=UNIVERSE[:2])
+
+        self.assertEqual(set(df["coin_symbol"]), {"BTC", "ETH"})
+        self.assertLessEqual(df.groupby("coin_symbol").size().max(), 30)
+        self.assertGreaterEqual(df["date"].min(), pd.Timestamp.now() - pd.Timedelta(days=30))
+
+    def test_uncovered_request_is_a_miss(self):
+        self.cache.save_oi_history(_oi_history(30), "A", 30, symbols=UNIVERSE[:2])
+        self.assertIsNone(self.cache.load_oi_history("A", 30, symbols=UNIVERSE))
+        self.assertIsNone(self.cache.load_oi_history("A", 60, symbols=UNIVERSE[:2]))
+        self.assertIsNone(self.cache.load_oi_history("H", 30))
+
+    def test_funding_subset_and_ttl(self):
+        rates = pd.DataFrame({"base": ["BTC", "ETH", "SOL"], "funding_rate": [0.01, 0.02, 0.03]})
+        self.cache.save_funding_rates(rates, "aggregated", symbols=UNIVERSE)
+        df = self.cache.load_funding_rates("aggregated", symbols=["ETH/USDC:USDC"])
+        self.assertEqual(list(df["base"]), ["ETH"])
+
+        path = self.cache._get_cache_path("funding_rates", "aggregated")
+        stale = (datetime.now() - timedelta(hours=9)).timestamp()
+        os.utime(path, (stale, stale))
+        self.assertIsNone(self.cache.load_funding_rates("aggregated", symbols=UNIVERSE))
+
+    def test_oi_invalidated_on_date_change(self):
+        """Entries written on a previous day are stale regardless of the TTL"""
+        self.cache.save_oi_history(_oi_history(5), "A", 5)
+        path = self.cache._get_cache_path("oi_history", "A_days5")
+        midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+        stamp = (midnight - timedelta(seconds=1)).timestamp()
+        os.utime(path, (stamp, stamp))
+        self.assertFalse(self.cache._is_oi_cache_valid(path))
+        self.assertIsNone(self.cache.load_oi_history("A", 5))
+
+    def test_clear_removes_files_and_index_entries(self):
+        self.cache.save_oi_history(_oi_history(5), "A", 5)
+        self.cache.save_funding_rates(pd.DataFrame({"base": ["BTC"]}), "H")
+        self.cache.clear_cache("oi_history")
+
+        funding = self.cache._get_cache_path("funding_rates", "H").name
+        self.assertEqual([f["name"] for f in self.cache.get_cache_info()["files"]], [funding])
+        self.assertEqual(list(self.cache._read_index()["entries"]), [funding])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Tests for the daily market cap expansion
+Tests: as-of join of supply snapshots onto daily prices, incremental extension
+with new snapshots, and the size and carry factor joins of the vectorized backtest
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add parent and backtest script directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backtests", "scripts"))
+
+from backtest_vectorized import prepare_factor_data
+from data.scripts.calculate_daily_market_cap import (
+    calculate_daily_market_cap,
+    merge_latest_snapshot,
+)
+from tests.helpers import quiet
+
+
+def _prices(start="2024-01-01", end="2024-04-30"):
+    dates = pd.date_range(start, end)
+    return pd.DataFrame(
+        [(d, f"{coin}/USD", float(k + 1)) for k, coin in enumerate(["BTC", "ETH"]) for d in dates],
+        columns=["date", "symbol", "close"],
+    )
+
+
+def _snapshots(months=("20240101", "20240201", "20240301", "20240401")):
+    rows = [(int(m), "BTC", 10.0 * (i + 1)) for i, m in enumerate(months)]
+    # ETH: listed from February, one snapshot without supply
+    rows += [(20240201, "ETH", 100.0), (20240301, "ETH", np.nan), (20240401, "ETH", 300.0)]
+    return pd.DataFrame(rows, columns=["snapshot_date", "Symbol", "Circulating Supply"])
+
+
+class TestMergeLatestSnapshot(unittest.TestCase):
+    """Test the as-of join"""
+
+    def test_latest_snapshot_on_or_before(self):
+        frame = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-05", "2024-01-01", "2024-02-10", "2024-02-10"]),
+                "symbol": ["A", "A", "A", "B"],
+            },
+            index=[10, 11, 12, 13],
+        )
+        snapshots = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-03", "2024-02-01", "2024-01-01"]),
+                "symbol": ["A", "A", "C"],
+                "supply": [1.0, 2.0, 9.0],
+            }
+        )
+        result = merge_latest_snapshot(frame, snapshots, by="symbol", columns=["supply"])
+
+        self.assertEqual(list(result.index), [10, 11, 12, 13])
+        np.testing.assert_array_equal(result["supply"], [1.0, np.nan, 2.0, np.nan])
+
+
+class TestCalculateDailyMarketCap(unittest.TestCase):
+    """Test the daily expansion and incremental extension"""
+
+    def test_supply_carried_between_snapshots(self):
+        result = quiet(calculate_daily_market_cap, _prices(), _snapshots())
+        btc = result[result["symbol"] == "BTC/USD"].set_index("date")["market_cap"]
+        eth = result[result["symbol"] == "ETH/USD"].set_index("date")["market_cap"]
+
+        self.assertEqual(btc[pd.Timestamp("2024-01-31")], 10.0)
+        self.assertEqual(btc[pd.Timestamp("2024-02-01")], 20.0)
+        self.assertEqual(eth.index.min(), pd.Timestamp("2024-02-01"))
+        # The snapshot without supply carries February's value forward
+        self.assertEqual(eth[pd.Timestamp("2024-03-15")], 200.0)
+        self.assertEqual(eth[pd.Timestamp("2024-04-01")], 600.0)
+
+    def test_extension_matches_full_recompute(self):
+        """A new monthly snapshot and new price days only recompute from the snapshot"""
+        march = quiet(
+            calculate_daily_market_cap,
+            _prices(end="2024-04-10"),
+            _snapshots()[lambda df: df["snapshot_date"] < 20240401],
+        )
+        extended = quiet(calculate_daily_market_cap, _prices(), _snapshots(), existing=march)
+        full = quiet(calculate_daily_market_cap, _prices(), _snapshots())
+
+        def ordered(df):
+            return df.sort_values(["date", "symbol"]).reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(ordered(extended), ordered(full), check_dtype=False)
+
+    def test_extension_after_several_snapshots(self):
+        """Rows after the first snapshot the existing output never saw are recomputed"""
+        february = quiet(
+            calculate_daily_market_cap,
+            _prices(end="2024-04-10"),
+            _snapshots()[lambda df: df["snapshot_date"] < 20240301],
+        )
+        extended = quiet(calculate_daily_market_cap, _prices(), _snapshots(), existing=february)
+        full = quiet(calculate_daily_market_cap, _prices(), _snapshots())
+
+        def ordered(df):
+            return df.sort_values(["date", "symbol"]).reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(ordered(extended), ordered(full), check_dtype=False)
+
+        # Outputs written before snapshot dates were recorded are recomputed in full
+        legacy = february.drop(columns="snapshot_date")
+        rebuilt = quiet(calculate_daily_market_cap, _prices(), _snapshots(), existing=legacy)
+        pd.testing.assert_frame_equal(ordered(rebuilt), ordered(full), check_dtype=False)
+
+
+class TestSizeFactorData(unittest.TestCase):
+    """Test the size and carry joins of prepare_factor_data"""
+
+    def test_market_cap_as_of_price_dates(self):
+        prices = _prices().assign(symbol=lambda df: df["symbol"].str.split("/").str[0])
+        marketcap = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-10", "2024-02-01", "2024-03-01"]),
+                "symbol": ["BTC", "BTC", "ETH"],
+                "market_cap": [1.0, 2.0, 3.0],
+            }
+        )
+        result = prepare_factor_data(prices, "size", marketcap_data=marketcap)
+
+        self.assertEqual(result["date"].min(), pd.Timestamp("2024-01-10"))
+        by_date = result.set_index(["symbol", "date"])["market_cap"]
+        self.assertEqual(by_date[("BTC", pd.Timestamp("2024-01-31"))], 1.0)
+        self.assertEqual(by_date[("BTC", pd.Timestamp("2024-04-30"))], 2.0)
+        self.assertEqual(by_date.loc["ETH"].index.min(), pd.Timestamp("2024-03-01"))
+
+    def test_carry_joins_on_asset_ids(self):
+        """Funding keyed by trading pair joins price rows keyed by base asset"""
+        prices = _prices(end="2024-01-03").assign(symbol=lambda df: df["symbol"].str[:3])
+        funding = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-02", "2024-01-02"]),
+                "symbol": ["ETH/USDC:USDC", "SOL/USDC:USDC"],
+                "funding_rate": [0.01, 0.02],
+            }
+        )
+        result = prepare_factor_data(prices, "carry", funding_data=funding)
+
+        self.assertEqual(list(result["symbol"]), ["ETH"])
+        self.assertEqual(result["funding_rate"].iloc[0], 0.01)
+        self.assertTrue(pd.api.types.is_integer_dtype(result["asset_id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
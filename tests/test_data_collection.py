@@ -1,13 +1,16 @@
 """
 Tests for Data Collection Functions
-Tests: ccxt, coinalyze, and coinmarketcap data collection
+Tests: ccxt, coinalyze (client, rate limiting, batched history), and coinmarketcap
+data collection
 """
 
+import asyncio
 import unittest
 import sys
 import os
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
 # Add parent directory to path
@@ -15,12 +18,19 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 # Import data collection modules
 from data.scripts.ccxt_get_data import ccxt_fetch_hyperliquid_daily_data
-from data.scripts.coinalyze_client import CoinalyzeClient
+from data.scripts import coinalyze_client
+from data.scripts.coinalyze_client import (
+    CoinalyzeClient,
+    GlobalRateLimiter,
+    fetch_history_batched,
+    plan_history_requests,
+)
 from data.scripts.fetch_coinmarketcap_data import (
     fetch_coinmarketcap_data,
     fetch_mock_marketcap_data,
     map_symbols_to_trading_pairs,
 )
+from tests.helpers import FakeClock
 
 
 class TestCCXTDataCollection(unittest.TestCase):
@@ -150,6 +160,114 @@ class TestCCXTDataCollection(unittest.TestCase):
         self.assertIsInstance(result, pd.DataFrame)
         self.assertEqual(len(result), 1)
 
+    @patch("ccxt.hyperliquid")
+    @patch("time.sleep")
+    def test_ccxt_fetch_concurrent_matches_sequential(self, mock_sleep, mock_exchange_class):
+        """Thread-pooled fetch returns the same frame and paces by weight, not fixed delay"""
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.parse8601.return_value = int(datetime.now().timestamp() * 1000)
+
+        past = [datetime.now() - timedelta(days=d) for d in (3, 2)]
+
+        def fake_ohlcv(symbol, timeframe, since, limit):
+            base = {"BTC/USDC:USDC": 100, "ETH/USDC:USDC": 10, "SOL/USDC:USDC": 1}[symbol]
+            return [[int(d.timestamp() * 1000), base, base + 1, base - 1, base, 5] for d in past]
+
+        mock_exchange.fetch_ohlcv.side_effect = fake_ohlcv
+        symbols = ["SOL/USDC:USDC", "BTC/USDC:USDC", "ETH/USDC:USDC"]
+
+        sequential = ccxt_fetch_hyperliquid_daily_data(symbols=symbols, days=5, verbose=False)
+        limiter = MagicMock()
+        concurrent = ccxt_fetch_hyperliquid_daily_data(
+            symbols=symbols, days=5, max_workers=3, verbose=False, rate_limiter=limiter
+        )
+
+        pd.testing.assert_frame_equal(sequential, concurrent)
+        self.assertEqual(len(concurrent), 6)
+        # One weighted acquire per symbol (20 + 1 per 60 candles), no fixed delays
+        self.assertEqual(limiter.acquire.call_count, 3)
+        limiter.acquire.assert_called_with(21)
+        self.assertEqual(mock_exchange_class.call_args[0][0]["enableRateLimit"], False)
+
+    @patch("ccxt.hyperliquid")
+    @patch("time.sleep")
+    def test_ccxt_fetch_rate_limit_backs_off_once(self, mock_sleep, mock_exchange_class):
+        """With a shared limiter a 429 penalizes the limiter instead of also sleeping"""
+        import ccxt
+
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.parse8601.return_value = int(datetime.now().timestamp() * 1000)
+        past_date = datetime.now() - timedelta(days=2)
+        mock_exchange.fetch_ohlcv.side_effect = [
+            ccxt.RateLimitExceeded("429"),
+            [[int(past_date.timestamp() * 1000), 100, 110, 95, 105, 1000]],
+        ]
+        limiter = MagicMock()
+
+        result = ccxt_fetch_hyperliquid_daily_data(
+            symbols=["BTC/USDC:USDC"], days=5, verbose=False, rate_limiter=limiter
+        )
+
+        self.assertEqual(len(result), 1)
+        limiter.penalize.assert_called_once_with(2)
+        mock_sleep.assert_not_called()
+
+    @patch("ccxt.hyperliquid")
+    @patch("time.sleep")
+    def test_ccxt_fetch_concurrent_retries_per_symbol(self, mock_sleep, mock_exchange_class):
+        """A transient error on one symbol is retried without affecting the others"""
+        import ccxt
+
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.parse8601.return_value = int(datetime.now().timestamp() * 1000)
+
+        past_date = datetime.now() - timedelta(days=2)
+        failures = {"ETH/USDC:USDC": 1, "SOL/USDC:USDC": 5}
+
+        def fake_ohlcv(symbol, timeframe, since, limit):
+            if failures.get(symbol, 0) > 0:
+                failures[symbol] -= 1
+                raise ccxt.NetworkError("timeout")
+            return [[int(past_date.timestamp() * 1000), 100, 110, 95, 105, 1000]]
+
+        mock_exchange.fetch_ohlcv.side_effect = fake_ohlcv
+
+        result = ccxt_fetch_hyperliquid_daily_data(
+            symbols=["BTC/USDC:USDC", "ETH/USDC:USDC", "SOL/USDC:USDC"],
+            days=5,
+            max_retries=3,
+            max_workers=3,
+            verbose=False,
+        )
+
+        # ETH recovers after one retry; SOL exhausts its retries and is skipped
+        self.assertEqual(sorted(result["symbol"]), ["BTC/USDC:USDC", "ETH/USDC:USDC"])
+        self.assertIn(unittest.mock.call(2), mock_sleep.call_args_list)
+
+    @patch("ccxt.hyperliquid")
+    def test_ccxt_fetch_quiet_mode(self, mock_exchange_class):
+        """verbose=False suppresses the per-symbol table dumps"""
+        import io
+        from contextlib import redirect_stdout
+
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.parse8601.return_value = int(datetime.now().timestamp() * 1000)
+        past_date = datetime.now() - timedelta(days=2)
+        mock_exchange.fetch_ohlcv.return_value = [
+            [int(past_date.timestamp() * 1000), 100, 110, 95, 105, 1000]
+        ]
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            ccxt_fetch_hyperliquid_daily_data(symbols=["BTC/USDC:USDC"], days=5, verbose=False)
+
+        self.assertNotIn("Summary for", out.getvalue())
+        self.assertEqual(out.getvalue().strip().count("\n"), 0)
+
 
 class TestCoinalyzeClient(unittest.TestCase):
     """Test Coinalyze API client functions"""
@@ -177,6 +295,14 @@ class TestCoinalyzeClient(unittest.TestCase):
         self.assertEqual(client.api_key, "test_key")
         self.assertIsNotNone(client.session)
 
+    def test_session_per_thread(self):
+        """Each thread gets its own requests.Session; a thread reuses its own"""
+        client = CoinalyzeClient(api_key="test_key")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            other = pool.submit(lambda: client.session).result()
+        self.assertIs(client.session, client.session)
+        self.assertIsNot(client.session, other)
+
     @patch("requests.Session.get")
     def test_get_exchanges_returns_data(self, mock_get):
         """Test that get_exchanges returns exchange data"""
@@ -223,6 +349,118 @@ class TestCoinalyzeClient(unittest.TestCase):
             self.assertIn("history", result[0])
 
 
+def _response(status, headers=None):
+    response = MagicMock(status_code=status, headers=headers or {})
+    response.json.return_value = []
+    return response
+
+
+class TestCoinalyzeRateLimiting(unittest.TestCase):
+    """Test the per-key sliding window, key rotation and 429 handling"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = GlobalRateLimiter(40, clock=self.clock, sleep=self.clock.sleep)
+        patcher = patch.object(coinalyze_client, "_global_rate_limiter", self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_paced(self):
+        """An idle key makes 40 calls at once, the 41st waits for the window to roll"""
+        waits = [self.limiter.wait("k") for _ in range(41)]
+        self.assertEqual(waits[:40], [0.0] * 40)
+        self.assertAlmostEqual(waits[40], 60.0)
+        self.assertEqual(self.limiter.wait("other"), 0.0)
+
+    def test_sustained_rate_is_limit(self):
+        """Over 5 simulated minutes a busy key sustains 40 calls per minute"""
+        times = []
+        while self.clock.now < 300:
+            self.limiter.wait("k")
+            times.append(self.clock.now)
+        self.assertEqual(sum(t < 300 for t in times), 200)
+
+    def test_no_minute_exceeds_limit(self):
+        """Any 60s window holds at most 40 calls, including the first one"""
+        times = []
+        for _ in range(200):
+            self.limiter.wait("k")
+            times.append(self.clock.now)
+
+        in_window = [sum(start <= t < start + 60 for t in times) for start in times]
+        self.assertLessEqual(max(in_window), 40)
+
+    @patch("requests.Session.get")
+    def test_keys_rotate_round_robin(self, mock_get):
+        mock_get.return_value = _response(200)
+        client = CoinalyzeClient(api_keys=["k1", "k2"])
+        for _ in range(4):
+            client.get_exchanges()
+        keys = [call.kwargs["headers"]["api_key"] for call in mock_get.call_args_list]
+        self.assertEqual(keys, ["k1", "k2", "k1", "k2"])
+
+        with patch.dict(os.environ, {"COINALYZE_API": "a, b"}):
+            self.assertEqual(CoinalyzeClient().api_keys, ["a", "b"])
+
+    @patch("requests.Session.get")
+    def test_retry_after_debits_bucket(self, mock_get):
+        """A 429 stalls the key for Retry-After seconds before the retry"""
+        mock_get.side_effect = [_response(429, {"Retry-After": "30"}), _response(200)]
+        client = CoinalyzeClient(api_key="k")
+        self.assertEqual(client.get_exchanges(), [])
+        self.assertGreaterEqual(self.clock.now, 30.0)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("requests.Session.get")
+    def test_async_requests(self, mock_get):
+        mock_get.return_value = _response(200)
+        client = CoinalyzeClient(api_key="k")
+
+        async def run():
+            return await asyncio.gather(*(client.request_async("exchanges") for _ in range(3)))
+
+        self.assertEqual(asyncio.run(run()), [(True, [])] * 3)
+
+
+class TestBatchedHistory(unittest.TestCase):
+    """Test batching of Coinalyze history requests"""
+
+    def test_plan_chunks_symbols_and_windows(self):
+        """45 symbols over 12000 days: 3 symbol chunks x 3 windows of 5000 days"""
+        symbols = [f"C{i}USDT_PERP.A" for i in range(45)]
+        plan = plan_history_requests(symbols, "daily", 0, 12000 * 86400 - 1)
+
+        self.assertEqual(len(plan), 9)
+        self.assertEqual([len(p[0].split(",")) for p in plan[::3]], [20, 20, 5])
+        self.assertEqual(plan[1][1:], (5000 * 86400, 10000 * 86400 - 1))
+        self.assertEqual(plan[2][2], 12000 * 86400 - 1)
+
+    def test_fetch_merges_windows_and_reports_failures(self):
+        """Windows are merged per symbol; symbols of a failed request are omitted"""
+        client = MagicMock()
+
+        def history(symbols, interval, from_ts, to_ts, convert_to_usd):
+            if "BAD" in symbols:
+                return None
+            return [
+                {"symbol": s, "history": [{"t": from_ts, "c": 1.0}, {"t": to_ts, "c": 2.0}]}
+                for s in symbols.split(",")
+                if s != "EMPTY"
+            ]
+
+        client.get_open_interest_history.side_effect = history
+        symbols = ["BTC"] * 2 + ["EMPTY"] + [f"X{i}" for i in range(18)] + ["BAD"]
+        end = 3 * 86400 - 1
+        result = fetch_history_batched(
+            client, "open_interest", symbols, "daily", 0, end, max_points=2, convert_to_usd=True
+        )
+
+        self.assertEqual(client.get_open_interest_history.call_count, 4)
+        self.assertEqual([p["t"] for p in result["BTC"]], [0, 2 * 86400 - 1, 2 * 86400, end])
+        self.assertEqual(result["EMPTY"], [])
+        self.assertNotIn("BAD", result)
+
+
 class TestCoinMarketCapDataCollection(unittest.TestCase):
     """Test CoinMarketCap data collection functions"""
 
@@ -0,0 +1,141 @@
+"""
+Tests for the Exchange Session Pool
+Tests: one client per account, markets TTL, credential handling and
+injection into the execution helpers
+"""
+
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch, MagicMock
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+import exchange_session
+from exchange_session import ExchangeSessionPool
+
+
+class TestExchangeSessionPool(unittest.TestCase):
+    """Test client reuse and market loading"""
+
+    @patch("ccxt.hyperliquid")
+    def test_one_client_per_account(self, mock_exchange_class):
+        """Repeat lookups reuse the client; other accounts get their own"""
+        mock_exchange_class.side_effect = lambda config: MagicMock(config=config)
+        pool = ExchangeSessionPool()
+
+        first = pool.get("wallet", "secret")
+        again = pool.get("wallet", "secret")
+        other = pool.get("wallet2", "secret2")
+        public = pool.get()
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        self.assertEqual(mock_exchange_class.call_count, 3)
+        self.assertEqual(first.config["walletAddress"], "wallet")
+        self.assertNotIn("privateKey", public.config)
+
+    @patch("ccxt.hyperliquid")
+    @patch("exchange_session.time.time")
+    def test_markets_loaded_once_then_refreshed(self, mock_time, mock_exchange_class):
+        """load_markets runs on first use and again only after the TTL"""
+        client = MagicMock()
+        mock_exchange_class.return_value = client
+        pool = ExchangeSessionPool(markets_ttl=60)
+
+        mock_time.return_value = 1000.0
+        pool.get("wallet", "secret")
+        mock_time.return_value = 1030.0
+        pool.get("wallet", "secret")
+        self.assertEqual(client.load_markets.call_count, 1)
+
+        mock_time.return_value = 1100.0
+        pool.get("wallet", "secret")
+        self.assertEqual(client.load_markets.call_count, 2)
+        client.load_markets.assert_called_with(reload=True)
+
+    @patch("ccxt.hyperliquid")
+    def test_slow_market_load_does_not_block_other_accounts(self, mock_exchange_class):
+        """A client loading markets holds only its own lock, not the pool's"""
+        release = threading.Event()
+        started = threading.Event()
+
+        def make_client(config):
+            client = MagicMock(config=config)
+            if config.get("walletAddress") == "slow":
+                client.load_markets.side_effect = lambda reload: (started.set(), release.wait(5))
+            return client
+
+        mock_exchange_class.side_effect = make_client
+        pool = ExchangeSessionPool()
+        slow = threading.Thread(target=pool.get, args=("slow", "secret"))
+        slow.start()
+        try:
+            self.assertTrue(started.wait(5))
+            self.assertEqual(pool.get("fast", "secret").config["walletAddress"], "fast")
+            self.assertTrue(slow.is_alive())
+        finally:
+            release.set()
+            slow.join()
+
+    @patch("ccxt.hyperliquid")
+    def test_market_load_failure_is_not_fatal(self, mock_exchange_class):
+        """A failed market load still returns the client and retries next time"""
+        client = MagicMock()
+        client.load_markets.side_effect = [Exception("timeout"), {}]
+        mock_exchange_class.return_value = client
+        pool = ExchangeSessionPool()
+
+        self.assertIs(pool.get(), client)
+        pool.get()
+        self.assertEqual(client.load_markets.call_count, 2)
+
+    def test_get_exchange_requires_credentials(self):
+        """get_exchange raises ValueError without HL_API / HL_SECRET"""
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                exchange_session.get_exchange()
+
+
+class TestExchangeInjection(unittest.TestCase):
+    """Test that execution helpers use the injected client"""
+
+    def test_modify_order_with_known_state_is_one_round_trip(self):
+        """modify_order skips fetch_order when the order state is passed in"""
+        from modify_order import modify_order
+
+        exchange = MagicMock()
+        exchange.edit_order.return_value = {"id": "2", "price": 101.0, "amount": 1.0, "status": "open"}
+        order = {"id": "1", "side": "buy", "price": 100.0, "amount": 1.0, "status": "open"}
+
+        result = modify_order("1", "BTC/USDC:USDC", new_price=101.0, exchange=exchange, existing_order=order)
+
+        exchange.fetch_order.assert_not_called()
+        exchange.edit_order.assert_called_once()
+        self.assertEqual(exchange.edit_order.call_args.kwargs["price"], 101.0)
+        self.assertEqual(result["id"], "2")
+
+    @patch("ccxt.hyperliquid")
+    @patch.dict(os.environ, {"HL_API": "pool_api", "HL_SECRET": "pool_secret"})
+    def test_helpers_share_pooled_client(self, mock_exchange_class):
+        """Balance and position helpers reuse one pooled client"""
+        from ccxt_get_balance import ccxt_get_hyperliquid_balance
+        from ccxt_get_positions import ccxt_get_positions
+
+        client = MagicMock()
+        client.walletAddress = "pool_api"
+        client.fetch_positions.return_value = []
+        mock_exchange_class.return_value = client
+
+        ccxt_get_hyperliquid_balance()
+        ccxt_get_positions()
+
+        self.assertEqual(mock_exchange_class.call_count, 1)
+        client.fetch_balance.assert_any_call({"user": "pool_api", "type": "swap"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,284 @@
+"""
+Tests for the execution simulator
+Tests: queue-position fill model, virtual-time replay of the asyncio engine,
+book loading from recordings and liquidity snapshots, and parameter sweeps
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+from execution_simulator import (
+    BookTimeline,
+    SimulatedExchange,
+    VirtualClock,
+    load_book_timeline,
+    simulate_rebalance,
+    sweep_parameters,
+)
+from market_data import MarketDataFeed, ReplaySource
+
+BTC = "BTC/USDC:USDC"
+START = 1_700_000_000.0
+
+
+def _timeline(bid_sizes, bid=100.0, ask=100.1, step=1.0):
+    """One symbol whose best bid size follows bid_sizes (one book per step seconds)"""
+    books = [([(bid, size), (99.9, 10.0)], [(ask, 5.0), (100.2, 10.0)]) for size in bid_sizes]
+    return BookTimeline({BTC: ([START + i * step for i in range(len(books))], books)})
+
+
+def _place(exchange, side, amount, price):
+    request = {"symbol": BTC, "side": side, "amount": amount, "price": price}
+    return asyncio.run(exchange.create_orders([request]))[0]
+
+
+class TestQueueFillModel(unittest.TestCase):
+    """Test fills of resting and marketable orders"""
+
+    def test_passive_order_waits_for_queue_ahead(self):
+        """A bid behind 4 units fills only after 4 units traded at its level"""
+        clock = VirtualClock(START)
+        exchange = SimulatedExchange(_timeline([4.0, 2.0, 6.0, 1.0]), clock, trade_fraction=1.0)
+        order = _place(exchange, "buy", 1.0, 100.0)
+        self.assertEqual(order["remaining"], 1.0)
+
+        # 2 traded, then size added behind us
+        clock.elapsed = 2.0
+        exchange.advance()
+        self.assertEqual(exchange.fills, [])
+
+        clock.elapsed = 3.0
+        exchange.advance()
+        self.assertEqual(len(exchange.fills), 1)
+        self.assertEqual(exchange.fills[0]["price"], 100.0)
+        self.assertFalse(exchange.fills[0]["taker"])
+        self.assertEqual(asyncio.run(exchange.fetch_open_orders()), [])
+
+    def test_cancellations_only_advance_queue(self):
+        """With trade_fraction=0 a shrinking level never fills the order"""
+        clock = VirtualClock(START)
+        exchange = SimulatedExchange(_timeline([4.0, 0.5, 0.0]), clock, trade_fraction=0.0)
+        _place(exchange, "buy", 1.0, 100.0)
+
+        clock.elapsed = 2.0
+        exchange.advance()
+        self.assertEqual(exchange.fills, [])
+        self.assertEqual(len(exchange.orders), 1)
+
+    def test_level_leaving_view_is_not_traded(self):
+        """A bid level that drops out behind a better best bid does not fill the order"""
+        clock = VirtualClock(START)
+        books = [
+            ([(100.0, 10.0)], [(100.5, 5.0)]),
+            ([(100.0, 30.0)], [(100.5, 5.0)]),
+            ([(101.0, 10.0)], [(102.0, 5.0)]),
+        ]
+        timeline = BookTimeline({BTC: ([START, START + 1.0, START + 2.0], books)})
+        exchange = SimulatedExchange(timeline, clock, trade_fraction=1.0)
+        _place(exchange, "buy", 5.0, 100.0)
+
+        clock.elapsed = 2.0
+        exchange.advance()
+        self.assertEqual(exchange.fills, [])
+        self.assertEqual(len(exchange.orders), 1)
+
+    def test_marketable_order_takes_levels(self):
+        """A buy through the ask fills as taker, level by level up to its limit"""
+        exchange = SimulatedExchange(_timeline([4.0]), VirtualClock(START))
+        order = _place(exchange, "buy", 8.0, 100.2)
+
+        fills = [(f["price"], f["amount"]) for f in exchange.fills]
+        self.assertEqual(fills, [(100.1, 5.0), (100.2, 3.0)])
+        self.assertTrue(all(f["taker"] for f in exchange.fills))
+        self.assertEqual(order["status"], "closed")
+
+    def test_improving_order_is_first_in_queue(self):
+        """A bid above the best bid has no queue ahead"""
+        clock = VirtualClock(START)
+        exchange = SimulatedExchange(_timeline([4.0, 4.0]), clock)
+        _place(exchange, "buy", 1.0, 100.05)
+        self.assertEqual(next(iter(exchange.orders.values()))["queue_ahead"], 0.0)
+
+    def test_book_moving_through_resting_bid_fills_as_maker(self):
+        """A later book whose ask crosses a resting bid fills it at its limit as maker"""
+        clock = VirtualClock(START)
+        first = ([(100.0, 4.0)], [(100.1, 5.0)])
+        crossed = ([(99.8, 4.0)], [(99.9, 2.0), (100.0, 3.0)])
+        timeline = BookTimeline({BTC: ([START, START + 1.0], [first, crossed])})
+        exchange = SimulatedExchange(timeline, clock)
+        _place(exchange, "buy", 4.0, 100.0)
+        self.assertEqual(exchange.fills, [])
+
+        clock.elapsed = 1.0
+        exchange.advance()
+        self.assertEqual(len(exchange.fills), 1)
+        fill = exchange.fills[0]
+        self.assertIs(fill["taker"], False)
+        self.assertEqual(fill["price"], 100.0)
+        self.assertEqual(fill["amount"], 4.0)
+
+    def test_taken_level_is_not_filled_again(self):
+        """Size taken from a level stays taken while the recorded book still shows it"""
+        clock = VirtualClock(START)
+        exchange = SimulatedExchange(_timeline([4.0] * 5), clock)
+        _place(exchange, "buy", 8.0, 100.1)
+        self.assertEqual(sum(f["amount"] for f in exchange.fills), 5.0)
+
+        clock.elapsed = 4.0
+        exchange.advance()
+        _place(exchange, "buy", 8.0, 100.1)
+        self.assertEqual(sum(f["amount"] for f in exchange.fills), 5.0)
+
+    def test_edit_replaces_only_the_remainder(self):
+        """An edit arriving after a partial fill does not reopen the filled size"""
+        exchange = SimulatedExchange(_timeline([4.0]), VirtualClock(START))
+        order = _place(exchange, "buy", 8.0, 100.1)
+        request = {"id": order["id"], "symbol": BTC, "side": "buy", "amount": 8.0, "price": 100.05}
+
+        edited = asyncio.run(exchange.edit_orders([request]))[0]
+
+        self.assertEqual(edited["amount"], 3.0)
+
+
+class TestSimulateRebalance(unittest.TestCase):
+    """Test the asyncio engine replayed in virtual time"""
+
+    def setUp(self):
+        # Best bid queue drains by 1 unit per second
+        self.timeline = _timeline([max(20.0 - i, 0.0) for i in range(200)])
+
+    def test_ladder_run_is_virtual_and_deterministic(self):
+        """A 75s rebalance replays instantly with identical results"""
+        params = {"tick_interval": 2.0, "max_time": 60, "cross_spread_wait": 15}
+        first = simulate_rebalance(self.timeline, {BTC: 500.0}, START, params)
+        second = simulate_rebalance(self.timeline, {BTC: 500.0}, START, params)
+
+        self.assertEqual(first, second)
+        self.assertGreater(first["fill_rate"], 0.9)
+        self.assertLessEqual(first["elapsed_time"], 75.0)
+
+    def test_patient_mode(self):
+        """Patient orders rest at spread offsets for the horizon"""
+        result = simulate_rebalance(
+            self.timeline, {BTC: 500.0}, START, {"patient": 1.0, "horizon": 100}
+        )
+        self.assertEqual(result["elapsed_time"], 100)
+        self.assertEqual(result["requests"], 2)
+
+    def test_order_filled_during_cancel_is_not_recrossed(self):
+        """The lone cancel at the deadline is rejected because the order filled meanwhile"""
+        times = [START + i * 0.25 for i in range(200)]
+        # No size at the ask until the book sweeps through the order at +10.5s,
+        # after the deadline poll but before the cancel lands (1s latency)
+        books = [
+            ([(100.0, 4.0)], [(99.0, 100.0)] if t >= START + 10.5 else [(101.0, 0.0)])
+            for t in times
+        ]
+        timeline = BookTimeline({BTC: (times, books)})
+        params = {"tick_interval": 2.0, "max_time": 10, "cross_spread_wait": 5}
+
+        result = simulate_rebalance(timeline, {BTC: 500.0}, START, params, latency=1.0)
+
+        # Only the original order (sized at last + 2 * spread) filled, once, as maker
+        # at its last ladder limit of 101.476 rather than the crossing ask
+        self.assertAlmostEqual(result["fill_rate"], 101.476 / 102.5)
+        self.assertEqual(result["maker_share"], 1.0)
+
+    def test_static_book_fill_rate_is_at_most_one(self):
+        """A book that never changes cannot fill more than is displayed or targeted"""
+        times = [START + i for i in range(60)]
+        book = ([(10.0, 100.0)], [(10.1, 3.0), (10.5, 100.0)])
+        timeline = BookTimeline({BTC: (times, [book] * len(times))})
+        params = {"tick_interval": 1.0, "max_time": 20, "cross_spread_wait": 5}
+
+        result = simulate_rebalance(timeline, {BTC: 100.0}, START, params)
+
+        self.assertLessEqual(result["fill_rate"], 1.0)
+        # Only the 3 units displayed at 10.1 are reachable below the 10.25 limit
+        self.assertAlmostEqual(result["fill_rate"], 3.0 * 10.1 / 100.0)
+
+    def test_unknown_parameter_rejected(self):
+        with self.assertRaises(ValueError):
+            simulate_rebalance(self.timeline, {BTC: 500.0}, START, {"tick": 1.0})
+
+
+class TestBookSources(unittest.TestCase):
+    """Test loading recorded books"""
+
+    def test_feed_recording(self):
+        """Books replayed from a MarketDataFeed recording"""
+        messages = [
+            {"channel": "book", "symbol": BTC, "bids": [[100.0, 1.0]], "asks": [[100.1, 2.0]]},
+            {"channel": "book", "symbol": BTC, "bids": [[100.05, 3.0]], "asks": [[100.1, 2.0]]},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.jsonl")
+            MarketDataFeed(ReplaySource(messages), record_path=path).run()
+            timeline = load_book_timeline(path)
+
+        self.assertEqual(timeline.symbols, [BTC])
+        self.assertEqual(timeline.book_at(BTC, timeline.end)[0], [(100.05, 3.0)])
+
+    def test_liquidity_snapshots(self):
+        """Summary rows become a best level plus the remaining depth"""
+        df = pd.DataFrame(
+            {
+                "symbol": [BTC, BTC],
+                "timestamp": ["2025-01-01 00:00:00", "2025-01-01 00:05:00"],
+                "best_bid": [100.0, 101.0],
+                "best_ask": [100.1, 101.1],
+                "best_bid_size": [1.0, 1.0],
+                "best_ask_size": [2.0, 2.0],
+                "avg_bid_price": [99.5, 100.5],
+                "avg_ask_price": [100.6, 101.6],
+                "total_bid_size": [5.0, 5.0],
+                "total_ask_size": [2.0, 2.0],
+            }
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "liquidity_snapshots.csv")
+            df.to_csv(path, index=False)
+            timeline = load_book_timeline(path)
+
+        self.assertEqual(timeline.end - timeline.start, 300.0)
+        bids, asks = timeline.book_at(BTC, timeline.start)
+        self.assertEqual(bids, [(100.0, 1.0), (99.5, 4.0)])
+        self.assertEqual(asks, [(100.1, 2.0)])
+
+
+class TestSweep(unittest.TestCase):
+    """Test parameter sweeps over start times in worker processes"""
+
+    def test_sweep_summary(self):
+        books = [
+            {
+                "channel": "book",
+                "symbol": BTC,
+                "received_at": START + i,
+                "bids": [[100.0, max(20.0 - i, 0.1)]],
+                "asks": [[100.1, 5.0]],
+            }
+            for i in range(120)
+        ]
+        grid = {"tick_interval": [1.0, 2.0], "ladder_step": [0.2, 0.5]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.jsonl")
+            pd.DataFrame(books).to_json(path, orient="records", lines=True)
+            runs, summary = sweep_parameters(path, {BTC: 500.0}, grid, starts=3, processes=2)
+
+        self.assertEqual(len(runs), 12)
+        self.assertEqual(len(summary), 4)
+        self.assertTrue({"tick_interval", "ladder_step", "fill_rate"} <= set(summary.columns))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+"""
+Tests for the account-wide Fill Tracker
+Tests: open/partial/closed/canceled diffing, fill de-duplication and
+request count per poll
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+from fill_tracker import FillTracker, FILL_LOOKBACK_MS
+from tests.helpers import FakeClock
+
+SYMBOLS = [f"COIN{i}/USDC:USDC" for i in range(50)]
+
+
+def _resting(order_id, amount, remaining, price):
+    return {
+        "id": order_id,
+        "amount": amount,
+        "remaining": remaining,
+        "filled": amount - remaining,
+        "price": price,
+    }
+
+
+def _fill(trade_id, order_id, amount, price):
+    return {"id": trade_id, "order": order_id, "amount": amount, "price": price}
+
+
+class TestFillTracker(unittest.TestCase):
+    """Test diffing tracked orders against open orders and fills"""
+
+    def setUp(self):
+        self.exchange = MagicMock()
+        self.exchange.fetch_open_orders.return_value = []
+        self.exchange.fetch_my_trades.return_value = []
+        self.now = 1_700_000_000.0
+        self.tracker = FillTracker(self.exchange, clock=lambda: self.now)
+
+    def test_two_requests_per_poll(self):
+        """Polling 50 orders costs one open-orders and one fills request"""
+        for i, symbol in enumerate(SYMBOLS):
+            self.tracker.track(symbol, str(i), "buy", 1.0, 10.0)
+        self.exchange.fetch_open_orders.return_value = [
+            _resting(str(i), 1.0, 1.0, 10.0) for i in range(len(SYMBOLS))
+        ]
+
+        statuses = self.tracker.poll()
+
+        self.assertEqual(len(statuses), 50)
+        self.assertEqual(self.exchange.fetch_open_orders.call_count, 1)
+        self.assertEqual(self.exchange.fetch_my_trades.call_count, 1)
+        self.exchange.fetch_order.assert_not_called()
+        self.assertEqual(self.tracker.requests_sent, 2)
+
+    def test_partial_fill_from_book(self):
+        """A resting order reports filled/remaining/price from the open-orders book"""
+        self.tracker.track("BTC/USDC:USDC", 7, "buy", 0.3, 100.0)
+        self.exchange.fetch_open_orders.return_value = [_resting("7", 0.3, 0.1, 101.0)]
+        self.exchange.fetch_my_trades.return_value = [_fill("t1", "7", 0.2, 100.5)]
+
+        status = self.tracker.poll()["BTC/USDC:USDC"]
+
+        self.assertEqual(status["status"], "open")
+        self.assertAlmostEqual(status["filled"], 0.2)
+        self.assertAlmostEqual(status["remaining"], 0.1)
+        self.assertEqual(status["price"], 101.0)
+        self.assertEqual(status["side"], "buy")
+        self.assertAlmostEqual(status["average"], 100.5)
+
+    def test_closed_when_fills_cover_amount(self):
+        """A vanished order whose fills cover its size is closed; fills are de-duplicated"""
+        self.tracker.track("ETH/USDC:USDC", "9", "sell", 2.0, 10.0)
+        self.exchange.fetch_my_trades.return_value = [_fill("a", "9", 1.5, 10.0)]
+        self.tracker.poll()
+
+        # Overlapping fill windows return the first fill again
+        self.exchange.fetch_my_trades.return_value = [
+            _fill("a", "9", 1.5, 10.0),
+            _fill("b", "9", 0.5, 9.9),
+        ]
+        status = self.tracker.poll()["ETH/USDC:USDC"]
+
+        self.assertEqual(status["status"], "closed")
+        self.assertAlmostEqual(status["filled"], 2.0)
+        self.assertEqual(status["remaining"], 0.0)
+
+    def test_missing_without_fills_becomes_canceled(self):
+        """An order gone without fills is given one poll of grace before canceled"""
+        self.tracker.track("SOL/USDC:USDC", "3", "buy", 1.0, 50.0)
+
+        self.assertEqual(self.tracker.poll()["SOL/USDC:USDC"]["status"], "open")
+        self.assertEqual(self.tracker.poll()["SOL/USDC:USDC"]["status"], "canceled")
+
+    def test_filled_at_placement_is_not_canceled(self):
+        """An order filled before the first fill window keeps its placement fill"""
+        self.tracker.track("SOL/USDC:USDC", "4", "buy", 1.0, 50.0, filled=1.0, status="closed")
+
+        status = self.tracker.poll()["SOL/USDC:USDC"]
+
+        self.assertEqual(status["status"], "closed")
+        self.assertEqual(status["filled"], 1.0)
+        self.assertEqual(status["remaining"], 0.0)
+
+    def test_replacement_keeps_prior_fills(self):
+        """An order replacing a partial fill reports the symbol's total amount and fills"""
+        self.tracker.track("BTC/USDC:USDC", "8", "buy", 0.1, 101.0, prior_filled=0.2)
+        self.exchange.fetch_open_orders.return_value = [_resting("8", 0.1, 0.1, 101.0)]
+
+        status = self.tracker.poll()["BTC/USDC:USDC"]
+        self.assertAlmostEqual(status["amount"], 0.3)
+        self.assertAlmostEqual(status["filled"], 0.2)
+        self.assertAlmostEqual(status["remaining"], 0.1)
+        self.assertNotIn("prior_filled", status)
+
+        self.exchange.fetch_open_orders.return_value = []
+        self.exchange.fetch_my_trades.return_value = [_fill("c", "8", 0.1, 101.0)]
+        status = self.tracker.poll()["BTC/USDC:USDC"]
+        self.assertEqual(status["status"], "closed")
+        self.assertAlmostEqual(status["filled"], 0.3)
+
+    def test_fill_window_advances(self):
+        """Each poll requests fills since the previous poll minus the overlap"""
+        self.tracker.track("BTC/USDC:USDC", "1", "buy", 1.0, 100.0)
+        start_ms = int(self.now * 1000)
+        self.tracker.poll()
+        self.now += 2.0
+        self.tracker.poll()
+
+        calls = self.exchange.fetch_my_trades.call_args_list
+        self.assertEqual(calls[0].kwargs["since"], start_ms - FILL_LOOKBACK_MS)
+        self.assertEqual(calls[1].kwargs["since"], start_ms - FILL_LOOKBACK_MS)
+        self.now += 2.0
+        self.tracker.poll()
+        self.assertEqual(
+            self.exchange.fetch_my_trades.call_args.kwargs["since"],
+            start_ms + 2000 - FILL_LOOKBACK_MS,
+        )
+
+    def test_poll_error_and_subset(self):
+        """Failed polls report an error per symbol; untracked symbols are ignored"""
+        self.tracker.track("BTC/USDC:USDC", "1", "buy", 1.0, 100.0)
+        self.exchange.fetch_open_orders.side_effect = Exception("timeout")
+
+        statuses = self.tracker.poll(["BTC/USDC:USDC", "XYZ/USDC:USDC"])
+
+        self.assertEqual(statuses, {"BTC/USDC:USDC": {"id": "1", "error": "timeout"}})
+
+
+class TestAggressiveExecutionPolling(unittest.TestCase):
+    """Test that the price ladder polls fills account-wide"""
+
+    def test_fills_detected_without_fetch_order(self):
+        """Orders filled on the first tick are detected from the fills request"""
+        import pandas as pd
+        from unittest.mock import patch
+        import aggressive_order_execution as aggressive
+
+        symbols = SYMBOLS[:20]
+        exchange = MagicMock()
+        exchange.has = {"createOrders": True}
+        exchange.create_orders.side_effect = lambda requests: [
+            {"id": str(i), "info": {"resting": {"oid": i}}} for i in range(len(requests))
+        ]
+        exchange.fetch_open_orders.return_value = []
+        exchange.fetch_my_trades.return_value = [
+            _fill(f"t{i}", str(i), 1.0 / 10.25, 10.0) for i in range(len(symbols))
+        ]
+        prices = pd.DataFrame(
+            {
+                "symbol": symbols,
+                "bid": 10.0,
+                "ask": 10.1,
+                "last": 10.05,
+                "spread": 0.1,
+                "spread_pct": 1.0,
+                "max_price": 10.25,
+            }
+        )
+
+        with patch.object(aggressive, "get_exchange", return_value=exchange), patch.object(
+            aggressive, "get_prices_with_last", return_value=prices
+        ), patch.object(aggressive.time, "sleep"):
+            result = aggressive.aggressive_execute_orders(
+                {symbol: 1.0 for symbol in symbols}, max_time=30, dry_run=False
+            )
+
+        self.assertEqual(exchange.create_orders.call_count, 1)
+        self.assertEqual(exchange.fetch_open_orders.call_count, 1)
+        exchange.fetch_order.assert_not_called()
+        self.assertEqual(result["filled"], 20)
+        self.assertEqual(result["ticks"], 1)
+
+    def test_ladder_edit_uses_remaining_after_partial_fill(self):
+        """A partially filled order is walked up for what is left, not its full size"""
+        import pandas as pd
+        from unittest.mock import patch
+        import aggressive_order_execution as aggressive
+
+        symbol = SYMBOLS[0]
+        amount = 1.0 / 10.25
+        book = {"0": _resting("0", amount, amount * 0.6, 10.0)}
+
+        def edit_orders(requests):
+            # Each edit replaces the single resting order with a new id
+            (request,) = requests
+            order_id = str(int(request["id"]) + 1)
+            book.clear()
+            book[order_id] = _resting(
+                order_id, request["amount"], request["amount"], request["price"]
+            )
+            return [{"id": order_id, "info": {"resting": {"oid": int(order_id)}}}]
+
+        exchange = MagicMock()
+        exchange.has = {"createOrders": True, "editOrders": True}
+        exchange.create_orders.return_value = [{"id": "0", "info": {"resting": {"oid": 0}}}]
+        exchange.edit_orders.side_effect = edit_orders
+        exchange.fetch_open_orders.side_effect = lambda: list(book.values())
+        exchange.fetch_my_trades.return_value = [_fill("t0", "0", amount * 0.4, 10.0)]
+        prices = pd.DataFrame(
+            {
+                "symbol": [symbol],
+                "bid": 10.0,
+                "ask": 10.1,
+                "last": 10.05,
+                "spread": 0.1,
+                "spread_pct": 1.0,
+                "max_price": 10.25,
+            }
+        )
+        clock = FakeClock(1_700_000_000.0)
+
+        with patch.object(aggressive, "get_exchange", return_value=exchange), patch.object(
+            aggressive, "get_prices_with_last", return_value=prices
+        ), patch.object(aggressive.time, "sleep", clock.sleep), patch.object(
+            aggressive.time, "time", clock
+        ):
+            aggressive.aggressive_execute_orders(
+                {symbol: 1.0},
+                tick_interval=1.0,
+                max_time=3,
+                cross_spread_after=False,
+                dry_run=False,
+            )
+
+        edits = [call.args[0][0] for call in exchange.edit_orders.call_args_list]
+        self.assertGreater(len(edits), 1)
+        for edit in edits:
+            self.assertAlmostEqual(edit["amount"], amount * 0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+"""
+Tests for the incremental historical datasets
+Tests: high-water marks, dedup on the dataset key, seeding from legacy exports,
+request windows for Coinalyze refreshes and monthly market cap snapshots
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data.scripts.incremental_datasets import (
+    IncrementalDataset,
+    latest_dataset_path,
+    refresh_coinalyze_dataset,
+    refresh_market_cap_snapshots,
+)
+
+DAY = 86400
+NOW = datetime(2025, 10, 20, 6, 0, tzinfo=timezone.utc)
+
+
+def _ts(date):
+    return int(pd.Timestamp(date, tz="UTC").timestamp())
+
+
+def _oi_rows(symbol, dates, value=1.0):
+    return pd.DataFrame(
+        {
+            "coin_symbol": symbol.split("USDT")[0],
+            "symbol": symbol,
+            "date": dates,
+            "timestamp": [_ts(d) for d in dates],
+            "oi_open": value,
+            "oi_high": value,
+            "oi_low": value,
+            "oi_close": value,
+        }
+    )
+
+
+class FakeCoinalyze:
+    """Serves daily OI points up to NOW and records the requested windows"""
+
+    def __init__(self, first="2025-10-01", missing=()):
+        self.first = _ts(first)
+        self.missing = set(missing)
+        self.calls = []
+
+    def get_open_interest_history(self, symbols, interval, from_ts, to_ts, convert_to_usd):
+        self.calls.append((symbols, from_ts))
+        start = max(from_ts, self.first)
+        history = [
+            {"t": t, "o": 2.0, "h": 2.0, "l": 2.0, "c": 2.0} for t in range(start, to_ts, DAY)
+        ]
+        return [
+            {"symbol": symbol, "history": history}
+            for symbol in symbols.split(",")
+            if symbol not in self.missing
+        ]
+
+    def starts(self):
+        """{symbol: from_ts} of the requests, one entry per symbol"""
+        return {s: from_ts for batch, from_ts in self.calls for s in batch.split(",")}
+
+
+class TestIncrementalDataset(unittest.TestCase):
+    """Test merge, dedup and high-water marks"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.dataset = IncrementalDataset("open_interest", self.tmp)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_append_dedups_and_keeps_newest(self):
+        """Overlapping days are replaced, only unseen keys count as new"""
+        added = self.dataset.append(_oi_rows("BTCUSDT_PERP.A", ["2025-10-01", "2025-10-02"]))
+        self.assertEqual(added, 2)
+        added = self.dataset.append(
+            _oi_rows("BTCUSDT_PERP.A", ["2025-10-02", "2025-10-03"], value=5.0)
+        )
+        self.assertEqual(added, 1)
+
+        df = self.dataset.load()
+        self.assertEqual(list(df["date"]), ["2025-10-01", "2025-10-02", "2025-10-03"])
+        self.assertEqual(list(df["oi_close"]), [1.0, 5.0, 5.0])
+        self.assertEqual(self.dataset.last_date("BTCUSDT_PERP.A"), pd.Timestamp("2025-10-03"))
+
+    def test_empty_append_keeps_data_file(self):
+        """Nothing new: the CSV is not rewritten and pandas does not warn"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            self.dataset.append(_oi_rows("BTCUSDT_PERP.A", ["2025-10-01"]))
+            mtime = os.stat(self.dataset.path).st_mtime_ns
+            added = self.dataset.append(
+                _oi_rows("BTCUSDT_PERP.A", []), checked={"ETHUSDT_PERP.A": "2025-10-02"}
+            )
+
+        self.assertEqual(added, 0)
+        self.assertEqual(os.stat(self.dataset.path).st_mtime_ns, mtime)
+        fresh = IncrementalDataset("open_interest", self.tmp)
+        start = fresh.fetch_start("ETHUSDT_PERP.A", datetime(2020, 1, 1))
+        self.assertEqual(start, pd.Timestamp("2025-10-02"))
+        self.assertEqual(len(fresh.load()), 1)
+
+    def test_marks_rebuilt_when_file_changes(self):
+        self.dataset.append(_oi_rows("ETHUSDT_PERP.A", ["2025-10-05"]))
+        _oi_rows("ETHUSDT_PERP.A", ["2025-10-05", "2025-10-09"]).to_csv(
+            self.dataset.path, index=False
+        )
+        fresh = IncrementalDataset("open_interest", self.tmp)
+        self.assertEqual(fresh.last_date("ETHUSDT_PERP.A"), pd.Timestamp("2025-10-09"))
+
+    def test_bootstrap_from_legacy_export(self):
+        legacy = os.path.join(self.tmp, "historical_open_interest_all_perps_since2020_20251027.csv")
+        _oi_rows("BTCUSDT_PERP.A", ["2025-10-01"]).to_csv(legacy, index=False)
+        self.assertEqual(latest_dataset_path("open_interest", self.tmp), legacy)
+
+        self.assertTrue(self.dataset.bootstrap())
+        self.assertEqual(latest_dataset_path("open_interest", self.tmp), str(self.dataset.path))
+        self.assertEqual(len(self.dataset.load()), 1)
+
+
+class TestCoinalyzeRefresh(unittest.TestCase):
+    """Test that refreshes request only the days after the high-water mark"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.symbols = {"BTCUSDT_PERP.A": "BTC", "NEWUSDT_PERP.A": "NEW"}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_windows_start_at_high_water_mark(self):
+        IncrementalDataset("open_interest", self.tmp).append(
+            _oi_rows("BTCUSDT_PERP.A", ["2025-10-17", "2025-10-18"])
+        )
+        client = FakeCoinalyze()
+        result = refresh_coinalyze_dataset(
+            "open_interest", client, self.symbols, datetime(2020, 1, 1), now=NOW, data_dir=self.tmp
+        )
+
+        starts = client.starts()
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(starts["BTCUSDT_PERP.A"], _ts("2025-10-18"))
+        self.assertEqual(starts["NEWUSDT_PERP.A"], _ts("2020-01-01"))
+        # BTC: 19th and 20th are new; NEW: 1st-20th
+        self.assertEqual(result["new_rows"], 2 + 20)
+
+        df = pd.read_csv(result["path"])
+        btc = df[df["symbol"] == "BTCUSDT_PERP.A"]
+        self.assertEqual(list(btc["oi_close"]), [1.0, 2.0, 2.0, 2.0])
+        self.assertFalse(df.duplicated(["symbol", "date"]).any())
+
+    def test_same_day_refresh_makes_no_requests(self):
+        client = FakeCoinalyze(missing={"NEWUSDT_PERP.A"})
+        kwargs = {"now": NOW, "data_dir": self.tmp}
+        start = datetime(2020, 1, 1)
+        result = refresh_coinalyze_dataset("open_interest", client, self.symbols, start, **kwargs)
+        self.assertEqual((len(client.calls), result["requests"]), (1, 1))
+
+        result = refresh_coinalyze_dataset("open_interest", client, self.symbols, start, **kwargs)
+        self.assertEqual(result["requests"], 0)
+
+        # Next day: the symbol without data resumes from the last check, not from 2020
+        later = datetime(2025, 10, 21, 6, 0, tzinfo=timezone.utc)
+        client.calls.clear()
+        refresh_coinalyze_dataset(
+            "open_interest", client, self.symbols, start, now=later, data_dir=self.tmp
+        )
+        self.assertEqual(client.starts()["NEWUSDT_PERP.A"], _ts("2025-10-20"))
+
+
+class TestMarketCapSnapshots(unittest.TestCase):
+    """Test that only months after the last snapshot are fetched"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        pd.DataFrame(
+            {
+                "Rank": [1, 1],
+                "Name": ["Bitcoin", "Bitcoin"],
+                "Symbol": ["BTC", "BTC"],
+                "Market Cap": [1.0, 2.0],
+                "snapshot_date": [20250801, 20250901],
+            }
+        ).to_csv(os.path.join(self.tmp, "coinmarketcap_monthly_all_snapshots.csv"), index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_fetches_missing_months_only(self):
+        requested = []
+
+        def fetch(date_str):
+            requested.append(date_str)
+            return pd.DataFrame(
+                {"Rank": [1], "Name": ["Bitcoin"], "Symbol": ["BTC"], "Market Cap": [3.0]}
+            )
+
+        result = refresh_market_cap_snapshots(fetch, now=NOW, data_dir=self.tmp)
+
+        self.assertEqual(requested, ["20251001"])
+        self.assertEqual(result["new_rows"], 1)
+        df = pd.read_csv(result["path"])
+        self.assertEqual(list(df["snapshot_date"]), [20250801, 20250901, 20251001])
+        # The raw export the dataset was seeded from is left untouched
+        legacy = os.path.join(self.tmp, "coinmarketcap_monthly_all_snapshots.csv")
+        self.assertNotEqual(result["path"], legacy)
+        self.assertEqual(len(pd.read_csv(legacy)), 2)
+
+    def test_same_ticker_different_coins_kept(self):
+        """Two coins listed under one ticker in a snapshot are both stored"""
+
+        def fetch(date_str):
+            return pd.DataFrame(
+                {"Rank": [90, 900], "Name": ["BinaryX", "BinaryX (old)"], "Symbol": ["BNX"] * 2}
+            )
+
+        result = refresh_market_cap_snapshots(fetch, now=NOW, data_dir=self.tmp)
+
+        self.assertEqual(result["new_rows"], 2)
+        df = pd.read_csv(result["path"])
+        self.assertEqual(len(df[df["Symbol"] == "BNX"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for the streaming market data feed
+Tests: book maintenance and gap detection from replayed messages, staleness,
+recording, the price_snapshot hook and FillTracker reading from the feed
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+import price_snapshot
+from fill_tracker import FillTracker
+from market_data import MarketDataFeed, ReplaySource
+from tests.helpers import FakeClock
+
+BTC = "BTC/USDC:USDC"
+ETH = "ETH/USDC:USDC"
+
+
+def _book(symbol, seq, bids, asks, kind="snapshot"):
+    return {
+        "channel": "book",
+        "symbol": symbol,
+        "type": kind,
+        "seq": seq,
+        "bids": bids,
+        "asks": asks,
+    }
+
+
+SESSION = [
+    _book(BTC, 1, [[100.0, 1.0], [99.5, 2.0]], [[100.5, 1.0], [101.0, 3.0]]),
+    _book(ETH, 7, [[10.0, 5.0]], [[10.1, 5.0]]),
+    _book(BTC, 2, [[100.0, 0], [100.2, 0.5]], [], kind="delta"),
+    {"channel": "ticker", "symbol": BTC, "last": 100.3},
+]
+
+
+def _replay(messages, **kwargs):
+    feed = MarketDataFeed(ReplaySource(messages), **kwargs)
+    feed.run()
+    return feed
+
+
+class TestOrderBookReplay(unittest.TestCase):
+    """Test book state built from recorded messages"""
+
+    def test_snapshot_and_delta(self):
+        """Deltas update and delete levels; last falls back to the mid price"""
+        feed = _replay(SESSION)
+        snapshot = feed.snapshot([BTC, ETH])
+
+        np.testing.assert_allclose(snapshot.bid, [100.2, 10.0])
+        np.testing.assert_allclose(snapshot.ask, [100.5, 10.1])
+        np.testing.assert_allclose(snapshot.last, [100.3, 10.05])
+        self.assertEqual(feed.book(BTC, depth=2)["bids"], [[100.2, 0.5], [99.5, 2.0]])
+        self.assertEqual(feed.messages, 4)
+
+    def test_sequence_gap_marks_book_out_of_sync(self):
+        """A skipped delta hides the book until the next snapshot"""
+        feed = _replay(SESSION + [_book(BTC, 4, [[100.4, 1.0]], [], kind="delta")])
+
+        self.assertEqual(feed.gaps, 1)
+        self.assertFalse(feed.covers([BTC]))
+        self.assertTrue(np.isnan(feed.snapshot([BTC]).bid[0]))
+        self.assertIsNone(feed.book(BTC))
+
+        feed.process(_book(BTC, 5, [[100.1, 1.0]], [[100.6, 1.0]]))
+        self.assertTrue(feed.covers([BTC]))
+        self.assertEqual(feed.snapshot([BTC]).bid[0], 100.1)
+
+    def test_out_of_order_snapshot_dropped(self):
+        """An older snapshot arriving late does not overwrite a newer one"""
+        newer = _book(BTC, 10, [[101.0, 1.0]], [[102.0, 1.0]])
+        older = _book(BTC, 9, [[99.0, 1.0]], [[100.0, 1.0]])
+        feed = _replay([newer, older])
+        self.assertEqual(feed.snapshot([BTC]).bid[0], 101.0)
+
+    def test_stale_book_not_served(self):
+        """Books without updates for stale_after seconds are treated as missing"""
+        clock = FakeClock(1_700_000_000.0)
+        feed = _replay(SESSION, clock=clock, stale_after=5.0)
+        self.assertTrue(feed.covers([BTC, ETH]))
+
+        clock.now += 6.0
+        self.assertFalse(feed.covers([BTC]))
+        self.assertTrue(np.isnan(feed.snapshot([BTC]).ask[0]))
+
+    def test_recorded_session_replays_identically(self):
+        """A recorded session rebuilds the same books from the file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.jsonl")
+            live = _replay(SESSION, record_path=path)
+            replayed = _replay(path)
+
+        self.assertEqual(replayed.book(BTC), live.book(BTC))
+        self.assertEqual(replayed.book(ETH), live.book(ETH))
+
+
+class TestFeedConsumers(unittest.TestCase):
+    """Test the execution code reading from the feed"""
+
+    def tearDown(self):
+        price_snapshot.set_market_data_feed(None)
+
+    def test_get_price_snapshot_reads_feed(self):
+        """Covered symbols come from memory; uncovered ones fall back to REST"""
+        price_snapshot.set_market_data_feed(_replay(SESSION))
+
+        with patch.object(price_snapshot, "get_snapshot_service") as service:
+            snapshot = price_snapshot.get_price_snapshot([BTC, ETH])
+            service.assert_not_called()
+            price_snapshot.get_price_snapshot([BTC, "SOL/USDC:USDC"])
+            service.assert_called_once()
+
+        self.assertEqual(snapshot.bid_ask_dict()[ETH]["ask"], 10.1)
+
+    def test_fill_tracker_on_feed(self):
+        """FillTracker polls the feed's streamed orders and fills without requests"""
+        order = {"id": "42", "symbol": BTC, "side": "buy", "amount": 2.0, "price": 100.0}
+        resting = {**order, "remaining": 2.0, "status": "open"}
+        feed = _replay([{"channel": "orders", "snapshot": True, "orders": [resting]}])
+        self.assertTrue(feed.has_user_data)
+
+        tracker = FillTracker(feed)
+        tracker.track(BTC, "42", "buy", 2.0, 100.0)
+        self.assertEqual(tracker.poll()[BTC]["status"], "open")
+
+        filled = {**order, "remaining": 0.0, "status": "closed"}
+        feed.process({"channel": "orders", "orders": [filled]})
+        fill = {"id": "t1", "order": "42", "symbol": BTC, "amount": 2.0, "price": 100.0}
+        feed.process({"channel": "fills", "trades": [fill]})
+
+        status = tracker.poll()[BTC]
+        self.assertEqual(status["status"], "closed")
+        self.assertEqual(status["average"], 100.0)
+        self.assertEqual(feed.fetch_open_orders(), [])
+
+    def test_fill_ids_trimmed_with_fills(self):
+        """Dropping old fills also forgets their ids, including fills without an id"""
+        feed = MarketDataFeed()
+        trades = [{"order": "42", "timestamp": 1000 + i, "amount": 1.0} for i in range(3)]
+        trades.append({"id": "t9", "order": "43", "amount": 1.0})
+
+        with patch("market_data.MAX_FILLS", 2):
+            feed.process({"channel": "fills", "trades": trades})
+
+        self.assertEqual(len(feed.fetch_my_trades()), 2)
+        self.assertEqual(list(feed._fill_ids), [("42", 1002), "t9"])
+
+
+if __name__ == "__main__":
+    unittest.main()
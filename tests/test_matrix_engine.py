@@ -0,0 +1,182 @@
+"""
+Tests for the Dense Matrix Backtest Engine
+Tests: ranking primitives against pandas, and matrix vs long engine equivalence
+"""
+
+import unittest
+import sys
+import os
+import io
+import contextlib
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backtests", "scripts"))
+
+from backtests.scripts.matrix_engine import (
+    forward_fill_matrix,
+    percentile_matrix,
+    quintile_matrix,
+    top_bottom_matrix,
+)
+from backtests.scripts.backtest_vectorized import backtest_factor_vectorized
+
+
+def _make_prices(num_symbols=14, num_days=320, seed=7):
+    """Random-walk prices with a late listing and a few missing rows."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start="2022-01-01", periods=num_days, freq="D")
+    symbols = ["BTC"] + [f"C{i:02d}" for i in range(num_symbols - 1)]
+    frames = []
+    for i, symbol in enumerate(symbols):
+        vol = 0.01 + 0.005 * i
+        close = 100 * np.exp(np.cumsum(rng.normal(0, vol, num_days)))
+        df = pd.DataFrame({
+            "date": dates,
+            "symbol": f"{symbol}/USDC:USDC",
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.uniform(1e5, 1e6, num_days),
+        })
+        if i == 3:
+            df = df.iloc[120:]
+        if i == 5:
+            df = df.drop(df.index[[50, 51, 200]])
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _run(engine, prices, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return backtest_factor_vectorized(prices, engine=engine, **kwargs)
+
+
+class TestRankingPrimitives(unittest.TestCase):
+    """Matrix ranking helpers match the pandas groupby implementations"""
+
+    def test_quintiles_match_qcut(self):
+        """Quintile labels match pd.qcut, including the tied-edge fallback"""
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(6, 12))
+        values[1, :] = 1.0  # all ties -> rank fallback
+        values[2, :4] = np.nan
+        values[3, :9] = np.nan  # fewer than 5 names -> unassigned
+
+        labels = quintile_matrix(values, 5)
+
+        for i, row in enumerate(values):
+            x = pd.Series(row).dropna()
+            if len(x) < 5:
+                self.assertTrue(np.isnan(labels[i]).all())
+                continue
+            try:
+                expected = pd.qcut(x, q=5, labels=range(1, 6), duplicates="drop")
+            except ValueError:
+                expected = pd.cut(x.rank(method="first"), bins=5, labels=range(1, 6))
+            np.testing.assert_array_equal(labels[i, x.index], expected.astype(float).values)
+
+    def test_percentiles_match_first_rank(self):
+        """Percentiles equal rank(method='first') / count * 100"""
+        values = np.array([[3.0, 1.0, 1.0, np.nan, 2.0]])
+        expected = pd.Series(values[0]).rank(method="first") / 4 * 100
+
+        np.testing.assert_allclose(percentile_matrix(values)[0], expected.values)
+
+    def test_top_bottom_split_when_short_of_names(self):
+        """With fewer than top_n + bottom_n names the selection is split proportionally"""
+        values = np.array([
+            [5.0, 1.0, 4.0, 2.0, 3.0, 6.0, 7.0, 0.0],
+            [5.0, 1.0, 4.0, np.nan, 3.0, np.nan, np.nan, np.nan],
+        ])
+
+        is_bottom, is_top = top_bottom_matrix(values, top_n=3, bottom_n=3)
+
+        # Full row: 3 lowest long, 3 highest short
+        self.assertEqual(set(np.flatnonzero(is_bottom[0])), {1, 3, 7})
+        self.assertEqual(set(np.flatnonzero(is_top[0])), {0, 5, 6})
+        # 4 names: int(4 * 0.5) = 2 bottom, 2 top
+        self.assertEqual(set(np.flatnonzero(is_bottom[1])), {1, 4})
+        self.assertEqual(set(np.flatnonzero(is_top[1])), {0, 2})
+
+    def test_forward_fill(self):
+        """NaN cells take the last value above; leading NaN stays NaN"""
+        matrix = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 0.0], [np.nan, np.nan]])
+        expected = np.array([[np.nan, 1.0], [2.0, 1.0], [2.0, 0.0], [2.0, 0.0]])
+
+        np.testing.assert_array_equal(forward_fill_matrix(matrix), expected)
+
+
+class TestMatrixEngineEquivalence(unittest.TestCase):
+    """Matrix engine reproduces the long engine's portfolio returns"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.prices = _make_prices()
+
+    def assert_engines_match(self, **kwargs):
+        long_results = _run("long", self.prices, **kwargs)
+        matrix_results = _run("matrix", self.prices, **kwargs)
+
+        expected = long_results["portfolio_returns"].reset_index(drop=True)
+        actual = matrix_results["portfolio_returns"].reset_index(drop=True)
+        self.assertEqual(len(expected), len(actual))
+        pd.testing.assert_series_equal(expected["date"], actual["date"], check_dtype=False)
+        np.testing.assert_allclose(
+            actual["portfolio_return"].values, expected["portfolio_return"].values, atol=1e-12
+        )
+        for metric, value in long_results["metrics"].items():
+            self.assertAlmostEqual(matrix_results["metrics"][metric], value, places=10)
+
+    def test_volatility_equal_weight(self):
+        self.assert_engines_match(
+            factor_type="volatility", strategy="long_low_short_high", rebalance_days=7
+        )
+
+    def test_volatility_risk_parity(self):
+        self.assert_engines_match(
+            factor_type="volatility",
+            strategy="long_high_short_low",
+            weighting_method="risk_parity",
+            rebalance_days=3,
+        )
+
+    def test_beta_percentiles(self):
+        self.assert_engines_match(
+            factor_type="beta", strategy="betting_against_beta", beta_window=60, rebalance_days=5
+        )
+
+    def test_kurtosis_regime_filter(self):
+        self.assert_engines_match(
+            factor_type="kurtosis",
+            strategy="long_low_short_high",
+            regime_filter="bear_only",
+            start_date="2022-02-01",
+        )
+
+    def test_carry_top_bottom(self):
+        rng = np.random.default_rng(3)
+        funding = self.prices[["date", "symbol"]].copy()
+        funding["symbol"] = funding["symbol"].str.split("/").str[0]
+        funding["funding_rate_pct"] = rng.normal(0, 0.01, len(funding))
+
+        self.assert_engines_match(
+            factor_type="carry",
+            strategy="carry",
+            funding_data=funding,
+            top_n=4,
+            bottom_n=4,
+            weighting_method="risk_parity",
+        )
+
+    def test_breakout_uses_generator_signals(self):
+        self.assert_engines_match(
+            factor_type="breakout", strategy="breakout", entry_window=20, exit_window=10
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
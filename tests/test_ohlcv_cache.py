@@ -0,0 +1,234 @@
+"""
+Tests for the Incremental OHLCV Cache
+Tests: append-only storage, gap detection, freshness report and
+incremental fetching through ccxt_fetch_hyperliquid_daily_data
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import pandas as pd
+from datetime import datetime, timezone
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data.scripts.ohlcv_cache import OHLCVCache
+from data.scripts.ccxt_get_data import ccxt_fetch_hyperliquid_daily_data
+
+NOW = datetime(2025, 3, 10, 15, 30, tzinfo=timezone.utc)
+
+
+def _candles(start, periods, base=100.0):
+    dates = pd.date_range(start, periods=periods, freq="D")
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": base,
+            "high": base + 1,
+            "low": base - 1,
+            "close": base + pd.Series(range(periods), dtype=float).values,
+            "volume": 10.0,
+        }
+    )
+
+
+class TestOHLCVCache(unittest.TestCase):
+    """Test the per-symbol candle store"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = OHLCVCache(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_drops_partial_bar(self):
+        """Only complete UTC days are stored"""
+        written = self.cache.append("BTC/USDC:USDC", _candles("2025-03-01", 10), now=NOW)
+
+        self.assertEqual(written, 9)
+        df = self.cache.load("BTC/USDC:USDC")
+        self.assertEqual(df["date"].max(), pd.Timestamp("2025-03-09"))
+        self.assertEqual(df["symbol"].unique().tolist(), ["BTC/USDC:USDC"])
+        self.assertEqual(str(df["close"].dtype), "float64")
+
+    def test_append_only(self):
+        """Re-fetched bars never overwrite cached ones"""
+        self.cache.append("BTC/USDC:USDC", _candles("2025-03-01", 5), now=NOW)
+        written = self.cache.append("BTC/USDC:USDC", _candles("2025-03-04", 5, base=500.0), now=NOW)
+
+        df = self.cache.load("BTC/USDC:USDC")
+        self.assertEqual(written, 3)
+        self.assertEqual(len(df), 8)
+        self.assertEqual(df.loc[df["date"] == "2025-03-04", "open"].iloc[0], 100.0)
+
+    def test_missing_bars_tail_and_gaps(self):
+        """Missing bars include interior gaps and days after the last bar"""
+        candles = _candles("2025-03-01", 6)
+        candles = candles[candles["date"] != "2025-03-03"]
+        self.cache.append("ETH/USDC:USDC", candles, now=NOW)
+
+        missing = self.cache.missing_bars("ETH/USDC:USDC", "2025-03-01", now=NOW)
+
+        expected = pd.to_datetime(["2025-03-03", "2025-03-07", "2025-03-08", "2025-03-09"])
+        self.assertTrue(missing.equals(pd.DatetimeIndex(expected)))
+        self.assertEqual(
+            self.cache.missing_ranges("ETH/USDC:USDC", "2025-03-01", now=NOW),
+            [(pd.Timestamp("2025-03-03"),) * 2, (pd.Timestamp("2025-03-07"), pd.Timestamp("2025-03-09"))],
+        )
+
+    def test_requested_gap_is_known_empty(self):
+        """A gap the exchange returned empty is not missing anymore, a lagging tail still is"""
+        candles = _candles("2025-03-01", 6)
+        candles = candles[candles["date"] != "2025-03-03"]
+        self.cache.append(
+            "ETH/USDC:USDC", candles, requested_from="2025-03-01", requested_to="2025-03-09", now=NOW
+        )
+
+        missing = self.cache.missing_bars("ETH/USDC:USDC", "2025-03-01", now=NOW)
+
+        expected = pd.to_datetime(["2025-03-07", "2025-03-08", "2025-03-09"])
+        self.assertTrue(missing.equals(pd.DatetimeIndex(expected)))
+        info = self.cache.get_cache_info(now=NOW)["files"][0]
+        self.assertEqual(info["gaps"], 0)
+
+    def test_late_listing_not_rerequested(self):
+        """Bars before the first bar of an earlier request are known not to exist"""
+        self.cache.append("NEW/USDC:USDC", _candles("2025-03-05", 5), requested_from="2025-02-01", now=NOW)
+
+        self.assertEqual(len(self.cache.missing_bars("NEW/USDC:USDC", "2025-02-10", now=NOW)), 0)
+        # Without a record of the earlier request the days are treated as missing
+        self.cache.append("OLD/USDC:USDC", _candles("2025-03-05", 5), now=NOW)
+        self.assertEqual(len(self.cache.missing_bars("OLD/USDC:USDC", "2025-03-01", now=NOW)), 4)
+
+    def test_freshness_report(self):
+        """get_cache_info flags stale and gapped symbols"""
+        self.cache.append("FRESH/USDC:USDC", _candles("2025-03-01", 9), now=NOW)
+        self.cache.append("STALE/USDC:USDC", _candles("2025-03-01", 6), now=NOW)
+        gapped = _candles("2025-03-01", 9)
+        self.cache.append("GAP/USDC:USDC", gapped[gapped["date"] != "2025-03-04"], now=NOW)
+
+        info = self.cache.get_cache_info(now=NOW)
+        files = {f["symbol"]: f for f in info["files"]}
+
+        self.assertEqual(info["last_complete_bar"], "2025-03-09T00:00:00")
+        self.assertEqual(files["FRESH/USDC:USDC"]["validation_reason"], "valid")
+        self.assertEqual(files["STALE/USDC:USDC"]["validation_reason"], "stale")
+        self.assertEqual(files["STALE/USDC:USDC"]["bars_behind"], 3)
+        self.assertEqual(files["GAP/USDC:USDC"]["validation_reason"], "gaps")
+        self.assertEqual(files["GAP/USDC:USDC"]["gaps"], 1)
+
+
+class TestIncrementalFetch(unittest.TestCase):
+    """Test that the fetcher only requests bars the cache is missing"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = OHLCVCache(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _fake_ohlcv(symbol, timeframe, since, limit):
+        today = pd.Timestamp.now(tz="UTC").tz_convert(None).normalize()
+        dates = pd.date_range(pd.Timestamp(since, unit="ms").ceil("D"), periods=limit, freq="D")
+        dates = dates[dates <= today]
+        return [[int(d.tz_localize("UTC").timestamp() * 1000), 1.0, 2.0, 0.5, float(d.day), 10.0] for d in dates]
+
+    @patch("ccxt.hyperliquid")
+    def test_second_run_is_served_from_cache(self, mock_exchange_class):
+        """A repeat run makes no requests and returns the same frame"""
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.parse8601.side_effect = lambda iso: int(pd.Timestamp(iso).timestamp() * 1000)
+        mock_exchange.fetch_ohlcv.side_effect = self._fake_ohlcv
+        symbols = ["BTC/USDC:USDC", "ETH/USDC:USDC"]
+
+        uncached = ccxt_fetch_hyperliquid_daily_data(symbols=symbols, days=30, verbose=False)
+        first = ccxt_fetch_hyperliquid_daily_data(symbols=symbols, days=30, verbose=False, cache=self.cache)
+        calls_after_first = mock_exchange.fetch_ohlcv.call_count
+        second = ccxt_fetch_hyperliquid_daily_data(symbols=symbols, days=30, verbose=False, cache=self.cache)
+
+        pd.testing.assert_frame_equal(uncached, first)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(len(second), 60)
+        self.assertEqual(mock_exchange.fetch_ohlcv.call_count, calls_after_first)
+
+    @patch("ccxt.hyperliquid")
+    def test_only_missing_tail_is_requested(self, mock_exchange_class):
+        """A cache that is a few days behind requests only those days"""
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.fetch_ohlcv.side_effect = self._fake_ohlcv
+
+        today = pd.Timestamp.now(tz="UTC").tz_convert(None).normalize()
+        self.cache.append("BTC/USDC:USDC", _candles(today - pd.Timedelta(days=40), 37))
+
+        result = ccxt_fetch_hyperliquid_daily_data(
+            symbols=["BTC/USDC:USDC"], days=30, verbose=False, cache=self.cache
+        )
+
+        kwargs = mock_exchange.fetch_ohlcv.call_args.kwargs
+        self.assertEqual(pd.Timestamp(kwargs["since"], unit="ms"), today - pd.Timedelta(days=3))
+        self.assertEqual(kwargs["limit"], 3)
+        self.assertEqual(len(result), 30)
+        self.assertEqual(result["date"].max(), today - pd.Timedelta(days=1))
+
+    @patch("ccxt.hyperliquid")
+    def test_permanent_gap_is_not_refetched(self, mock_exchange_class):
+        """A gap the exchange has no bars for is requested once, then only the tail is"""
+        today = pd.Timestamp.now(tz="UTC").tz_convert(None).normalize()
+        halted = today - pd.Timedelta(days=10)
+
+        def ohlcv(symbol, timeframe, since, limit):
+            return [row for row in self._fake_ohlcv(symbol, timeframe, since, limit) if row[0] != halted.value // 10**6]
+
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.fetch_ohlcv.side_effect = ohlcv
+
+        gapped = _candles(today - pd.Timedelta(days=40), 38)
+        self.cache.append("BTC/USDC:USDC", gapped[gapped["date"] != halted])
+
+        with patch("time.sleep") as sleep:
+            ccxt_fetch_hyperliquid_daily_data(
+                symbols=["BTC/USDC:USDC", "ETH/USDC:USDC"], days=30, verbose=False, cache=self.cache
+            )
+        # One request for the gap and one for the tail, plus ETH's window
+        requested = [pd.Timestamp(c.kwargs["since"], unit="ms") for c in mock_exchange.fetch_ohlcv.call_args_list]
+        self.assertEqual(requested[:2], [halted, today - pd.Timedelta(days=2)])
+        self.assertEqual(sleep.call_count, 1)
+
+        mock_exchange.fetch_ohlcv.reset_mock()
+        with patch("time.sleep") as sleep:
+            result = ccxt_fetch_hyperliquid_daily_data(
+                symbols=["BTC/USDC:USDC", "ETH/USDC:USDC"], days=30, verbose=False, cache=self.cache
+            )
+
+        mock_exchange.fetch_ohlcv.assert_not_called()
+        sleep.assert_not_called()
+        self.assertEqual(len(result[result["symbol"] == "BTC/USDC:USDC"]), 29)
+
+    @patch("ccxt.hyperliquid")
+    def test_fetch_failure_falls_back_to_cache(self, mock_exchange_class):
+        """If the top-up fails, the cached window is still returned"""
+        mock_exchange = MagicMock()
+        mock_exchange_class.return_value = mock_exchange
+        mock_exchange.fetch_ohlcv.side_effect = Exception("API Error")
+
+        today = pd.Timestamp.now(tz="UTC").tz_convert(None).normalize()
+        self.cache.append("BTC/USDC:USDC", _candles(today - pd.Timedelta(days=40), 38))
+
+        result = ccxt_fetch_hyperliquid_daily_data(
+            symbols=["BTC/USDC:USDC"], days=30, verbose=False, cache=self.cache
+        )
+
+        self.assertEqual(len(result), 28)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Tests for bulk order submission
+Tests: chunking, per-order result mapping, rejections, per-order fallback
+and the execution callers built on it (tick, move_limits, aggressive)
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+from order_batch import OrderBatch
+
+SYMBOLS = [f"COIN{i}/USDC:USDC" for i in range(60)]
+
+
+def _resting(requests, params=None):
+    return [
+        {"id": str(1000 + i), "status": None, "info": {"resting": {"oid": 1000 + i}}}
+        for i in range(len(requests))
+    ]
+
+
+def _exchange():
+    exchange = MagicMock()
+    exchange.has = {"createOrders": True, "editOrders": True, "cancelOrdersForSymbols": True}
+    exchange.create_orders.side_effect = _resting
+    exchange.edit_orders.side_effect = _resting
+    return exchange
+
+
+class TestOrderBatch(unittest.TestCase):
+    """Test queueing, chunking and result mapping"""
+
+    def test_chunks_to_request_limit(self):
+        """60 creates go out as two bulk requests and every symbol gets its order"""
+        exchange = _exchange()
+        batch = OrderBatch(exchange, max_batch_size=40)
+        for symbol in SYMBOLS:
+            batch.create(symbol, "buy", 1.0, 10.0)
+
+        results = batch.submit()["create"]
+
+        self.assertEqual(exchange.create_orders.call_count, 2)
+        self.assertEqual([len(c.args[0]) for c in exchange.create_orders.call_args_list], [40, 20])
+        self.assertEqual(batch.requests_sent, 2)
+        self.assertEqual(list(results), SYMBOLS)
+        self.assertTrue(all(r["success"] for r in results.values()))
+        self.assertEqual(results[SYMBOLS[45]]["order"]["id"], "1005")
+        exchange.create_order.assert_not_called()
+        self.assertEqual(len(batch), 0)
+
+    def test_rejected_order_maps_to_its_symbol(self):
+        """A per-order error inside an ok response only fails that order"""
+        exchange = _exchange()
+        exchange.edit_orders.side_effect = None
+        exchange.edit_orders.return_value = [
+            {"id": "1", "info": {"resting": {"oid": 1}}},
+            {"id": None, "status": "rejected", "info": {"error": "Order has invalid price."}},
+        ]
+        batch = OrderBatch(exchange)
+        batch.edit("1", "BTC/USDC:USDC", "buy", 0.1, 100.0)
+        batch.edit("2", "ETH/USDC:USDC", "sell", 1.0, 10.0)
+
+        results = batch.submit()["edit"]
+
+        self.assertTrue(results["BTC/USDC:USDC"]["success"])
+        self.assertFalse(results["ETH/USDC:USDC"]["success"])
+        self.assertEqual(results["ETH/USDC:USDC"]["error"], "Order has invalid price.")
+
+    def test_cancel_statuses_and_order(self):
+        """Cancels are sent first and their statuses are unpacked from the raw response"""
+        exchange = _exchange()
+        calls = []
+        statuses = ["success", {"error": "Order was never placed"}]
+
+        def cancel(requests):
+            calls.append("cancel")
+            return [{"info": {"response": {"data": {"statuses": statuses}}}}]
+
+        def create(requests):
+            calls.append("create")
+            return _resting(requests)
+
+        exchange.cancel_orders_for_symbols.side_effect = cancel
+        exchange.create_orders.side_effect = create
+        batch = OrderBatch(exchange)
+        batch.create("BTC/USDC:USDC", "buy", 0.1, 101.0)
+        batch.cancel("1", "BTC/USDC:USDC")
+        batch.cancel("2", "ETH/USDC:USDC")
+
+        results = batch.submit()
+
+        self.assertEqual(calls, ["cancel", "create"])
+        self.assertTrue(results["cancel"]["BTC/USDC:USDC"]["success"])
+        self.assertEqual(results["cancel"]["ETH/USDC:USDC"]["error"], "Order was never placed")
+        self.assertTrue(results["create"]["BTC/USDC:USDC"]["success"])
+
+    def test_single_cancel_error_unpacked(self):
+        """A lone cancel also comes back as the raw wrapper and its error is reported"""
+        exchange = _exchange()
+        exchange.cancel_orders_for_symbols.return_value = [
+            {"info": {"response": {"data": {"statuses": [{"error": "Order was never placed"}]}}}}
+        ]
+        batch = OrderBatch(exchange)
+        batch.cancel("1", "BTC/USDC:USDC")
+
+        result = batch.submit()["cancel"]["BTC/USDC:USDC"]
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "Order was never placed")
+
+    def test_failed_request_marks_chunk(self):
+        """A failed bulk request fails every order in it without per-order retries"""
+        exchange = _exchange()
+        exchange.create_orders.side_effect = Exception("Network down")
+        batch = OrderBatch(exchange)
+        batch.create("BTC/USDC:USDC", "buy", 0.1, 100.0)
+        batch.create("ETH/USDC:USDC", "buy", 1.0, 10.0)
+
+        results = batch.submit()["create"]
+
+        self.assertEqual({r["error"] for r in results.values()}, {"Network down"})
+        exchange.create_order.assert_not_called()
+
+    def test_fallback_without_bulk_support(self):
+        """Exchanges without bulk endpoints get one call per order"""
+        exchange = MagicMock()
+        exchange.has = {}
+        exchange.edit_order.side_effect = [{"id": "a"}, Exception("Order not found")]
+        batch = OrderBatch(exchange)
+        batch.edit("1", "BTC/USDC:USDC", "buy", 0.1, 100.0)
+        batch.edit("2", "ETH/USDC:USDC", "buy", 1.0, 10.0)
+
+        results = batch.submit()["edit"]
+
+        self.assertEqual(exchange.edit_order.call_count, 2)
+        self.assertTrue(results["BTC/USDC:USDC"]["success"])
+        self.assertEqual(results["ETH/USDC:USDC"]["error"], "Order not found")
+
+    def test_duplicate_key_rejected(self):
+        """Two actions of the same type need distinct keys"""
+        batch = OrderBatch(_exchange())
+        batch.edit("1", "BTC/USDC:USDC", "buy", 0.1, 100.0, key="1")
+        batch.edit("2", "BTC/USDC:USDC", "buy", 0.1, 99.0, key="2")
+        with self.assertRaises(ValueError):
+            batch.edit("3", "BTC/USDC:USDC", "buy", 0.1, 98.0, key="1")
+
+
+class TestBatchedCallers(unittest.TestCase):
+    """Test that the execution scripts submit one bulk request per tick"""
+
+    def _open_orders(self):
+        return [
+            {"id": str(i), "symbol": symbol, "side": "buy", "price": 9.0, "amount": 1.0}
+            for i, symbol in enumerate(SYMBOLS[:30])
+        ]
+
+    def _bid_ask(self):
+        prices = {"bid": 10.0, "ask": 10.1, "spread": 0.1, "spread_pct": 1.0}
+        return {symbol: dict(prices) for symbol in SYMBOLS}
+
+    def test_tick_orders_single_edit_request(self):
+        """tick_orders moves 30 orders with one edit_orders call"""
+        import tick
+
+        exchange = _exchange()
+        exchange.fetch_open_orders.return_value = self._open_orders()
+
+        with patch.object(tick, "get_exchange", return_value=exchange), patch.object(
+            tick, "fetch_bid_ask_prices", return_value=self._bid_ask()
+        ):
+            result = tick.tick_orders(dry_run=False)
+
+        self.assertEqual(result["modified"], 30)
+        self.assertEqual(exchange.edit_orders.call_count, 1)
+        exchange.edit_order.assert_not_called()
+
+    def test_move_limits_single_edit_request(self):
+        """move_orders_to_best_prices maps bulk results back to each order"""
+        import move_limits
+
+        exchange = _exchange()
+        exchange.edit_orders.side_effect = lambda requests: _resting(requests[:-1]) + [
+            {"id": None, "status": "rejected", "info": {"error": "Order was never placed"}}
+        ]
+        snapshot = MagicMock()
+        snapshot.bid_ask_dict.return_value = self._bid_ask()
+
+        with patch.object(move_limits, "get_exchange", return_value=exchange), patch.object(
+            move_limits, "get_all_open_orders", return_value=self._open_orders()
+        ), patch.object(move_limits, "get_price_snapshot", return_value=snapshot):
+            result = move_limits.move_orders_to_best_prices(dry_run=False)
+
+        self.assertEqual(result["modified_orders"], 29)
+        self.assertEqual(result["error_orders"], 1)
+        self.assertEqual(exchange.edit_orders.call_count, 1)
+
+    def test_cross_spread_with_limit_orders(self):
+        """Crossing the spread for many symbols is one cancel and one create request"""
+        from aggressive_order_execution import cross_spread_with_limit_orders
+
+        exchange = _exchange()
+        exchange.cancel_orders_for_symbols.side_effect = lambda requests: [
+            {"info": {"response": {"data": {"statuses": ["success"] * len(requests)}}}}
+        ]
+        statuses = {
+            symbol: {"id": str(i), "side": "buy", "price": 10.0, "remaining": 2.0}
+            for i, symbol in enumerate(SYMBOLS[:20])
+        }
+
+        new_orders = cross_spread_with_limit_orders(exchange, statuses, self._bid_ask())
+
+        self.assertEqual(set(new_orders), set(statuses))
+        self.assertEqual(new_orders[SYMBOLS[0]]["price"], 10.1)
+        self.assertEqual(new_orders[SYMBOLS[0]]["amount"], 2.0)
+        self.assertEqual(exchange.cancel_orders_for_symbols.call_count, 1)
+        self.assertEqual(exchange.create_orders.call_count, 1)
+
+    def test_cross_spread_skips_failed_cancel(self):
+        """An order whose cancel fails is not crossed, so it cannot fill twice"""
+        from aggressive_order_execution import cross_spread_with_limit_orders
+
+        exchange = _exchange()
+        exchange.cancel_orders_for_symbols.side_effect = lambda requests: [
+            {
+                "info": {
+                    "response": {
+                        "data": {"statuses": ["success", {"error": "Order was never placed"}]}
+                    }
+                }
+            }
+        ]
+        statuses = {
+            symbol: {"id": str(i), "side": "buy", "price": 10.0, "remaining": 2.0}
+            for i, symbol in enumerate(SYMBOLS[:2])
+        }
+
+        new_orders = cross_spread_with_limit_orders(exchange, statuses, self._bid_ask())
+
+        self.assertEqual(list(new_orders), [SYMBOLS[0]])
+        created = exchange.create_orders.call_args.args[0]
+        self.assertEqual([request["symbol"] for request in created], [SYMBOLS[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for the Parameter Sweep Runner
+Tests: sweep results match individual backtests and factor panels are computed once
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backtests", "scripts"))
+
+import parameter_sweep
+from parameter_sweep import expand_grid, run_parameter_sweep
+from backtests.scripts.backtest_vectorized import backtest_factor_vectorized
+from tests.helpers import quiet
+from tests.test_matrix_engine import _make_prices
+
+
+class TestExpandGrid(unittest.TestCase):
+    def test_cartesian_product_in_grid_order(self):
+        combos = expand_grid({"a": [1, 2], "b": ["x", "y"]})
+
+        self.assertEqual(
+            combos,
+            [{"a": 1, "b": "x"}, {"a": 1, "b": "y"}, {"a": 2, "b": "x"}, {"a": 2, "b": "y"}],
+        )
+
+
+class TestParameterSweep(unittest.TestCase):
+    """Sweep metrics equal one backtest_factor_vectorized run per combination"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.prices = _make_prices()
+
+    def assert_sweep_matches(self, factor_type, strategy, grid, **base_params):
+        results = quiet(run_parameter_sweep, self.prices, factor_type, strategy, grid, **base_params)
+        self.assertEqual(len(results), len(expand_grid(grid)))
+
+        for _, row in results.iterrows():
+            combo = {name: row[name] for name in grid}
+            for name, value in combo.items():
+                if isinstance(value, (np.integer, np.floating)):
+                    combo[name] = value.item()
+            params = parameter_sweep._resolve_params(factor_type, {**base_params, **combo})
+            expected = quiet(backtest_factor_vectorized, self.prices, factor_type, strategy, **params)
+            if expected is None:
+                # No positions (e.g. both allocations zero): no metrics
+                self.assertTrue(np.isnan(row["sharpe_ratio"]))
+                continue
+            for metric, value in expected["metrics"].items():
+                self.assertAlmostEqual(row[metric], value, places=10, msg=f"{combo} {metric}")
+
+    def test_volatility_rebalance_and_allocation_grid(self):
+        self.assert_sweep_matches(
+            "volatility",
+            "long_low_short_high",
+            {
+                "rebalance_days": [1, 7],
+                "weighting_method": ["equal_weight", "risk_parity"],
+                "long_allocation": [0.5, 1.0, 0.0],
+                "short_allocation": [0.5, 0.0],
+            },
+        )
+
+    def test_window_and_percentile_grid(self):
+        self.assert_sweep_matches(
+            "kurtosis",
+            "long_low_short_high",
+            {"kurtosis_window": [20, 30], "long_percentile": [10, 20], "rebalance_days": [3]},
+        )
+
+    def test_event_driven_factor(self):
+        self.assert_sweep_matches(
+            "breakout",
+            "breakout",
+            {"entry_window": [20, 30], "weighting_method": ["equal_weight", "risk_parity"]},
+            exit_window=10,
+        )
+
+    def test_factor_panel_computed_once_per_window(self):
+        original = parameter_sweep.prepare_factor_data
+        with mock.patch.object(parameter_sweep, "prepare_factor_data", side_effect=original) as prepare:
+            quiet(
+                run_parameter_sweep,
+                self.prices,
+                "volatility",
+                "long_low_short_high",
+                {"window": [20, 30], "num_quintiles": [3, 5], "rebalance_days": [1, 5, 10]},
+            )
+
+        self.assertEqual(prepare.call_count, 2)
+
+    def test_writes_results_table(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "sweep.csv")
+            quiet(
+                run_parameter_sweep,
+                self.prices,
+                "beta",
+                "betting_against_beta",
+                {"rebalance_days": [1, 5]},
+                beta_window=60,
+                output_file=output,
+            )
+            table = pd.read_csv(output)
+
+        self.assertEqual(table["rebalance_days"].tolist(), [1, 5])
+        self.assertIn("sharpe_ratio", table.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
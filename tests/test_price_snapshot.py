@@ -0,0 +1,164 @@
+"""
+Tests for the Price Snapshot Service
+Tests: bulk snapshot construction, shared polling, per-symbol fallback
+and the callers built on it (get_bid_ask, tick, get_prices_with_last)
+"""
+
+import unittest
+import sys
+import os
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+import price_snapshot
+from price_snapshot import PriceSnapshot, PriceSnapshotService
+
+TICKERS = {
+    "BTC/USDC:USDC": {"bid": 100.0, "ask": 101.0, "last": 100.5},
+    "ETH/USDC:USDC": {"bid": 10.0, "ask": 10.2, "last": 10.1},
+    "XYZ/USDC:USDC": {"bid": None, "ask": 5.0, "last": 5.0},
+}
+
+
+def _exchange(bulk=True):
+    exchange = MagicMock()
+    exchange.has = {"fetchTickers": bulk}
+    exchange.fetch_tickers.return_value = TICKERS
+    exchange.fetch_ticker.side_effect = lambda symbol: TICKERS[symbol]
+    return exchange
+
+
+class TestPriceSnapshot(unittest.TestCase):
+    """Test the NumPy-backed snapshot"""
+
+    def setUp(self):
+        self.snapshot = PriceSnapshot.from_tickers(TICKERS, timestamp=0.0)
+
+    def test_arrays(self):
+        """Prices are aligned arrays with NaN for missing sides"""
+        np.testing.assert_allclose(self.snapshot.spread[:2], [1.0, 0.2])
+        np.testing.assert_allclose(self.snapshot.spread_pct[:2], [1.0, 2.0])
+        self.assertTrue(np.isnan(self.snapshot.bid[2]))
+        np.testing.assert_array_equal(self.snapshot.has_bid_ask, [True, True, False])
+
+    def test_bid_ask_dict(self):
+        """bid_ask_dict matches tick.fetch_bid_ask_prices' shape and skips one-sided books"""
+        result = self.snapshot.bid_ask_dict()
+
+        self.assertEqual(set(result), {"BTC/USDC:USDC", "ETH/USDC:USDC"})
+        self.assertEqual(set(result["BTC/USDC:USDC"]), {"bid", "ask", "spread", "spread_pct"})
+        self.assertAlmostEqual(result["ETH/USDC:USDC"]["spread_pct"], 2.0)
+
+    def test_to_frame(self):
+        """to_frame returns get_bid_ask's schema sorted by symbol"""
+        df = self.snapshot.to_frame()
+
+        self.assertEqual(list(df.columns), ["symbol", "bid", "ask", "spread", "spread_pct", "timestamp"])
+        self.assertEqual(df["symbol"].tolist(), ["BTC/USDC:USDC", "ETH/USDC:USDC"])
+
+    def test_subset(self):
+        """subset orders by the requested symbols and leaves unknown ones NaN"""
+        sub = self.snapshot.subset(["ETH/USDC:USDC", "NOPE/USDC:USDC"])
+
+        self.assertEqual(sub.bid[0], 10.0)
+        self.assertTrue(np.isnan(sub.bid[1]))
+        self.assertEqual(sub.get("ETH/USDC:USDC")["last"], 10.1)
+
+
+class TestPriceSnapshotService(unittest.TestCase):
+    """Test polling and sharing"""
+
+    def test_single_bulk_call(self):
+        """All symbols come from one fetch_tickers call"""
+        exchange = _exchange()
+        service = PriceSnapshotService(exchange)
+
+        snapshot = service.snapshot(["BTC/USDC:USDC", "ETH/USDC:USDC"])
+
+        self.assertEqual(exchange.fetch_tickers.call_count, 1)
+        exchange.fetch_ticker.assert_not_called()
+        self.assertEqual(len(snapshot), 2)
+
+    def test_recent_snapshot_is_shared(self):
+        """Requests within max_age reuse the last poll; max_age=0 forces a new one"""
+        exchange = _exchange()
+        service = PriceSnapshotService(exchange, max_age=60)
+
+        service.snapshot(["BTC/USDC:USDC"])
+        service.snapshot(["ETH/USDC:USDC"])
+        self.assertEqual(exchange.fetch_tickers.call_count, 1)
+
+        service.snapshot(["ETH/USDC:USDC"], max_age=0)
+        self.assertEqual(exchange.fetch_tickers.call_count, 2)
+
+    def test_missing_symbol_does_not_force_repoll(self):
+        """A symbol the bulk poll never returns is remembered while the snapshot is fresh"""
+        exchange = _exchange()
+        service = PriceSnapshotService(exchange, max_age=60)
+
+        for _ in range(3):
+            snapshot = service.snapshot(["BTC/USDC:USDC", "DELISTED/USDC:USDC"])
+        self.assertEqual(exchange.fetch_tickers.call_count, 1)
+        self.assertTrue(np.isnan(snapshot.bid[1]))
+
+        service.snapshot(["DELISTED/USDC:USDC"], max_age=0)
+        self.assertEqual(exchange.fetch_tickers.call_count, 2)
+
+    def test_per_symbol_fallback(self):
+        """Exchanges without fetch_tickers are polled symbol by symbol"""
+        exchange = _exchange(bulk=False)
+        service = PriceSnapshotService(exchange)
+
+        snapshot = service.snapshot(["BTC/USDC:USDC", "ETH/USDC:USDC"])
+
+        self.assertEqual(exchange.fetch_ticker.call_count, 2)
+        self.assertEqual(snapshot.get("BTC/USDC:USDC")["ask"], 101.0)
+
+
+class TestSnapshotCallers(unittest.TestCase):
+    """Test the execution helpers built on the snapshot"""
+
+    def setUp(self):
+        price_snapshot._default_services.clear()
+        self.exchange = _exchange()
+
+    def tearDown(self):
+        price_snapshot._default_services.clear()
+
+    def test_get_bid_ask(self):
+        """get_bid_ask keeps its DataFrame schema"""
+        from get_bid_ask import get_bid_ask
+
+        with patch("ccxt.hyperliquid", return_value=self.exchange):
+            df = get_bid_ask(["BTC/USDC:USDC", "XYZ/USDC:USDC"], max_age=0)
+
+        self.assertEqual(df["symbol"].tolist(), ["BTC/USDC:USDC"])
+        self.assertEqual(df["spread"].iloc[0], 1.0)
+        self.assertEqual(self.exchange.fetch_tickers.call_count, 1)
+
+    def test_tick_fetch_bid_ask_prices(self):
+        """tick.fetch_bid_ask_prices polls the given exchange once"""
+        from tick import fetch_bid_ask_prices
+
+        result = fetch_bid_ask_prices(self.exchange, ["BTC/USDC:USDC", "ETH/USDC:USDC"])
+
+        self.assertEqual(set(result), {"BTC/USDC:USDC", "ETH/USDC:USDC"})
+        self.assertEqual(self.exchange.fetch_tickers.call_count, 1)
+
+    def test_get_prices_with_last(self):
+        """get_prices_with_last computes max_price = last + 2 * spread"""
+        from aggressive_order_execution import get_prices_with_last
+
+        with patch("ccxt.hyperliquid", return_value=self.exchange):
+            df = get_prices_with_last(["BTC/USDC:USDC", "XYZ/USDC:USDC"])
+
+        self.assertEqual(df["symbol"].tolist(), ["BTC/USDC:USDC"])
+        self.assertAlmostEqual(df["max_price"].iloc[0], 102.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
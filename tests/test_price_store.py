@@ -0,0 +1,176 @@
+"""
+Tests for the Columnar Price Store
+Tests: CSV -> Parquet build, freshness detection, and pushdown reads
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from data.scripts.price_store import (
+    PriceStore,
+    PYARROW_AVAILABLE,
+    load_dataset,
+    load_price_data,
+    read_csv_filtered,
+)
+
+
+def _make_price_csv(path, symbols=("BTC/USDC:USDC", "ETH/USDC:USDC", "SOL/USDC:USDC")):
+    dates = pd.date_range(start="2020-11-01", end="2022-02-28", freq="D")
+    frames = []
+    for i, symbol in enumerate(symbols):
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": dates.strftime("%Y-%m-%d"),
+                    "symbol": symbol,
+                    "open": np.linspace(100, 200, len(dates)) * (i + 1),
+                    "high": np.linspace(101, 201, len(dates)) * (i + 1),
+                    "low": np.linspace(99, 199, len(dates)) * (i + 1),
+                    "close": np.linspace(100, 200, len(dates)) * (i + 1),
+                    "volume": np.arange(len(dates), dtype=float),
+                }
+            )
+        )
+    # Write unsorted to make sure loaders restore (symbol, date) order
+    pd.concat(frames).sample(frac=1.0, random_state=0).to_csv(path, index=False)
+
+
+class TestCsvFallback(unittest.TestCase):
+    """Test the CSV read path used when no store exists"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "prices.csv")
+        _make_price_csv(self.csv_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_csv_fallback_parses_dates(self):
+        """Fallback read returns a datetime date column"""
+        df = read_csv_filtered(self.csv_path)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+
+    def test_csv_fallback_applies_filters(self):
+        """Column, date and symbol filters apply without a store"""
+        df = read_csv_filtered(
+            self.csv_path,
+            columns=["close"],
+            start_date="2021-01-01",
+            end_date="2021-12-31",
+            symbols=["ETH/USDC:USDC"],
+        )
+        self.assertEqual(list(df.columns), ["date", "symbol", "close"])
+        self.assertEqual(df["symbol"].unique().tolist(), ["ETH/USDC:USDC"])
+        self.assertEqual(len(df), 365)
+
+    def test_snapshot_date_is_normalized(self):
+        """CoinMarketCap YYYYMMDD snapshot dates become a typed date column"""
+        mcap_path = os.path.join(self.temp_dir, "mcap.csv")
+        pd.DataFrame(
+            {"Symbol": ["BTC", "ETH"], "Market Cap": [1.0, 2.0], "snapshot_date": [20210101, 20210201]}
+        ).to_csv(mcap_path, index=False)
+
+        df = read_csv_filtered(mcap_path)
+        self.assertEqual(df["date"].tolist(), [pd.Timestamp("2021-01-01"), pd.Timestamp("2021-02-01")])
+
+
+@unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow not installed")
+class TestPriceStore(unittest.TestCase):
+    """Test the Parquet-backed store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, "prices.csv")
+        _make_price_csv(self.csv_path)
+        self.store = PriceStore(os.path.join(self.temp_dir, "store"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_missing_store_falls_back_to_csv(self):
+        """Without a built store, load_dataset reads the CSV and builds nothing"""
+        df = load_dataset(self.csv_path, store=self.store)
+
+        self.assertGreater(len(df), 0)
+        self.assertFalse(self.store.dataset_path(self.store.dataset_name(self.csv_path)).exists())
+
+    def test_build_and_load_matches_csv(self):
+        """Store contents are identical to a direct CSV read"""
+        self.store.build(self.csv_path)
+        self.assertTrue(self.store.is_fresh(self.csv_path))
+
+        from_store = load_price_data(self.csv_path, store=self.store)
+        from_csv = load_price_data(self.csv_path, use_store=False)
+
+        pd.testing.assert_frame_equal(from_store, from_csv, check_dtype=False)
+
+    def test_pushdown_matches_csv_filters(self):
+        """Column/date/symbol pushdown returns the same rows as filtering the CSV"""
+        self.store.build(self.csv_path)
+        kwargs = dict(
+            columns=["close", "volume"],
+            start_date="2021-06-01",
+            end_date="2022-01-15",
+            symbols=["BTC/USDC:USDC", "SOL/USDC:USDC"],
+        )
+
+        from_store = load_price_data(self.csv_path, store=self.store, **kwargs)
+        from_csv = load_price_data(self.csv_path, use_store=False, **kwargs)
+
+        self.assertEqual(list(from_store.columns), ["date", "symbol", "close", "volume"])
+        self.assertEqual(from_store["date"].min(), pd.Timestamp("2021-06-01"))
+        self.assertEqual(from_store["date"].max(), pd.Timestamp("2022-01-15"))
+        pd.testing.assert_frame_equal(from_store, from_csv, check_dtype=False)
+
+    def test_modified_csv_marks_store_stale(self):
+        """Rewriting the source CSV invalidates the store"""
+        self.store.build(self.csv_path)
+        _make_price_csv(self.csv_path, symbols=("BTC/USDC:USDC",))
+        os.utime(self.csv_path, (0, 0))
+
+        self.assertFalse(self.store.is_fresh(self.csv_path))
+
+        df = load_dataset(self.csv_path, store=self.store, build_if_stale=True)
+        self.assertTrue(self.store.is_fresh(self.csv_path))
+        self.assertEqual(df["symbol"].unique().tolist(), ["BTC/USDC:USDC"])
+
+    def test_categorical_symbols(self):
+        """Symbols can be returned as a pandas Categorical"""
+        self.store.build(self.csv_path)
+        df = self.store.load(self.store.dataset_name(self.csv_path), categorical_symbols=True)
+        self.assertIsInstance(df["symbol"].dtype, pd.CategoricalDtype)
+
+        df = load_price_data(self.csv_path, store=self.store, categorical_symbols=True)
+        self.assertIsInstance(df["symbol"].dtype, pd.CategoricalDtype)
+        df = load_price_data(self.csv_path, use_store=False, categorical_symbols=True)
+        self.assertIsInstance(df["symbol"].dtype, pd.CategoricalDtype)
+
+    def test_same_stem_in_other_directory_is_separate(self):
+        """CSVs sharing a file name but not a directory get their own datasets"""
+        other_dir = os.path.join(self.temp_dir, "other")
+        os.makedirs(other_dir)
+        other_csv = os.path.join(other_dir, "prices.csv")
+        _make_price_csv(other_csv, symbols=("BTC/USDC:USDC",))
+
+        self.store.build(self.csv_path)
+        self.store.build(other_csv)
+
+        self.assertNotEqual(self.store.dataset_name(self.csv_path), self.store.dataset_name(other_csv))
+        self.assertTrue(self.store.is_fresh(self.csv_path))
+        self.assertTrue(self.store.is_fresh(other_csv))
+        self.assertEqual(load_dataset(other_csv, store=self.store)["symbol"].nunique(), 1)
+        self.assertEqual(load_dataset(self.csv_path, store=self.store)["symbol"].nunique(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
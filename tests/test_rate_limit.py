@@ -0,0 +1,103 @@
+"""
+Tests for the Token Bucket Rate Limiter
+Tests: burst capacity, refill pacing, try_acquire, penalize and async acquire
+"""
+
+import asyncio
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from common.rate_limit import TokenBucket
+from tests.helpers import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test TokenBucket pacing with a fake clock"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=20.0, capacity=100.0, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_then_throttle(self):
+        """Capacity is spent without waiting, then calls are paced at the rate"""
+        for _ in range(5):
+            self.assertEqual(self.bucket.acquire(20), 0.0)
+
+        wait = self.bucket.acquire(20)
+        self.assertAlmostEqual(wait, 1.0)
+        self.assertAlmostEqual(self.clock.now, 1.0)
+
+    def test_sustained_rate(self):
+        """Long-run throughput never exceeds the refill rate plus the burst"""
+        for _ in range(50):
+            self.bucket.acquire(24)
+
+        spent = 50 * 24
+        self.assertGreaterEqual(self.clock.now * 20.0 + 100.0, spent - 1e-9)
+
+    def test_refill_is_capped(self):
+        """Idle time never accumulates more than the capacity"""
+        self.clock.now += 1000.0
+        self.assertAlmostEqual(self.bucket.available, 100.0)
+
+    def test_try_acquire(self):
+        """try_acquire never waits and only succeeds when tokens are available"""
+        self.assertTrue(self.bucket.try_acquire(100))
+        self.assertFalse(self.bucket.try_acquire(1))
+        self.clock.now += 0.05
+        self.assertTrue(self.bucket.try_acquire(1))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_penalize(self):
+        """penalize() stalls the next caller for the given time"""
+        self.bucket.penalize(2.0)
+        self.assertAlmostEqual(self.bucket.acquire(20), 3.0)
+
+    def test_acquire_async(self):
+        """acquire_async() reserves like acquire() without calling the blocking sleep"""
+        bucket = TokenBucket(rate=1000.0, capacity=1.0, clock=self.clock, sleep=self.clock.sleep)
+
+        async def run():
+            return [await bucket.acquire_async() for _ in range(2)]
+
+        waits = asyncio.run(run())
+        self.assertEqual(waits[0], 0.0)
+        self.assertAlmostEqual(waits[1], 0.001)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_invalid_arguments(self):
+        """Rate and capacity must be positive"""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, capacity=10)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+
+    def test_thread_safe_reservations(self):
+        """Concurrent callers reserve distinct slots"""
+        bucket = TokenBucket(rate=1.0, capacity=10.0, sleep=lambda seconds: None)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = bucket.acquire(5)
+            with lock:
+                waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # 2 fit in the burst; the other 8 wait 5, 10, ... 40 s in turn
+        self.assertEqual(sum(w == 0.0 for w in waits), 2)
+        self.assertEqual(sorted(round(w) for w in waits if w > 0), list(range(5, 45, 5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Tests for the Batched Rolling ADF Engine
+Tests: agreement with statsmodels adfuller, symbol boundaries, and cache reuse
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import warnings
+import pandas as pd
+import numpy as np
+from statsmodels.tsa.adfvalues import mackinnonp
+from statsmodels.tsa.stattools import adfuller
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from signals.calc_rolling_adf import ADFCache, adf_windows, mackinnon_pvalue, rolling_adf
+from execution.strategies.adf import calculate_adf_signals
+
+
+def _random_walks(num_windows, nobs=60, seed=5):
+    rng = np.random.default_rng(seed)
+    return np.array([100 * np.exp(np.cumsum(rng.normal(0, 0.03, nobs))) for _ in range(num_windows)])
+
+
+def _adfuller(window, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return adfuller(window, **kwargs)
+
+
+class TestADFWindows(unittest.TestCase):
+    """Test the batched regressions against adfuller"""
+
+    def test_matches_adfuller(self):
+        """Statistic, p-value and selected lag match for each lag mode and regression"""
+        windows = _random_walks(40)
+        for regression in ("c", "ct", "ctt", "n"):
+            for autolag in ("AIC", "BIC", None):
+                stat, pvalue, used_lag = adf_windows(windows, regression=regression, autolag=autolag)
+                expected = np.array([
+                    _adfuller(w, regression=regression, autolag=autolag)[:3] for w in windows
+                ])
+                np.testing.assert_allclose(stat, expected[:, 0], atol=1e-9)
+                np.testing.assert_allclose(pvalue, expected[:, 1], atol=1e-9)
+                np.testing.assert_array_equal(used_lag, expected[:, 2])
+
+    def test_fixed_lag(self):
+        """An explicit maxlag with autolag=None is used as the lag"""
+        windows = _random_walks(5)
+        stat, _, used_lag = adf_windows(windows, regression="ct", autolag=None, maxlag=3)
+
+        expected = [_adfuller(w, maxlag=3, regression="ct", autolag=None)[0] for w in windows]
+        np.testing.assert_allclose(stat, expected, atol=1e-9)
+        self.assertTrue((used_lag == 3).all())
+
+    def test_constant_and_missing_windows_are_nan(self):
+        """Windows adfuller cannot test give NaN"""
+        windows = _random_walks(3)
+        windows[0] = 5.0
+        windows[1, 10] = np.nan
+
+        stat, pvalue, _ = adf_windows(windows)
+
+        self.assertTrue(np.isnan(stat[:2]).all())
+        self.assertTrue(np.isnan(pvalue[:2]).all())
+        self.assertFalse(np.isnan(stat[2]))
+
+    def test_pvalue_matches_mackinnonp(self):
+        """Vectorized p-values match mackinnonp across both tails"""
+        stats = np.array([-30.0, -5.0, -3.0, -2.89, -1.5, -1.0, 0.5, 0.6, 2.0, 3.0])
+        for regression in ("n", "c", "ct", "ctt"):
+            expected = [mackinnonp(s, regression=regression) for s in stats]
+            np.testing.assert_allclose(mackinnon_pvalue(stats, regression), expected)
+
+
+class TestRollingADF(unittest.TestCase):
+    """Test rolling evaluation and the persistent cache"""
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.window = 60
+        self.values = np.concatenate([100 * np.exp(np.cumsum(rng.normal(0, 0.03, n))) for n in (90, 70)])
+        self.groups = np.repeat(["A", "B"], [90, 70])
+        self.dates = np.concatenate([
+            pd.date_range("2024-01-01", periods=90, freq="D").values,
+            pd.date_range("2024-01-01", periods=70, freq="D").values,
+        ])
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ADFCache(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_windows_do_not_cross_symbols(self):
+        """Row i tests the window ending at i within its own symbol"""
+        result = rolling_adf(self.values, self.groups, window=self.window)
+
+        self.assertTrue(result["adf_stat"].iloc[: self.window - 1].isna().all())
+        self.assertTrue(result["adf_stat"].iloc[90 : 90 + self.window - 1].isna().all())
+        expected = _adfuller(self.values[100:160], regression="ct", autolag="AIC")[0]
+        self.assertAlmostEqual(result["adf_stat"].iloc[159], expected, places=9)
+
+    def test_cache_round_trip(self):
+        """A second run reads every window from the cache"""
+        first = rolling_adf(self.values, self.groups, self.dates, window=self.window, cache=self.cache)
+
+        # Tamper with the cache: a reused entry must come back unchanged
+        cached = self.cache.load(self.window, "ct", "AIC")
+        self.assertEqual(len(cached), first["adf_stat"].notna().sum())
+        cached["adf_stat"] = -99.0
+        self.cache.store(cached, self.window, "ct", "AIC")
+
+        second = rolling_adf(self.values, self.groups, self.dates, window=self.window, cache=self.cache)
+        self.assertTrue((second["adf_stat"].dropna() == -99.0).all())
+
+    def test_revised_prices_are_recomputed(self):
+        """A cached window whose prices changed is computed again"""
+        rolling_adf(self.values, self.groups, self.dates, window=self.window, cache=self.cache)
+        revised = self.values.copy()
+        revised[80] *= 1.05
+
+        result = rolling_adf(revised, self.groups, self.dates, window=self.window, cache=self.cache)
+
+        # Windows ending at rows 80..89 contain the revised price
+        expected = _adfuller(revised[30:90], regression="ct", autolag="AIC")[0]
+        self.assertAlmostEqual(result["adf_stat"].iloc[89], expected, places=9)
+        cached = self.cache.load(self.window, "ct", "AIC")
+        self.assertEqual(len(cached), result["adf_stat"].notna().sum())
+
+    def test_new_day_only_computes_new_window(self):
+        """Appending a day adds exactly one window to the cache"""
+        keep = np.r_[np.arange(89), np.arange(90, 160)]
+        rolling_adf(self.values[keep], self.groups[keep], self.dates[keep], window=self.window, cache=self.cache)
+        before = len(self.cache.load(self.window, "ct", "AIC"))
+
+        result = rolling_adf(self.values, self.groups, self.dates, window=self.window, cache=self.cache)
+
+        self.assertEqual(len(self.cache.load(self.window, "ct", "AIC")), before + 1)
+        expected = _adfuller(self.values[30:90], regression="ct", autolag="AIC")[0]
+        self.assertAlmostEqual(result["adf_stat"].iloc[89], expected, places=9)
+
+
+class TestLiveADFSignals(unittest.TestCase):
+    """Live strategy uses the engine on the most recent window"""
+
+    def test_latest_window_matches_adfuller(self):
+        rng = np.random.default_rng(9)
+        historical_data = {}
+        for symbol in ("AAA", "BBB"):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, 80)))
+            historical_data[symbol] = pd.DataFrame({
+                "date": pd.date_range("2099-01-01", periods=80, freq="D"),
+                "close": close,
+            })
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = calculate_adf_signals(
+                historical_data, ["AAA", "BBB", "MISSING"], adf_window=60, cache=ADFCache(tmpdir)
+            )
+
+        self.assertEqual(result["symbol"].tolist(), ["AAA", "BBB"])
+        for _, row in result.iterrows():
+            expected = _adfuller(historical_data[row["symbol"]]["close"].values[-60:], regression="ct", autolag="AIC")
+            self.assertAlmostEqual(row["adf_stat"], np.clip(expected[0], -20, 0), places=9)
+            self.assertAlmostEqual(row["adf_pvalue"], expected[1], places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the Rolling Higher-Moment Kernel
+Tests: agreement with scipy.stats skew/kurtosis, NaN handling and row alignment
+"""
+
+import unittest
+import sys
+import os
+import io
+import contextlib
+import warnings
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backtests", "scripts"))
+
+from signals.calc_rolling_moments import calculate_rolling_moments, rolling_higher_moments
+from backtests.scripts.backtest_vectorized import prepare_factor_data
+from execution.strategies.kurtosis import strategy_kurtosis
+
+
+def _reference(values, window, min_periods, **kwargs):
+    """Per-window scipy loop, as the kurtosis/skew modules used to compute it."""
+    rows = []
+    for i in range(len(values)):
+        window_values = values[max(0, i - window + 1) : i + 1]
+        valid = window_values[~np.isnan(window_values)]
+        if i < window - 1 or len(valid) < min_periods:
+            rows.append([np.nan, np.nan])
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rows.append([
+                stats.skew(valid, bias=kwargs.get("bias", True)),
+                stats.kurtosis(valid, **kwargs),
+            ])
+    return np.array(rows)
+
+
+class TestRollingHigherMoments(unittest.TestCase):
+    """Test the vectorized kernel against scipy"""
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.window = 30
+        self.series = []
+        for _ in range(3):
+            values = rng.standard_t(4, 150) * 0.03
+            values[rng.random(150) < 0.1] = np.nan
+            self.series.append(values)
+        self.series[1][60:95] = 0.01  # constant stretch -> zero variance
+
+    def test_matches_scipy(self):
+        """Skewness and kurtosis match scipy for each bias / fisher setting"""
+        values = np.concatenate(self.series)
+        groups = np.repeat(["A", "B", "C"], 150)
+
+        for kwargs in ({}, {"bias": False}, {"fisher": False}):
+            result = rolling_higher_moments(values, groups, window=self.window, min_periods=20, **kwargs)
+
+            expected = np.vstack([_reference(v, self.window, 20, **kwargs) for v in self.series])
+            np.testing.assert_allclose(result[["skewness", "kurtosis"]].values, expected, rtol=1e-9, atol=1e-12)
+
+    def test_full_window_required_by_default(self):
+        """Without min_periods any NaN in the window gives NaN (pandas min_periods=window)"""
+        values = np.linspace(0.0, 1.0, 40) ** 2
+        values[5] = np.nan
+
+        result = rolling_higher_moments(values, np.zeros(40), window=30)
+
+        self.assertTrue(result["kurtosis"].iloc[:35].isna().all())
+        self.assertTrue(result["kurtosis"].iloc[35:].notna().all())
+
+    def test_wrapper_keeps_row_order(self):
+        """Interleaved symbols are grouped without reordering rows within a symbol"""
+        df = pd.DataFrame({"symbol": np.tile(["A", "B"], 150), "daily_return": np.nan})
+        df.loc[df["symbol"] == "A", "daily_return"] = self.series[0]
+        df.loc[df["symbol"] == "B", "daily_return"] = self.series[2]
+
+        result = calculate_rolling_moments(df, window=self.window)
+
+        expected = df.groupby("symbol")["daily_return"].transform(
+            lambda x: x.rolling(window=self.window, min_periods=self.window).apply(stats.kurtosis, raw=True)
+        )
+        np.testing.assert_allclose(result["kurtosis"].values, expected.values, rtol=1e-9)
+
+
+class TestMomentConsumers(unittest.TestCase):
+    """Factor preparation and the live strategy use the kernel"""
+
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        frames = []
+        for symbol in ("AAA", "BBB", "CCC"):
+            close = 100 * np.exp(np.cumsum(rng.standard_t(3, 90) * 0.03))
+            frames.append(pd.DataFrame({
+                "date": pd.date_range("2024-01-01", periods=90, freq="D"),
+                "symbol": symbol,
+                "close": close,
+            }))
+        self.prices = pd.concat(frames, ignore_index=True)
+
+    def test_prepare_factor_data_skew(self):
+        df = prepare_factor_data(self.prices, "skew", skew_window=20)
+
+        expected = df.groupby("symbol")["daily_return"].transform(
+            lambda x: x.rolling(window=20, min_periods=20).apply(stats.skew, raw=True)
+        )
+        np.testing.assert_allclose(df["skewness_20d"].values, expected.values, rtol=1e-9)
+
+    def test_live_kurtosis_ranks_latest_window(self):
+        """Live momentum strategy longs the highest and shorts the lowest scipy kurtosis"""
+        historical_data = {s: g.drop(columns="symbol") for s, g in self.prices.groupby("symbol")}
+        kurtosis = {
+            s: stats.kurtosis(np.log(df["close"] / df["close"].shift(1)).tail(30).dropna())
+            for s, df in historical_data.items()
+        }
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            positions = strategy_kurtosis(
+                historical_data,
+                list(historical_data),
+                1000.0,
+                top_n=1,
+                bottom_n=1,
+                strategy_type="momentum",
+                weighting_method="equal_weight",
+                regime_filter="always",
+            )
+
+        self.assertGreater(positions[max(kurtosis, key=kurtosis.get)], 0)
+        self.assertLess(positions[min(kurtosis, key=kurtosis.get)], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
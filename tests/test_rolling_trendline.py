@@ -0,0 +1,107 @@
+"""
+Tests for the Rolling Trendline Kernel
+Tests: agreement with scipy.stats.linregress, NaN handling and symbol boundaries
+"""
+
+import unittest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from scipy import stats
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from signals.calc_rolling_trendline import rolling_linregress
+from signals.calc_trendline_breakout_signals import calculate_rolling_trendline
+
+
+def _reference(values, window):
+    """Per-window linregress loop, as the trendline modules used to compute it."""
+    rows = []
+    for i in range(len(values)):
+        if i < window - 1:
+            rows.append([np.nan] * 6)
+            continue
+        prices = values[i - window + 1 : i + 1]
+        valid = prices[~np.isnan(prices)]
+        if len(valid) < int(window * 0.7):
+            rows.append([np.nan] * 6)
+            continue
+        fit = stats.linregress(np.arange(len(valid)), valid)
+        predicted = fit.slope * (len(valid) - 1) + fit.intercept
+        rows.append([fit.slope, fit.intercept, fit.rvalue**2, fit.pvalue, fit.stderr, predicted])
+    return np.array(rows)
+
+
+class TestRollingLinregress(unittest.TestCase):
+    """Test the vectorized kernel against scipy"""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.window = 30
+        self.series = []
+        for _ in range(3):
+            values = 100 + np.cumsum(rng.normal(0, 1, 120))
+            values[rng.random(120) < 0.2] = np.nan
+            self.series.append(values)
+
+    def test_matches_linregress(self):
+        """Slope, intercept, R², p-value, std-err and prediction match per window"""
+        values = np.concatenate(self.series)
+        groups = np.repeat(["A", "B", "C"], 120)
+
+        result = rolling_linregress(values, groups, window=self.window)
+
+        expected = np.vstack([_reference(v, self.window) for v in self.series])
+        np.testing.assert_allclose(
+            result[["slope", "intercept", "r_squared", "p_value", "std_err", "predicted_price"]].values,
+            expected,
+            rtol=1e-9,
+            atol=1e-12,
+        )
+
+    def test_windows_do_not_cross_symbols(self):
+        """The first window - 1 rows of each symbol are NaN"""
+        values = np.concatenate(self.series)
+        groups = np.repeat(["A", "B", "C"], 120)
+
+        result = rolling_linregress(values, groups, window=self.window)
+
+        for start in (0, 120, 240):
+            self.assertTrue(result["slope"].iloc[start : start + self.window - 1].isna().all())
+
+    def test_min_periods(self):
+        """Windows with fewer than 70% valid prices are NaN"""
+        values = np.arange(40, dtype=float)
+        values[5:15] = np.nan  # windows ending at 29..34 see only 20 valid prices
+
+        result = rolling_linregress(values, np.zeros(40), window=30)
+
+        self.assertTrue(result["slope"].iloc[29:35].isna().all())
+        self.assertAlmostEqual(result["slope"].iloc[35], 1.0)
+
+
+class TestCalculateRollingTrendline(unittest.TestCase):
+    """Test the DataFrame wrapper used by the signal module"""
+
+    def test_unsorted_input_is_aligned(self):
+        """Metrics are attached to the right (symbol, date) rows"""
+        dates = pd.date_range("2024-01-01", periods=40, freq="D")
+        df = pd.concat([
+            pd.DataFrame({"date": dates, "symbol": "UP", "close": np.arange(40, dtype=float) + 10}),
+            pd.DataFrame({"date": dates, "symbol": "DOWN", "close": 100 - 2.0 * np.arange(40)}),
+        ]).sample(frac=1.0, random_state=0)
+
+        result = calculate_rolling_trendline(df, window=30)
+        last = result.groupby("symbol").tail(1).set_index("symbol")
+
+        self.assertAlmostEqual(last.loc["UP", "slope"], 1.0)
+        self.assertAlmostEqual(last.loc["DOWN", "slope"], -2.0)
+        self.assertAlmostEqual(last.loc["UP", "r_squared"], 1.0)
+        self.assertAlmostEqual(last.loc["DOWN", "predicted_price"], 100 - 2.0 * 39)
+
+
+if __name__ == "__main__":
+    unittest.main()
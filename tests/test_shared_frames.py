@@ -0,0 +1,73 @@
+"""
+Tests for Shared-Memory DataFrames
+Tests: round-trip of typed columns, read-only views, and attaching from a worker process
+"""
+
+import unittest
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backtests.scripts.shared_frames import SharedFramePool, attach_frame, detach_all
+
+
+def _make_frame():
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=6, freq="D"),
+        "symbol": ["BTC", "ETH", None, "BTC", "SOL", "ETH"],
+        "close": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0],
+        "volume": np.arange(6, dtype=np.int64),
+        "is_active": [True, False, True, True, False, True],
+        "sector": pd.Categorical(["L1", "L1", "DeFi", "L1", "L1", "DeFi"]),
+    })
+
+
+def _sum_close_in_worker(descriptor):
+    df = attach_frame(descriptor)
+    return float(df["close"].sum()), df["symbol"].tolist()
+
+
+class TestSharedFramePool(unittest.TestCase):
+    """Test publishing and attaching DataFrames"""
+
+    def tearDown(self):
+        detach_all()
+
+    def test_round_trip_preserves_values_and_dtypes(self):
+        """Attached frame equals the original, column by column"""
+        df = _make_frame()
+        with SharedFramePool({"prices": df, "missing": None}) as pool:
+            self.assertIsNone(pool.descriptors["missing"])
+            attached = attach_frame(pool.descriptors["prices"])
+            pd.testing.assert_frame_equal(attached, df)
+            detach_all()
+
+    def test_numeric_columns_are_read_only(self):
+        """Workers cannot mutate the shared buffers in place"""
+        with SharedFramePool({"prices": _make_frame()}) as pool:
+            attached = attach_frame(pool.descriptors["prices"])
+            with self.assertRaises(ValueError):
+                attached["close"].to_numpy()[0] = 99.0
+            del attached
+            detach_all()
+
+    def test_worker_process_attaches(self):
+        """A separate process reads the published frame"""
+        with SharedFramePool({"prices": _make_frame()}) as pool:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                total, symbols = executor.submit(
+                    _sum_close_in_worker, pool.descriptors["prices"]
+                ).result()
+
+        self.assertEqual(total, 18.0)
+        self.assertEqual(symbols[:2], ["BTC", "ETH"])
+        self.assertTrue(pd.isna(symbols[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
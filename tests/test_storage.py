@@ -0,0 +1,49 @@
+"""
+Tests for the shared cache storage helpers
+Tests: atomic replace, failed writes keep the previous file, no temp files left behind
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from common.storage import write_atomic
+
+
+class TestWriteAtomic(unittest.TestCase):
+    """Test write_atomic replace and cleanup"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.path = self.dir / "data.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_and_replaces(self):
+        write_atomic(self.path, lambda p: p.write_text("first"))
+        write_atomic(self.path, lambda p: p.write_text("second"))
+        self.assertEqual(self.path.read_text(), "second")
+        self.assertEqual(list(self.dir.iterdir()), [self.path])
+
+    def test_failed_write_keeps_previous_file(self):
+        self.path.write_text("original")
+
+        def fail(p):
+            p.write_text("partial")
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            write_atomic(self.path, fail)
+        self.assertEqual(self.path.read_text(), "original")
+        self.assertEqual(list(self.dir.iterdir()), [self.path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests for the shared strategy feature layer and concurrent strategy runner
+Tests: strategies give the same positions with and without StrategyFeatures,
+the vectorized days-since-200d-high, and per-strategy output capture/timing
+"""
+
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+from execution.strategies import (
+    StrategyFeatures,
+    strategy_beta,
+    strategy_breakout,
+    strategy_days_from_high,
+    strategy_kurtosis,
+    strategy_volatility,
+)
+from signals.calc_days_from_high import get_current_days_since_high
+from strategy_runner import run_strategies
+from tests.helpers import quiet
+
+BTC = "BTC/USDC:USDC"
+
+
+def _historical_data(num_symbols=12, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for k in range(num_symbols):
+        n = 120 if k % 4 == 3 else 240
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, n)))
+        symbol = BTC if k == 0 else f"C{k}/USDC:USDC"
+        data[symbol] = pd.DataFrame(
+            {
+                "date": pd.date_range("2024-01-01", periods=n, freq="D"),
+                "open": close,
+                "high": close * rng.uniform(1.0, 1.02, n),
+                "low": close * 0.98,
+                "close": close,
+                "volume": rng.uniform(1, 2, n),
+            }
+        )
+    return data
+
+
+class TestStrategyFeatures(unittest.TestCase):
+    """Test strategies reading the shared feature layer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data = _historical_data()
+        cls.symbols = list(cls.data)
+        cls.features = StrategyFeatures(cls.data)
+
+    def _assert_same_positions(self, fn, *args, **kwargs):
+        expected = quiet(fn, *args, **kwargs)
+        actual = quiet(fn, *args, features=self.features, **kwargs)
+        self.assertTrue(expected)
+        self.assertEqual(expected.keys(), actual.keys())
+        for symbol, notional in expected.items():
+            self.assertAlmostEqual(actual[symbol], notional, places=6)
+
+    def test_breakout_and_days_from_high(self):
+        self._assert_same_positions(strategy_breakout, self.data, 1000.0)
+        self._assert_same_positions(strategy_days_from_high, self.data, 1000.0, max_days=60)
+
+    def test_volatility_and_beta(self):
+        self._assert_same_positions(
+            strategy_volatility, self.data, self.symbols, 1000.0, top_n=3, bottom_n=3
+        )
+        self._assert_same_positions(
+            strategy_beta, self.data, self.symbols, 1000.0, top_n=3, bottom_n=3
+        )
+
+    def test_kurtosis_regime_detected_once(self):
+        """The regime is cached on the feature layer"""
+        kwargs = {"regime_filter": "always", "reference_symbol": BTC, "top_n": 3, "bottom_n": 3}
+        self._assert_same_positions(strategy_kurtosis, self.data, self.symbols, 1000.0, **kwargs)
+        self.assertIs(self.features.market_regime(BTC), self.features.market_regime(BTC))
+
+    def test_days_from_high_matches_signal_module(self):
+        combined = pd.concat(
+            [df.assign(symbol=symbol) for symbol, df in self.data.items()], ignore_index=True
+        )
+        latest = get_current_days_since_high(combined)
+        expected = dict(zip(latest["symbol"], latest["days_since_200d_high"].astype(int)))
+        self.assertEqual(self.features.days_from_high, expected)
+
+    def test_returns_frame_is_a_copy(self):
+        frame = self.features.returns_frame(BTC)
+        frame["daily_return"] = 0.0
+        self.assertFalse((self.features.returns_frame(BTC)["daily_return"] == 0.0).all())
+
+
+def _slow_strategy(name, delay):
+    print(f"running {name}")
+    time.sleep(delay)
+    return {name: 1.0}
+
+
+def _failing_strategy():
+    print("about to fail")
+    raise ValueError("no data")
+
+
+class TestRunStrategies(unittest.TestCase):
+    """Test concurrent evaluation"""
+
+    def test_concurrent_with_captured_output(self):
+        """Strategies overlap in time and each keeps its own log"""
+        tasks = {name: (_slow_strategy, (name, 0.2), {}) for name in ("a", "b", "c")}
+        start = time.perf_counter()
+        results = quiet(run_strategies, tasks, max_workers=3)
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(list(results), ["a", "b", "c"])
+        for name, result in results.items():
+            self.assertEqual(result.contributions, {name: 1.0})
+            self.assertEqual(result.output, f"running {name}\n")
+            self.assertGreaterEqual(result.elapsed, 0.2)
+
+    def test_error_yields_empty_contribution(self):
+        tasks = {"ok": (_slow_strategy, ("ok", 0.0), {}), "bad": (_failing_strategy, (), {})}
+        results = run_strategies(tasks, max_workers=1)
+
+        self.assertEqual(results["bad"].contributions, {})
+        self.assertEqual(results["bad"].error, "no data")
+        self.assertEqual(results["bad"].output, "about to fail\n")
+        self.assertIsNone(results["ok"].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
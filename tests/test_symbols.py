@@ -0,0 +1,122 @@
+"""
+Tests for symbol normalization and the universe index
+Tests: venue symbol parsing, stable asset ids across venues and reloads,
+validity ranges and shared categorical codes
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from common.symbols import SymbolIndex, base_asset, base_assets, coinalyze_symbol
+
+
+class TestParsing(unittest.TestCase):
+    """Test the venue symbol parsers"""
+
+    def test_base_asset_per_venue(self):
+        self.assertEqual(base_asset("BTC/USDC:USDC"), "BTC")
+        self.assertEqual(base_asset("ETH/USD"), "ETH")
+        self.assertEqual(base_asset("SOL"), "SOL")
+        # Coinalyze forms only parse with the venue, other dotted tickers are kept
+        self.assertEqual(base_asset("BTC.H"), "BTC.H")
+        self.assertEqual(base_asset("BTC.H", "coinalyze"), "BTC")
+        self.assertEqual(base_asset("1000PEPEUSDT_PERP.A", "coinalyze"), "1000PEPE")
+        self.assertEqual(base_asset("ETHUSD_PERP.0", "coinalyze"), "ETH")
+
+    def test_base_assets_keeps_index_and_missing(self):
+        symbols = pd.Series(["BTC/USD", None, "ETH/USD", "BTC/USD"], index=[5, 6, 7, 8])
+        result = base_assets(symbols)
+        self.assertEqual(list(result.index), [5, 6, 7, 8])
+        self.assertEqual(result.tolist()[::2], ["BTC", "ETH"])
+        self.assertTrue(pd.isna(result[6]))
+
+    def test_coinalyze_symbol_round_trip(self):
+        for code in ("A", "H", "4"):
+            symbol = coinalyze_symbol("BTC", "USDT", code)
+            self.assertEqual(base_asset(symbol, "coinalyze"), "BTC")
+        self.assertEqual(coinalyze_symbol("BTC", "USDC", "A"), "BTCUSDT_PERP.A")
+
+
+class TestSymbolIndex(unittest.TestCase):
+    """Test registration, lookups and persistence"""
+
+    def setUp(self):
+        self.index = SymbolIndex()
+        self.index.add("hyperliquid", ["BTC/USDC:USDC", "ETH/USDC:USDC"])
+        self.index.add(
+            "coinalyze",
+            ["BTCUSDT_PERP.A", "BTCUSDT_PERP.A", "SOL.H"],
+            dates=["2024-01-01", "2024-06-30", "2024-03-01"],
+        )
+        self.index.add("defillama", ["SKY", "AAVE"], bases={"SKY": "MKR"})
+
+    def test_same_asset_same_code_across_venues(self):
+        self.assertEqual(self.index.assets, ["BTC", "ETH", "SOL", "AAVE", "MKR"])
+        codes = self.index.codes(["BTCUSDT_PERP.A", "SOL.H", "XRP.H", None], venue="coinalyze")
+        np.testing.assert_array_equal(codes, [0, 2, -1, -1])
+        np.testing.assert_array_equal(self.index.codes(["BTC/USD", "SKY"]), [0, -1])
+        np.testing.assert_array_equal(self.index.codes(["SKY"], venue="defillama"), [4])
+
+    def test_add_extends_ranges_without_renumbering(self):
+        added = self.index.add(
+            "coinalyze", ["BTCUSDT_PERP.A", "XRPUSDT_PERP.A"], dates=["2024-09-01", "2024-09-01"]
+        )
+        self.assertEqual(added, 1)
+        self.assertEqual(self.index.asset_id("MKR"), 4)
+        self.assertEqual(self.index.asset_id("XRP"), 5)
+
+        btc = self.index.table[self.index.table["symbol"] == "BTCUSDT_PERP.A"].iloc[0]
+        self.assertEqual(btc["valid_from"], pd.Timestamp("2024-01-01"))
+        self.assertEqual(btc["valid_to"], pd.Timestamp("2024-09-01"))
+
+    def test_venue_symbol_respects_validity(self):
+        lookup = self.index.venue_symbol
+        self.assertEqual(lookup("BTC", "coinalyze", "2024-03-15"), "BTCUSDT_PERP.A")
+        self.assertIsNone(lookup("BTC", "coinalyze", "2023-12-31"))
+        # Open-ended ranges match any date
+        self.assertEqual(lookup("ETH", "hyperliquid", "2020-01-01"), "ETH/USDC:USDC")
+        self.assertIsNone(lookup("DOGE", "hyperliquid"))
+
+    def test_categoricals_share_codes_for_joins(self):
+        prices = pd.DataFrame({"symbol": ["ETH/USDC:USDC", "BTC/USDC:USDC"], "close": [2.0, 1.0]})
+        funding = pd.DataFrame({"symbol": ["BTCUSDT_PERP.A"], "funding_rate": [0.01]})
+        prices["asset"] = self.index.categorical(prices["symbol"], venue="hyperliquid")
+        funding["asset"] = self.index.categorical(funding["symbol"], venue="coinalyze")
+
+        self.assertEqual(prices["asset"].dtype, funding["asset"].dtype)
+        merged = prices.merge(funding[["asset", "funding_rate"]], on="asset", how="left")
+        self.assertEqual(merged["funding_rate"].isna().tolist(), [True, False])
+        self.assertEqual(list(prices["asset"].cat.codes), [1, 0])
+
+    def test_register_unknown_assets(self):
+        """Registered assets get new ids after the known ones and survive a reload"""
+        codes = self.index.codes(["DOGE/USD", "BTC/USD", "DOGE/USD"], register=True)
+        np.testing.assert_array_equal(codes, [5, 0, 5])
+        self.assertEqual(self.index.assets[5], "DOGE")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded = SymbolIndex.load(self.index.save(os.path.join(tmp, "index.parquet")))
+        self.assertEqual(loaded.asset_id("DOGE"), 5)
+
+    def test_save_and_load_keep_ids(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("index.parquet", "index.csv"):
+                loaded = SymbolIndex.load(self.index.save(os.path.join(tmp, name)))
+                self.assertEqual(loaded.assets, self.index.assets)
+                self.assertEqual(loaded.venue_symbol("MKR", "defillama"), "SKY")
+                self.assertEqual(
+                    loaded.venue_symbol("BTC", "coinalyze", "2024-02-01"), "BTCUSDT_PERP.A"
+                )
+            self.assertEqual(len(SymbolIndex.load(os.path.join(tmp, "missing.parquet"))), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
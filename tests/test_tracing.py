@@ -0,0 +1,188 @@
+"""
+Tests for per-run tracing
+Tests: span nesting and timing, API call attribution, spans across worker
+threads and asyncio tasks, the ccxt fetch hook and the JSON timeline
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+from common import tracing
+from common.tracing import count_api_call, span, stage, start_run, stop_run, traced
+from strategy_runner import run_strategies
+from tests.helpers import FakeClock
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracer = start_run("test", clock=self.clock)
+
+    def tearDown(self):
+        stop_run()
+
+    def spans(self, name):
+        return [s for s in self.tracer.spans if s.name == name]
+
+
+class TestSpans(TracingTestCase):
+    """Test nesting, timing and API call attribution"""
+
+    def test_nesting_and_api_calls(self):
+        """Calls count towards every open span; stage() closes the previous stage"""
+        stage("markets")
+        self.clock.now = 1.0
+        count_api_call("ccxt.hyperliquid", "info:meta")
+        stage("ohlcv")
+        with span("fetch", symbol="BTC"):
+            self.clock.now = 3.0
+            count_api_call("ccxt.hyperliquid", "info:candleSnapshot", 2)
+        self.clock.now = 4.0
+        self.tracer.finish()
+
+        markets, ohlcv, fetch = self.tracer.spans
+        self.assertEqual((markets.duration, ohlcv.duration, fetch.duration), (1.0, 3.0, 2.0))
+        self.assertIs(fetch.parent, ohlcv)
+        self.assertIsNone(ohlcv.parent)
+        self.assertEqual(dict(markets.api_calls), {"ccxt.hyperliquid": 1})
+        self.assertEqual(dict(ohlcv.api_calls), {"ccxt.hyperliquid": 2})
+        self.assertEqual(fetch.attrs, {"symbol": "BTC"})
+        self.assertEqual(
+            self.tracer.api_calls["ccxt.hyperliquid"],
+            {"info:meta": 1, "info:candleSnapshot": 2},
+        )
+
+    def test_error_recorded_and_decorator(self):
+        @traced("load")
+        def load():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            load()
+        self.assertEqual(self.spans("load")[0].error, "ValueError: boom")
+
+    def test_off_without_run(self):
+        stop_run()
+        with span("ignored") as s:
+            count_api_call("coinalyze", "funding-rate")
+        s.end()
+        self.assertEqual(self.tracer.spans, [])
+
+
+class TestConcurrentSpans(TracingTestCase):
+    """Test spans opened from worker threads and asyncio tasks"""
+
+    def test_strategy_runner_nests_under_caller(self):
+        def strategy(name):
+            count_api_call("coinalyze", name)
+            return {name: 1.0}
+
+        tasks = {name: (strategy, (name,), {}) for name in ("carry", "size")}
+        with span("strategies") as parent:
+            run_strategies(tasks, max_workers=2)
+
+        for name in tasks:
+            (child,) = self.spans(f"strategy.{name}")
+            self.assertIs(child.parent, parent)
+            self.assertEqual(dict(child.api_calls), {"coinalyze": 1})
+        self.assertEqual(dict(parent.api_calls), {"coinalyze": 2})
+
+    def test_async_ticks_per_task(self):
+        async def ticks(symbol):
+            for n in range(2):
+                with span("execution.tick", symbol=symbol, tick=n):
+                    await asyncio.sleep(0)
+
+        async def run():
+            with span("execution"):
+                await asyncio.gather(ticks("BTC"), ticks("ETH"))
+
+        asyncio.run(run())
+        execution = self.spans("execution")[0]
+        tick_spans = self.spans("execution.tick")
+        self.assertEqual(len(tick_spans), 4)
+        self.assertTrue(all(s.parent is execution for s in tick_spans))
+
+
+class TestCcxtHook(TracingTestCase):
+    """Test request counting on ccxt clients"""
+
+    def test_sync_and_async_fetch_counted(self):
+        """Counted before the request is sent, so failed requests count too"""
+        exchange = ccxt.hyperliquid()
+        exchange.session = Mock(request=Mock(side_effect=OSError("offline")), headers={})
+        with self.assertRaisesRegex(OSError, "offline"):
+            exchange.fetch("https://api.hyperliquid.xyz/info", "POST", {}, '{"type": "meta"}')
+        exchange.session.request.assert_called_once()
+
+        async def fetch_async():
+            exchange = ccxt_async.hyperliquid()
+            session = Mock(post=Mock(side_effect=OSError("offline")), headers={}, close=AsyncMock())
+            exchange.session = session
+            try:
+                with self.assertRaisesRegex(OSError, "offline"):
+                    await exchange.fetch("https://api.hyperliquid.xyz/info", "POST", {}, "{}")
+            finally:
+                await exchange.close()
+            session.post.assert_called_once()
+
+        asyncio.run(fetch_async())
+        self.assertEqual(self.tracer.api_calls["ccxt.hyperliquid"], {"info:meta": 1, "info": 1})
+
+    def test_endpoint_names(self):
+        self.assertEqual(
+            tracing._ccxt_endpoint(
+                "https://api.hyperliquid.xyz/exchange", '{"action": {"type": "batchModify"}}'
+            ),
+            "exchange:batchModify",
+        )
+        self.assertEqual(tracing._ccxt_endpoint("https://x.io/v1/ticker?symbol=BTC", None), "ticker")
+
+
+class TestTimeline(TracingTestCase):
+    """Test the summary table and JSON output"""
+
+    def test_summary_and_write(self):
+        for n in range(3):
+            with span("execution.tick", tick=n):
+                self.clock.now += 0.5 * (n + 1)
+        self.tracer.finish()
+
+        (row,) = self.tracer.summary()
+        self.assertEqual((row["count"], row["total"], row["max"]), (3, 3.0, 1.5))
+        self.assertIn("execution.tick", self.tracer.format_summary())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(self.tracer.write(tmp)) as f:
+                timeline = json.load(f)
+        self.assertEqual(timeline["run"], "test")
+        self.assertEqual([s["start"] for s in timeline["spans"]], [0.0, 0.5, 1.5])
+        self.assertEqual(timeline["spans"][2]["attrs"], {"tick": 2})
+
+    def test_traced_run_prints_and_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                with tracing.traced_run("rebalance", tmp):
+                    stage("markets")
+            self.assertEqual(len(os.listdir(tmp)), 1)
+        self.assertIn("RUN TIMING: rebalance", output.getvalue())
+        self.assertIsNone(tracing.get_tracer())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for the strategy x symbol weight matrix
+Tests: contribution alignment, capital reallocation, single-step netting and
+the diff/threshold trade list used by execution/main.py
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add parent and execution directories to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "execution"))
+
+from weight_matrix import (
+    build_contribution_matrix,
+    matrix_to_contributions,
+    net_positions,
+    reallocate_strategy_weights,
+    scale_contributions,
+    trade_frame,
+)
+
+CONTRIBUTIONS = {
+    "breakout": {"BTC": 300.0, "ETH": -100.0},
+    "size": {"ETH": 200.0, "SOL": -50.0},
+    "carry": {},
+    "kurtosis": {},
+}
+WEIGHTS = pd.Series({"breakout": 0.4, "size": 0.2, "carry": 0.3, "kurtosis": 0.1})
+
+
+class TestContributionMatrix(unittest.TestCase):
+    """Test alignment and netting"""
+
+    def test_alignment_and_netting(self):
+        """Missing entries are zero and netting sums each symbol across strategies"""
+        matrix = build_contribution_matrix(CONTRIBUTIONS)
+
+        self.assertEqual(list(matrix.index), list(CONTRIBUTIONS))
+        self.assertEqual(list(matrix.columns), ["BTC", "ETH", "SOL"])
+        self.assertEqual(matrix.loc["carry"].abs().sum(), 0.0)
+        net = net_positions(matrix).to_dict()
+        self.assertEqual(net, {"BTC": 300.0, "ETH": 100.0, "SOL": -50.0})
+
+    def test_round_trip_keeps_sparse_keys(self):
+        matrix = build_contribution_matrix(CONTRIBUTIONS)
+        self.assertEqual(matrix_to_contributions(matrix, CONTRIBUTIONS), CONTRIBUTIONS)
+
+    def test_empty(self):
+        matrix = build_contribution_matrix({"carry": {}})
+        self.assertTrue(net_positions(matrix).empty)
+
+
+class TestReallocation(unittest.TestCase):
+    """Test redistribution of inactive strategy weight"""
+
+    def test_inactive_flexible_weight_goes_to_flexible(self):
+        """Fixed strategies keep their weight; flexible ones absorb the rest"""
+        active = pd.Series({"breakout": True, "size": True, "carry": False, "kurtosis": False})
+        rebalanced = reallocate_strategy_weights(WEIGHTS, active)
+
+        self.assertAlmostEqual(rebalanced["breakout"], 0.4)
+        self.assertAlmostEqual(rebalanced["size"], 0.6)
+        self.assertEqual(list(rebalanced.index), ["breakout", "size"])
+
+        matrix = scale_contributions(build_contribution_matrix(CONTRIBUTIONS), WEIGHTS, rebalanced)
+        net = net_positions(matrix)
+        pd.testing.assert_series_equal(
+            net, pd.Series({"BTC": 300.0, "ETH": 500.0, "SOL": -150.0}), check_names=False
+        )
+
+    def test_only_fixed_active(self):
+        active = pd.Series({"breakout": True, "size": False, "carry": False, "kurtosis": False})
+        self.assertEqual(reallocate_strategy_weights(WEIGHTS, active).to_dict(), {"breakout": 0.4})
+
+    def test_nothing_to_redistribute(self):
+        """Only fixed strategies inactive: weights unchanged"""
+        active = pd.Series({"breakout": False, "size": True, "carry": True, "kurtosis": True})
+        pd.testing.assert_series_equal(reallocate_strategy_weights(WEIGHTS, active), WEIGHTS)
+
+
+class TestTrades(unittest.TestCase):
+    """Test diff and threshold against current positions"""
+
+    def test_threshold_and_neutralize(self):
+        """Off-target positions always close; on-target ones trade past the threshold"""
+        targets = pd.Series({"BTC": 300.0, "ETH": 100.0, "SOL": -50.0, "AVAX": -80.0})
+        current = pd.Series({"BTC": 290.0, "ETH": -100.0, "DOGE": -5.0})
+        frame = trade_frame(targets, current, 1000.0, threshold=0.05)
+        trades = frame.loc[frame["trade"], "difference"].to_dict()
+
+        # SOL sits exactly at the threshold and is not traded
+        self.assertEqual(trades, {"ETH": 200.0, "AVAX": -80.0, "DOGE": 5.0})
+        self.assertEqual(frame.index[frame["neutralize"]].tolist(), ["DOGE"])
+
+    def test_calculate_trade_amounts_matches(self):
+        """main.calculate_trade_amounts returns the same dict from exchange positions"""
+        import main
+
+        positions = {
+            "positions": [
+                {"symbol": "ETH", "contracts": 50, "markPrice": 2.0, "side": "short"},
+                {"symbol": "DOGE", "contracts": 10, "markPrice": 0.5, "side": "short"},
+                {"symbol": "BTC", "contracts": 0, "markPrice": 1.0, "side": "long"},
+            ]
+        }
+        targets = {"BTC": 300.0, "ETH": 100.0, "SOL": -80.0}
+        with patch.dict(os.environ, {"HL_API": "", "HL_SECRET": ""}):
+            trades = main.calculate_trade_amounts(targets, positions, 1000.0, threshold=0.05)
+
+        self.assertEqual(trades, {"BTC": 300.0, "ETH": 200.0, "SOL": -80.0, "DOGE": 5.0})
+
+
+if __name__ == "__main__":
+    unittest.main()